@@ -1,24 +1,38 @@
+import csv
+import io
 import psycopg2
-import bcrypt
 import streamlit as st
 from backend.db import get_connection, release_connection  # Connection Pool 활용
+from backend.config import PASSWORD_HASH_CONFIG, SESSION_TOKEN_CONFIG, ADMIN_CONFIG
+from backend.passwords import get_password_hasher, needs_rehash, MAX_PASSWORD_BYTES
+from backend.metrics import instrument, record_error
+from backend.session_tokens import (
+    CookieTokenStore,
+    get_token_cache,
+    create_session_token,
+    validate_session_token,
+    revoke_session_token,
+    revoke_user_sessions,
+)
 
-# 비밀번호 해싱
+# 비밀번호 해싱 (해싱 전용 프로세스 풀에서 실행)
+@instrument("auth")
 def hash_password(password: str) -> str:
     """비밀번호를 해싱하여 저장"""
     if not isinstance(password, str):
         raise ValueError("Password must be a string")
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode(), salt).decode()  # 해싱 후 문자열로 변환
+    return get_password_hasher(PASSWORD_HASH_CONFIG).hash(password)  # 해싱 후 문자열로 변환
 
-# 비밀번호 검증
+# 비밀번호 검증 (해싱 전용 프로세스 풀에서 실행)
+@instrument("auth")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """비밀번호를 검증 (해싱된 비밀번호와 비교)"""
     if not isinstance(plain_password, str) or not isinstance(hashed_password, str):
         raise ValueError("Both plain_password and hashed_password must be strings")
-    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode('utf-8'))  # 수정된 부분
+    return get_password_hasher(PASSWORD_HASH_CONFIG).verify(plain_password, hashed_password)
 
 # 사용자 등록
+@instrument("db")
 def register_user(username: str, password: str) -> bool:
     """새 사용자를 데이터베이스에 추가"""
     if not isinstance(username, str) or not isinstance(password, str):
@@ -63,13 +77,139 @@ def register_user(username: str, password: str) -> bool:
                 return True  # 회원가입 성공
         except Exception as e:
             print(f"Error during registration: {e}")
+            record_error()
             return False
         finally:
             release_connection(conn)
 
+# 사용자 일괄 등록
+@instrument("db")
+def bulk_register_users(users: list, hasher=None) -> list:
+    """
+    여러 사용자를 한 번에 등록 (register_user와 같은 규칙: 활성 사용자는 건너뛰고, 탈퇴한 사용자는 재활성화)
+    :param users: [(line_no, username, password), ...]
+    :param hasher: 병렬 해싱에 사용할 PasswordHasher (기본값: 공유 해셔)
+    :return: 행별 결과 [{"line_no", "username", "status"}, ...]
+             status: created | reactivated | exists | duplicate | invalid | error
+    """
+    results = {}
+    valid = []
+    for line_no, username, password in users:
+        if (
+            not username
+            or not password
+            or len(username) > 255
+            or len(password.encode("utf-8")) > MAX_PASSWORD_BYTES
+        ):
+            results[line_no] = {"line_no": line_no, "username": username, "status": "invalid"}
+        else:
+            valid.append((line_no, username, password))
+
+    if valid:
+        hasher = hasher or get_password_hasher(PASSWORD_HASH_CONFIG)
+        hashed_passwords = hasher.hash_many([password for _, _, password in valid])
+
+        # 스테이징 테이블에 COPY로 적재할 CSV 데이터
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for (line_no, username, _), hashed_password in zip(valid, hashed_passwords):
+            writer.writerow([line_no, username, hashed_password])
+        buffer.seek(0)
+
+        conn = get_connection()
+        if conn:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        CREATE TEMP TABLE staging_users (
+                            line_no INT,
+                            username VARCHAR(255),
+                            password TEXT
+                        ) ON COMMIT DROP;
+                    """)
+                    cur.copy_expert(
+                        "COPY staging_users (line_no, username, password) FROM STDIN WITH (FORMAT csv)",
+                        buffer,
+                    )
+                    # 파일 내 중복 아이디는 첫 행만 사용, 탈퇴 사용자는 재활성화, 없는 사용자는 추가
+                    cur.execute("""
+                        WITH first_rows AS (
+                            SELECT DISTINCT ON (username) line_no, username, password
+                            FROM staging_users
+                            ORDER BY username, line_no
+                        ),
+                        reactivated AS (
+                            UPDATE users u
+                            SET password = f.password, is_active = TRUE
+                            FROM first_rows f
+                            WHERE u.username = f.username AND u.is_active = FALSE
+                            RETURNING u.username
+                        ),
+                        inserted AS (
+                            INSERT INTO users (username, password)
+                            SELECT f.username, f.password
+                            FROM first_rows f
+                            WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.username = f.username)
+                            ON CONFLICT (username) DO NOTHING
+                            RETURNING username
+                        )
+                        SELECT s.line_no, s.username,
+                            CASE
+                                WHEN f.line_no IS NULL THEN 'duplicate'
+                                WHEN r.username IS NOT NULL THEN 'reactivated'
+                                WHEN i.username IS NOT NULL THEN 'created'
+                                ELSE 'exists'
+                            END AS status
+                        FROM staging_users s
+                        LEFT JOIN first_rows f ON f.line_no = s.line_no
+                        LEFT JOIN reactivated r ON r.username = f.username
+                        LEFT JOIN inserted i ON i.username = f.username;
+                    """)
+                    for line_no, username, status in cur.fetchall():
+                        results[line_no] = {"line_no": line_no, "username": username, "status": status}
+                    conn.commit()
+            except Exception as e:
+                print(f"Error during bulk registration: {e}")
+                record_error()
+                conn.rollback()
+                results.update(
+                    {line_no: {"line_no": line_no, "username": username, "status": "error"} for line_no, username, _ in valid}
+                )
+            finally:
+                release_connection(conn)
+        else:
+            results.update(
+                {line_no: {"line_no": line_no, "username": username, "status": "error"} for line_no, username, _ in valid}
+            )
+
+    return [results[line_no] for line_no, _, _ in users]
+
 # 사용자 인증 (로그인)
+@instrument("auth")
 def authenticate(username: str, password: str) -> bool:
     """사용자의 비밀번호를 검증하여 로그인 처리"""
+    # DB 연결은 해시 조회 후 바로 반환하고, 느린 bcrypt 검증은 연결 없이 수행
+    stored_password = get_password_hash(username)
+    if stored_password is None:
+        return False
+
+    try:
+        if not verify_password(password, stored_password):
+            return False
+    except Exception as e:
+        print(f"Error during authentication: {e}")
+        record_error()
+        return False
+
+    # 설정된 해싱 비용이 바뀌었으면 로그인 성공 시 새 비용으로 다시 해싱
+    if needs_rehash(stored_password, get_password_hasher(PASSWORD_HASH_CONFIG).rounds):
+        upgrade_password_hash(username, stored_password, hash_password(password))
+    return True
+
+# 저장된 비밀번호 해시 조회
+@instrument("db")
+def get_password_hash(username: str):
+    """활성 사용자의 해싱된 비밀번호 조회 (없으면 None)"""
     conn = get_connection()
     if conn:
         try:
@@ -79,34 +219,69 @@ def authenticate(username: str, password: str) -> bool:
                     (username,),
                 )
                 user_data = cur.fetchone()
+            return user_data[0] if user_data else None  # 데이터베이스에서 가져온 해싱된 비밀번호
+        except Exception as e:
+            print(f"Error fetching password hash: {e}")
+            record_error()
+            return None
+        finally:
+            release_connection(conn)
 
-            if user_data:
-                stored_password = user_data[0]  # 데이터베이스에서 가져온 해싱된 비밀번호
-                return verify_password(password, stored_password)  # 수정된 부분
-            return False
+# 비밀번호 해시 교체 (재해싱)
+@instrument("db")
+def upgrade_password_hash(username: str, old_hash: str, new_hash: str) -> bool:
+    """해시가 그 사이 바뀌지 않은 경우에만 새 해시로 교체"""
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE users SET password = %s WHERE username = %s AND password = %s",
+                    (new_hash, username, old_hash),
+                )
+                conn.commit()
+                return cur.rowcount == 1
         except Exception as e:
-            print(f"Error during authentication: {e}")
+            print(f"Error upgrading password hash: {e}")
+            record_error()
             return False
         finally:
             release_connection(conn)
+    return False
+
+# 로그인 토큰 쿠키 저장소
+def _token_store():
+    return CookieTokenStore(
+        SESSION_TOKEN_CONFIG["cookie_name"], SESSION_TOKEN_CONFIG["ttl"], secure=SESSION_TOKEN_CONFIG["cookie_secure"]
+    )
 
 # 로그인 처리 (세션 업데이트)
 def login_user(username: str):
-    """로그인 시 세션에 사용자 정보 저장"""
+    """로그인 시 세션에 사용자 정보 저장 및 새로고침 후에도 유지되도록 세션 토큰 발급"""
     st.session_state["authenticated"] = True
     st.session_state["user"] = username
+    token = create_session_token(username, SESSION_TOKEN_CONFIG["ttl"])
+    if token:
+        st.session_state["session_token"] = token
+        _token_store().set(token)
     st.success(f"{username}님, 로그인되었습니다.")
 
 # 로그아웃 처리
 def logout():
-    """로그아웃 시 세션 초기화"""
+    """로그아웃 시 세션 초기화 및 세션 토큰 폐기"""
+    token = st.session_state.get("session_token")
+    if token:
+        revoke_session_token(token, get_token_cache(SESSION_TOKEN_CONFIG))
+    _token_store().clear()
     st.session_state["authenticated"] = False
     st.session_state["user"] = None
+    st.session_state["session_token"] = None
     st.info("📢 로그아웃 되었습니다.")
 
 # 회원 탈퇴 (is_active = False 로 변경)
+@instrument("db")
 def delete_user(username: str) -> bool:
-    """회원 탈퇴 시 실제 데이터를 삭제하는 대신 is_active = False로 변경"""
+    """회원 탈퇴 시 실제 데이터를 삭제하는 대신 is_active = False로 변경하고 모든 세션 토큰 폐기"""
     conn = get_connection()
     if conn:
         try:
@@ -116,14 +291,47 @@ def delete_user(username: str) -> bool:
                     (username,),
                 )
                 conn.commit()
-                return True  # 탈퇴 성공
         except Exception as e:
             print(f"Error deleting user: {e}")
+            record_error()
             return False
         finally:
             release_connection(conn)
 
+        revoke_user_sessions(username, get_token_cache(SESSION_TOKEN_CONFIG))
+        if st.session_state.get("user") == username:
+            _token_store().clear()
+        return True  # 탈퇴 성공
+
 # 로그인 상태 확인
 def is_authenticated() -> bool:
-    """세션을 통해 현재 로그인 상태 확인"""
-    return st.session_state.get("authenticated", False)
\ No newline at end of file
+    """세션을 통해 현재 로그인 상태 확인 (새로고침/새 탭이면 쿠키의 세션 토큰으로 복원)"""
+    if st.session_state.get("authenticated", False):
+        return True
+    return restore_login()
+
+# 관리자 여부 확인
+def is_admin() -> bool:
+    """로그인한 사용자가 관리자 목록(ADMIN_CONFIG)에 있는지 확인"""
+    return is_authenticated() and st.session_state.get("user") in ADMIN_CONFIG["users"]
+
+# 세션 토큰으로 로그인 복원
+def restore_login() -> bool:
+    """쿠키의 세션 토큰이 유효하면 로그인 상태 복원 (bcrypt 검증 없음)"""
+    store = _token_store()
+    token = store.get()
+    if not token:
+        return False
+    username = validate_session_token(token, get_token_cache(SESSION_TOKEN_CONFIG))
+    if username is None:
+        store.clear()  # 만료/폐기된 토큰은 쿠키에서도 제거
+        return False
+    st.session_state["authenticated"] = True
+    st.session_state["user"] = username
+    st.session_state["session_token"] = token
+    return True
+
+# 대기 중인 로그인 쿠키 변경 반영
+def flush_login_cookie():
+    """로그인/로그아웃으로 바뀐 세션 토큰 쿠키를 브라우저에 저장 (매 페이지 렌더링 시 호출)"""
+    _token_store().flush()
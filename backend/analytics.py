@@ -0,0 +1,97 @@
+"""
+관리자 사용 통계
+- 화면을 열 때마다 원본 테이블(chat_sessions, chat_messages)을 다시 집계하지 않도록
+  일/사용자별 집계 테이블(usage_daily)에 누적하고, 통계 화면은 집계 테이블만 조회
+- 마지막으로 집계한 id(high-water mark) 이후 행만 집계하므로 갱신 비용은 새로 추가된 행 수에 비례
+- 갱신 직전 LAG초 안에 저장된 행은 다음 갱신으로 미룸 (먼저 받은 id가 늦게 커밋되는 경우를 건너뛰지 않도록)
+- 삭제된 세션/메시지는 집계에서 빼지 않음 (사용 이력 기준)
+
+설정 예시 (.streamlit/secrets.toml):
+    [analytics]
+    REFRESH_INTERVAL = 300
+    LAG = 60
+
+실행 예시 (cron 등에서 주기적으로 갱신):
+    python -m backend.analytics refresh
+    python -m backend.analytics summary --days 7
+"""
+
+import argparse
+import datetime
+import sys
+
+from backend.config import ANALYTICS_CONFIG
+from backend.db import get_daily_usage, get_usage_watermark, get_user_usage, refresh_usage_rollups
+
+
+def refresh(config):
+    """새로 추가된 행을 집계 (다른 갱신이 진행 중이면 {}, 오류 시 None)"""
+    return refresh_usage_rollups(lag_seconds=config["lag"])
+
+
+def refresh_if_stale(config):
+    """마지막 갱신 후 refresh_interval초가 지났을 때만 갱신 (갱신하지 않았으면 None)"""
+    watermark = get_usage_watermark()
+    if watermark is not None and watermark["age"] is not None and watermark["age"] < config["refresh_interval"]:
+        return None
+    return refresh(config)
+
+
+def default_period(days=30, today=None):
+    """오늘을 포함한 최근 days일 (시작일, 종료일)"""
+    today = today or datetime.date.today()
+    return today - datetime.timedelta(days=days - 1), today
+
+
+def summarize_usage(daily, users):
+    """
+    기간 전체 요약
+    :param daily: get_daily_usage 결과
+    :param users: get_user_usage(limit=None) 결과 (활동 사용자 수 계산용)
+    """
+    sessions = sum(row["sessions"] for row in daily)
+    answers = sum(row["answers"] for row in daily)
+    latency_days = [row for row in daily if row["avg_latency"] is not None]
+    weighted = sum(row["avg_latency"] * row["latency_count"] for row in latency_days)
+    weight = sum(row["latency_count"] for row in latency_days)
+    return {
+        "sessions": sessions,
+        "active_users": len(users),
+        "answers": answers,
+        "answers_per_session": answers / sessions if sessions else 0.0,
+        "avg_latency": weighted / weight if weight else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="관리자 사용 통계 집계")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("refresh", help="새로 추가된 세션/메시지를 집계 테이블에 반영")
+    summary_parser = subparsers.add_parser("summary", help="최근 기간의 일별 통계 출력")
+    summary_parser.add_argument("--days", type=int, default=7, help="오늘을 포함한 조회 기간 (일)")
+    args = parser.parse_args(argv)
+
+    if args.command == "refresh":
+        result = refresh(ANALYTICS_CONFIG)
+        if result is None:
+            sys.exit("❌ 집계 갱신에 실패했습니다.")
+        if not result:
+            print("다른 갱신이 진행 중이어서 건너뛰었습니다.")
+        else:
+            print(f"✅ 세션 {result['sessions']}개, 메시지 {result['messages']}개 집계 "
+                  f"(session_mark={result['session_mark']}, message_mark={result['message_mark']})")
+        return
+
+    start, end = default_period(args.days)
+    daily = get_daily_usage(start, end)
+    summary = summarize_usage(daily, get_user_usage(start, end))
+    print(f"{'day':<12}{'sessions':>10}{'users':>8}{'answers':>9}{'avg_latency(s)':>16}")
+    for row in daily:
+        latency = "-" if row["avg_latency"] is None else f"{row['avg_latency']:.2f}"
+        print(f"{str(row['day']):<12}{row['sessions']:>10}{row['active_users']:>8}{row['answers']:>9}{latency:>16}")
+    print(f"기간 {start} ~ {end}: 세션 {summary['sessions']}개, 활동 사용자 {summary['active_users']}명, "
+          f"세션당 답변 {summary['answers_per_session']:.1f}개")
+
+
+if __name__ == "__main__":
+    main()
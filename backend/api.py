@@ -0,0 +1,293 @@
+"""
+면접 HTTP API (Streamlit 없이 면접 진행)
+- POST /auth/login 으로 세션 토큰(backend.session_tokens)을 발급받고, 이후 요청은 Authorization: Bearer <token> 으로 인증
+- 면접 로직은 backend.interview_service를 그대로 사용 (Streamlit 화면과 같은 DB 기록/트레이스/지표)
+- 답변 평가는 SSE(POST /interviews/{id}/answers) 또는 WebSocket(/interviews/{id}/ws)으로 토큰 단위 스트리밍
+- DELETE /interviews/{id} 로 면접 상태 삭제 (끝내지 않은 면접은 상태 저장소의 TTL이 지나면 삭제)
+- GET /exports 로 대화를 CSV/JSONL/Parquet으로 스트리밍 내보내기 (backend.export)
+- 면접 상태는 요청마다 상태 저장소(backend.state_store)에서 읽고 버전을 확인하며 저장하므로,
+  postgres 저장소를 사용하면 여러 프로세스/서버가 같은 면접의 요청을 나누어 처리할 수 있음
+  (같은 면접에 동시에 들어온 요청은 먼저 저장한 쪽만 반영되고 나머지는 409 또는 error 이벤트)
+
+실행 예시:
+    uvicorn backend.api:app --host 0.0.0.0 --port 8000 --workers 4
+"""
+
+import datetime
+import json
+import queue
+import threading
+import uuid
+from collections import namedtuple
+from urllib.parse import quote
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from backend import interview_service as service, resilience
+from backend.accounts import authenticate
+from backend.config import ADMIN_CONFIG, SESSION_TOKEN_CONFIG, STATE_STORE_CONFIG
+from backend.export import export_file_name, export_messages, FORMATS
+from backend.db import get_user_id
+from backend.session_tokens import (create_session_token,
+                                    get_token_cache,
+                                    revoke_session_token,
+                                    validate_session_token)
+from backend.state_store import get_state_store, StateStoreError, VersionConflict
+from backend.token_budget import summarize_usage
+
+
+class LoginRequest(BaseModel):
+    username: str
+    password: str
+
+
+class AnswerRequest(BaseModel):
+    answer: str
+
+
+# 저장소에서 읽은 면접 상태와 버전
+Interview = namedtuple("Interview", ["key", "state", "version"])
+
+
+def _interview_key(interview_id):
+    return f"interview:{interview_id}"
+
+
+# 인증
+def _authorize(authorization):
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer":
+        return None
+    return validate_session_token(token.strip(), get_token_cache(SESSION_TOKEN_CONFIG))
+
+
+def current_user(authorization: str = Header(None)) -> str:
+    username = _authorize(authorization)
+    if username is None:
+        raise HTTPException(401, "유효하지 않은 세션 토큰입니다.", headers={"WWW-Authenticate": "Bearer"})
+    return username
+
+
+# 이벤트 스트리밍
+_DONE = object()
+
+
+def _format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _usage(state):
+    return summarize_usage(state.get("token_usage", []))
+
+
+def _answer_turn(state, answer, emit):
+    """답변 저장/평가 (사용자 메시지 → 평가 조각들 → 평가 메시지 순서로 이벤트 전달)"""
+    service.submit_answer(
+        state,
+        answer,
+        on_message=lambda msg: emit("message", msg),
+        on_chunk=lambda text: emit("token", {"content": text}),
+    )
+
+
+def _question_turn(state, emit):
+    emit("message", service.ask_question(state))
+
+
+def stream_turn(store, interview, turn):
+    """
+    turn(emit)을 작업 스레드에서 실행하고 면접 상태를 저장한 뒤 done 이벤트 전달
+    - emit된 (event, data)를 차례로 반환
+    - 클라이언트가 연결을 끊어도 턴은 끝까지 실행되어 DB와 면접 상태에 반영됨
+    """
+    events = queue.Queue()
+
+    def run():
+        try:
+            turn(lambda event, data: events.put((event, data)))
+            store.save(interview.key, interview.state, interview.version)
+            events.put(("done", _usage(interview.state)))
+        except service.TokenCapReached:
+            events.put(("error", {"detail": "이번 면접의 토큰 사용 한도에 도달했습니다."}))
+        except VersionConflict:
+            events.put(("error", {"detail": "같은 면접의 다른 요청이 먼저 처리되었습니다."}))
+        except Exception as e:
+            print(f"Error during interview turn: {e}")
+            events.put(("error", {"detail": "면접 처리 중 오류가 발생했습니다."}))
+        finally:
+            events.put(_DONE)
+
+    threading.Thread(target=run, name="interview-turn", daemon=True).start()
+    return _drain(events)
+
+
+def _drain(events):
+    while (item := events.get()) is not _DONE:
+        yield item
+
+
+def create_app(store=None) -> FastAPI:
+    store = store or get_state_store(STATE_STORE_CONFIG)
+    app = FastAPI(title="interview api")
+
+    def load_interview(interview_id, username):
+        key = _interview_key(interview_id)
+        state, version = store.load(key)
+        if state is None or state.get("user") != username:
+            return None
+        return Interview(key, state, version)
+
+    def owned_interview(interview_id: str, username: str = Depends(current_user)) -> Interview:
+        interview = load_interview(interview_id, username)
+        if interview is None:
+            raise HTTPException(404, "면접을 찾을 수 없습니다.")
+        return interview
+
+    def save(interview):
+        try:
+            store.save(interview.key, interview.state, interview.version)
+        except VersionConflict:
+            raise HTTPException(409, "같은 면접의 다른 요청이 먼저 처리되었습니다.")
+        except StateStoreError:
+            raise HTTPException(503, "면접 상태를 저장하지 못했습니다.")
+
+    @app.get("/healthz")
+    def healthz():
+        """외부 의존성 중 서킷 브레이커가 열린 것이 있으면 degraded (fallback으로 계속 응답)"""
+        dependencies = resilience.snapshot()
+        degraded = any(row["state"] != "closed" for row in dependencies)
+        return {"status": "degraded" if degraded else "ok", "dependencies": dependencies}
+
+    @app.post("/auth/login")
+    def login(body: LoginRequest):
+        if not authenticate(body.username, body.password):
+            raise HTTPException(401, "아이디 또는 비밀번호가 올바르지 않습니다.")
+        token = create_session_token(body.username, SESSION_TOKEN_CONFIG["ttl"])
+        if token is None:
+            raise HTTPException(503, "세션 토큰을 발급하지 못했습니다.")
+        return {"token": token, "username": body.username, "expires_in": SESSION_TOKEN_CONFIG["ttl"]}
+
+    @app.post("/auth/logout", status_code=204)
+    def logout(authorization: str = Header(None), username: str = Depends(current_user)):
+        revoke_session_token(authorization.partition(" ")[2].strip(), get_token_cache(SESSION_TOKEN_CONFIG))
+
+    @app.post("/interviews", status_code=201)
+    def start_interview(username: str = Depends(current_user)):
+        state = service.new_state(user=username)
+        question = service.start_interview(state, get_user_id(username))
+        interview_id = uuid.uuid4().hex
+        save(Interview(_interview_key(interview_id), state, 0))
+        return {"interview_id": interview_id, "session_id": state.get("session_id"), "question": question}
+
+    @app.get("/interviews/{interview_id}")
+    def get_interview(interview: Interview = Depends(owned_interview)):
+        state = interview.state
+        return {
+            "session_id": state.get("session_id"),
+            "messages": state["messages"],
+            "usage": _usage(state),
+        }
+
+    @app.delete("/interviews/{interview_id}", status_code=204)
+    def end_interview(interview: Interview = Depends(owned_interview)):
+        """면접 상태 삭제 (대화 기록은 DB에 남음)"""
+        store.delete(interview.key)
+
+    @app.post("/interviews/{interview_id}/questions")
+    def next_question(interview: Interview = Depends(owned_interview)):
+        try:
+            question = service.ask_question(interview.state)
+        except service.TokenCapReached:
+            raise HTTPException(409, "이번 면접의 토큰 사용 한도에 도달했습니다.")
+        save(interview)
+        return {"question": question}
+
+    @app.post("/interviews/{interview_id}/answers")
+    def submit_answer(body: AnswerRequest, interview: Interview = Depends(owned_interview)):
+        """평가 결과를 SSE(event: message/token/done/error)로 스트리밍"""
+        events = stream_turn(store, interview, lambda emit: _answer_turn(interview.state, body.answer, emit))
+        return StreamingResponse(
+            (_format_sse(event, data) for event, data in events),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.get("/exports")
+    def export(
+        format: str = Query("csv", pattern="^(csv|jsonl|parquet)$"),
+        session_id: int = None,
+        user: str = None,
+        start: datetime.date = None,
+        end: datetime.date = None,
+        username: str = Depends(current_user),
+    ):
+        """
+        대화 내보내기를 DB에서 읽는 대로 스트리밍 (응답 크기와 무관하게 메모리 사용량 일정)
+        - 일반 사용자는 자신의 대화만, 관리자는 user/start/end로 전체 사용자 대화를 내보낼 수 있음
+        """
+        is_admin = username in ADMIN_CONFIG["users"]
+        if user is not None and user != username and not is_admin:
+            raise HTTPException(403, "다른 사용자의 대화는 내보낼 수 없습니다.")
+        owner = user or (None if is_admin else username)
+        user_id = None
+        if owner is not None:
+            user_id = get_user_id(owner)
+            if user_id is None:
+                raise HTTPException(404, "사용자를 찾을 수 없습니다.")
+
+        file_name = export_file_name(format, session_id, owner, start, end)
+        return StreamingResponse(
+            export_messages(format, session_id, user_id, start, end),
+            media_type=FORMATS[format][0],
+            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(file_name)}"},
+        )
+
+    @app.websocket("/interviews/{interview_id}/ws")
+    async def interview_socket(websocket: WebSocket, interview_id: str):
+        """
+        한 연결로 면접 진행 (브라우저는 헤더를 지정할 수 없으므로 ?token= 도 허용)
+        - 보내기: {"type": "answer", "answer": "..."} 또는 {"type": "question"}
+        - 받기: {"event": "message" | "token" | "done" | "error", "data": {...}}
+        """
+        token = websocket.query_params.get("token")
+        authorization = websocket.headers.get("authorization") or (f"Bearer {token}" if token else None)
+        username = await run_in_threadpool(_authorize, authorization)
+        if username is None:
+            await websocket.close(code=4401)
+            return
+        if await run_in_threadpool(load_interview, interview_id, username) is None:
+            await websocket.close(code=4404)
+            return
+
+        await websocket.accept()
+        try:
+            while True:
+                request = await websocket.receive_json()
+                if request.get("type") == "answer" and request.get("answer"):
+                    answer = request["answer"]
+                    turn = lambda state, emit: _answer_turn(state, answer, emit)  # noqa: E731
+                elif request.get("type") == "question":
+                    turn = _question_turn
+                else:
+                    await websocket.send_json({"event": "error", "data": {"detail": "알 수 없는 요청입니다."}})
+                    continue
+
+                # 다른 프로세스에서 진행했을 수 있으므로 턴마다 최신 상태를 다시 읽음
+                interview = await run_in_threadpool(load_interview, interview_id, username)
+                if interview is None:
+                    await websocket.send_json({"event": "error", "data": {"detail": "면접을 찾을 수 없습니다."}})
+                    break
+                events = stream_turn(store, interview, lambda emit: turn(interview.state, emit))
+                async for event, data in iterate_in_threadpool(events):
+                    await websocket.send_json({"event": event, "data": data})
+        except WebSocketDisconnect:
+            return
+        await websocket.close()
+
+    return app
+
+
+app = create_app()
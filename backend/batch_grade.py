@@ -0,0 +1,280 @@
+"""
+질문/답변 일괄 평가 CLI
+- CSV/JSONL 파일에서 (question, answer) 레코드를 한 줄씩 읽어 EVALUATION_PROMPT와 retriever로 평가
+- 설정한 동시 실행 수만큼만 평가를 진행하고, 결과는 완료되는 즉시 출력 파일에 추가
+- 출력 파일이 체크포인트 역할을 하므로 중단 후 다시 실행하면 완료된 레코드는 건너뜀
+  (JSONL 결과 파일에 쓰다 만 마지막 줄은 다시 실행할 때 잘라 내고 해당 레코드를 다시 평가)
+
+실행 예시:
+    python -m backend.batch_grade answers.csv results.jsonl --concurrency 8
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from backend.evaluations import parse_evaluation, CRITERIA
+
+# 일괄 평가는 실시간 평가에 밀려 대기열에서 오래 기다릴 수 있으므로 deadline을 길게 설정 (초)
+BATCH_QUEUE_DEADLINE = 600
+
+
+# 입력 레코드 읽기
+def read_records(path):
+    """CSV/JSONL 파일에서 레코드를 하나씩 반환 (id가 없으면 행 번호 사용)"""
+    if not path.endswith((".jsonl", ".csv")):
+        raise ValueError(f"Unsupported input format: {path} (use .csv or .jsonl)")
+
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+
+        for line_no, row in enumerate(rows, start=1):
+            if not row.get("question") or not row.get("answer"):
+                print(f"⚠️ {line_no}번째 레코드에 question/answer가 없어 건너뜁니다.")
+                continue
+            yield {
+                "id": str(row.get("id") or line_no),
+                "question": row["question"],
+                "answer": row["answer"],
+            }
+
+
+# 체크포인트 (이미 완료된 레코드 id)
+def load_completed_ids(path):
+    """기존 출력 파일에 기록된 레코드 id 집합"""
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            completed = set()
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    completed.add(str(json.loads(line)["id"]))
+                except (ValueError, KeyError, TypeError):
+                    # 기록 도중 중단된 줄 (완료되지 않은 것으로 보고 다시 평가)
+                    print(f"⚠️ 결과 파일 {line_no}번째 줄을 읽을 수 없어 건너뜁니다.")
+            return completed
+        return {row["id"] for row in csv.DictReader(f)}
+
+
+def truncate_partial_line(path, chunk_size=65536):
+    """
+    파일이 줄바꿈으로 끝나지 않으면 마지막 줄바꿈 뒤(기록 도중 중단된 줄)를 잘라 냄
+    :return: 잘라 낸 바이트 수
+    """
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return 0
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return 0
+        end = size
+        while end > 0:
+            start = max(0, end - chunk_size)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        f.truncate(end)
+        return size - end
+
+
+# 결과 스트리밍 저장
+class ResultWriter:
+    FIELDS = [
+        "id", "question", "answer", "evaluation", "score", "accuracy", "completeness", "clarity", "topic",
+        "prompt_tokens", "completion_tokens", "latency",
+    ]
+
+    def __init__(self, path):
+        """출력 파일을 추가 모드로 열고, 새 CSV 파일이면 헤더 작성 (JSONL은 쓰다 만 마지막 줄을 잘라 냄)"""
+        if not path.endswith((".jsonl", ".csv")):
+            raise ValueError(f"Unsupported output format: {path} (use .csv or .jsonl)")
+        self.path = path
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not is_new and path.endswith(".jsonl"):
+            dropped = truncate_partial_line(path)
+            if dropped:
+                print(f"⚠️ 결과 파일 끝의 불완전한 줄({dropped} bytes)을 잘라 냈습니다.")
+        self._file = open(path, "a", encoding="utf-8", newline="")
+        self._csv = None
+        if path.endswith(".csv"):
+            self._csv = csv.DictWriter(self._file, fieldnames=self.FIELDS)
+            if is_new:
+                self._csv.writeheader()
+
+    def write(self, result):
+        if self._csv is not None:
+            self._csv.writerow({field: result.get(field) for field in self.FIELDS})
+        else:
+            self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self._file.flush()  # 중단되어도 완료된 결과는 남도록
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# 평가 함수 생성
+def make_evaluator():
+    """
+    설정된 retriever, 평가 프롬프트, LLM 스케줄러, 평가 캐시를 사용하는 평가 함수 반환
+    (retriever/LLM 호출은 면접 화면과 같은 resilience 정책으로 재시도)
+    """
+    from backend.config import (
+        get_openai_client,
+        EVALUATION_PROMPT,
+        retriever,
+        DEFAULT_MODEL,
+        MAX_COMPLETION_TOKENS,
+        TOKEN_BUDGET_CONFIG,
+        EVAL_CACHE_CONFIG,
+        LLM_SCHEDULER_CONFIG,
+    )
+    from backend.eval_cache import get_evaluation_cache
+    from backend.llm_scheduler import get_llm_scheduler, estimate_tokens, PRIORITY_BACKGROUND
+    from backend.resilience import get_dependency
+    from backend.token_budget import count_tokens, compress_context
+
+    chain = EVALUATION_PROMPT | get_openai_client()
+    scheduler = get_llm_scheduler(LLM_SCHEDULER_CONFIG)
+
+    def evaluate(question, answer):
+        # 재시도/deadline/서킷 브레이커는 resilience 정책으로 처리 (클라이언트 자체 재시도는 끔)
+        docs = get_dependency("pinecone").call(lambda: retriever.invoke(question), hedge=True)
+        context = compress_context(
+            "\n".join(doc.page_content for doc in docs),
+            question,
+            TOKEN_BUDGET_CONFIG["context_tokens"],
+            DEFAULT_MODEL,
+        )
+
+        cache = get_evaluation_cache(EVAL_CACHE_CONFIG)
+        if cache is not None:
+            cached = cache.get(question, answer, context, DEFAULT_MODEL)
+            if cached is not None:
+                return cached, {}
+
+        inputs = {"question": question, "answer": answer, "context": context}
+        start = time.perf_counter()
+        response = scheduler.submit(
+            lambda: get_dependency("openai").call(lambda: chain.invoke(inputs)),
+            priority=PRIORITY_BACKGROUND,  # 화면에서 기다리는 사용자의 평가가 먼저 실행되도록
+            est_tokens=estimate_tokens(
+                inputs, MAX_COMPLETION_TOKENS, counter=lambda text: count_tokens(text, DEFAULT_MODEL)
+            ),
+            deadline=BATCH_QUEUE_DEADLINE,
+        )
+        usage = getattr(response, "usage_metadata", None) or {}
+        if cache is not None:
+            cache.set(
+                question, answer, context, DEFAULT_MODEL, response.content,
+                total_tokens=usage.get("total_tokens", 0),
+                latency=time.perf_counter() - start,
+            )
+        return response.content, usage
+
+    return evaluate
+
+
+def _grade(record, evaluate):
+    from backend.config import EVALUATION_TOPICS
+
+    start = time.perf_counter()
+    evaluation, usage = evaluate(record["question"], record["answer"])
+    evaluation, scores = parse_evaluation(evaluation, EVALUATION_TOPICS)
+    return {
+        **record,
+        "evaluation": evaluation,
+        **{key: (scores or {}).get(key) for key in ("score",) + CRITERIA + ("topic",)},
+        "prompt_tokens": usage.get("input_tokens", 0),
+        "completion_tokens": usage.get("output_tokens", 0),
+        "latency": round(time.perf_counter() - start, 3),
+    }
+
+
+# 일괄 평가 실행
+def run_batch(records, evaluate, writer, concurrency=4, completed_ids=frozenset()):
+    """
+    레코드를 최대 concurrency개씩 동시에 평가하고 완료 순서대로 writer에 기록
+    :return: 처리 건수, 건너뛴 건수, 실패 건수, 토큰 사용량, 처리 속도 통계
+    """
+    stats = {"graded": 0, "skipped": 0, "failed": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    start = time.perf_counter()
+
+    def collect(done):
+        for future in done:
+            record = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                # 기록하지 않으므로 다음 실행 때 다시 평가됨
+                stats["failed"] += 1
+                print(f"Error grading record {record['id']}: {e}")
+                continue
+            writer.write(result)
+            stats["graded"] += 1
+            stats["prompt_tokens"] += result["prompt_tokens"]
+            stats["completion_tokens"] += result["completion_tokens"]
+
+    pending = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for record in records:
+            if record["id"] in completed_ids:
+                stats["skipped"] += 1
+                continue
+            if len(pending) >= concurrency:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[executor.submit(_grade, record, evaluate)] = record
+        collect(wait(pending).done)
+
+    stats["elapsed"] = time.perf_counter() - start
+    stats["records_per_sec"] = stats["graded"] / stats["elapsed"] if stats["elapsed"] else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="질문/답변 일괄 평가")
+    parser.add_argument("input", help="입력 파일 (.csv 또는 .jsonl, question/answer 컬럼 필요)")
+    parser.add_argument("output", help="결과 파일 (.csv 또는 .jsonl, 이미 있으면 이어서 진행)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 평가할 최대 레코드 수")
+    args = parser.parse_args(argv)
+
+    completed_ids = load_completed_ids(args.output)
+    if completed_ids:
+        print(f"이전 실행에서 완료된 {len(completed_ids)}건은 건너뜁니다.")
+
+    with ResultWriter(args.output) as writer:
+        stats = run_batch(
+            read_records(args.input), make_evaluator(), writer, args.concurrency, completed_ids
+        )
+
+    print(
+        f"✅ 평가 완료: {stats['graded']}건 (건너뜀 {stats['skipped']}, 실패 {stats['failed']}), "
+        f"{stats['elapsed']:.1f}s, {stats['records_per_sec']:.2f} records/s"
+    )
+    print(
+        f"토큰 사용량: 프롬프트 {stats['prompt_tokens']} / 응답 {stats['completion_tokens']} "
+        f"(총 {stats['prompt_tokens'] + stats['completion_tokens']})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 import streamlit as st
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 # from pinecone import Pinecone, ServerlessSpec
 import pinecone
 from langchain_pinecone import PineconeVectorStore
+from backend.embedding_registry import ActiveRetriever, check_index, default_record, embedding_config, same_index
+from backend.embeddings import create_embeddings
+from backend.metrics import setup_metrics
+from backend import tracing, resilience
 # Neon PostgreSQL 연결 정보
 DB_CONFIG = {
     "host": st.secrets['postgres']['POSTGRES_HOST'],
@@ -21,14 +25,142 @@ PINECONE_CONFIG = {
 
 # openai 기본 모델 설정
 DEFAULT_MODEL = "gpt-4o-mini"
+MAX_COMPLETION_TOKENS = 1500
 
 # OpenAI API 클라이언트 설정
 def get_openai_client():
-    return ChatOpenAI(model= DEFAULT_MODEL, temperature=0.9, api_key=st.secrets['openai']["OPENAI_API_KEY"],max_completion_tokens=1500)
+    return ChatOpenAI(model= DEFAULT_MODEL, temperature=0.9, api_key=st.secrets['openai']["OPENAI_API_KEY"],max_completion_tokens=MAX_COMPLETION_TOKENS, stream_usage=True,
+                      # 재시도와 전체 deadline은 backend.resilience에서 관리
+                      timeout=RESILIENCE_CONFIG["openai"]["timeout"], max_retries=0)
 
 def get_openai_key():
     return st.secrets['openai']["OPENAI_API_KEY"]
 
+# 비밀번호 해싱 설정 (ROUNDS를 바꾸면 다음 로그인 때 자동으로 다시 해싱)
+PASSWORD_HASH_CONFIG = {
+    "rounds": st.secrets.get("password_hash", {}).get("ROUNDS", 12),
+    "workers": st.secrets.get("password_hash", {}).get("WORKERS", 2),  # 해싱 프로세스 수 (0이면 스크립트 스레드에서 실행)
+}
+
+# 로그인 세션 토큰 설정
+SESSION_TOKEN_CONFIG = {
+    "ttl": st.secrets.get("session_token", {}).get("TTL", 7 * 24 * 3600),  # 토큰 유효 기간 (초)
+    "cache_ttl": st.secrets.get("session_token", {}).get("CACHE_TTL", 60),  # 프로세스 내 검증 캐시 유지 시간 (초)
+    "cookie_name": st.secrets.get("session_token", {}).get("COOKIE_NAME", "interview_session"),
+    # 쿠키를 HTTPS에서만 전송 (HTTP로 접속하는 로컬 개발 환경에서만 false)
+    "cookie_secure": st.secrets.get("session_token", {}).get("COOKIE_SECURE", True),
+}
+
+# LLM 요청 스케줄러 설정 (OpenAI 계정의 rate limit에 맞춰 조정)
+LLM_SCHEDULER_CONFIG = {
+    "requests_per_min": st.secrets.get("llm_scheduler", {}).get("REQUESTS_PER_MIN", 500),
+    "tokens_per_min": st.secrets.get("llm_scheduler", {}).get("TOKENS_PER_MIN", 200000),
+    "max_concurrency": st.secrets.get("llm_scheduler", {}).get("MAX_CONCURRENCY", 8),
+    "max_queue": st.secrets.get("llm_scheduler", {}).get("MAX_QUEUE", 100),
+    "deadline": st.secrets.get("llm_scheduler", {}).get("DEADLINE", 30.0),  # 대기 최대 시간 (초)
+}
+
+# 프롬프트 토큰 예산 설정
+TOKEN_BUDGET_CONFIG = {
+    "context_tokens": st.secrets.get("token_budget", {}).get("CONTEXT_TOKENS", 1500),  # 참고 문서 최대 토큰 수 (0이면 제한 없음)
+    "interview_token_cap": st.secrets.get("token_budget", {}).get("INTERVIEW_TOKEN_CAP", 0),  # 면접 1회 최대 토큰 수 (0이면 제한 없음)
+}
+
+# 평가 결과 캐시 설정 (기본값: 사용 안 함)
+EVAL_CACHE_CONFIG = {
+    "enabled": st.secrets.get("eval_cache", {}).get("ENABLED", False),
+    "backend": st.secrets.get("eval_cache", {}).get("BACKEND", "memory"),  # memory | postgres
+    "ttl": st.secrets.get("eval_cache", {}).get("TTL", 86400),  # 초 단위
+    "max_size": st.secrets.get("eval_cache", {}).get("MAX_SIZE", 1000),
+}
+
+# 면접 상태 저장소 설정 (postgres면 여러 프로세스/서버가 상태를 공유하고 재시작 후에도 면접 유지)
+STATE_STORE_CONFIG = {
+    "backend": st.secrets.get("state_store", {}).get("BACKEND", "memory"),  # memory | postgres
+    "ttl": st.secrets.get("state_store", {}).get("TTL", 24 * 3600),  # 이 시간(초) 동안 진행하지 않은 면접 상태 삭제
+    "max_entries": st.secrets.get("state_store", {}).get("MAX_ENTRIES", 10000),  # memory: 최대 보관 수
+    "sweep_interval": st.secrets.get("state_store", {}).get("SWEEP_INTERVAL", 600),  # postgres: 만료 행 삭제 주기 (초)
+}
+
+# 성능 지표 수집 설정 (기본값: 사용 안 함, 켜면 http://HOST:PORT/metrics 제공)
+METRICS_CONFIG = {
+    "enabled": st.secrets.get("metrics", {}).get("ENABLED", False),
+    "host": st.secrets.get("metrics", {}).get("HOST", "127.0.0.1"),
+    "port": st.secrets.get("metrics", {}).get("PORT", 9108),
+}
+setup_metrics(METRICS_CONFIG)
+
+# 면접 턴 트레이싱 설정 (기본값: 사용 안 함)
+TRACING_CONFIG = {
+    "enabled": st.secrets.get("tracing", {}).get("ENABLED", False),
+    "path": st.secrets.get("tracing", {}).get("PATH", "traces.jsonl"),  # span을 저장할 JSONL 파일
+    "sample_rate": st.secrets.get("tracing", {}).get("SAMPLE_RATE", 1.0),  # 기록할 턴 비율 (0~1)
+}
+tracing.configure(TRACING_CONFIG)
+
+# 느린 재실행 프로파일링 설정 (기본값: 사용 안 함)
+PROFILING_CONFIG = {
+    "enabled": st.secrets.get("profiling", {}).get("ENABLED", False),
+    "threshold": st.secrets.get("profiling", {}).get("THRESHOLD", 1.0),  # 이 시간(초)을 넘은 재실행만 저장
+    "dir": st.secrets.get("profiling", {}).get("DIR", "profiles"),
+    "keep": st.secrets.get("profiling", {}).get("KEEP", 20),  # 보관할 최근 프로파일 수
+}
+
+# 외부 의존성 호출 정책 (deadline, 재시도, 서킷 브레이커, hedge)
+_resilience_secrets = st.secrets.get("resilience", {})
+RESILIENCE_CONFIG = {
+    "openai": {
+        "timeout": _resilience_secrets.get("openai", {}).get("TIMEOUT", 60.0),  # 재시도 포함 전체 deadline (초)
+        "attempts": _resilience_secrets.get("openai", {}).get("ATTEMPTS", 2),
+        "failure_threshold": _resilience_secrets.get("openai", {}).get("FAILURE_THRESHOLD", 5),
+        "reset_timeout": _resilience_secrets.get("openai", {}).get("RESET_TIMEOUT", 30.0),
+    },
+    "pinecone": {
+        "timeout": _resilience_secrets.get("pinecone", {}).get("TIMEOUT", 5.0),
+        "attempts": _resilience_secrets.get("pinecone", {}).get("ATTEMPTS", 3),
+        "failure_threshold": _resilience_secrets.get("pinecone", {}).get("FAILURE_THRESHOLD", 5),
+        "reset_timeout": _resilience_secrets.get("pinecone", {}).get("RESET_TIMEOUT", 30.0),
+        "hedge_after": _resilience_secrets.get("pinecone", {}).get("HEDGE_AFTER", 1.0),  # 검색이 이 시간(초)을 넘으면 한 번 더 요청
+    },
+    "postgres": {
+        "timeout": None,  # 연결은 CONNECT_TIMEOUT으로 제한 (별도 스레드를 거치지 않음)
+        "attempts": _resilience_secrets.get("postgres", {}).get("ATTEMPTS", 3),  # 연결 풀 고갈 시 재시도
+        "backoff_base": _resilience_secrets.get("postgres", {}).get("BACKOFF_BASE", 0.05),
+        "failure_threshold": _resilience_secrets.get("postgres", {}).get("FAILURE_THRESHOLD", 5),
+        "reset_timeout": _resilience_secrets.get("postgres", {}).get("RESET_TIMEOUT", 10.0),
+    },
+}
+resilience.configure(RESILIENCE_CONFIG)
+
+# 관리자 설정 (관리자 페이지 접근 가능 사용자)
+ADMIN_CONFIG = {
+    "users": st.secrets.get("admin", {}).get("USERS", []),
+}
+
+# 관리자 사용 통계 설정 (backend.analytics)
+ANALYTICS_CONFIG = {
+    "refresh_interval": st.secrets.get("analytics", {}).get("REFRESH_INTERVAL", 300),  # 통계 화면을 열 때 이 시간(초)이 지났으면 집계 갱신
+    "lag": st.secrets.get("analytics", {}).get("LAG", 60),  # 이 시간(초)보다 최근에 저장된 행은 다음 갱신에 집계
+}
+
+# 대화 내보내기 설정 (backend.export)
+EXPORT_CONFIG = {
+    "download_limit_mb": st.secrets.get("export", {}).get("DOWNLOAD_LIMIT_MB", 50),  # 화면 다운로드 최대 크기 (넘으면 CLI/API 안내)
+}
+
+# 참고 문서 적재 설정 (backend.ingest)
+INGEST_CONFIG = {
+    "data_dir": st.secrets.get("ingest", {}).get("DATA_DIR", "backend/data"),  # 적재할 문서 폴더 (하위 폴더 포함)
+    "chunk_size": st.secrets.get("ingest", {}).get("CHUNK_SIZE", 1000),  # 청크 최대 길이 (문자 수, 겹침 포함)
+    "chunk_overlap": st.secrets.get("ingest", {}).get("CHUNK_OVERLAP", 100),  # 앞 청크 끝에서 가져올 길이
+    "batch_size": st.secrets.get("ingest", {}).get("BATCH_SIZE", 100),  # 한 번에 임베딩/업서트할 청크 수
+}
+
+# 채팅 화면 설정
+CHAT_VIEW_CONFIG = {
+    "window": st.secrets.get("chat_view", {}).get("WINDOW", 20),  # 처음 표시할 최근 메시지 수 (0이면 전체 표시)
+}
+
 # 면접 질문 생성 프롬프트
 QUESTION_PROMPT = PromptTemplate(
     template="""주어진 문서를 기반으로 파이썬 면접 질문을 하나만 생성해 주세요. 
@@ -37,7 +169,23 @@ QUESTION_PROMPT = PromptTemplate(
     input_variables=["context"]
 )
 
-# 면접 챗봇 평가 프롬프트
+# LLM을 사용할 수 없을 때 대신 내는 질문과 평가 안내
+FALLBACK_QUESTIONS = [
+    "파이썬의 리스트와 튜플의 차이점을 설명해 주세요.",
+    "GIL(Global Interpreter Lock)이 무엇이고 멀티스레딩에 어떤 영향을 주는지 설명해 주세요.",
+    "데코레이터가 무엇이고 어떤 경우에 사용하는지 설명해 주세요.",
+    "제너레이터와 이터레이터의 차이점을 설명해 주세요.",
+    "파이썬에서 얕은 복사와 깊은 복사의 차이를 설명해 주세요.",
+]
+FALLBACK_EVALUATION = "지금은 답변 평가 서비스에 연결할 수 없습니다. 답변은 저장되었으니 잠시 후 다시 시도해 주세요."
+
+# 평가 주제 (약한 주제 통계용, 목록에 없는 주제는 "기타")
+EVALUATION_TOPICS = [
+    "자료형", "함수", "클래스/객체지향", "데코레이터", "제너레이터/이터레이터",
+    "예외 처리", "메모리 관리", "동시성/GIL", "비동기", "모듈/패키지", "표준 라이브러리",
+]
+
+# 면접 챗봇 평가 프롬프트 (점수 블록 형식은 backend.evaluations 참고)
 EVALUATION_PROMPT = PromptTemplate(
     template="""
     너는 파이썬 면접관 챗봇이야. 
@@ -48,21 +196,51 @@ EVALUATION_PROMPT = PromptTemplate(
     
     질문: {question}
     답변: {answer}
+
+    아래 형식으로 작성하고, 맨 마지막 줄에 점수 블록을 붙여줘.
+    점수는 0~10 정수, topic은 [{topics}] 중 질문에 가장 가까운 하나야.
     평가:
+    (평가 내용)
+
+    모범 답안:
+    (모범 답안)
+
+    <score>{{"score": 0, "accuracy": 0, "completeness": 0, "clarity": 0, "topic": ""}}</score>
     """,
-    input_variables=["question", "answer", "context"]
+    input_variables=["question", "answer", "context"],
+    partial_variables={"topics": ", ".join(EVALUATION_TOPICS)},
 )
 
 # RAG 설정
 VECTOR_STORE_PATH = "my_vector_store"
 
-# Embedding 설정
-
-embeddings = OpenAIEmbeddings(api_key=get_openai_key())
+# Embedding 설정 (backend.embeddings, [embedding.indexes.<인덱스 이름>]으로 인덱스별 덮어쓰기)
+_embedding_secrets = {
+    **{key: value for key, value in st.secrets.get("embedding", {}).items() if key != "indexes"},
+    **st.secrets.get("embedding", {}).get("indexes", {}).get(PINECONE_CONFIG["index_name"], {}),
+}
+EMBEDDING_CONFIG = {
+    "backend": _embedding_secrets.get("BACKEND", "openai"),  # openai | local
+    "model": _embedding_secrets.get("MODEL"),  # 비우면 백엔드 기본 모델
+    "threads": _embedding_secrets.get("THREADS", 0),  # local: torch 스레드 수 (0이면 torch 기본값)
+    "batch_size": _embedding_secrets.get("BATCH_SIZE", 32),  # local: 한 번에 추론할 문장 수
+    "processes": _embedding_secrets.get("PROCESSES", 0),  # local: 대량 임베딩 프로세스 수 (0이면 현재 프로세스)
+    "query_prefix": _embedding_secrets.get("QUERY_PREFIX", ""),
+    "document_prefix": _embedding_secrets.get("DOCUMENT_PREFIX", ""),
+    "cache_dir": _embedding_secrets.get("CACHE_DIR"),  # local: 모델 캐시 폴더
+    "offline": _embedding_secrets.get("OFFLINE", False),  # local: 캐시에 있는 모델만 사용
+    "projection": _embedding_secrets.get("PROJECTION", ""),  # 차원 축소 투영 파일 (backend.projection, 비우면 전체 차원)
+    "registry_refresh": _embedding_secrets.get("REGISTRY_REFRESH", 30),  # 활성 인덱스 확인 주기 (초, backend.embedding_registry)
+}
 
 PINECONE_API_KEY = PINECONE_CONFIG["api_key"]
 PINECONE_ENV = PINECONE_CONFIG["environment"]
 INDEX_NAME = PINECONE_CONFIG["index_name"]
+PINECONE_NAMESPACE = "example-namespace"  # 검색과 문서 적재(backend.ingest)가 함께 사용
+
+# 설정의 인덱스/모델 (레지스트리에 활성 인덱스가 등록되기 전까지 검색에 사용)
+DEFAULT_INDEX = default_record(INDEX_NAME, PINECONE_NAMESPACE, EMBEDDING_CONFIG)
+embeddings = create_embeddings(embedding_config(DEFAULT_INDEX, EMBEDDING_CONFIG), api_key=get_openai_key())
 
 pc = pinecone.Pinecone(api_key=PINECONE_API_KEY)
 
@@ -78,18 +256,42 @@ pc = pinecone.Pinecone(api_key=PINECONE_API_KEY)
 #         )
 #     )
 
-# index 객체 생성
-if INDEX_NAME not in pc.list_indexes().names():
+# index 객체 생성 (목록 조회가 실패/지연되면 확인을 건너뛰고 검색할 때 다시 시도)
+try:
+    index_names = resilience.get_dependency("pinecone").call(lambda: pc.list_indexes().names())
+except Exception as e:
+    print(f"Error listing Pinecone indexes: {e}")
+    index_names = None
+if index_names is not None and INDEX_NAME not in index_names:
     raise ValueError(f"Pinecone 인덱스 '{INDEX_NAME}'가 존재하지 않습니다. 먼저 생성해 주세요.")
 
 index = pc.Index(INDEX_NAME)
 
+# 질문 임베딩 모델과 인덱스 차원이 다르면 시작하지 않음
+check_index(pc, DEFAULT_INDEX, embeddings)
+
 # Vector Store 생성 (LangChain용)
-vectorstore = PineconeVectorStore(index, embeddings,namespace="example-namespace")
+vectorstore = PineconeVectorStore(index, embeddings, namespace=PINECONE_NAMESPACE)
 print(type(vectorstore))  # <class 'langchain_pinecone.vectorstores.Pinecone'>
 
-# retriever로 변환
-retriever = vectorstore.as_retriever(search_type = "mmr",search_kwargs={"k": 5, "fetch_k": 20, "lambda_mult": 0.7})
+
+def open_vectorstore(record):
+    """레지스트리에 등록된 인덱스의 벡터 스토어 (모델/차원 확인 후 생성, 설정의 인덱스면 위 vectorstore 재사용)"""
+    if same_index(record, DEFAULT_INDEX):
+        return vectorstore
+    record_embeddings = create_embeddings(embedding_config(record, EMBEDDING_CONFIG), api_key=get_openai_key())
+    check_index(pc, record, record_embeddings)
+    return PineconeVectorStore(pc.Index(record["index_name"]), record_embeddings, namespace=record["namespace"])
+
+
+# retriever로 변환 (활성 인덱스가 바뀌면 REGISTRY_REFRESH초 안에 새 인덱스로 검색)
+retriever = ActiveRetriever(
+    DEFAULT_INDEX,
+    open_vectorstore,
+    search_type="mmr",
+    search_kwargs={"k": 5, "fetch_k": 20, "lambda_mult": 0.7},
+    refresh_interval=EMBEDDING_CONFIG["registry_refresh"],
+)
 
 QUERY="파이썬 면접 질문 하나 생성해"
 
@@ -1,7 +1,13 @@
+import datetime
+import re
+import uuid
+
 from psycopg2.extras import RealDictCursor
 from psycopg2 import pool
 import streamlit as st
 from backend.config import DB_CONFIG  # `config.py`에서 DB 설정 가져오기
+from backend.metrics import instrument, record_error
+from backend.resilience import get_dependency
 
 # Connection Pool 생성 (최소 1개, 최대 5개)
 try:
@@ -14,6 +20,7 @@ try:
         host=DB_CONFIG["host"],
         port=DB_CONFIG["port"],
         sslmode=st.secrets["postgres"].get("SSL_MODE", "require"),  # 기본값 'require'
+        connect_timeout=st.secrets["postgres"].get("CONNECT_TIMEOUT", 5),  # 새 연결을 기다리는 최대 시간 (초)
     )
     if connection_pool:
         print("Database connection pool created successfully.")
@@ -21,12 +28,23 @@ except Exception as e:
     print(f"Database connection pool creation failed: {e}")
 
 
+# 연결 풀 고갈은 잠시 후 재시도하되 DB 장애로 세지 않음 (서킷 브레이커는 연결 실패에만 열림)
+get_dependency("postgres").is_failure = lambda error: not isinstance(error, pool.PoolError)
+
+
 # PostgreSQL 연결 함수 (연결 풀에서 가져오기)
+@instrument("db", "get_connection")
+def _acquire_connection():
+    return get_dependency("postgres").call(connection_pool.getconn)
+
+
 def get_connection():
+    """연결 풀에서 연결을 가져옴 (실패하면 None, 호출한 DB 작업도 실패로 기록)"""
     try:
-        return connection_pool.getconn()
+        return _acquire_connection()
     except Exception as e:
         print(f"Error getting connection from pool: {e}")
+        record_error()  # 연결 획득 호출은 예외로 이미 error, 여기서는 바깥 DB 작업을 error로 표시
         return None
 
 
@@ -37,6 +55,7 @@ def release_connection(conn):
 
 
 # 새로운 채팅 세션 생성
+@instrument("db")
 def create_chat_session(user_id):
     """새로운 채팅 세션을 생성하고, 세션 ID를 반환"""
     conn = get_connection()
@@ -52,33 +71,41 @@ def create_chat_session(user_id):
                 conn.commit()
         except Exception as e:
             print(f"Error creating chat session: {e}")
+            record_error()
         finally:
             release_connection(conn)
     return session_id
 
 
 # 챗봇과의 대화 메시지 삽입
+@instrument("db")
 def insert_chat_message(session_id, sender, message):
-    """사용자 또는 챗봇이 보낸 메시지를 저장"""
+    """사용자 또는 챗봇이 보낸 메시지를 저장하고 메시지 ID 반환 (실패 시 None)"""
     conn = get_connection()
+    message_id = None
     if conn:
         try:
             with conn.cursor() as cur:
                 cur.execute(
                     """
                     INSERT INTO chat_messages (session_id, sender, message) 
-                    VALUES (%s, %s, %s);
+                    VALUES (%s, %s, %s)
+                    RETURNING id;
                 """,
                     (session_id, sender, message),
                 )
+                message_id = cur.fetchone()[0]
                 conn.commit()
         except Exception as e:
             print(f"Error inserting chat message: {e}")
+            record_error()
         finally:
             release_connection(conn)
+    return message_id
 
 
 # 특정 세션의 대화 내역 가져오기
+@instrument("db")
 def get_chat_history(session_id):
     """특정 채팅 세션의 대화 내역을 시간순으로 조회"""
     conn = get_connection()
@@ -98,12 +125,14 @@ def get_chat_history(session_id):
                 chat_history = cur.fetchall()
         except Exception as e:
             print(f"Error fetching chat history: {e}")
+            record_error()
         finally:
             release_connection(conn)
     return chat_history
 
 
 # 사용자별 전체 채팅 세션 목록 가져오기
+@instrument("db")
 def get_user_chat_sessions(user_id):
     """사용자가 가진 모든 채팅 세션을 최신순으로 조회"""
     conn = get_connection()
@@ -123,12 +152,14 @@ def get_user_chat_sessions(user_id):
                 sessions = cur.fetchall()
         except Exception as e:
             print(f"Error fetching chat sessions: {e}")
+            record_error()
         finally:
             release_connection(conn)
     return sessions
 
 
 # 전체 사용자 대화 기록 조회
+@instrument("db")
 def get_all_chat_sessions():
     """모든 사용자 채팅 세션 목록을 최신순으로 조회"""
     conn = get_connection()
@@ -147,12 +178,14 @@ def get_all_chat_sessions():
                 sessions = cur.fetchall()
         except Exception as e:
             print(f"Error fetching all chat sessions: {e}")
+            record_error()
         finally:
             release_connection(conn)
     return sessions
 
 
 # 특정 채팅 세션의 대화 메시지 삭제
+@instrument("db")
 def delete_chat_messages(session_id):
     """특정 채팅 세션의 모든 메시지를 삭제"""
     conn = get_connection()
@@ -166,11 +199,13 @@ def delete_chat_messages(session_id):
                 print(f"Chat messages for session {session_id} deleted successfully.")
         except Exception as e:
             print(f"Error deleting chat messages: {e}")
+            record_error()
         finally:
             release_connection(conn)
 
 
 # 특정 채팅 세션과 모든 대화 내역 삭제
+@instrument("db")
 def delete_chat_session(session_id):
     """특정 채팅 세션의 메시지와 세션 정보를 삭제"""
     conn = get_connection()
@@ -189,11 +224,13 @@ def delete_chat_session(session_id):
                 )
         except Exception as e:
             print(f"Error deleting chat session: {e}")
+            record_error()
         finally:
             release_connection(conn)
 
 
 # 특정 사용자의 모든 채팅 세션 및 대화 삭제
+@instrument("db")
 def delete_all_user_sessions(user_id):
     """특정 사용자의 모든 채팅 세션과 연관된 메시지를 삭제"""
     conn = get_connection()
@@ -221,10 +258,131 @@ def delete_all_user_sessions(user_id):
                 )
         except Exception as e:
             print(f"Error deleting all user chat sessions: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+
+
+# 대화 메시지 내보내기 (서버 쪽 커서)
+def iter_chat_messages(session_id=None, user_id=None, start_day=None, end_day=None, batch_size=2000):
+    """
+    조건에 맞는 메시지를 id 순서로 하나씩 반환 (세션, 사용자, 기간(시작일~종료일) 조건은 함께 지정 가능)
+    - 이름 있는 커서(서버 쪽 커서)로 batch_size개씩 가져오므로 결과 크기와 무관하게 메모리 사용량 일정
+    - 반환이 끝나거나 호출한 쪽이 중단(close)하면 연결 반납
+    - 중간에 실패하면 잘린 결과를 내보내지 않도록 예외를 그대로 전달
+    :return: {"message_id", "session_id", "session_created_at", "username", "sender", "message", "timestamp"}
+    """
+    conditions, params = [], []
+    if session_id is not None:
+        conditions.append("m.session_id = %s")
+        params.append(session_id)
+    if user_id is not None:
+        conditions.append("s.user_id = %s")
+        params.append(user_id)
+    if start_day is not None:
+        conditions.append("m.timestamp >= %s")
+        params.append(start_day)
+    if end_day is not None:
+        conditions.append("m.timestamp < %s")
+        params.append(end_day + datetime.timedelta(days=1))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    conn = get_connection()
+    if conn is None:
+        raise ConnectionError("Database connection unavailable")
+    try:
+        with conn.cursor(name=f"export_{uuid.uuid4().hex}", cursor_factory=RealDictCursor) as cur:
+            cur.itersize = batch_size
+            cur.execute(
+                f"""
+                SELECT m.id AS message_id, m.session_id, s.created_at AS session_created_at,
+                       u.username, m.sender, m.message, m.timestamp
+                FROM chat_messages m
+                JOIN chat_sessions s ON s.id = m.session_id
+                JOIN users u ON u.id = s.user_id
+                {where}
+                ORDER BY m.id;
+            """,
+                params,
+            )
+            yield from cur
+    except Exception as e:
+        print(f"Error exporting chat messages: {e}")
+        record_error()
+        raise
+    finally:
+        if not conn.closed:
+            conn.rollback()  # 읽기 전용 트랜잭션 종료 (서버 쪽 커서 해제)
+        release_connection(conn)
+
+
+# 전문 검색어 변환
+SEARCH_MAX_TERMS = 8
+
+
+def build_search_query(query):
+    """
+    검색어를 to_tsquery('simple', ...) 형식으로 변환 (검색할 단어가 없으면 None)
+    - 단어마다 접두사 검색(:*)으로 조사가 붙은 단어도 찾음 ('GIL' → 'GIL에', 'GIL은')
+    - 단어가 아닌 문자는 버려 tsquery 연산자/문법 오류가 생기지 않도록 함
+    """
+    terms = re.findall(r"[^\W_]+", (query or "").lower())[:SEARCH_MAX_TERMS]
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+# 대화 메시지 전문 검색
+@instrument("db")
+def search_chat_messages(query, user_id=None, limit=20, offset=0):
+    """
+    메시지 본문을 검색하여 관련도순(같으면 최신순)으로 한 페이지 조회
+    - chat_messages.message_tsv(GIN 인덱스)로 검색하고, 강조 표시(snippet)는 현재 페이지 행만 생성
+    - user_id를 지정하면 해당 사용자의 세션만 검색, None이면 전체 사용자 (관리자용)
+    :return: [{"message_id", "session_id", "username", "sender", "timestamp", "rank", "snippet"}, ...]
+    """
+    tsquery = build_search_query(query)
+    if tsquery is None:
+        return []
+
+    user_filter = "AND s.user_id = %(user_id)s" if user_id is not None else ""
+    conn = get_connection()
+    results = []
+    if conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    f"""
+                    WITH matches AS (
+                        SELECT m.id, m.session_id, u.username, m.sender, m.message, m.timestamp,
+                               ts_rank_cd(m.message_tsv, q.query) AS rank
+                        FROM chat_messages m
+                        JOIN chat_sessions s ON s.id = m.session_id
+                        JOIN users u ON u.id = s.user_id
+                        CROSS JOIN to_tsquery('simple', %(query)s) AS q(query)
+                        WHERE m.message_tsv @@ q.query {user_filter}
+                        ORDER BY rank DESC, m.timestamp DESC, m.id DESC
+                        LIMIT %(limit)s OFFSET %(offset)s
+                    )
+                    SELECT id AS message_id, session_id, username, sender, timestamp, rank,
+                           ts_headline('simple', message, to_tsquery('simple', %(query)s),
+                                       'StartSel=**, StopSel=**, MaxWords=30, MinWords=10, MaxFragments=2')
+                               AS snippet
+                    FROM matches
+                    ORDER BY rank DESC, timestamp DESC, message_id DESC;
+                """,
+                    {"query": tsquery, "user_id": user_id, "limit": limit, "offset": offset},
+                )
+                results = cur.fetchall()
+        except Exception as e:
+            print(f"Error searching chat messages: {e}")
+            record_error()
         finally:
             release_connection(conn)
+    return results
 
 
+@instrument("db")
 def get_user_id(username):
     """사용자의 user_id를 조회"""
     conn = get_connection()
@@ -238,6 +396,655 @@ def get_user_id(username):
                     user_id = result[0]  # ID 값 반환
         except Exception as e:
             print(f"Error fetching user ID: {e}")
+            record_error()
         finally:
             release_connection(conn)
     return user_id
+
+
+# 캐시된 평가 결과 조회
+@instrument("db")
+def get_cached_evaluation(cache_key, ttl):
+    """TTL(초) 이내에 저장된 평가 결과를 조회"""
+    conn = get_connection()
+    row = None
+    if conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT evaluation, total_tokens, latency
+                    FROM evaluation_cache
+                    WHERE cache_key = %s
+                      AND created_at > (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul') - make_interval(secs => %s);
+                """,
+                    (cache_key, ttl),
+                )
+                row = cur.fetchone()
+        except Exception as e:
+            print(f"Error fetching cached evaluation: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+    return row
+
+
+# 평가 결과 캐시 저장
+@instrument("db")
+def save_cached_evaluation(cache_key, evaluation, total_tokens, latency):
+    """평가 결과를 캐시 테이블에 저장 (같은 키는 덮어쓰기)"""
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO evaluation_cache (cache_key, evaluation, total_tokens, latency)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (cache_key) DO UPDATE
+                    SET evaluation = EXCLUDED.evaluation,
+                        total_tokens = EXCLUDED.total_tokens,
+                        latency = EXCLUDED.latency,
+                        created_at = (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul');
+                """,
+                    (cache_key, evaluation, total_tokens, latency),
+                )
+                conn.commit()
+        except Exception as e:
+            print(f"Error saving cached evaluation: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+
+
+# 면접 상태 조회
+@instrument("db")
+def load_interview_state(state_key):
+    """저장된 면접 상태와 버전 조회 (없으면 None)"""
+    conn = get_connection()
+    row = None
+    if conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    "SELECT state, version FROM interview_states WHERE state_key = %s;",
+                    (state_key,),
+                )
+                row = cur.fetchone()
+        except Exception as e:
+            print(f"Error loading interview state: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+    return row
+
+
+# 면접 상태 저장 (낙관적 동시성 제어)
+@instrument("db")
+def save_interview_state(state_key, state, version):
+    """
+    읽은 버전(version)이 아직 최신일 때만 저장
+    :return: 저장하면 True, 그 사이 다른 곳에서 저장했으면 False, 오류 시 None
+    """
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                if version == 0:
+                    cur.execute(
+                        """
+                        INSERT INTO interview_states (state_key, state, version)
+                        VALUES (%s, %s, 1)
+                        ON CONFLICT (state_key) DO NOTHING;
+                    """,
+                        (state_key, state),
+                    )
+                else:
+                    cur.execute(
+                        """
+                        UPDATE interview_states
+                        SET state = %s,
+                            version = version + 1,
+                            updated_at = (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul')
+                        WHERE state_key = %s AND version = %s;
+                    """,
+                        (state, state_key, version),
+                    )
+                conn.commit()
+                return cur.rowcount == 1
+        except Exception as e:
+            print(f"Error saving interview state: {e}")
+            record_error()
+            conn.rollback()
+        finally:
+            release_connection(conn)
+    return None
+
+
+# 면접 상태 삭제
+@instrument("db")
+def delete_interview_state(state_key):
+    """면접 종료 시 저장된 상태 삭제"""
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM interview_states WHERE state_key = %s;", (state_key,))
+                conn.commit()
+        except Exception as e:
+            print(f"Error deleting interview state: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+
+
+# 오래된 면접 상태 삭제
+@instrument("db")
+def purge_interview_states(max_age):
+    """
+    max_age초 동안 저장되지 않은 면접 상태 삭제 (끝내지 않고 떠난 면접)
+    :return: 삭제한 행 수 (오류 시 None)
+    """
+    conn = get_connection()
+    deleted = None
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    DELETE FROM interview_states
+                    WHERE updated_at < (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul') - make_interval(secs => %s);
+                """,
+                    (max_age,),
+                )
+                deleted = cur.rowcount
+                conn.commit()
+        except Exception as e:
+            print(f"Error purging interview states: {e}")
+            record_error()
+            conn.rollback()
+        finally:
+            release_connection(conn)
+    return deleted
+
+
+# 사용 통계 집계 갱신 (마지막으로 집계한 id 이후 행만)
+@instrument("db")
+def refresh_usage_rollups(lag_seconds=60):
+    """
+    chat_sessions/chat_messages에 새로 추가된 행을 usage_daily(일, 사용자)에 더하고 high-water mark 이동
+    - lag_seconds보다 최근에 저장된 행은 다음 갱신으로 미룸 (먼저 받은 id가 늦게 커밋되는 경우를 건너뛰지 않도록)
+    - 응답 시간: 챗봇 메시지와 같은 세션의 바로 앞 사용자 메시지 사이 시간 (초)
+    - 다른 갱신이 진행 중이면 기다리지 않고 건너뜀 (두 번 더하지 않도록 advisory lock 사용)
+    :return: {"sessions", "messages": 이번에 집계한 행 수, "session_mark", "message_mark"}
+             (다른 갱신이 진행 중이면 {}, 오류 시 None)
+    """
+    conn = get_connection()
+    result = None
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_xact_lock(hashtext('usage_rollups'));")
+                if not cur.fetchone()[0]:
+                    conn.rollback()
+                    return {}
+
+                cur.execute(
+                    """
+                    SELECT session_mark, message_mark, (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul') - %s * INTERVAL '1 second'
+                    FROM usage_watermarks WHERE name = 'usage';
+                """,
+                    (lag_seconds,),
+                )
+                session_mark, message_mark, cutoff = cur.fetchone()
+
+                # 이번에 집계할 id 범위의 끝 (lag보다 오래된 행까지)
+                cur.execute(
+                    "SELECT max(id), count(*) FROM chat_sessions WHERE id > %s AND created_at < %s;",
+                    (session_mark, cutoff),
+                )
+                new_session_mark, sessions = cur.fetchone()
+                new_session_mark = new_session_mark or session_mark
+                cur.execute(
+                    "SELECT max(id), count(*) FROM chat_messages WHERE id > %s AND timestamp < %s;",
+                    (message_mark, cutoff),
+                )
+                new_message_mark, messages = cur.fetchone()
+                new_message_mark = new_message_mark or message_mark
+
+                cur.execute(
+                    """
+                    INSERT INTO usage_daily (day, user_id, sessions)
+                    SELECT created_at::date, user_id, count(*)
+                    FROM chat_sessions
+                    WHERE id > %s AND id <= %s
+                    GROUP BY 1, 2
+                    ON CONFLICT (day, user_id) DO UPDATE
+                    SET sessions = usage_daily.sessions + EXCLUDED.sessions;
+                """,
+                    (session_mark, new_session_mark),
+                )
+
+                cur.execute(
+                    """
+                    INSERT INTO usage_daily (day, user_id, user_messages, bot_messages,
+                                             latency_count, latency_sum, latency_max)
+                    SELECT m.timestamp::date, s.user_id,
+                           count(*) FILTER (WHERE m.sender = 'user'),
+                           count(*) FILTER (WHERE m.sender = 'bot'),
+                           count(l.seconds), COALESCE(sum(l.seconds), 0), max(l.seconds)
+                    FROM chat_messages m
+                    JOIN chat_sessions s ON s.id = m.session_id
+                    LEFT JOIN LATERAL (
+                        SELECT EXTRACT(EPOCH FROM m.timestamp - prev.timestamp) AS seconds
+                        FROM (
+                            SELECT sender, timestamp FROM chat_messages p
+                            WHERE p.session_id = m.session_id AND p.id < m.id
+                            ORDER BY p.id DESC LIMIT 1
+                        ) prev
+                        WHERE prev.sender = 'user'
+                    ) l ON m.sender = 'bot'
+                    WHERE m.id > %s AND m.id <= %s
+                    GROUP BY 1, 2
+                    ON CONFLICT (day, user_id) DO UPDATE
+                    SET user_messages = usage_daily.user_messages + EXCLUDED.user_messages,
+                        bot_messages = usage_daily.bot_messages + EXCLUDED.bot_messages,
+                        latency_count = usage_daily.latency_count + EXCLUDED.latency_count,
+                        latency_sum = usage_daily.latency_sum + EXCLUDED.latency_sum,
+                        latency_max = GREATEST(usage_daily.latency_max, EXCLUDED.latency_max);
+                """,
+                    (message_mark, new_message_mark),
+                )
+
+                cur.execute(
+                    """
+                    UPDATE usage_watermarks
+                    SET session_mark = %s,
+                        message_mark = %s,
+                        refreshed_at = (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul')
+                    WHERE name = 'usage';
+                """,
+                    (new_session_mark, new_message_mark),
+                )
+                conn.commit()
+                result = {
+                    "sessions": sessions,
+                    "messages": messages,
+                    "session_mark": new_session_mark,
+                    "message_mark": new_message_mark,
+                }
+        except Exception as e:
+            print(f"Error refreshing usage rollups: {e}")
+            record_error()
+            conn.rollback()
+        finally:
+            release_connection(conn)
+    return result
+
+
+# 사용 통계 마지막 갱신 정보
+@instrument("db")
+def get_usage_watermark():
+    """마지막으로 집계한 id와 갱신 시각, 갱신 후 지난 시간(초, 갱신한 적 없으면 None)"""
+    conn = get_connection()
+    row = None
+    if conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT session_mark, message_mark, refreshed_at,
+                           EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul') - refreshed_at) AS age
+                    FROM usage_watermarks WHERE name = 'usage';
+                """
+                )
+                row = cur.fetchone()
+        except Exception as e:
+            print(f"Error fetching usage watermark: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+    return row
+
+
+# 일별 사용 통계 (집계 테이블만 조회)
+@instrument("db")
+def get_daily_usage(start_day, end_day):
+    """기간 내 날짜별 세션 수, 활동 사용자 수, 답변/챗봇 메시지 수, 응답 시간 측정 수, 평균/최대 응답 시간(초)"""
+    conn = get_connection()
+    rows = []
+    if conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT day,
+                           sum(sessions) AS sessions,
+                           count(*) FILTER (WHERE sessions > 0 OR user_messages > 0) AS active_users,
+                           sum(user_messages) AS answers,
+                           sum(bot_messages) AS bot_messages,
+                           sum(latency_count) AS latency_count,
+                           sum(latency_sum) / NULLIF(sum(latency_count), 0) AS avg_latency,
+                           max(latency_max) AS max_latency
+                    FROM usage_daily
+                    WHERE day BETWEEN %s AND %s
+                    GROUP BY day
+                    ORDER BY day;
+                """,
+                    (start_day, end_day),
+                )
+                rows = cur.fetchall()
+        except Exception as e:
+            print(f"Error fetching daily usage: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+    return rows
+
+
+# 사용자별 사용 통계 (집계 테이블만 조회)
+@instrument("db")
+def get_user_usage(start_day, end_day, limit=None):
+    """기간 내 답변이 많은 사용자 순으로 세션 수, 답변 수, 활동 일수, 평균 응답 시간(초) (limit이 None이면 전체)"""
+    conn = get_connection()
+    rows = []
+    if conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT d.user_id,
+                           COALESCE(u.username, '(탈퇴)') AS username,
+                           sum(d.sessions) AS sessions,
+                           sum(d.user_messages) AS answers,
+                           count(*) AS active_days,
+                           sum(d.latency_sum) / NULLIF(sum(d.latency_count), 0) AS avg_latency
+                    FROM usage_daily d
+                    LEFT JOIN users u ON u.id = d.user_id
+                    WHERE d.day BETWEEN %s AND %s
+                    GROUP BY d.user_id, u.username
+                    ORDER BY answers DESC, sessions DESC, d.user_id
+                    LIMIT %s;
+                """,
+                    (start_day, end_day, limit),
+                )
+                rows = cur.fetchall()
+        except Exception as e:
+            print(f"Error fetching user usage: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+    return rows
+
+
+# 구조화된 평가 저장
+@instrument("db")
+def insert_evaluation(session_id, message_id, question, evaluation):
+    """
+    평가 메시지의 점수를 evaluations에 저장 (사용자는 세션에서 찾음)
+    :param evaluation: backend.evaluations.parse_evaluation 결과
+    """
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO evaluations (session_id, message_id, user_id, topic, score,
+                                             accuracy, completeness, clarity, question, model_answer)
+                    SELECT s.id, %s, s.user_id, %s, %s, %s, %s, %s, %s, %s
+                    FROM chat_sessions s WHERE s.id = %s;
+                """,
+                    (
+                        message_id, evaluation["topic"], evaluation["score"],
+                        evaluation["accuracy"], evaluation["completeness"], evaluation["clarity"],
+                        question, evaluation["model_answer"], session_id,
+                    ),
+                )
+                conn.commit()
+        except Exception as e:
+            print(f"Error inserting evaluation: {e}")
+            record_error()
+            conn.rollback()
+        finally:
+            release_connection(conn)
+
+
+# 사용자 점수 추이 (일별)
+@instrument("db")
+def get_score_trend(user_id, start_day=None):
+    """날짜별 평균 점수/항목별 평균 점수와 평가 수 (evaluations (user_id, created_at) 인덱스)"""
+    conn = get_connection()
+    rows = []
+    if conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT created_at::date AS day,
+                           count(*) AS evaluations,
+                           avg(score)::float AS score,
+                           avg(accuracy)::float AS accuracy,
+                           avg(completeness)::float AS completeness,
+                           avg(clarity)::float AS clarity
+                    FROM evaluations
+                    WHERE user_id = %s AND created_at >= COALESCE(%s, '-infinity'::timestamp)
+                    GROUP BY day
+                    ORDER BY day;
+                """,
+                    (user_id, start_day),
+                )
+                rows = cur.fetchall()
+        except Exception as e:
+            print(f"Error fetching score trend: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+    return rows
+
+
+# 사용자 주제별 점수 (낮은 순)
+@instrument("db")
+def get_topic_scores(user_id, min_evaluations=1):
+    """주제별 평균 점수와 평가 수를 평균 점수가 낮은 주제부터 (evaluations (user_id, topic) 인덱스)"""
+    conn = get_connection()
+    rows = []
+    if conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    SELECT topic, count(*) AS evaluations, avg(score)::float AS score
+                    FROM evaluations
+                    WHERE user_id = %s
+                    GROUP BY topic
+                    HAVING count(*) >= %s
+                    ORDER BY score, evaluations DESC, topic;
+                """,
+                    (user_id, min_evaluations),
+                )
+                rows = cur.fetchall()
+        except Exception as e:
+            print(f"Error fetching topic scores: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+    return rows
+
+
+# 전체 사용자 대비 백분위
+@instrument("db")
+def get_score_percentile(user_id, start_day=None):
+    """
+    기간 내 사용자별 평균 점수 중 해당 사용자의 위치
+    :return: {"score": 평균 점수, "percentile": 0~1 (자신보다 낮은 사용자 비율), "users": 비교한 사용자 수}
+             (기간 내 평가가 없으면 None)
+    """
+    conn = get_connection()
+    row = None
+    if conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    """
+                    WITH per_user AS (
+                        SELECT user_id, avg(score)::float AS score
+                        FROM evaluations
+                        WHERE created_at >= COALESCE(%s, '-infinity'::timestamp)
+                        GROUP BY user_id
+                    ), ranked AS (
+                        SELECT user_id, score,
+                               percent_rank() OVER (ORDER BY score) AS percentile,
+                               count(*) OVER () AS users
+                        FROM per_user
+                    )
+                    SELECT score, percentile, users FROM ranked WHERE user_id = %s;
+                """,
+                    (start_day, user_id),
+                )
+                row = cur.fetchone()
+        except Exception as e:
+            print(f"Error fetching score percentile: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+    return row
+
+
+# 임베딩 모델 레지스트리 (backend.embedding_registry)
+EMBEDDING_INDEX_COLUMNS = """
+    index_name, namespace, model, dimension, query_prefix, document_prefix, projection, status, created_at, activated_at
+"""
+
+
+@instrument("db")
+def register_embedding_index(index_name, namespace, model, dimension, query_prefix="", document_prefix="", projection=""):
+    """
+    인덱스의 임베딩 모델/차원/접두어/차원 축소 파일 등록 (이미 있으면 덮어씀, 새 인덱스는 building 상태)
+    :return: 등록했으면 True, 활성 인덱스라서 바꾸지 않았거나 오류면 False
+    """
+    conn = get_connection()
+    registered = False
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO embedding_indexes
+                        (index_name, namespace, model, dimension, query_prefix, document_prefix, projection)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (index_name) DO UPDATE
+                    SET namespace = EXCLUDED.namespace, model = EXCLUDED.model, dimension = EXCLUDED.dimension,
+                        query_prefix = EXCLUDED.query_prefix, document_prefix = EXCLUDED.document_prefix,
+                        projection = EXCLUDED.projection
+                    WHERE embedding_indexes.status <> 'active';
+                """,
+                    (index_name, namespace, model, dimension, query_prefix, document_prefix, projection),
+                )
+                registered = cur.rowcount == 1
+                conn.commit()
+        except Exception as e:
+            print(f"Error registering embedding index: {e}")
+            record_error()
+            conn.rollback()
+        finally:
+            release_connection(conn)
+    return registered
+
+
+@instrument("db")
+def get_embedding_index(index_name):
+    """등록된 인덱스 정보 (없으면 None)"""
+    conn = get_connection()
+    row = None
+    if conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    f"SELECT {EMBEDDING_INDEX_COLUMNS} FROM embedding_indexes WHERE index_name = %s;", (index_name,)
+                )
+                row = cur.fetchone()
+        except Exception as e:
+            print(f"Error fetching embedding index: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+    return row
+
+
+@instrument("db")
+def get_active_embedding_index():
+    """검색에 사용할 활성 인덱스 (등록된 활성 인덱스가 없거나 오류면 None)"""
+    conn = get_connection()
+    row = None
+    if conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(f"SELECT {EMBEDDING_INDEX_COLUMNS} FROM embedding_indexes WHERE status = 'active';")
+                row = cur.fetchone()
+        except Exception as e:
+            print(f"Error fetching active embedding index: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+    return row
+
+
+@instrument("db")
+def list_embedding_indexes():
+    """등록된 인덱스 목록 (활성 인덱스 먼저, 최근 등록 순)"""
+    conn = get_connection()
+    rows = []
+    if conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    f"""
+                    SELECT {EMBEDDING_INDEX_COLUMNS} FROM embedding_indexes
+                    ORDER BY status = 'active' DESC, created_at DESC;
+                """
+                )
+                rows = cur.fetchall()
+        except Exception as e:
+            print(f"Error listing embedding indexes: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+    return rows
+
+
+@instrument("db")
+def activate_embedding_index(index_name):
+    """
+    검색에 사용할 인덱스를 바꿈 (이전 활성 인덱스는 standby로, 한 트랜잭션에서 교체)
+    :return: 바꿨으면 True, 등록되지 않은 인덱스거나 오류면 False
+    """
+    conn = get_connection()
+    activated = False
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE embedding_indexes SET status = 'standby' WHERE status = 'active' AND index_name <> %s;",
+                    (index_name,),
+                )
+                cur.execute(
+                    """
+                    UPDATE embedding_indexes
+                    SET status = 'active', activated_at = CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul'
+                    WHERE index_name = %s;
+                """,
+                    (index_name,),
+                )
+                activated = cur.rowcount == 1
+            if activated:
+                conn.commit()
+            else:
+                conn.rollback()
+        except Exception as e:
+            print(f"Error activating embedding index: {e}")
+            record_error()
+            conn.rollback()
+        finally:
+            release_connection(conn)
+    return activated
@@ -0,0 +1,160 @@
+"""
+임베딩 모델 레지스트리
+- 인덱스마다 임베딩 모델, 차원, 질문/문서 입력 규칙(접두어)을 embedding_indexes 테이블에 기록
+- 검색은 활성(active) 인덱스 하나를 사용하고, 등록된 활성 인덱스가 없으면 설정(secrets)의 인덱스/모델 사용
+- 차원을 줄인 인덱스는 투영 파일(backend.projection)도 기록하여 질문/문서에 같은 투영 적용
+- 시작할 때와 인덱스를 바꿀 때 등록된 차원, 모델 출력 차원(MODELS, 로컬 모델), 투영 입출력 차원, Pinecone 인덱스 차원이
+  모두 맞는지 확인하고 다르면 EmbeddingMismatch (질문 벡터와 문서 벡터가 다른 공간에 있는 채로 검색하지 않도록)
+- ActiveRetriever는 refresh_interval초마다 활성 인덱스를 확인하여 바뀌었으면 새 retriever로 교체
+  (backend.reembed activate로 바꾸면 재시작 없이 모든 프로세스가 다음 확인 때부터 새 인덱스로 검색)
+"""
+
+import threading
+import time
+
+from backend.embeddings import DEFAULT_MODELS, MODELS
+from backend.projection import load_projection, Projection
+from backend.resilience import get_dependency
+
+# 검색 경로가 같은 인덱스인지 판단할 때 비교하는 항목
+RECORD_KEYS = ("index_name", "namespace", "model", "query_prefix", "document_prefix", "projection")
+
+
+class EmbeddingMismatch(ValueError):
+    """질문 임베딩과 인덱스에 저장된 벡터의 모델/차원이 맞지 않음"""
+
+
+def default_record(index_name, namespace, config):
+    """설정(secrets)의 인덱스와 임베딩 설정으로 만든 레지스트리 레코드 (등록된 인덱스가 없을 때 사용)"""
+    model = config.get("model") or DEFAULT_MODELS[config["backend"]]
+    spec = MODELS.get(model, {})
+    projection = config.get("projection") or ""
+    return {
+        "index_name": index_name,
+        "namespace": namespace,
+        "model": model,
+        "dimension": load_projection(projection).output_dimension if projection else spec.get("dimension"),
+        "query_prefix": config.get("query_prefix") or spec.get("query_prefix", ""),
+        "document_prefix": config.get("document_prefix") or spec.get("document_prefix", ""),
+        "projection": projection,
+    }
+
+
+def embedding_config(record, config):
+    """레코드의 모델/접두어/투영에 설정의 실행 옵션(threads, batch_size 등)을 더한 create_embeddings용 설정"""
+    return {
+        **config,
+        "backend": MODELS.get(record["model"], {}).get("backend", config["backend"]),
+        "model": record["model"],
+        "query_prefix": record["query_prefix"],
+        "document_prefix": record["document_prefix"],
+        "projection": record.get("projection") or "",
+    }
+
+
+def same_index(a, b):
+    return a is not None and b is not None and all(a.get(key) == b.get(key) for key in RECORD_KEYS)
+
+
+def validate(record, index_dimension=None, embedding_dimension=None, projection=None):
+    """
+    등록된 차원, 알려진 모델 차원, Pinecone 인덱스 차원, 임베딩 객체 출력 차원이 모두 같은지 확인
+    (투영을 등록한 인덱스는 모델 차원 = 투영 입력 차원, 나머지 = 투영 출력 차원, 알 수 없는 값(None)은 건너뜀)
+    :param projection: 임베딩 객체에 적용된 backend.projection.Projection
+    """
+    model_dimension = MODELS.get(record["model"], {}).get("dimension")
+    expected = record.get("dimension") or model_dimension
+    if record.get("projection") and projection is None:
+        raise EmbeddingMismatch(
+            f"{record['index_name']} ({record['model']}): 투영 {record['projection']}이 적용되지 않았습니다"
+        )
+    checks = (
+        ("모델 목록의 차원", model_dimension, projection.input_dimension if projection else expected),
+        ("투영 출력 차원", projection.output_dimension if projection else None, expected),
+        ("Pinecone 인덱스 차원", index_dimension, expected),
+        ("임베딩 모델 출력 차원", embedding_dimension, expected),
+    )
+    problems = [
+        f"{label} {value} != {target}"
+        for label, value, target in checks
+        if value is not None and target is not None and value != target
+    ]
+    if problems:
+        raise EmbeddingMismatch(f"{record['index_name']} ({record['model']}): " + ", ".join(problems))
+
+
+def _embedding_dimension(embeddings):
+    """임베딩 객체가 API 호출 없이 알려주는 출력 차원 (LocalEmbeddings/ProjectedEmbeddings.dimension, 그 외에는 None)"""
+    dimension = getattr(embeddings, "dimension", None)
+    return dimension if isinstance(dimension, int) else None
+
+
+def check_index(pc, record, embeddings):
+    """Pinecone 인덱스 차원을 조회하여 validate (조회에 실패하면 인덱스 차원 확인만 건너뜀)"""
+    try:
+        index_dimension = get_dependency("pinecone").call(lambda: pc.describe_index(record["index_name"]).dimension)
+    except Exception as e:
+        print(f"Error describing Pinecone index '{record['index_name']}': {e}")
+        index_dimension = None
+    projection = getattr(embeddings, "projection", None)
+    if not isinstance(projection, Projection):
+        projection = None
+    validate(record, index_dimension, _embedding_dimension(embeddings), projection)
+
+
+class ActiveRetriever:
+    """
+    활성 인덱스의 retriever로 위임 (LangChain retriever 대신 사용, invoke만 지원)
+    :param open_vectorstore: record → 벡터 스토어 (모델/차원 확인 포함)
+    """
+
+    def __init__(self, default, open_vectorstore, search_type="similarity", search_kwargs=None,
+                 refresh_interval=30, clock=time.monotonic):
+        self.default = default
+        self.open_vectorstore = open_vectorstore
+        self.search_type = search_type
+        self.search_kwargs = search_kwargs or {}
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._record = None
+        self._retriever = None
+        self._checked_at = None
+
+    @property
+    def record(self):
+        """현재 검색에 사용하는 인덱스 레코드"""
+        self.current()
+        return self._record
+
+    def _active_record(self):
+        from backend.db import get_active_embedding_index
+
+        return get_active_embedding_index()
+
+    def current(self):
+        """refresh_interval이 지났으면 활성 인덱스를 다시 확인하여 retriever 반환"""
+        with self._lock:
+            now = self._clock()
+            if self._retriever is not None and now - self._checked_at < self.refresh_interval:
+                return self._retriever
+            self._checked_at = now
+            # 조회에 실패하면(None) 지금 쓰는 인덱스를 계속 사용
+            record = self._active_record() or self._record or self.default
+            if self._retriever is None or not same_index(record, self._record):
+                try:
+                    vectorstore = self.open_vectorstore(record)
+                    self._retriever = vectorstore.as_retriever(
+                        search_type=self.search_type, search_kwargs=self.search_kwargs
+                    )
+                    if self._record is not None:
+                        print(f"Switched retriever to embedding index '{record['index_name']}' ({record['model']})")
+                    self._record = record
+                except Exception as e:
+                    if self._retriever is None:
+                        raise
+                    print(f"Error switching to embedding index '{record['index_name']}': {e}")
+            return self._retriever
+
+    def invoke(self, query, **kwargs):
+        return self.current().invoke(query, **kwargs)
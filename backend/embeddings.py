@@ -0,0 +1,180 @@
+"""
+임베딩 백엔드
+- openai: OpenAIEmbeddings (원격 API, 질문마다 네트워크 왕복과 호출 비용)
+- local: sentence-transformers 모델을 프로세스 안에서 CPU로 실행 (네트워크 없이 동작)
+  - 모델은 프로세스마다 한 번만 읽고, 같은 모델을 쓰는 LocalEmbeddings끼리 공유
+  - threads: torch 연산 스레드 수 (웹 서버 worker 여러 개가 코어를 나눠 쓸 때 worker당 스레드 제한)
+  - processes: 2 이상이면 대량 임베딩(문서 적재 등)을 여러 프로세스로 나누어 실행 (질문 임베딩은 항상 현재 프로세스)
+  - offline: True면 모델을 내려받지 않고 캐시(cache_dir)나 로컬 경로(model)에서만 읽음
+  - e5 계열처럼 질문/문서 앞에 접두어가 필요한 모델은 query_prefix/document_prefix 지정
+- 인덱스 차원은 모델 출력 차원과 같아야 함 (MODELS, 인덱스별 모델 기록과 확인은 backend.embedding_registry)
+- PROJECTION을 지정하면 모델 출력을 투영하여 차원을 줄임 (backend.projection, 인덱스 차원은 투영 출력 차원)
+
+설정 예시 (.streamlit/secrets.toml):
+    [embedding]
+    BACKEND = "local"
+    MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    THREADS = 4
+    BATCH_SIZE = 32
+    PROCESSES = 0
+    OFFLINE = true
+
+    # 인덱스별로 다른 백엔드를 쓰려면 인덱스 이름으로 덮어쓰기
+    [embedding.indexes.interview-openai]
+    BACKEND = "openai"
+"""
+
+import atexit
+import threading
+
+from langchain_core.embeddings import Embeddings
+
+from backend.metrics import InstrumentedEmbeddings
+from backend.projection import load_projection, ProjectedEmbeddings
+
+DEFAULT_LOCAL_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"  # 한국어 지원, 384차원
+
+# 알려진 임베딩 모델 (백엔드, 출력 차원, 질문/문서 입력 규칙)
+# - pinecone 백엔드(Pinecone inference)는 PineconeWrapper에서 input_type으로 구분하며 검색 경로(create_embeddings)에서는 사용하지 않음
+MODELS = {
+    "text-embedding-ada-002": {"backend": "openai", "dimension": 1536},
+    "text-embedding-3-small": {"backend": "openai", "dimension": 1536},
+    "text-embedding-3-large": {"backend": "openai", "dimension": 3072},
+    "multilingual-e5-large": {
+        "backend": "pinecone", "dimension": 1024, "query_input_type": "query", "document_input_type": "passage",
+    },
+    DEFAULT_LOCAL_MODEL: {"backend": "local", "dimension": 384},
+    "intfloat/multilingual-e5-small": {
+        "backend": "local", "dimension": 384, "query_prefix": "query: ", "document_prefix": "passage: ",
+    },
+    "intfloat/multilingual-e5-base": {
+        "backend": "local", "dimension": 768, "query_prefix": "query: ", "document_prefix": "passage: ",
+    },
+}
+DEFAULT_MODELS = {"openai": "text-embedding-ada-002", "local": DEFAULT_LOCAL_MODEL}  # MODEL을 비웠을 때
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_model(model, cache_dir=None, offline=False, threads=0):
+    """sentence-transformers 모델을 프로세스당 한 번만 읽어 반환"""
+    with _models_lock:
+        loaded = _models.get(model)
+        if loaded is None:
+            import torch
+            from sentence_transformers import SentenceTransformer
+
+            if threads:
+                torch.set_num_threads(threads)
+            loaded = _models[model] = SentenceTransformer(
+                model, device="cpu", cache_folder=cache_dir, local_files_only=offline
+            )
+    return loaded
+
+
+class LocalEmbeddings(Embeddings):
+    """sentence-transformers 모델로 CPU에서 임베딩 (LangChain Embeddings 인터페이스)"""
+
+    def __init__(
+        self,
+        model=DEFAULT_LOCAL_MODEL,
+        batch_size=32,
+        threads=0,
+        processes=0,
+        query_prefix="",
+        document_prefix="",
+        cache_dir=None,
+        offline=False,
+    ):
+        self.model_name = model
+        self.batch_size = batch_size
+        self.threads = threads
+        self.processes = processes
+        self.query_prefix = query_prefix
+        self.document_prefix = document_prefix
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def model(self):
+        return load_model(self.model_name, self.cache_dir, self.offline, self.threads)
+
+    @property
+    def dimension(self):
+        return self.model.get_sentence_embedding_dimension()
+
+    def embed_documents(self, texts):
+        texts = [self.document_prefix + text for text in texts]
+        # 프로세스 간 전달 비용이 있으므로 프로세스마다 한 batch 이상일 때만 나누어 실행
+        if self.processes > 1 and len(texts) >= self.batch_size * self.processes:
+            vectors = self.model.encode_multi_process(
+                texts, self._process_pool(), batch_size=self.batch_size, normalize_embeddings=True
+            )
+        else:
+            vectors = self._encode(texts)
+        return vectors.tolist()
+
+    def embed_query(self, text):
+        return self._encode([self.query_prefix + text])[0].tolist()
+
+    def _encode(self, texts):
+        return self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+
+    def _process_pool(self):
+        """대량 임베딩용 프로세스 풀 (처음 사용할 때 시작하여 close() 또는 종료 시까지 재사용)"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = self.model.start_multi_process_pool(["cpu"] * self.processes)
+                atexit.register(self.close)
+        return self._pool
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self.model.stop_multi_process_pool(self._pool)
+                self._pool = None
+
+
+def create_embeddings(config, api_key=None):
+    """
+    설정에 맞는 임베딩 객체 생성 (호출 지연 시간은 backend.metrics로 측정)
+    :param config: {"backend": "openai" | "local", "model", "threads", "batch_size", "processes", "projection", ...}
+                   (접두어를 비우면 MODELS에 기록된 모델의 접두어 사용, projection은 투영 파일 경로)
+    :param api_key: OpenAI API 키 (openai 백엔드)
+    """
+    embeddings = _create_model_embeddings(config, api_key)
+    if config.get("projection"):
+        return ProjectedEmbeddings(embeddings, load_projection(config["projection"]))
+    return embeddings
+
+
+def _create_model_embeddings(config, api_key):
+    if config["backend"] == "local":
+        model = config.get("model") or DEFAULT_LOCAL_MODEL
+        spec = MODELS.get(model, {})
+        local = LocalEmbeddings(
+            model=model,
+            batch_size=config.get("batch_size", 32),
+            threads=config.get("threads", 0),
+            processes=config.get("processes", 0),
+            query_prefix=config.get("query_prefix") or spec.get("query_prefix", ""),
+            document_prefix=config.get("document_prefix") or spec.get("document_prefix", ""),
+            cache_dir=config.get("cache_dir"),
+            offline=config.get("offline", False),
+        )
+        return InstrumentedEmbeddings(local, name="local")
+    if config["backend"] == "openai":
+        from langchain_openai import OpenAIEmbeddings
+
+        options = {"model": config["model"]} if config.get("model") else {}
+        return InstrumentedEmbeddings(OpenAIEmbeddings(api_key=api_key, **options), name="openai")
+    raise ValueError(f"Unknown embedding backend: {config['backend']}")
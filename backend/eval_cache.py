@@ -0,0 +1,149 @@
+"""
+평가 결과 캐시 (opt-in)
+- 같은 질문에 같은(공백/대소문자 정규화 기준) 답변이 들어오면 LLM 평가를 다시 호출하지 않고 재사용
+- 캐시 키: (질문, 정규화된 답변, 참고 문서 해시, 모델)
+- 메모리(LRU + TTL) 기본, 선택적으로 PostgreSQL(evaluation_cache 테이블)까지 조회
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+# 답변 정규화 (공백 압축 + 대소문자 무시)
+def normalize_answer(answer: str) -> str:
+    """공백을 하나로 합치고 대소문자를 무시하도록 정규화"""
+    if not isinstance(answer, str):
+        raise ValueError("Answer must be a string")
+    return " ".join(answer.split()).casefold()
+
+
+# 캐시 키 생성
+def make_cache_key(question: str, answer: str, context: str, model: str) -> str:
+    """(질문, 정규화된 답변, 문서 해시, 모델)로 캐시 키 생성"""
+    context_hash = hashlib.sha256((context or "").encode()).hexdigest()
+    raw = "\x1f".join(
+        [(question or "").strip(), normalize_answer(answer), context_hash, model or ""]
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class EvaluationCache:
+    def __init__(self, max_size=1000, ttl=86400, backend="memory"):
+        """
+        평가 결과 캐시 초기화
+        :param max_size: 메모리에 보관할 최대 항목 수 (LRU)
+        :param ttl: 캐시 유효 시간 (초)
+        :param backend: "memory" 또는 "postgres"
+        """
+        if backend not in ("memory", "postgres"):
+            raise ValueError(f"Unknown evaluation cache backend: {backend}")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.backend = backend
+
+        self._entries = OrderedDict()  # key -> (evaluation, total_tokens, latency, created_at)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self.saved_latency = 0.0
+
+    def get(self, question, answer, context, model):
+        """캐시된 평가 결과 반환 (없으면 None)"""
+        key = make_cache_key(question, answer, context, model)
+        entry = self._get_memory(key)
+
+        if entry is None and self.backend == "postgres":
+            entry = self._get_postgres(key)
+            if entry is not None:
+                self._set_memory(key, entry)
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            evaluation, total_tokens, latency, _ = entry
+            self.hits += 1
+            self.saved_tokens += total_tokens
+            self.saved_latency += latency
+        return evaluation
+
+    def set(self, question, answer, context, model, evaluation, total_tokens=0, latency=0.0):
+        """평가 결과 저장 (토큰 수와 소요 시간은 절약량 계산에 사용)"""
+        key = make_cache_key(question, answer, context, model)
+        entry = (evaluation, total_tokens, latency, time.time())
+        self._set_memory(key, entry)
+
+        if self.backend == "postgres":
+            from backend.db import save_cached_evaluation
+
+            save_cached_evaluation(key, evaluation, total_tokens, latency)
+
+    def stats(self) -> dict:
+        """적중률, 절약한 토큰 수와 시간 반환"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_tokens": self.saved_tokens,
+                "saved_latency": self.saved_latency,
+                "size": len(self._entries),
+            }
+
+    def clear(self):
+        """메모리 캐시와 통계 초기화"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.saved_tokens = 0
+            self.saved_latency = 0.0
+
+    def _get_memory(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[3] > self.ttl:
+                del self._entries[key]  # 만료된 항목 제거
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _set_memory(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)  # 가장 오래 사용되지 않은 항목 제거
+
+    def _get_postgres(self, key):
+        from backend.db import get_cached_evaluation
+
+        row = get_cached_evaluation(key, self.ttl)
+        if row is None:
+            return None
+        return (row["evaluation"], row["total_tokens"], row["latency"], time.time())
+
+
+# 프로세스 전체에서 공유하는 캐시 인스턴스
+_evaluation_cache = None
+_evaluation_cache_lock = threading.Lock()
+
+
+def get_evaluation_cache(config: dict):
+    """설정에서 캐시가 켜져 있으면 공유 캐시 인스턴스를 반환 (꺼져 있으면 None)"""
+    global _evaluation_cache
+    if not config.get("enabled", False):
+        return None
+    with _evaluation_cache_lock:
+        if _evaluation_cache is None:
+            _evaluation_cache = EvaluationCache(
+                max_size=config.get("max_size", 1000),
+                ttl=config.get("ttl", 86400),
+                backend=config.get("backend", "memory"),
+            )
+    return _evaluation_cache
@@ -0,0 +1,91 @@
+"""
+구조화된 답변 평가
+- EVALUATION_PROMPT는 본문(평가, 모범 답안) 뒤에 <score>{JSON}</score> 블록을 붙이도록 요청
+- 화면과 chat_messages에는 본문만 남기고, 점수/항목별 점수/주제/모범 답안은 evaluations 테이블에 저장
+  (성적 추이, 약한 주제, 전체 사용자 대비 백분위를 대화 기록을 다시 읽지 않고 evaluations에서 바로 집계)
+- 스트리밍 중에는 ScoreFilter가 <score> 이후 조각을 화면에 보내지 않음
+- 블록이 없거나 형식이 맞지 않는 평가(이전 캐시, 대체 평가 등)는 본문만 사용하고 점수는 저장하지 않음
+"""
+
+import json
+import re
+
+SCORE_OPEN = "<score>"
+SCORE_CLOSE = "</score>"
+CRITERIA = ("accuracy", "completeness", "clarity")  # 정확성, 완성도, 명확성
+OTHER_TOPIC = "기타"
+
+_SCORE_BLOCK = re.compile(re.escape(SCORE_OPEN) + r"(.*?)(?:" + re.escape(SCORE_CLOSE) + r"|$)", re.DOTALL)
+_MODEL_ANSWER = re.compile(r"모범\s*답안\s*[:：]?\s*(.+)", re.DOTALL)
+
+
+def _clamp_score(value):
+    score = int(round(float(value)))
+    if not 0 <= score <= 10:
+        raise ValueError(f"score out of range: {value}")
+    return score
+
+
+def parse_evaluation(text, topics=()):
+    """
+    평가 응답을 (본문, 구조화된 평가)로 분리
+    :param topics: 허용할 주제 목록 (목록에 없는 주제는 OTHER_TOPIC)
+    :return: (본문, {"score", "accuracy", "completeness", "clarity", "topic", "model_answer"} 또는 None)
+    """
+    match = _SCORE_BLOCK.search(text or "")
+    if match is None:
+        return (text or "").strip(), None
+    body = text[:match.start()].strip()
+
+    try:
+        data = json.loads(match.group(1).strip())
+        evaluation = {key: _clamp_score(data[key]) for key in ("score",) + CRITERIA}
+    except (ValueError, TypeError, KeyError) as e:
+        print(f"Invalid evaluation score block: {e}")
+        return body, None
+
+    topic = str(data.get("topic", "")).strip()
+    evaluation["topic"] = topic if topic in topics else OTHER_TOPIC
+    answer = _MODEL_ANSWER.search(body)
+    evaluation["model_answer"] = answer.group(1).strip() if answer else None
+    return body, evaluation
+
+
+class ScoreFilter:
+    """
+    스트리밍 조각 중 <score> 블록 앞의 본문만 on_chunk로 전달
+    (태그가 두 조각에 걸칠 수 있으므로 태그 앞부분일 수 있는 끝부분은 다음 조각까지 보류)
+    """
+
+    def __init__(self, on_chunk):
+        self.on_chunk = on_chunk
+        self._pending = ""
+        self._stopped = False
+
+    def __call__(self, text):
+        if self._stopped:
+            return
+        self._pending += text
+        index = self._pending.find(SCORE_OPEN)
+        if index >= 0:
+            self._emit(self._pending[:index])
+            self._pending = ""
+            self._stopped = True
+            return
+        keep = next(
+            (size for size in range(min(len(SCORE_OPEN) - 1, len(self._pending)), 0, -1)
+             if SCORE_OPEN.startswith(self._pending[-size:])),
+            0,
+        )
+        self._emit(self._pending[:len(self._pending) - keep])
+        self._pending = self._pending[len(self._pending) - keep:]
+
+    def flush(self):
+        """블록 없이 끝났으면 보류한 끝부분 전달"""
+        if not self._stopped:
+            self._emit(self._pending)
+        self._pending = ""
+
+    def _emit(self, text):
+        if text:
+            self.on_chunk(text)
@@ -0,0 +1,197 @@
+"""
+면접 대화 내보내기 (CSV, JSONL, Parquet)
+- backend.db.iter_chat_messages(서버 쪽 커서)에서 읽은 행을 batch 단위로 변환하여 바이트 조각으로 반환
+  (전체 결과를 메모리에 올리지 않으므로 내보내기 크기와 무관하게 메모리 사용량 일정)
+- CSV: Excel에서 한글이 깨지지 않도록 UTF-8 BOM 포함
+- Parquet: batch마다 row group 하나를 쓰고 바로 내보냄 (footer는 마지막 조각)
+- 같은 조각을 CLI(파일/표준 출력), HTTP API(GET /exports), Streamlit 다운로드(크기 제한)에서 사용
+
+실행 예시:
+    python -m backend.export --format parquet --output interviews.parquet --start 2025-03-01 --end 2025-03-31
+    python -m backend.export --format jsonl --user kim > kim.jsonl
+    python -m backend.export --format csv --session-id 42 --output session42.csv
+"""
+
+import argparse
+import csv
+import datetime
+import io
+import json
+import sys
+import time
+from itertools import islice
+
+from backend.db import get_user_id, iter_chat_messages
+
+COLUMNS = ["session_id", "session_created_at", "username", "message_id", "sender", "message", "timestamp"]
+
+# 형식별 (MIME 타입, 확장자)
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+BATCH_SIZE = 5000
+
+
+def _batched(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _csv_chunks(batches):
+    yield "\ufeff".encode("utf-8")
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _json_default(value):
+    return value.isoformat() if isinstance(value, (datetime.date, datetime.datetime)) else str(value)
+
+
+def _jsonl_chunks(batches):
+    for batch in batches:
+        lines = (
+            json.dumps({column: row[column] for column in COLUMNS}, ensure_ascii=False, default=_json_default)
+            for row in batch
+        )
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """ParquetWriter가 쓴 바이트를 모아 두었다가 조각으로 꺼냄"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_chunks(batches):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("session_id", pa.int64()),
+        ("session_created_at", pa.timestamp("us")),
+        ("username", pa.string()),
+        ("message_id", pa.int64()),
+        ("sender", pa.string()),
+        ("message", pa.string()),
+        ("timestamp", pa.timestamp("us")),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            if data := sink.drain():
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+_WRITERS = {"csv": _csv_chunks, "jsonl": _jsonl_chunks, "parquet": _parquet_chunks}
+
+
+def iter_export(rows, fmt, batch_size=BATCH_SIZE):
+    """행(dict)을 fmt 형식의 바이트 조각으로 변환하여 차례로 반환"""
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return _WRITERS[fmt](_batched(rows, batch_size))
+
+
+def export_messages(fmt, session_id=None, user_id=None, start_day=None, end_day=None, batch_size=BATCH_SIZE):
+    """조건에 맞는 메시지를 DB에서 읽으며 바로 fmt 형식 바이트 조각으로 반환"""
+    rows = iter_chat_messages(session_id, user_id, start_day, end_day, batch_size=batch_size)
+    return iter_export(rows, fmt, batch_size)
+
+
+def export_bytes(chunks, max_bytes):
+    """
+    화면 다운로드용으로 조각을 모아 반환 (Streamlit 다운로드 버튼은 파일 전체를 메모리에 올림)
+    max_bytes를 넘으면 읽기를 멈추고 None 반환 (큰 내보내기는 CLI나 HTTP API 사용)
+    """
+    buffer = io.BytesIO()
+    try:
+        for chunk in chunks:
+            buffer.write(chunk)
+            if buffer.tell() > max_bytes:
+                return None
+    finally:
+        chunks.close()  # 중간에 멈춰도 DB 연결 반납
+    return buffer.getvalue()
+
+
+def export_file_name(fmt, session_id=None, username=None, start_day=None, end_day=None):
+    """내보내기 범위를 나타내는 파일 이름"""
+    parts = ["interviews"]
+    if username:
+        parts.append(username)
+    if session_id is not None:
+        parts.append(f"session{session_id}")
+    if start_day or end_day:
+        parts.append(f"{start_day or ''}_{end_day or ''}")
+    return f"{'-'.join(parts)}.{FORMATS[fmt][1]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="면접 대화 내보내기")
+    parser.add_argument("--format", choices=FORMATS, default="csv", help="내보낼 형식")
+    parser.add_argument("--output", default="-", help="저장할 파일 (기본값: 표준 출력)")
+    parser.add_argument("--session-id", type=int, help="내보낼 세션 ID")
+    parser.add_argument("--user", help="내보낼 사용자 아이디")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, help="시작일 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--end", type=datetime.date.fromisoformat, help="종료일 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="한 번에 가져와 변환할 행 수")
+    args = parser.parse_args(argv)
+
+    user_id = None
+    if args.user:
+        user_id = get_user_id(args.user)
+        if user_id is None:
+            sys.exit(f"❌ 사용자를 찾을 수 없습니다: {args.user}")
+    if args.output == "-" and args.format == "parquet" and sys.stdout.isatty():
+        sys.exit("❌ Parquet은 --output 파일로 저장하세요.")
+
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    written = 0
+    start = time.perf_counter()
+    try:
+        for chunk in export_messages(args.format, args.session_id, user_id, args.start, args.end, args.batch_size):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    print(f"✅ {written / 1024:.1f} KiB 저장 ({time.perf_counter() - start:.1f}s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
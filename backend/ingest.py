@@ -0,0 +1,290 @@
+"""
+참고 문서 증분 적재 (backend/data → Pinecone)
+- 문서(.docx, .txt, .md)에서 텍스트를 뽑아 문단 단위로 청크를 나누고, 청크마다 내용 해시 id를 붙임
+  id = "<문서 경로 해시 12자>-<청크 내용 해시 24자>" (내용이 같으면 실행할 때마다 같은 id)
+- 인덱스에 이미 있는 id는 다시 임베딩하지 않음: 새로 생긴 청크만 임베딩/업서트하고, 사라진 청크(삭제된 문서 포함)의 벡터는 삭제
+  (바뀐 내용이 없으면 임베딩 호출 없이 끝나므로 갱신 비용은 바뀐 청크 수에 비례)
+- 청크 경계는 크기만으로 정하지 않고 내용 해시로 고른 문단에서도 끊으므로,
+  문서 앞부분을 고쳐도 뒤쪽 청크의 경계와 id는 그대로 유지됨
+- 업서트를 모두 마친 뒤 삭제하므로 중간에 실패해도 검색에는 이전 벡터가 남고, 다시 실행하면 남은 청크만 적재
+- 검색 중인 인덱스(backend.embedding_registry)나 --index로 지정한 등록된 인덱스의 임베딩 모델/네임스페이스를 사용하고
+  본문은 metadata "text"에 저장
+- 이 모듈의 id 형식이 아닌 벡터(직접 업서트한 예시 데이터 등)는 건드리지 않음
+- 청크 크기나 겹침을 바꾸면 모든 청크 id가 바뀌므로 전체를 다시 임베딩함
+
+설정 예시 (.streamlit/secrets.toml):
+    [ingest]
+    DATA_DIR = "backend/data"
+    CHUNK_SIZE = 1000
+    CHUNK_OVERLAP = 100
+    BATCH_SIZE = 100
+
+실행 예시:
+    python -m backend.ingest --dry-run
+    python -m backend.ingest
+    python -m backend.ingest --data-dir docs --chunk-size 500 --chunk-overlap 50
+    python -m backend.ingest --index interview-e5-small   # 새 인덱스를 문서에서 바로 채우기
+"""
+
+import argparse
+import hashlib
+import re
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+from backend.config import INGEST_CONFIG
+from backend.embedding_registry import check_index, embedding_config
+from backend.embeddings import create_embeddings
+from backend.resilience import get_dependency
+
+ID_PATTERN = re.compile(r"^[0-9a-f]{12}-[0-9a-f]{24}$")
+ANCHOR_EVERY = 4  # 평균 몇 문단마다 내용 기준 경계를 둘지
+DELETE_BATCH_SIZE = 1000  # Pinecone delete 한 번에 보낼 수 있는 최대 id 수
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_LONG_PARAGRAPH_SEPARATORS = ("\n", ". ", " ")
+
+
+# 텍스트 추출
+def _read_docx(path):
+    import docx2txt
+
+    return docx2txt.process(str(path))
+
+
+def _read_text(path):
+    return Path(path).read_text(encoding="utf-8")
+
+
+EXTRACTORS = {".docx": _read_docx, ".txt": _read_text, ".md": _read_text}
+
+
+def extract_text(path):
+    """확장자에 맞는 방식으로 문서 텍스트 추출"""
+    suffix = Path(path).suffix.lower()
+    if suffix not in EXTRACTORS:
+        raise ValueError(f"Unsupported document type: {path}")
+    return EXTRACTORS[suffix](path)
+
+
+def iter_documents(data_dir):
+    """data_dir 아래에서 지원하는 문서를 (data_dir 기준 상대 경로, 경로) 순서대로 반환 (~$로 시작하는 임시 파일 제외)"""
+    root = Path(data_dir)
+    for path in sorted(root.rglob("*")):
+        if path.is_file() and path.suffix.lower() in EXTRACTORS and not path.name.startswith("~$"):
+            yield path.relative_to(root).as_posix(), path
+
+
+# 청크 나누기
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _paragraphs(text, max_size):
+    """빈 줄로 문단을 나누고, max_size보다 긴 문단은 줄/문장/단어 경계에서 자름"""
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        while len(paragraph) > max_size:
+            cut = max_size
+            for separator in _LONG_PARAGRAPH_SEPARATORS:
+                index = paragraph.rfind(separator, max_size // 2, max_size)
+                if index > 0:
+                    cut = index + len(separator.rstrip())
+                    break
+            yield paragraph[:cut].strip()
+            paragraph = paragraph[cut:].strip()
+        if paragraph:
+            yield paragraph
+
+
+def _is_anchor(paragraph):
+    return int(_digest(paragraph)[:8], 16) % ANCHOR_EVERY == 0
+
+
+def _tail(text, size):
+    """text 끝의 size자 이내 (단어 중간에서 시작하지 않도록 첫 공백 이후부터)"""
+    if size <= 0:
+        return ""
+    tail = text[-size:]
+    if len(tail) < len(text) and " " in tail:
+        tail = tail[tail.index(" ") + 1:]
+    return tail.strip()
+
+
+def split_text(text, chunk_size=1000, chunk_overlap=0):
+    """
+    텍스트를 chunk_size자 이하 청크로 분할
+    - 문단을 chunk_size - chunk_overlap자까지 이어 붙이고, 절반 이상 찼을 때 경계 문단(_is_anchor)을 만나면 끊음
+    - 각 청크 앞에 직전 청크 끝의 chunk_overlap자 이내를 붙임 (수정의 영향은 바로 다음 청크까지만 전파)
+    """
+    if chunk_size <= 0 or not 0 <= chunk_overlap < chunk_size:
+        raise ValueError(f"Invalid chunk size/overlap: {chunk_size}/{chunk_overlap}")
+    body_size = chunk_size - chunk_overlap
+
+    bodies, current, size = [], [], 0
+    for paragraph in _paragraphs(text, body_size):
+        added = len(paragraph) + (2 if current else 0)
+        if current and size + added > body_size:
+            bodies.append("\n\n".join(current))
+            current, size, added = [], 0, len(paragraph)
+        current.append(paragraph)
+        size += added
+        if size >= body_size // 2 and _is_anchor(paragraph):
+            bodies.append("\n\n".join(current))
+            current, size = [], 0
+    if current:
+        bodies.append("\n\n".join(current))
+
+    chunks = bodies[:1]
+    for previous, body in zip(bodies, bodies[1:]):
+        tail = _tail(previous, chunk_overlap - 1)
+        chunks.append(f"{tail}\n{body}" if tail else body)
+    return chunks
+
+
+def source_prefix(source):
+    """문서별 id 접두어 (Pinecone id는 ASCII만 허용하므로 경로 대신 해시 사용)"""
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:12] + "-"
+
+
+def chunk_id(source, text):
+    return source_prefix(source) + _digest(text)[:24]
+
+
+def build_chunks(data_dir, chunk_size, chunk_overlap):
+    """
+    data_dir의 문서를 청크로 나눔
+    :return: ({청크 id: {"text", "source"}}, 문서 수) (같은 문서 안의 중복 청크는 하나로 합침)
+    """
+    chunks, documents = {}, 0
+    for source, path in iter_documents(data_dir):
+        documents += 1
+        for text in split_text(extract_text(path), chunk_size, chunk_overlap):
+            chunks.setdefault(chunk_id(source, text), {"text": text, "source": source})
+    return chunks, documents
+
+
+def plan_changes(chunks, existing_ids):
+    """
+    적재할 청크 id와 삭제할 벡터 id 계산
+    :param existing_ids: 인덱스에 있는 id (이 모듈의 id 형식이 아닌 것은 무시)
+    :return: (업서트할 id 목록, 삭제할 id 목록)
+    """
+    existing = {vector_id for vector_id in existing_ids if ID_PATTERN.match(vector_id)}
+    upserts = [vector_id for vector_id in chunks if vector_id not in existing]
+    deletes = sorted(existing - chunks.keys())
+    return upserts, deletes
+
+
+def _batched(items, size):
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+class PineconeStore:
+    """적재 대상 Pinecone 네임스페이스 (검색에 쓰는 index/embeddings/namespace와 같아야 함)"""
+
+    def __init__(self, index, embeddings, namespace, embedding_dependency="openai"):
+        """
+        :param embedding_dependency: 임베딩 호출에 적용할 backend.resilience 의존성 이름
+                                     (원격 API용, 로컬 모델은 None이면 deadline/서킷 브레이커 없이 바로 호출)
+        """
+        self.index = index
+        self.embeddings = embeddings
+        self.namespace = namespace
+        self.embedding_dependency = embedding_dependency
+
+    def list_ids(self):
+        """네임스페이스의 모든 벡터 id (serverless 인덱스의 list는 id를 페이지 단위로 반환)"""
+        return [vector_id for page in self.index.list(namespace=self.namespace) for vector_id in page]
+
+    def upsert(self, items):
+        """
+        청크를 임베딩하여 업서트 (같은 id로 덮어쓰므로 재시도해도 안전)
+        :param items: [(청크 id, {"text", "source"}), ...]
+        """
+        texts = [metadata["text"] for _, metadata in items]
+        if self.embedding_dependency is None:
+            values = self.embeddings.embed_documents(texts)
+        else:
+            values = get_dependency(self.embedding_dependency).call(lambda: self.embeddings.embed_documents(texts))
+        vectors = [
+            {"id": vector_id, "values": vector, "metadata": metadata}
+            for (vector_id, metadata), vector in zip(items, values)
+        ]
+        get_dependency("pinecone").call(lambda: self.index.upsert(vectors=vectors, namespace=self.namespace))
+
+    def delete(self, ids):
+        for batch in _batched(ids, DELETE_BATCH_SIZE):
+            get_dependency("pinecone").call(lambda: self.index.delete(ids=batch, namespace=self.namespace))
+
+
+def open_store(pc, record, config, api_key=None):
+    """레지스트리 레코드(backend.embedding_registry)의 인덱스/모델로 적재 대상 생성 (모델과 인덱스 차원 확인)"""
+    options = embedding_config(record, config)
+    embeddings = create_embeddings(options, api_key=api_key)
+    check_index(pc, record, embeddings)
+    # 로컬 모델의 대량 임베딩이 OpenAI deadline에 걸리거나 LLM 호출과 같은 서킷 브레이커를 열지 않도록
+    dependency = "openai" if options["backend"] == "openai" else None
+    return PineconeStore(pc.Index(record["index_name"]), embeddings, record["namespace"], dependency)
+
+
+def ingest(store, data_dir, chunk_size, chunk_overlap, batch_size=100, dry_run=False):
+    """
+    data_dir의 문서를 store와 맞춤 (새 청크 업서트 → 사라진 청크 삭제)
+    :param dry_run: True면 변경 없이 계획만 계산
+    :return: {"documents", "chunks", "unchanged", "upserted", "deleted"}
+    """
+    chunks, documents = build_chunks(data_dir, chunk_size, chunk_overlap)
+    upserts, deletes = plan_changes(chunks, store.list_ids())
+    if not dry_run:
+        for batch in _batched(upserts, batch_size):
+            store.upsert([(vector_id, chunks[vector_id]) for vector_id in batch])
+        if deletes:
+            store.delete(deletes)
+    return {
+        "documents": documents,
+        "chunks": len(chunks),
+        "unchanged": len(chunks) - len(upserts),
+        "upserted": len(upserts),
+        "deleted": len(deletes),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="참고 문서 증분 적재")
+    parser.add_argument("--data-dir", default=INGEST_CONFIG["data_dir"], help="적재할 문서 폴더")
+    parser.add_argument("--chunk-size", type=int, default=INGEST_CONFIG["chunk_size"], help="청크 최대 길이 (문자 수)")
+    parser.add_argument("--chunk-overlap", type=int, default=INGEST_CONFIG["chunk_overlap"], help="청크 겹침 길이")
+    parser.add_argument("--batch-size", type=int, default=INGEST_CONFIG["batch_size"], help="한 번에 임베딩할 청크 수")
+    parser.add_argument("--index", help="적재할 등록된 인덱스 이름 (기본값: 검색에 사용 중인 인덱스)")
+    parser.add_argument("--dry-run", action="store_true", help="변경하지 않고 적재/삭제할 청크 수만 출력")
+    args = parser.parse_args(argv)
+
+    if not Path(args.data_dir).is_dir():
+        sys.exit(f"❌ 문서 폴더를 찾을 수 없습니다: {args.data_dir}")
+    if args.chunk_size <= 0 or not 0 <= args.chunk_overlap < args.chunk_size:
+        sys.exit("❌ --chunk-overlap은 0 이상, --chunk-size보다 작아야 합니다.")
+
+    from backend.config import EMBEDDING_CONFIG, get_openai_key, pc, retriever
+    from backend.db import get_embedding_index
+
+    record = get_embedding_index(args.index) if args.index else retriever.record
+    if record is None:
+        sys.exit(f"❌ 등록되지 않은 인덱스입니다: {args.index}")
+    store = open_store(pc, record, EMBEDDING_CONFIG, get_openai_key())
+    start = time.perf_counter()
+    stats = ingest(store, args.data_dir, args.chunk_size, args.chunk_overlap, args.batch_size, args.dry_run)
+    prefix = "(dry-run) " if args.dry_run else ""
+    print(
+        f"✅ {prefix}문서 {stats['documents']}개, 청크 {stats['chunks']}개: "
+        f"유지 {stats['unchanged']}, 업서트 {stats['upserted']}, 삭제 {stats['deleted']} "
+        f"({time.perf_counter() - start:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
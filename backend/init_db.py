@@ -1,5 +1,68 @@
 from backend.db import get_connection, release_connection
 
+# 구조화된 평가 점수 (backend.evaluations, user_id는 사용자별 조회를 위해 세션에서 복사)
+EVALUATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS evaluations (
+        id SERIAL PRIMARY KEY,
+        session_id INT NOT NULL REFERENCES chat_sessions(id) ON DELETE CASCADE,
+        message_id INT REFERENCES chat_messages(id) ON DELETE CASCADE,
+        user_id INT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        topic VARCHAR(50) NOT NULL,
+        score SMALLINT NOT NULL CHECK (score BETWEEN 0 AND 10),
+        accuracy SMALLINT NOT NULL CHECK (accuracy BETWEEN 0 AND 10),
+        completeness SMALLINT NOT NULL CHECK (completeness BETWEEN 0 AND 10),
+        clarity SMALLINT NOT NULL CHECK (clarity BETWEEN 0 AND 10),
+        question TEXT,
+        model_answer TEXT,
+        created_at TIMESTAMP DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul')
+    );
+    CREATE INDEX IF NOT EXISTS idx_evaluations_user_created
+        ON evaluations (user_id, created_at) INCLUDE (score, accuracy, completeness, clarity);
+    CREATE INDEX IF NOT EXISTS idx_evaluations_user_topic ON evaluations (user_id, topic) INCLUDE (score);
+    CREATE INDEX IF NOT EXISTS idx_evaluations_created ON evaluations (created_at) INCLUDE (user_id, score);
+    CREATE INDEX IF NOT EXISTS idx_evaluations_session_id ON evaluations (session_id);
+    CREATE INDEX IF NOT EXISTS idx_evaluations_message_id ON evaluations (message_id);
+"""
+
+# 사용 통계 집계 테이블 (backend.analytics, 원본 테이블 대신 관리자 통계 화면이 읽음)
+USAGE_ROLLUP_TABLES = """
+    CREATE TABLE IF NOT EXISTS usage_daily (
+        day DATE NOT NULL,
+        user_id INT NOT NULL,
+        sessions INT NOT NULL DEFAULT 0,
+        user_messages INT NOT NULL DEFAULT 0,
+        bot_messages INT NOT NULL DEFAULT 0,
+        latency_count INT NOT NULL DEFAULT 0,
+        latency_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+        latency_max DOUBLE PRECISION,
+        PRIMARY KEY (day, user_id)
+    );
+    CREATE TABLE IF NOT EXISTS usage_watermarks (
+        name VARCHAR(50) PRIMARY KEY,
+        session_mark INT NOT NULL DEFAULT 0,
+        message_mark INT NOT NULL DEFAULT 0,
+        refreshed_at TIMESTAMP
+    );
+    INSERT INTO usage_watermarks (name) VALUES ('usage') ON CONFLICT (name) DO NOTHING;
+"""
+
+# 임베딩 모델 레지스트리 (backend.embedding_registry, 인덱스별 모델/차원/입력 규칙, 검색에 쓰는 활성 인덱스는 하나)
+EMBEDDING_INDEXES_TABLE = """
+    CREATE TABLE IF NOT EXISTS embedding_indexes (
+        index_name VARCHAR(100) PRIMARY KEY,
+        namespace VARCHAR(100) NOT NULL DEFAULT '',
+        model VARCHAR(200) NOT NULL,
+        dimension INT NOT NULL CHECK (dimension > 0),
+        query_prefix TEXT NOT NULL DEFAULT '',
+        document_prefix TEXT NOT NULL DEFAULT '',
+        projection TEXT NOT NULL DEFAULT '',
+        status VARCHAR(20) NOT NULL DEFAULT 'building' CHECK (status IN ('building', 'active', 'standby')),
+        created_at TIMESTAMP DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul'),
+        activated_at TIMESTAMP
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_embedding_indexes_active ON embedding_indexes (status) WHERE status = 'active';
+"""
+
 def init_database():
     """데이터베이스 테이블 초기화"""
     conn = get_connection()
@@ -8,6 +71,13 @@ def init_database():
             with conn.cursor() as cur:
                 # 기존 테이블 삭제 (CASCADE로 외래 키 제약조건도 함께 삭제)
                 cur.execute("""
+                    DROP TABLE IF EXISTS evaluations CASCADE;
+                    DROP TABLE IF EXISTS embedding_indexes CASCADE;
+                    DROP TABLE IF EXISTS usage_watermarks CASCADE;
+                    DROP TABLE IF EXISTS usage_daily CASCADE;
+                    DROP TABLE IF EXISTS interview_states CASCADE;
+                    DROP TABLE IF EXISTS user_sessions CASCADE;
+                    DROP TABLE IF EXISTS evaluation_cache CASCADE;
                     DROP TABLE IF EXISTS chat_messages CASCADE;
                     DROP TABLE IF EXISTS chat_sessions CASCADE;
                     DROP TABLE IF EXISTS users CASCADE;
@@ -32,9 +102,10 @@ def init_database():
                         created_at TIMESTAMP DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul'),
                         FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
                     );
+                    CREATE INDEX idx_chat_sessions_user_id ON chat_sessions (user_id);
                 """)
 
-                # chat_messages 테이블 생성
+                # chat_messages 테이블 생성 (message_tsv: 전문 검색용, 저장할 때 자동 계산)
                 cur.execute("""
                     CREATE TABLE chat_messages (
                         id SERIAL PRIMARY KEY,
@@ -42,10 +113,57 @@ def init_database():
                         sender VARCHAR(50) NOT NULL CHECK (sender IN ('user', 'bot')),
                         message TEXT NOT NULL,
                         timestamp TIMESTAMP DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul'),
+                        message_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', message)) STORED,
                         FOREIGN KEY (session_id) REFERENCES chat_sessions(id) ON DELETE CASCADE
                     );
+                    CREATE INDEX idx_chat_messages_session_id ON chat_messages (session_id);
+                    CREATE INDEX idx_chat_messages_tsv ON chat_messages USING GIN (message_tsv);
                 """)
 
+                # user_sessions 테이블 생성 (로그인 세션 토큰, 토큰 원문 대신 해시 저장)
+                cur.execute("""
+                    CREATE TABLE user_sessions (
+                        token_hash CHAR(64) PRIMARY KEY,
+                        user_id INT NOT NULL,
+                        created_at TIMESTAMP DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul'),
+                        expires_at TIMESTAMP NOT NULL,
+                        revoked BOOLEAN DEFAULT FALSE,
+                        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+                    );
+                    CREATE INDEX idx_user_sessions_user_id ON user_sessions (user_id);
+                """)
+
+                # evaluation_cache 테이블 생성 (평가 결과 캐시)
+                cur.execute("""
+                    CREATE TABLE evaluation_cache (
+                        cache_key CHAR(64) PRIMARY KEY,
+                        evaluation TEXT NOT NULL,
+                        total_tokens INT DEFAULT 0,
+                        latency REAL DEFAULT 0,
+                        created_at TIMESTAMP DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul')
+                    );
+                """)
+
+                # interview_states 테이블 생성 (진행 중인 면접 상태, version으로 동시 수정 감지)
+                cur.execute("""
+                    CREATE TABLE interview_states (
+                        state_key VARCHAR(255) PRIMARY KEY,
+                        state JSONB NOT NULL,
+                        version INT NOT NULL,
+                        updated_at TIMESTAMP DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul')
+                    );
+                    CREATE INDEX idx_interview_states_updated_at ON interview_states (updated_at);
+                """)
+
+                # evaluations 테이블 생성 (평가 메시지의 점수, 성적 추이/약한 주제/백분위 조회용)
+                cur.execute(EVALUATIONS_TABLE)
+
+                # 사용 통계 집계 테이블 생성 (일/사용자별 누적값, 마지막으로 집계한 id)
+                cur.execute(USAGE_ROLLUP_TABLES)
+
+                # 임베딩 모델 레지스트리 생성 (등록된 인덱스가 없으면 설정의 인덱스로 검색)
+                cur.execute(EMBEDDING_INDEXES_TABLE)
+
                 conn.commit()
                 print("Database tables initialized successfully.")
         except Exception as e:
@@ -75,5 +193,107 @@ def convert_password_to_binary():
         finally:
             release_connection(conn)
 
+def add_message_search():
+    """
+    기존 DB에 메시지 전문 검색 컬럼과 인덱스 추가
+    (컬럼 추가 시 chat_messages 전체를 다시 쓰므로 사용량이 적을 때 실행)
+    """
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    ALTER TABLE chat_messages ADD COLUMN IF NOT EXISTS message_tsv TSVECTOR
+                        GENERATED ALWAYS AS (to_tsvector('simple', message)) STORED;
+                    CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_id ON chat_sessions (user_id);
+                    CREATE INDEX IF NOT EXISTS idx_chat_messages_session_id ON chat_messages (session_id);
+                    CREATE INDEX IF NOT EXISTS idx_chat_messages_tsv ON chat_messages USING GIN (message_tsv);
+                    ANALYZE chat_messages;
+                """)
+                conn.commit()
+                print("Message search column and indexes added successfully.")
+        except Exception as e:
+            print(f"Error adding message search: {e}")
+            conn.rollback()
+        finally:
+            release_connection(conn)
+
+def add_usage_rollups():
+    """기존 DB에 사용 통계 집계 테이블 추가 (다음 갱신 때 처음부터 집계)"""
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(USAGE_ROLLUP_TABLES)
+                conn.commit()
+                print("Usage rollup tables added successfully.")
+        except Exception as e:
+            print(f"Error adding usage rollup tables: {e}")
+            conn.rollback()
+        finally:
+            release_connection(conn)
+
+def add_evaluations():
+    """기존 DB에 evaluations 테이블 추가 (이후 평가부터 점수 저장)"""
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(EVALUATIONS_TABLE)
+                conn.commit()
+                print("Evaluations table added successfully.")
+        except Exception as e:
+            print(f"Error adding evaluations table: {e}")
+            conn.rollback()
+        finally:
+            release_connection(conn)
+
+def add_interview_state_expiry():
+    """기존 DB에 만료된 면접 상태 삭제(purge_interview_states)용 인덱스 추가"""
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_interview_states_updated_at ON interview_states (updated_at);"
+                )
+                conn.commit()
+                print("Interview state expiry index added successfully.")
+        except Exception as e:
+            print(f"Error adding interview state expiry index: {e}")
+            conn.rollback()
+        finally:
+            release_connection(conn)
+
+def add_embedding_indexes():
+    """기존 DB에 임베딩 모델 레지스트리 추가 (등록 전까지는 설정의 인덱스로 검색)"""
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(EMBEDDING_INDEXES_TABLE)
+                conn.commit()
+                print("Embedding index registry added successfully.")
+        except Exception as e:
+            print(f"Error adding embedding index registry: {e}")
+            conn.rollback()
+        finally:
+            release_connection(conn)
+
+def add_embedding_projection():
+    """기존 레지스트리에 차원 축소(투영) 파일 경로 컬럼 추가 (기존 인덱스는 축소하지 않은 인덱스로 유지)"""
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("ALTER TABLE embedding_indexes ADD COLUMN IF NOT EXISTS projection TEXT NOT NULL DEFAULT '';")
+                conn.commit()
+                print("Embedding projection column added successfully.")
+        except Exception as e:
+            print(f"Error adding embedding projection column: {e}")
+            conn.rollback()
+        finally:
+            release_connection(conn)
+
 if __name__ == "__main__":
     init_database()
\ No newline at end of file
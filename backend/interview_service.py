@@ -0,0 +1,369 @@
+"""
+UI와 무관한 면접 진행 로직
+- 면접 상태(state)를 인자로 받아 읽고 쓰므로 Streamlit(st.session_state)과 HTTP API(backend.api)에서 함께 사용
+- 면접 시작, 다음 질문 생성, 답변 제출(평가 결과를 토큰 단위로 스트리밍 가능)
+- state는 dict처럼 다룰 수 있는 객체면 되고, 사용하는 키는 new_state() 참고
+"""
+
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from langchain_core.messages import AIMessage
+
+from backend.config import (get_openai_client,
+                            QUESTION_PROMPT,
+                            EVALUATION_PROMPT,
+                            retriever,
+                            QUERY,
+                            DEFAULT_MODEL,
+                            MAX_COMPLETION_TOKENS,
+                            EVAL_CACHE_CONFIG,
+                            LLM_SCHEDULER_CONFIG,
+                            TOKEN_BUDGET_CONFIG,
+                            FALLBACK_QUESTIONS,
+                            FALLBACK_EVALUATION,
+                            EVALUATION_TOPICS)
+from backend.db import insert_chat_message, create_chat_session, insert_evaluation
+from backend.eval_cache import get_evaluation_cache
+from backend.evaluations import parse_evaluation, ScoreFilter
+from backend.metrics import track
+from backend.resilience import get_dependency
+from backend.tracing import start_trace, span
+from backend.llm_scheduler import (get_llm_scheduler,
+                                   estimate_tokens,
+                                   PRIORITY_EVALUATION,
+                                   PRIORITY_QUESTION)
+from backend.token_budget import (count_tokens,
+                                  compress_context,
+                                  record_usage,
+                                  summarize_usage)
+
+
+class TokenCapReached(Exception):
+    """면접 토큰 사용 한도에 도달하여 더 이상 질문을 생성하지 않음"""
+
+
+# 면접 상태
+def new_state(**extra) -> dict:
+    """빈 면접 상태 (user, session_id 등 추가 값은 키워드 인자로 전달)"""
+    state = {}
+    reset_interview(state)
+    state.update(extra)
+    return state
+
+
+def reset_messages(state):
+    state["messages"] = []
+    state["message_ids"] = set()  # 중복 메시지 확인용
+
+
+def reset_interview(state):
+    """이전 면접 상태 초기화"""
+    reset_messages(state)
+    state["used_prompts"] = set()  # 사용된 프롬프트 저장용
+    state["used_questions"] = set()  # 생성된 질문 저장용
+    state["token_usage"] = []
+    state["context"] = ""
+
+
+def add_message(state, role, content, msg_id=None):
+    """메시지에 고유 id를 붙여 저장 (id로 중복 여부를 O(1)에 확인)"""
+    msg = {"id": msg_id or uuid.uuid4().hex, "role": role, "content": content}
+    state["messages"].append(msg)
+    state["message_ids"].add(msg["id"])
+    return msg
+
+
+# 모든 LLM 호출은 전역 스케줄러를 거쳐 실행
+def invoke_chain(chain, inputs, usage_log, priority=PRIORITY_QUESTION, stage="question", on_chunk=None, fallback=None):
+    """
+    rate limit과 우선순위를 고려하여 체인을 실행하고 토큰 사용량 기록
+    :param on_chunk: 지정하면 응답을 스트리밍으로 받으며 조각(문자열)마다 호출
+    :param fallback: 지정하면 호출이 실패(대기열 초과, deadline, 서킷 브레이커 등)했을 때 fallback(error) 결과 반환
+    """
+    scheduler = get_llm_scheduler(LLM_SCHEDULER_CONFIG)
+
+    def run():
+        if on_chunk is None:
+            return chain.invoke(inputs)
+        return _stream_chain(chain, inputs, on_chunk)
+
+    def call():
+        with track("llm", stage):  # 대기열 시간은 제외하고 실제 호출 시간만 측정
+            # 스트리밍은 조각을 이미 전달했을 수 있으므로 재시도하지 않음
+            return get_dependency("openai").call(run, retry=on_chunk is None)
+
+    try:
+        with span("llm.scheduler", stage=stage):  # 대기열 대기 시간 포함
+            response = scheduler.submit(
+                call,
+                priority=priority,
+                est_tokens=estimate_tokens(
+                    inputs,
+                    MAX_COMPLETION_TOKENS,
+                    counter=lambda text: count_tokens(text, DEFAULT_MODEL),
+                ),
+            )
+    except Exception as e:
+        if fallback is None:
+            raise
+        print(f"LLM {stage} failed, using fallback: {e}")
+        return fallback(e)
+    record_usage(usage_log, stage, response)
+    return response
+
+
+def degraded_message(content) -> AIMessage:
+    """LLM 대신 만든 응답 (평가 캐시에 저장하지 않음)"""
+    return AIMessage(content=content, response_metadata={"degraded": True})
+
+
+def is_degraded(response) -> bool:
+    return bool((getattr(response, "response_metadata", None) or {}).get("degraded"))
+
+
+def _stream_chain(chain, inputs, on_chunk):
+    """스트리밍 조각을 전달하면서 하나의 메시지로 합침 (사용량은 마지막 조각에 포함)"""
+    response = None
+    for chunk in chain.stream(inputs):
+        if chunk.content:
+            on_chunk(chunk.content)
+        response = chunk if response is None else response + chunk
+    return response
+
+
+# 최근 검색 결과 (검색 장애 시 후보 문서로 사용)
+MAX_CANDIDATES = 100
+_candidates = OrderedDict()  # page_content -> Document
+_candidates_lock = threading.Lock()
+
+
+def _remember_candidates(docs):
+    with _candidates_lock:
+        for doc in docs:
+            _candidates[doc.page_content] = doc
+            _candidates.move_to_end(doc.page_content)
+        while len(_candidates) > MAX_CANDIDATES:
+            _candidates.popitem(last=False)
+
+
+def _cached_candidates(error):
+    with _candidates_lock:
+        if not _candidates:
+            raise error
+        return list(_candidates.values())
+
+
+def retrieve_candidates():
+    """질문 후보 문서 검색 (느리면 hedge, Pinecone 장애 시 최근 검색한 문서로 대체)"""
+    degraded = []
+
+    def fallback(error):
+        degraded.append(error)
+        return _cached_candidates(error)
+
+    with track("retriever", "invoke"):
+        docs = get_dependency("pinecone").call(lambda: retriever.invoke(QUERY), fallback=fallback, hedge=True)
+    if not degraded:
+        _remember_candidates(docs)
+    return docs
+
+
+def _fallback_question(state):
+    """LLM을 사용할 수 없을 때 준비된 질문 중 아직 하지 않은 질문 선택"""
+    unused = [question for question in FALLBACK_QUESTIONS if question not in state["used_questions"]]
+    return degraded_message(random.choice(unused or FALLBACK_QUESTIONS))
+
+
+# 토큰 예산에 맞춰 참고 문서 압축
+def fit_context(context, question=QUERY):
+    return compress_context(
+        context, question, TOKEN_BUDGET_CONFIG["context_tokens"], DEFAULT_MODEL
+    )
+
+
+# 면접 토큰 상한 초과 여부
+def is_token_cap_reached(state):
+    cap = TOKEN_BUDGET_CONFIG["interview_token_cap"]
+    if not cap:
+        return False
+    usage = summarize_usage(state.get("token_usage", []))
+    return usage["total_tokens"] >= cap
+
+
+# 새 면접 시작 (검색 1회 + 질문 생성 1회)
+def start_interview(state, user_id):
+    """채팅 세션 생성과 첫 질문 생성을 동시에 진행하고 첫 질문 메시지 반환"""
+    reset_interview(state)
+
+    with start_trace("interview.start", user=state.get("user")):
+        # 세션 행 생성(DB)은 별도 스레드에서, 질문 생성은 state를 쓰므로 현재 스레드에서 실행
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # 트레이스가 이어지도록 현재 context를 복사하여 실행
+            session_future = executor.submit(copy_context().run, create_chat_session, user_id)
+            new_question, new_context = next_question(state)
+            state["session_id"] = session_future.result()
+
+        return publish_question(state, new_question, new_context)
+
+
+def ask_question(state):
+    """사용자의 답변 후 새로운 질문을 생성 (토큰 상한에 도달하면 TokenCapReached)"""
+    if is_token_cap_reached(state):
+        raise TokenCapReached()
+
+    with start_trace("interview.question", user=state.get("user"), session_id=state.get("session_id")):
+        new_question, new_context = next_question(state)
+        return publish_question(state, new_question, new_context)
+
+
+def next_question(state):
+    """사용하지 않은 문서로 새 질문 생성 (중복 질문일 때만 다시 시도)"""
+    question_chain = QUESTION_PROMPT | get_openai_client()
+
+    max_retries = 5  # 새로운 질문을 찾기 위한 최대 시도 횟수
+    new_question = None
+    new_context = None
+
+    for _ in range(max_retries):
+        # 새로운 문맥 선택
+        retrieved_docs = retrieve_candidates()
+        available_docs = [doc.page_content for doc in retrieved_docs if doc.page_content not in state["used_prompts"]]
+
+        if available_docs:
+            raw_context = random.choice(available_docs)
+            state["used_prompts"].add(raw_context)
+            new_context = fit_context(raw_context)
+        else:
+            new_context = state.get("context", "")
+
+        ai_message = invoke_chain(
+            question_chain, {"context": new_context}, state["token_usage"],
+            fallback=lambda error: _fallback_question(state),
+        )
+        new_question = ai_message.content
+
+        # 중복된 질문인지 확인 후 새로운 질문이면 break
+        if new_question not in state["used_questions"]:
+            state["used_questions"].add(new_question)
+            break
+
+    return new_question, new_context
+
+
+def publish_question(state, new_question, new_context):
+    """생성한 질문을 면접 상태와 DB에 저장"""
+    state["generated_question"] = new_question
+    state["context"] = new_context  # 새로운 문맥 업데이트
+    msg = add_message(state, "assistant", new_question)
+
+    insert_chat_message(state.get("session_id"), "bot", new_question)
+    return msg
+
+
+# 답변 평가
+def _structured(response):
+    """평가 응답에서 점수 블록을 떼어 내고, 점수는 response_metadata["evaluation"]에 담아 반환"""
+    body, evaluation = parse_evaluation(response.content, EVALUATION_TOPICS)
+    metadata = {**(response.response_metadata or {}), "evaluation": evaluation}
+    return response.model_copy(update={"content": body, "response_metadata": metadata})
+
+
+def evaluate_answer(state, answer, on_chunk=None):
+    """
+    현재 질문에 대한 답변을 평가하여 AIMessage 반환 (on_chunk를 지정하면 스트리밍)
+    점수 블록은 본문에서 빼고 response_metadata["evaluation"]에 담음 (형식이 맞지 않으면 None)
+    """
+    question = state.get("generated_question", "")
+    context = state.get("context", "")
+    usage_log = state.setdefault("token_usage", [])
+    score_filter = ScoreFilter(on_chunk) if on_chunk is not None else None
+
+    # 동일한 질문/답변 평가 결과가 캐시에 있으면 LLM 호출 생략 (캐시에는 점수 블록까지 저장)
+    cache = get_evaluation_cache(EVAL_CACHE_CONFIG)
+    if cache is not None:
+        with span("eval_cache.get"):
+            cached = cache.get(question, answer, context, DEFAULT_MODEL)
+        if cached is not None:
+            response = _structured(AIMessage(content=cached))
+            record_usage(usage_log, "evaluation", response, cached=True)
+            if on_chunk is not None:
+                on_chunk(response.content)
+            return response
+
+    start = time.perf_counter()
+    evaluation_chain = EVALUATION_PROMPT | get_openai_client()
+    response = invoke_chain(
+        evaluation_chain,
+        {
+            "question": question,
+            "answer": answer,
+            "context": context,
+        },
+        usage_log,
+        priority=PRIORITY_EVALUATION,
+        stage="evaluation",
+        on_chunk=score_filter,
+        fallback=lambda error: _fallback_evaluation(score_filter),
+    )
+    if score_filter is not None:
+        score_filter.flush()
+
+    if cache is not None and not is_degraded(response):
+        usage = getattr(response, "usage_metadata", None) or {}
+        cache.set(
+            question, answer, context, DEFAULT_MODEL, response.content,
+            total_tokens=usage.get("total_tokens", 0),
+            latency=time.perf_counter() - start,
+        )
+    return _structured(response)
+
+
+def _fallback_evaluation(on_chunk):
+    response = degraded_message(FALLBACK_EVALUATION)
+    if on_chunk is not None:
+        on_chunk(response.content)
+    return response
+
+
+def _evaluate_once(state, user_msg, on_chunk):
+    yield evaluate_answer(state, user_msg["content"], on_chunk)
+
+
+def submit_answer(state, answer, on_message=None, on_chunk=None, evaluator=None):
+    """
+    답변 1회 처리(저장, 평가, 평가 저장)를 하나의 트레이스로 기록하고 추가된 평가 메시지 목록 반환
+    :param on_message: 메시지(사용자 답변, 평가)가 추가될 때마다 호출 (화면 출력 등)
+    :param on_chunk: 평가 응답 조각마다 호출
+    :param evaluator: (state, user_msg, on_chunk)를 받아 응답 메시지를 차례로 반환하는 함수
+                      (기본값은 evaluate_answer 1회, Streamlit은 LangGraph 워크플로우 이벤트)
+    """
+    session_id = state.get("session_id")
+    evaluator = evaluator or _evaluate_once
+    replies = []
+
+    with start_trace("interview.answer", user=state.get("user"), session_id=session_id):
+        # 사용자 입력 저장
+        insert_chat_message(session_id, "user", answer)
+        user_msg = add_message(state, "user", answer)
+        if on_message is not None:
+            on_message(user_msg)
+
+        for response in evaluator(state, user_msg, on_chunk):
+            # ✅ 중복 방지: 이미 추가한 메시지 id인지 확인
+            if response.id in state["message_ids"]:
+                continue
+            message_id = insert_chat_message(session_id, "bot", response.content)
+            evaluation = (getattr(response, "response_metadata", None) or {}).get("evaluation")
+            if evaluation is not None and message_id is not None:
+                insert_evaluation(session_id, message_id, state.get("generated_question"), evaluation)
+            reply = add_message(state, "assistant", response.content, msg_id=response.id)
+            replies.append(reply)
+            if on_message is not None:
+                on_message(reply)
+    return replies
@@ -1,56 +1,76 @@
-import uuid
-from langgraph.checkpoint.memory import MemorySaver
+import threading
+import time
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import START, MessagesState, StateGraph
 import streamlit as st
-import random
 from streamlit_chat import message
 
-from backend.config import (get_openai_client,
-                            QUESTION_PROMPT,
-                            EVALUATION_PROMPT,
-                            retriever, 
-                            BOT_AVATAR, USER_AVATAR,
-                            QUERY)
+from backend.config import BOT_AVATAR, USER_AVATAR, CHAT_VIEW_CONFIG, STATE_STORE_CONFIG
+from backend import interview_service as service
+from backend.state_store import get_state_store, StateStoreError, VersionConflict
+from backend.tracing import span
 
-from backend.db import insert_chat_message
 
-
-
-# Streamlit 세션 상태 초기화
+# Streamlit 세션 상태 초기화 (검색/LLM 호출 없음)
 def initialize_session():
+    if "messages" not in st.session_state:
+        restore_interview()  # 다른 프로세스/재시작 전에 진행하던 면접이 있으면 이어서 진행
     if "messages" not in st.session_state:
         st.session_state.messages = []
-
-    if "generated_question" not in st.session_state:
-        # RAG를 이용하여 질문 생성을 위한 관련 문서 검색
-        retrieved_docs = retriever.invoke(QUERY)  # 임시 검색 쿼리
-
-        
-        if retrieved_docs:
-            random_doc = random.choice(retrieved_docs)
-            context = random_doc.page_content  # 검색된 문서에서 내용 가져오기
-        else:
-            context = ""
-
-        st.session_state['context'] = context
+    if "used_prompts" not in st.session_state:
         st.session_state['used_prompts'] = set()  # 사용된 프롬프트 저장용
+    if "used_questions" not in st.session_state:
         st.session_state['used_questions'] = set()  # 생성된 질문 저장용
-
-
-        llm = get_openai_client()
-        
-        # 질문용 모델 체인 정의
-        question_chain = QUESTION_PROMPT | llm
-
-        # ai_message.content 형태로 사용
-        ai_message = question_chain.invoke({"context": context})
-
-        # RAG와 함께 질문 생성
-        generated_question = ai_message.content
-        st.session_state['used_questions'].add(generated_question)
-        st.session_state['used_prompts'].add(context)
-
-        st.session_state.generated_question = generated_question
+    if "token_usage" not in st.session_state:
+        st.session_state['token_usage'] = []
+    if "message_ids" not in st.session_state:
+        st.session_state['message_ids'] = set()  # 중복 메시지 확인용
+
+
+# 새 면접 시작 (검색 1회 + 질문 생성 1회)
+def start_interview(user_id):
+    """채팅 세션 생성과 첫 질문 생성을 동시에 진행하고, 첫 질문까지 걸린 시간을 기록"""
+    start = time.perf_counter()
+    reset_messages()
+    service.start_interview(st.session_state, user_id)
+    # 새 면접은 이전에 저장된 면접을 대체
+    get_state_store(STATE_STORE_CONFIG).delete(_state_key())
+    st.session_state.state_version = 0
+    save_interview()
+    st.session_state.first_question_latency = time.perf_counter() - start
+
+
+def end_interview():
+    """면접 종료 (대화 기록과 저장된 면접 상태 삭제)"""
+    reset_messages()
+    get_state_store(STATE_STORE_CONFIG).delete(_state_key())
+    st.session_state.state_version = 0
+
+
+# 면접 상태 저장소 (같은 사용자의 면접을 다른 프로세스/서버에서도 이어서 진행)
+def _state_key():
+    return f"user:{st.session_state.get('user')}"
+
+
+def restore_interview():
+    """저장소에 진행 중인 면접이 있으면 세션 상태로 불러옴"""
+    state, version = get_state_store(STATE_STORE_CONFIG).load(_state_key())
+    if state is not None:
+        st.session_state.update(state)
+    st.session_state.state_version = version
+
+
+def save_interview():
+    """현재 면접 상태 저장 (그 사이 다른 창/프로세스에서 진행했으면 저장된 상태를 다시 불러옴)"""
+    try:
+        st.session_state.state_version = get_state_store(STATE_STORE_CONFIG).save(
+            _state_key(), st.session_state, st.session_state.get("state_version", 0)
+        )
+    except VersionConflict:
+        restore_interview()
+        st.warning("다른 창에서 면접이 진행되어 최신 상태를 불러왔습니다.")
+    except StateStoreError as e:
+        print(f"Error saving interview state: {e}")
 
 
 # RAG를 이용하여 피드백을 위해 검색된 문서 가져오기
@@ -66,126 +86,115 @@ def initialize_evaluation_workflow():
     # 그래프 정의
     workflow = StateGraph(state_schema=MessagesState)
 
-    # 모델 평가 함수 정의
-    def call_model(state: MessagesState):
-        evaluation_chain = EVALUATION_PROMPT | get_openai_client()
-        response = evaluation_chain.invoke(
-            {
-                "question": st.session_state.get("generated_question", ""),
-                "answer": state["messages"][-1].content,
-                "context": st.session_state.get("context", ""),
-            }
-        )
-        return {"messages": [response]}
+    # 모델 평가 함수 정의 (면접 상태는 실행할 때 config로 전달받으므로 모든 세션이 같은 그래프를 공유)
+    def call_model(state: MessagesState, config: RunnableConfig):
+        with span("langgraph.call_model"):
+            answer = state["messages"][-1].content
+            interview_state = config["configurable"]["interview_state"]
+            return {"messages": [service.evaluate_answer(interview_state, answer)]}
 
     # 노드 및 엣지 추가
     workflow.add_node("chain", call_model)
     workflow.add_edge(START, "chain")
 
-    # 체크포인트 메모리 저장
-    memory = MemorySaver()
+    # 워크플로우 컴파일 (한 턴씩 실행하고 이어서 실행하지 않으므로 체크포인트는 저장하지 않음)
+    return workflow.compile()
 
-    # 워크플로우 컴파일
-    app = workflow.compile(checkpointer=memory)
 
-    return app
+_evaluation_workflow = None
+_evaluation_workflow_lock = threading.Lock()
+
+
+def get_evaluation_workflow():
+    """프로세스 전체에서 공유하는 평가 워크플로우 (세션마다 컴파일하지 않음)"""
+    global _evaluation_workflow
+    with _evaluation_workflow_lock:
+        if _evaluation_workflow is None:
+            _evaluation_workflow = initialize_evaluation_workflow()
+    return _evaluation_workflow
+
+# 채팅 메시지 관리
+def reset_messages():
+    """대화 기록과 화면 표시 상태 초기화"""
+    service.reset_messages(st.session_state)
+    st.session_state['history_window'] = CHAT_VIEW_CONFIG["window"]
+    st.session_state['rendered_count'] = 0
 
-# 채팅 기록 출력 함수
-def display_chat_history():
-    for i, msg in enumerate(st.session_state.messages):
-        is_user = msg["role"] == "user"
 
+def add_message(role, content, msg_id=None):
+    return service.add_message(st.session_state, role, content, msg_id)
+
+
+def render_message(msg):
+    """메시지 1개 출력 (key를 메시지 id로 고정하여 재실행 시에도 같은 컴포넌트 재사용)"""
+    is_user = msg["role"] == "user"
+    with span("render.message", role=msg["role"]):
         message(
             msg["content"],
             is_user=is_user,
-            key=f"msg_{i}",
+            key=f"msg_{msg['id']}",
             logo=USER_AVATAR if is_user else BOT_AVATAR,
         )
 
 
+def _show_more_history():
+    st.session_state.history_window += CHAT_VIEW_CONFIG["window"]
 
-def generate_question():
-    """사용자의 답변 후 새로운 질문을 생성하는 함수"""
-    question_chain = QUESTION_PROMPT | get_openai_client()
-
-    # ✅ 'AIMessage' 객체 반환 → 'str'로 변환
- 
 
-    max_retries = 5  # 새로운 질문을 찾기 위한 최대 시도 횟수
-    new_question = None
-    new_context = None
-
-    for _ in range(max_retries):
-        # 새로운 문맥 선택
-        retrieved_docs = retriever.invoke(QUERY)
-        available_docs = [doc.page_content for doc in retrieved_docs if doc.page_content not in st.session_state['used_prompts']]
-        
-        if available_docs:
-            new_context = random.choice(available_docs)
-            st.session_state['used_prompts'].add(new_context)
-        else:
-            new_context = st.session_state.get("context", "")
+# 채팅 기록 출력 함수
+def display_chat_history():
+    """
+    전체 실행 시 이전 대화 출력
+    - 긴 면접은 최근 window개만 출력하고 '이전 대화 더 보기'로 확장
+    - 출력한 메시지 수를 기록하여 이후 부분 실행(fragment)에서는 새로 추가된 메시지만 출력
+    """
+    messages = st.session_state.messages
+    window = st.session_state.get("history_window", CHAT_VIEW_CONFIG["window"])
+    start = max(0, len(messages) - window) if window else 0
 
-        ai_message = question_chain.invoke({"context": new_context})
-        new_question = ai_message.content
+    if start:
+        st.button(f"이전 대화 더 보기 ({start}개)", on_click=_show_more_history)
+    for msg in messages[start:]:
+        render_message(msg)
+    st.session_state.rendered_count = len(messages)
 
-        # 중복된 질문인지 확인 후 새로운 질문이면 break
-        if new_question not in st.session_state['used_questions']:
-            st.session_state['used_questions'].add(new_question)
-            break
-    
-    # 세션 상태 업데이트
 
-    st.session_state.generated_question = new_question
-    st.session_state.context = new_context  # 새로운 문맥 업데이트
-    st.session_state.messages.append({"role": "assistant", "content": new_question})
-    session_id = st.session_state.get("session_id")
+def display_new_messages():
+    """전체 실행 이후 추가된 메시지만 출력 (부분 실행 시 이전 대화는 다시 그리지 않음)"""
+    for msg in st.session_state.messages[st.session_state.get("rendered_count", 0):]:
+        render_message(msg)
 
-    insert_chat_message(session_id, "bot", new_question)
 
-    message(new_question, is_user=False, key=f"bot_{len(st.session_state.messages)}", logo=BOT_AVATAR)
+def generate_question():
+    """사용자의 답변 후 새로운 질문을 생성하는 함수"""
+    try:
+        render_message(service.ask_question(st.session_state))
+        save_interview()
+    except service.TokenCapReached:
+        # 면접 토큰 상한에 도달하면 더 이상 질문을 생성하지 않음
+        st.warning("이번 면접의 토큰 사용 한도에 도달했습니다. 새 면접을 시작해 주세요.")
 
 
 def handle_user_input():
     """사용자 입력을 처리하는 함수"""
     if prompt := st.chat_input("답변을 입력하세요..."):
-        session_id = st.session_state.get("session_id")
-        
-        # 사용자 입력 저장 및 출력
-        insert_chat_message(session_id, "user", prompt)
-
-        # 사용자 입력 UI 표시
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        message(
-            prompt,
-            is_user=True,
-            key=f"user_{len(st.session_state.messages)}",
-            logo=USER_AVATAR,
-        )
-
-        # LangGraph 워크플로우를 실행하여 RAG 검색 및 응답 생성
-        thread_id = uuid.uuid4()
-        config = {"configurable": {"thread_id": thread_id}}
+        # 사용자 입력과 평가를 추가되는 대로 출력
+        service.submit_answer(st.session_state, prompt, on_message=render_message, evaluator=_run_workflow)
+        save_interview()
 
-        input_message = {"role": "user", "content": prompt}
-
-        # LangGraph 평가 워크플로우 실행
-        if "app" not in st.session_state:
-            st.session_state.app = initialize_evaluation_workflow()
-
-        # AI 평가 수행
-        for event in st.session_state.app.stream(
-            {"messages": [input_message]}, config, stream_mode="values"
-        ):
-            response = event["messages"][-1].content
+        # ✅ 면접 지속 여부 선택 버튼 추가
+        st.session_state.show_continue_button = True
 
-            # ✅ 중복 방지: 동일한 응답이 있는지 확인
-            if not any(msg["content"] == response for msg in st.session_state.messages):
 
-                insert_chat_message(session_id, "bot", response)
-                st.session_state.messages.append({"role": "assistant", "content": response})
-                message(response, is_user=False, key=f"assistant_{len(st.session_state.messages)}", logo=BOT_AVATAR)
+def _run_workflow(state, user_msg, on_chunk=None):
+    """LangGraph 평가 워크플로우를 실행하여 이벤트의 마지막 메시지를 차례로 반환"""
+    config = {"configurable": {"interview_state": state}}
 
+    # 사용자 메시지와 같은 id로 전달하여 이벤트에 다시 포함되어도 중복으로 걸러지도록 함
+    input_message = {"role": "user", "content": user_msg["content"], "id": user_msg["id"]}
 
-        # ✅ 면접 지속 여부 선택 버튼 추가
-        st.session_state.show_continue_button = True
\ No newline at end of file
+    # AI 평가 수행
+    for event in get_evaluation_workflow().stream(
+        {"messages": [input_message]}, config, stream_mode="values"
+    ):
+        yield event["messages"][-1]
@@ -0,0 +1,228 @@
+"""
+프로세스 전역 LLM 요청 스케줄러
+- 모든 LLM 호출을 하나의 스케줄러가 관리하여 동시 면접이 몰려도 OpenAI rate limit에 함께 걸리지 않도록 조절
+- 분당 요청 수 / 분당 토큰 수 토큰 버킷, 우선순위(평가 > 질문 생성 > 백그라운드), 동시 실행 수 제한
+- 대기열 길이 제한과 요청별 deadline, 대기 시간 및 429 횟수 통계 제공
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+# 우선순위 (숫자가 작을수록 먼저 실행)
+PRIORITY_EVALUATION = 0  # 사용자가 기다리는 답변 평가
+PRIORITY_QUESTION = 1  # 면접 질문 생성
+PRIORITY_BACKGROUND = 2  # 질문 미리 생성, 질문 은행 보충 등
+
+
+class LLMQueueFull(RuntimeError):
+    """대기열이 가득 차서 요청을 받을 수 없음"""
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """deadline 안에 실행 순서가 오지 않음"""
+
+
+# 토큰 버킷
+class TokenBucket:
+    def __init__(self, rate_per_min, capacity=None):
+        """
+        :param rate_per_min: 분당 충전량
+        :param capacity: 최대 보유량 (기본값: rate_per_min)
+        """
+        self.rate = rate_per_min / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_min
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def time_until(self, amount):
+        """amount 만큼 사용할 수 있을 때까지 남은 시간 (초)"""
+        self._refill()
+        amount = min(amount, self.capacity)  # 용량보다 큰 요청도 언젠가는 실행되도록
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount):
+        """amount 만큼 차감 (실제 사용량 보정 시 음수 잔량 허용)"""
+        self._refill()
+        self.tokens -= min(amount, self.capacity) if amount > 0 else amount
+        self.tokens = min(self.tokens, self.capacity)
+
+
+def estimate_tokens(inputs: dict, max_completion_tokens=0, counter=None) -> int:
+    """
+    프롬프트 입력의 토큰 수 + 응답 토큰 예약
+    :param counter: 문자열 토큰 수 계산 함수 (기본값: 한글 기준 약 2자당 1토큰으로 추정)
+    """
+    if counter is None:
+        return sum(len(str(value)) for value in inputs.values()) // 2 + max_completion_tokens
+    return sum(counter(str(value)) for value in inputs.values()) + max_completion_tokens
+
+
+def _is_rate_limit_error(error) -> bool:
+    """OpenAI 429 (rate limit) 오류 여부"""
+    return (
+        getattr(error, "status_code", None) == 429
+        or type(error).__name__ == "RateLimitError"
+    )
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        requests_per_min=500,
+        tokens_per_min=200000,
+        max_concurrency=8,
+        max_queue=100,
+        default_deadline=30.0,
+        rate_limit_cooldown=2.0,
+    ):
+        """
+        :param requests_per_min: 분당 최대 요청 수
+        :param tokens_per_min: 분당 최대 토큰 수
+        :param max_concurrency: 동시에 실행할 수 있는 LLM 호출 수
+        :param max_queue: 대기열 최대 길이 (넘으면 LLMQueueFull)
+        :param default_deadline: 실행 순서를 기다리는 최대 시간 (초)
+        :param rate_limit_cooldown: 429 응답을 받은 뒤 새 요청을 멈추는 시간 (초)
+        """
+        self.request_bucket = TokenBucket(requests_per_min)
+        self.token_bucket = TokenBucket(tokens_per_min)
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.default_deadline = default_deadline
+        self.rate_limit_cooldown = rate_limit_cooldown
+
+        self._cond = threading.Condition()
+        self._queue = []  # (priority, seq) 힙
+        self._seq = itertools.count()
+        self._active = 0
+        self._cooldown_until = 0.0
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.expired = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def submit(self, fn, priority=PRIORITY_EVALUATION, est_tokens=0, deadline=None):
+        """
+        실행 순서가 오면 fn()을 호출하고 결과를 반환 (호출한 스레드에서 실행)
+        :param fn: 인자 없는 LLM 호출 함수
+        :param priority: PRIORITY_* 값
+        :param est_tokens: 예상 토큰 수 (분당 토큰 버킷에서 차감)
+        :param deadline: 대기 최대 시간 (초, 기본값: default_deadline)
+        """
+        deadline = self.default_deadline if deadline is None else deadline
+        enqueued_at = time.monotonic()
+        expires_at = enqueued_at + deadline
+
+        with self._cond:
+            self.submitted += 1
+            if len(self._queue) >= self.max_queue:
+                self.rejected += 1
+                raise LLMQueueFull(f"LLM request queue is full ({self.max_queue})")
+
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+
+            while True:
+                now = time.monotonic()
+                if now >= expires_at:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                    self.expired += 1
+                    self._cond.notify_all()
+                    raise LLMDeadlineExceeded(f"LLM request waited longer than {deadline}s")
+
+                wait = expires_at - now
+                if self._queue[0] == ticket and self._active < self.max_concurrency:
+                    wait_for_capacity = max(
+                        self._cooldown_until - now,
+                        self.request_bucket.time_until(1),
+                        self.token_bucket.time_until(est_tokens),
+                    )
+                    if wait_for_capacity <= 0:
+                        break
+                    wait = min(wait, wait_for_capacity)
+                self._cond.wait(wait)
+
+            heapq.heappop(self._queue)
+            self.request_bucket.consume(1)
+            self.token_bucket.consume(est_tokens)
+            self._active += 1
+
+            waited = time.monotonic() - enqueued_at
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self._cond.notify_all()  # 다음 순서의 요청이 바로 확인할 수 있도록
+
+        try:
+            result = fn()
+        except Exception as e:
+            with self._cond:
+                self.failed += 1
+                if _is_rate_limit_error(e):
+                    self.rate_limited += 1
+                    self._cooldown_until = time.monotonic() + self.rate_limit_cooldown
+            raise
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+        # 실제 사용한 토큰 수로 예상치 보정
+        usage = getattr(result, "usage_metadata", None) or {}
+        if usage.get("total_tokens"):
+            with self._cond:
+                self.token_bucket.consume(usage["total_tokens"] - est_tokens)
+
+        with self._cond:
+            self.completed += 1
+        return result
+
+    def stats(self) -> dict:
+        """대기열 길이, 실행 중인 요청 수, 대기 시간, 429 횟수 등 반환"""
+        with self._cond:
+            admitted = self.submitted - self.rejected - self.expired - len(self._queue)
+            return {
+                "queue_depth": len(self._queue),
+                "active": self._active,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "expired": self.expired,
+                "rate_limited": self.rate_limited,
+                "avg_wait": self.total_wait / admitted if admitted else 0.0,
+                "max_wait": self.max_wait,
+            }
+
+
+# 프로세스 전체에서 공유하는 스케줄러 인스턴스
+_llm_scheduler = None
+_llm_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler(config: dict) -> LLMScheduler:
+    """설정값으로 공유 스케줄러를 한 번만 생성하여 반환"""
+    global _llm_scheduler
+    with _llm_scheduler_lock:
+        if _llm_scheduler is None:
+            _llm_scheduler = LLMScheduler(
+                requests_per_min=config.get("requests_per_min", 500),
+                tokens_per_min=config.get("tokens_per_min", 200000),
+                max_concurrency=config.get("max_concurrency", 8),
+                max_queue=config.get("max_queue", 100),
+                default_deadline=config.get("deadline", 30.0),
+            )
+    return _llm_scheduler
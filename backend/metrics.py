@@ -0,0 +1,263 @@
+"""
+성능 지표 수집 (Prometheus 텍스트 형식)
+- DB 함수, 검색/임베딩, LLM 호출을 데코레이터(instrument) 또는 컨텍스트 매니저(track)로 감싸
+  component/operation/outcome 라벨별 호출 수와 소요 시간 히스토그램을 집계
+- 예외를 잡고 print만 하는 함수는 except 블록에서 record_error()를 호출하여 실패로 기록
+- 비활성화 상태(기본값)에서는 플래그 확인 한 번 후 원래 함수를 그대로 호출
+- 트레이스(backend.tracing)가 진행 중이면 같은 구간을 하위 span으로도 기록
+- /metrics 엔드포인트는 FastAPI 앱을 uvicorn으로 별도 스레드에서 실행하여 제공
+
+설정 예시 (.streamlit/secrets.toml):
+    [metrics]
+    ENABLED = true
+    PORT = 9108
+"""
+
+import bisect
+import functools
+import threading
+import time
+from contextvars import ContextVar
+
+from langchain_core.embeddings import Embeddings
+
+from backend import tracing
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LABEL_NAMES = ("component", "operation", "outcome")
+
+_enabled = False
+_current_call = ContextVar("metrics_current_call", default=None)
+
+
+class _Call:
+    __slots__ = ("failed",)
+
+    def __init__(self):
+        self.failed = False
+
+
+class MetricsRegistry:
+    """호출 수(counter)와 소요 시간(histogram)을 라벨 조합별로 보관"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._calls = {}  # labels -> 호출 수
+        self._durations = {}  # labels -> [버킷별 개수, 합계, 개수]
+        self._collectors = []  # render 때 추가할 지표 줄을 반환하는 함수 (서킷 브레이커 상태 등)
+
+    def observe(self, component, operation, outcome, seconds):
+        labels = (component, operation, outcome)
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._calls[labels] = self._calls.get(labels, 0) + 1
+            histogram = self._durations.get(labels)
+            if histogram is None:
+                histogram = self._durations[labels] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                histogram[0][index] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    def get_count(self, component, operation, outcome="ok"):
+        with self._lock:
+            return self._calls.get((component, operation, outcome), 0)
+
+    def total(self, outcome=None):
+        """전체 호출 수 (outcome을 지정하면 해당 결과만)"""
+        with self._lock:
+            return sum(count for labels, count in self._calls.items() if outcome in (None, labels[2]))
+
+    def add_collector(self, collect):
+        with self._lock:
+            self._collectors.append(collect)
+
+    def clear(self):
+        with self._lock:
+            self._calls.clear()
+            self._durations.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        with self._lock:
+            calls = dict(self._calls)
+            durations = {labels: (list(h[0]), h[1], h[2]) for labels, h in self._durations.items()}
+            collectors = list(self._collectors)
+
+        lines = [
+            "# HELP interview_calls_total Number of instrumented calls.",
+            "# TYPE interview_calls_total counter",
+        ]
+        for labels, count in sorted(calls.items()):
+            lines.append(f"interview_calls_total{{{_format_labels(labels)}}} {count}")
+
+        lines += [
+            "# HELP interview_call_duration_seconds Latency of instrumented calls.",
+            "# TYPE interview_call_duration_seconds histogram",
+        ]
+        for labels, (bucket_counts, total, count) in sorted(durations.items()):
+            label_text = _format_labels(labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                lines.append(
+                    f'interview_call_duration_seconds_bucket{{{label_text},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f'interview_call_duration_seconds_bucket{{{label_text},le="+Inf"}} {count}')
+            lines.append(f"interview_call_duration_seconds_sum{{{label_text}}} {total}")
+            lines.append(f"interview_call_duration_seconds_count{{{label_text}}} {count}")
+        for collect in collectors:
+            lines += collect()
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(values):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(LABEL_NAMES, values))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = MetricsRegistry()
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def record_error():
+    """현재 측정 중인 호출을 실패로 표시 (예외를 잡고 반환값으로 실패를 알리는 함수용)"""
+    call = _current_call.get()
+    if call is not None:
+        call.failed = True
+    tracing.mark_error()
+
+
+def instrument(component, operation=None):
+    """
+    함수 호출 수와 소요 시간을 기록하는 데코레이터
+    :param component: db, retriever, embedding, llm, pinecone 등
+    :param operation: 생략하면 함수 이름
+    """
+
+    def decorator(fn):
+        name = operation or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled and not tracing.is_tracing():
+                return fn(*args, **kwargs)
+            with track(component, name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class track:
+    """with 블록의 소요 시간을 기록하는 컨텍스트 매니저 (블록 안에서 예외가 나면 error)"""
+
+    __slots__ = ("component", "operation", "_call", "_token", "_start", "_span")
+
+    def __init__(self, component, operation):
+        self.component = component
+        self.operation = operation
+        self._call = None
+
+    def __enter__(self):
+        self._span = tracing.span(f"{self.component}.{self.operation}").__enter__()
+        if _enabled:
+            self._call = _Call()
+            self._token = _current_call.set(self._call)
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._span.__exit__(exc_type, exc, tb)
+        if self._call is None:
+            return False
+        elapsed = time.perf_counter() - self._start
+        _current_call.reset(self._token)
+        outcome = "error" if exc_type is not None or self._call.failed else "ok"
+        REGISTRY.observe(self.component, self.operation, outcome, elapsed)
+        return False
+
+
+class InstrumentedEmbeddings(Embeddings):
+    """LangChain 임베딩 객체의 embed_documents/embed_query 호출을 측정 (나머지 속성은 그대로 위임)"""
+
+    def __init__(self, embeddings, name="openai"):
+        self._embeddings = embeddings
+        self._name = name
+
+    def embed_documents(self, texts):
+        with track("embedding", f"{self._name}.embed_documents"):
+            return self._embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        with track("embedding", f"{self._name}.embed_query"):
+            return self._embeddings.embed_query(text)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._embeddings, name)
+
+
+# /metrics HTTP 엔드포인트
+def create_metrics_app(registry=REGISTRY):
+    from fastapi import FastAPI
+    from fastapi.responses import PlainTextResponse
+
+    app = FastAPI(title="interview metrics", docs_url=None, redoc_url=None)
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+    return app
+
+
+_server_thread = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(host="127.0.0.1", port=9108):
+    """uvicorn 서버를 데몬 스레드로 한 번만 실행 (Streamlit 재실행 시 중복 실행 방지)"""
+    global _server_thread
+    with _server_lock:
+        if _server_thread is not None:
+            return _server_thread
+
+        import uvicorn
+
+        server = uvicorn.Server(
+            uvicorn.Config(create_metrics_app(), host=host, port=port, log_level="warning")
+        )
+        _server_thread = threading.Thread(target=server.run, name="metrics-server", daemon=True)
+        _server_thread.start()
+        return _server_thread
+
+
+def setup_metrics(config: dict):
+    """설정에서 활성화된 경우에만 수집을 켜고 엔드포인트 실행"""
+    if not config.get("enabled", False):
+        return
+    enable()
+    try:
+        start_metrics_server(config.get("host", "127.0.0.1"), config.get("port", 9108))
+    except Exception as e:
+        print(f"Error starting metrics server: {e}")
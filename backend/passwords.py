@@ -0,0 +1,112 @@
+"""
+비밀번호 해싱 전용 프로세스 풀
+- bcrypt 해싱/검증을 Streamlit 스크립트 스레드가 아닌 별도 프로세스에서 실행
+- 해싱 비용(rounds)은 설정값으로 지정하고, 저장된 해시의 비용이 다르면 재해싱 대상으로 판단
+- spawn 방식으로 띄운 워커가 가볍게 import 할 수 있도록 bcrypt 외 의존성 없음
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+
+MAX_PASSWORD_BYTES = 72  # bcrypt가 받는 최대 길이 (UTF-8 바이트, 넘으면 bcrypt 5.x는 ValueError)
+
+
+# 워커 프로세스에서 실행되는 함수
+def _hashpw(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=rounds)).decode()
+
+
+def _checkpw(password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(password.encode(), hashed_password.encode("utf-8"))
+
+
+# 저장된 해시의 비용 확인
+def get_hash_rounds(hashed_password: str) -> int:
+    """bcrypt 해시($2b$12$...)에서 비용(rounds) 추출"""
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        raise ValueError("Invalid bcrypt hash")
+
+
+def needs_rehash(hashed_password: str, rounds: int) -> bool:
+    """저장된 해시의 비용이 현재 설정과 다르면 True"""
+    return get_hash_rounds(hashed_password) != rounds
+
+
+class PasswordHasher:
+    def __init__(self, rounds=12, workers=2):
+        """
+        :param rounds: bcrypt 비용 (4~31, 1 증가할 때마다 2배 느려짐)
+        :param workers: 해싱 프로세스 수 (0이면 호출한 스레드에서 바로 실행)
+        """
+        if not 4 <= rounds <= 31:
+            raise ValueError("bcrypt rounds must be between 4 and 31")
+        self.rounds = rounds
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+        # 대기 작업 수 제한 (로그인이 몰려도 프로세스 풀 큐가 무한정 늘어나지 않도록)
+        self._slots = threading.BoundedSemaphore(max(workers, 1) * 4)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),  # 스레드가 있는 프로세스에서 fork 방지
+                )
+            return self._executor
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        with self._slots:
+            try:
+                return self._get_executor().submit(fn, *args).result()
+            except BrokenProcessPool:
+                # 워커가 비정상 종료된 경우 풀을 다시 만들고 한 번 더 시도
+                with self._lock:
+                    self._executor = None
+                return self._get_executor().submit(fn, *args).result()
+
+    def hash(self, password: str) -> str:
+        return self._run(_hashpw, password, self.rounds)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self._run(_checkpw, password, hashed_password)
+
+    def hash_many(self, passwords: list) -> list:
+        """여러 비밀번호를 워커 프로세스에 나눠 병렬로 해싱 (입력 순서 유지)"""
+        rounds = [self.rounds] * len(passwords)
+        if self.workers <= 0:
+            return list(map(_hashpw, passwords, rounds))
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._get_executor().map(_hashpw, passwords, rounds, chunksize=chunksize))
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+# 프로세스 전체에서 공유하는 해셔 인스턴스
+_password_hasher = None
+_password_hasher_lock = threading.Lock()
+
+
+def get_password_hasher(config: dict) -> PasswordHasher:
+    """설정값으로 공유 해셔를 한 번만 생성하여 반환"""
+    global _password_hasher
+    with _password_hasher_lock:
+        if _password_hasher is None:
+            _password_hasher = PasswordHasher(
+                rounds=config.get("rounds", 12),
+                workers=config.get("workers", 2),
+            )
+    return _password_hasher
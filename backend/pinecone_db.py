@@ -1,6 +1,10 @@
 from pinecone.grpc import PineconeGRPC as Pinecone
 from pinecone import ServerlessSpec
 from dotenv import load_dotenv
+from backend.embedding_registry import _embedding_dimension, validate
+from backend.embeddings import MODELS
+from backend.metrics import instrument, track
+from backend.resilience import get_dependency
 
 # .env 파일 로드
 load_dotenv()
@@ -13,32 +17,67 @@ class PineconeWrapper:
         api_key,
         index_name,
         environment,
-        dimension=384,
+        dimension=None,
         metric="cosine",
         namespace="example-namespace",
+        embeddings=None,
+        projection=None,
+        model="multilingual-e5-large",
     ):
         """
-        초기화 및 인덱스 생성
+        초기화 및 인덱스 생성 (이미 있는 인덱스는 차원이 맞는지 확인하고 다르면 EmbeddingMismatch)
         :param api_key: Pinecone API 키
         :param index_name: 사용할 인덱스 이름
         :param environment: Pinecone 환경 (예: "us-east1-gcp")
-        :param dimension: 벡터 차원 수 (임베딩 모델에 따라 달라짐)
+        :param dimension: 벡터 차원 수 (None이면 투영 출력 차원, 임베딩 객체 출력 차원, MODELS의 model 차원 순으로 결정)
         :param metric: 유사도 측정 방식 (예: "cosine")
         :param namespace: 데이터를 저장할 네임스페이스 이름
+        :param embeddings: LangChain 임베딩 객체 (예: backend.embeddings.LocalEmbeddings,
+                           None이면 Pinecone inference API로 model 임베딩)
+        :param projection: 차원 축소 투영 (backend.projection.load_projection, 업서트와 질의 벡터에 같이 적용하며
+                           지정하면 인덱스 차원은 투영 출력 차원)
+        :param model: Pinecone inference 임베딩 모델 (embeddings를 지정하지 않았을 때 업서트와 질의에 같이 사용)
         """
         self.api_key = api_key
         self.index_name = index_name
         self.environment = environment
-        self.dimension = dimension
         self.metric = metric
         self.namespace = namespace
+        self.embeddings = embeddings
+        self.projection = projection
+        self.model = model
+
+        # 차원 검사용 모델 이름 (임베딩 객체는 LocalEmbeddings.model_name, 알 수 없으면 클래스 이름)
+        model_name = model if embeddings is None else getattr(embeddings, "model_name", None)
+        if not isinstance(model_name, str):
+            model_name = type(embeddings).__name__
+        embedding_dimension = _embedding_dimension(embeddings) if embeddings is not None else None
+        if projection is not None:
+            self.dimension = projection.output_dimension
+        else:
+            self.dimension = dimension or embedding_dimension or MODELS.get(model_name, {}).get("dimension")
+        if self.dimension is None:
+            raise ValueError(f"{model_name}의 출력 차원을 알 수 없습니다. dimension을 지정하세요.")
 
         # Pinecone 클라이언트 생성
         self.pc = Pinecone(api_key=self.api_key)
 
         # 인덱스 존재 여부 확인 (pinecone.list_indexes()는 구버전에서는 list 반환)
         existing_indexes = self.pc.list_indexes()  # list 형태
-        if self.index_name not in existing_indexes:
+        exists = self.index_name in existing_indexes
+        index_dimension = (
+            get_dependency("pinecone").call(lambda: self.pc.describe_index(self.index_name).dimension)
+            if exists
+            else None
+        )
+        # 투영을 적용하면 임베딩 객체 출력은 투영 입력이므로 모델 목록의 차원으로만 확인
+        validate(
+            {"index_name": self.index_name, "model": model_name, "dimension": self.dimension},
+            index_dimension,
+            embedding_dimension if projection is None else None,
+            projection,
+        )
+        if not exists:
             print(f"인덱스 '{self.index_name}'가 없으므로 생성합니다.")
             try:
                 self.pc.create_index(
@@ -60,92 +99,77 @@ class PineconeWrapper:
         # 인덱스 객체 가져오기
         self.index = self.pc.Index(self.index_name)
 
-    def upsert_data(self, data, model="multilingual-e5-large"):
+    def _input_type(self, kind):
+        """Pinecone inference input_type (MODELS의 query_input_type/document_input_type)"""
+        default = "query" if kind == "query" else "passage"
+        return MODELS.get(self.model, {}).get(f"{kind}_input_type", default)
+
+    @instrument("pinecone", "upsert")
+    def upsert_data(self, data):
         """
         주어진 데이터를 임베딩 후 업서트
         :param data: [{"id": ..., "text": ...}, ...] 형태의 데이터 리스트
-        :param model: 사용 할 임베딩 모델 이름
         """
         # 임베딩 수행: data의 "text" 항목들을 embed
         texts = [item["text"] for item in data]
-        embeddings = self.pc.inference.embed(
-            model=model,
-            inputs=texts,
-            parameters={"input_type": "passage", "truncate": "END"},
-        )
+        if self.embeddings is not None:
+            embeddings = self.embeddings.embed_documents(texts)
+        else:
+            with track("embedding", "pinecone.embed_documents"):
+                embeddings = [
+                    emb["values"]
+                    for emb in self.pc.inference.embed(
+                        model=self.model,
+                        inputs=texts,
+                        parameters={"input_type": self._input_type("document"), "truncate": "END"},
+                    )
+                ]
+        if self.projection is not None:
+            embeddings = self.projection.transform(embeddings).tolist()
         records = []
-        for item, emb in zip(data, embeddings):
+        for item, values in zip(data, embeddings):
             records.append(
                 {
                     "id": item["id"],
-                    "values": emb["values"],
+                    "values": values,
                     "metadata": {"text": item["text"]},
                 }
             )
-        # 업서트 수행 (namespace 사용)
-        self.index.upsert(vectors=records, namespace=self.namespace)
+        # 업서트 수행 (namespace 사용, 같은 id로 덮어쓰므로 재시도해도 안전)
+        get_dependency("pinecone").call(lambda: self.index.upsert(vectors=records, namespace=self.namespace))
         print("✅ 데이터 업서트 완료.")
 
-    def query(self, query_text, model="multilingual-e5-large", top_k=3):
+    @instrument("pinecone", "query")
+    def query(self, query_text, top_k=3):
         """
         쿼리 텍스트를 임베딩하여 인덱스에서 유사한 벡터 검색
         :param query_text: 검색할 문장
-        :param model: 사용 할 임베딩 모델 이름 (query 용)
         :param top_k: 반환할 상위 유사 벡터 수
         :return: 검색 결과 (dict)
         """
-        query_embedding = self.pc.inference.embed(
-            model=model, inputs=[query_text], parameters={"input_type": "query"}
-        )
-        results = self.index.query(
-            namespace=self.namespace,
-            vector=query_embedding[0].values,
-            top_k=top_k,
-            include_values=False,
-            include_metadata=True,
-        )
-        return results
-
-
-# main.py에서 실행할 것
-
-# import os
-# from dotenv import load_dotenv
-# from backend.pinecone_db import PineconeWrapper
-# from pinecone import Pinecone
 
-# # .env 파일 로드
-# load_dotenv()
-# PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
-# PINECONE_ENV = os.getenv("PINECONE_ENV")
-
-# # PineconeWrapper 인스턴스 생성
-# index_name = "example-index"  # 원하는 인덱스 이름
-
-# pinecone_client = PineconeWrapper(
-#     api_key=PINECONE_API_KEY,
-#     index_name=index_name,
-#     environment=PINECONE_ENV,
-#     dimension=384,  # 사용하려는 임베딩 모델의 차원 (예: all-MiniLM-L6-v2 → 384)
-#     metric="cosine",
-#     namespace="example-namespace" # 인덱스 내 저장소 이름
-# )
+        def search():
+            if self.embeddings is not None:
+                vector = self.embeddings.embed_query(query_text)
+            else:
+                with track("embedding", "pinecone.embed_query"):
+                    vector = self.pc.inference.embed(
+                        model=self.model, inputs=[query_text], parameters={"input_type": self._input_type("query")}
+                    )[0].values
+            if self.projection is not None:
+                vector = self.projection.transform([vector])[0].tolist()
+            return self.index.query(
+                namespace=self.namespace,
+                vector=vector,
+                top_k=top_k,
+                include_values=False,
+                include_metadata=True,
+            )
 
-# # 예시 데이터 (여기서는 면접 질문, 일반 텍스트 예시로 사용)
-# data = [
-#     {"id": "vec1", "text": "Apple is a popular fruit known for its sweetness and crisp texture."},
-#     {"id": "vec2", "text": "The tech company Apple is known for its innovative products like the iPhone."},
-#     {"id": "vec3", "text": "Many people enjoy eating apples as a healthy snack."},
-#     {"id": "vec4", "text": "Apple Inc. has revolutionized the tech industry with its sleek designs and user-friendly interfaces."},
-#     {"id": "vec5", "text": "An apple a day keeps the doctor away, as the saying goes."},
-#     {"id": "vec6", "text": "Apple Computer Company was founded on April 1, 1976, by Steve Jobs, Steve Wozniak, and Ronald Wayne as a partnership."}
-# ]
+        # 조회는 멱등이므로 느리면 같은 요청을 한 번 더 보내 먼저 끝난 결과 사용
+        return get_dependency("pinecone").call(search, hedge=True)
 
-# # 데이터 업서트 실행
-# pinecone_client.upsert_data(data)
 
-# # 쿼리 실행
-# query = "Tell me about the tech company known as Apple."
-# results = pinecone_client.query(query)
-# print("검색 결과:")
-# print(results)
+# 참고 문서(backend/data)를 인덱스에 적재하거나 갱신할 때는 backend.ingest 사용
+#   python -m backend.ingest --dry-run
+#   python -m backend.ingest
@@ -0,0 +1,160 @@
+"""
+느린 Streamlit 재실행 프로파일링
+- 페이지 재실행 전체를 cProfile로 감싸고, 실행 시간이 기준(threshold)을 넘은 경우에만 .prof 파일로 저장
+- 프로파일마다 페이지, 사용자, 채팅 세션, 면접 턴 수를 담은 .json 메타데이터를 함께 저장하고 최근 keep개만 유지
+- 같은 스레드에서 이미 프로파일링 중이면(fragment가 전체 실행 중에 호출된 경우 등) 바깥 프로파일에 포함
+- CLI로 저장된 프로파일들의 누적 시간(cumulative) 상위 함수를 요약
+
+실행 예시:
+    python -m backend.profiling --dir profiles --top 30 --page chat
+"""
+
+import argparse
+import cProfile
+import glob
+import json
+import os
+import pstats
+import threading
+import time
+from datetime import datetime
+
+import streamlit as st
+
+_local = threading.local()
+
+
+class profile_rerun:
+    """with 블록(페이지 재실행 1회)을 프로파일링하고 느린 경우에만 저장"""
+
+    def __init__(self, page, config):
+        self.page = page
+        self.config = config
+        self._profiler = None
+
+    def __enter__(self):
+        if not self.config.get("enabled", False) or getattr(_local, "active", False):
+            return self
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return self  # 다른 프로파일러가 이미 실행 중
+        _local.active = True
+        self._profiler = profiler
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._profiler is None:
+            return False
+        # st.rerun()/st.stop()도 예외로 빠져나오므로 예외 여부와 관계없이 기록
+        self._profiler.disable()
+        _local.active = False
+        elapsed = time.perf_counter() - self._start
+        if elapsed >= self.config.get("threshold", 1.0):
+            try:
+                save_profile(self._profiler, self.page, elapsed, self.config, _session_metadata())
+            except Exception as e:
+                print(f"Error saving profile: {e}")
+        return False
+
+
+def _session_metadata():
+    messages = st.session_state.get("messages", [])
+    return {
+        "user": st.session_state.get("user"),
+        "session_id": st.session_state.get("session_id"),
+        "turn": sum(1 for msg in messages if msg.get("role") == "user"),
+        "messages": len(messages),
+    }
+
+
+def save_profile(profiler, page, elapsed, config, metadata=None):
+    """프로파일과 메타데이터를 저장하고 오래된 프로파일 정리"""
+    directory = config.get("dir", "profiles")
+    os.makedirs(directory, exist_ok=True)
+    now = datetime.now()
+    base = os.path.join(
+        directory, f"{now.strftime('%Y%m%d-%H%M%S-%f')}_{page}_{int(elapsed * 1000)}ms"
+    )
+    profiler.dump_stats(base + ".prof")
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(
+            {"page": page, "elapsed": elapsed, "captured_at": now.isoformat(), **(metadata or {})},
+            f,
+            ensure_ascii=False,
+        )
+    prune_profiles(directory, config.get("keep", 20))
+    return base + ".prof"
+
+
+def prune_profiles(directory, keep):
+    """최근 keep개만 남기고 삭제 (파일 이름이 시각 순서)"""
+    for path in sorted(glob.glob(os.path.join(directory, "*.prof")))[:-keep or None]:
+        for file in (path, path[: -len(".prof")] + ".json"):
+            if os.path.exists(file):
+                os.remove(file)
+
+
+def list_profiles(directory, page=None) -> list:
+    """저장된 프로파일 목록 (메타데이터 포함, 오래된 순서)"""
+    profiles = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.prof"))):
+        meta_path = path[: -len(".prof")] + ".json"
+        metadata = {}
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                metadata = json.load(f)
+        if page is None or metadata.get("page") == page:
+            profiles.append({"path": path, **metadata})
+    return profiles
+
+
+def summarize_profiles(paths, top=20) -> list:
+    """여러 프로파일을 합쳐 누적 시간 상위 함수 반환"""
+    if not paths:
+        return []
+    stats = pstats.Stats(*paths)
+    rows = []
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append(
+            {
+                "function": f"{os.path.basename(filename)}:{line}({name})" if line else name,
+                "ncalls": ncalls,
+                "tottime": tottime,
+                "cumtime": cumtime,
+            }
+        )
+    rows.sort(key=lambda row: row["cumtime"], reverse=True)
+    return rows[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="느린 재실행 프로파일 요약")
+    parser.add_argument("--dir", default="profiles", help="프로파일 저장 디렉터리")
+    parser.add_argument("--page", help="특정 페이지만 요약 (chat, chat.fragment, history)")
+    parser.add_argument("--top", type=int, default=30, help="출력할 함수 수")
+    args = parser.parse_args(argv)
+
+    profiles = list_profiles(args.dir, args.page)
+    if not profiles:
+        print("저장된 프로파일이 없습니다.")
+        return
+
+    print(f"프로파일 {len(profiles)}개")
+    for profile in profiles:
+        print(
+            f"  {profile.get('captured_at', '-')}  {profile.get('page', '-'):<14} "
+            f"{profile.get('elapsed', 0) * 1000:8.0f}ms  user={profile.get('user')} "
+            f"session={profile.get('session_id')} turn={profile.get('turn')}"
+        )
+
+    print(f"\n누적 시간 상위 {args.top}개 함수 (전체 프로파일 합계)")
+    print(f"{'cumtime':>10} {'tottime':>10} {'ncalls':>8}  function")
+    for row in summarize_profiles([profile["path"] for profile in profiles], args.top):
+        print(f"{row['cumtime']:10.3f} {row['tottime']:10.3f} {row['ncalls']:8d}  {row['function']}")
+
+
+if __name__ == "__main__":
+    main()
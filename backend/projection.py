@@ -0,0 +1,169 @@
+"""
+저장 벡터 차원 축소 (투영)
+- 검색 비용(Pinecone 저장 용량, 질의 지연 시간)은 벡터 차원에 비례하므로 전체 차원(ada-002는 1536) 대신
+  코퍼스에 맞춘 선형 투영으로 줄인 벡터를 저장하고 검색
+  - pca: 코퍼스 벡터의 주성분 (같은 차원이면 재현율이 가장 높음)
+  - random: 가우시안 랜덤 투영 (코퍼스 분포와 무관, 적은 표본으로도 학습 가능)
+- scikit-learn으로 학습하고 components/mean을 .npz로 저장 (적용할 때는 numpy만 사용)
+- 질문과 문서에 같은 투영을 적용해야 하므로 레지스트리(embedding_indexes.projection)에 인덱스별로 파일 경로를 기록하고
+  create_embeddings가 ProjectedEmbeddings로 감싸서 retriever/적재/재임베딩 경로가 모두 같은 투영을 사용
+  (PineconeWrapper는 projection 인자로 지정)
+- 목표 차원은 benchmarks.projection_bench의 차원별 recall@k/지연 시간 보고서를 보고 선택
+
+실행 예시:
+    # 검색 중인 인덱스에 저장된 벡터(최대 20000개)로 256차원 PCA 학습
+    python -m backend.projection fit --dimension 256 --output backend/data/projections/ada-256.npz
+    # 축소 인덱스 등록 후 채우고 전환 (backend.reembed)
+    python -m backend.reembed register --index interview-ada-256 --model text-embedding-ada-002 \\
+        --projection backend/data/projections/ada-256.npz --create
+    python -m backend.reembed copy --target interview-ada-256
+    python -m backend.reembed activate --index interview-ada-256
+"""
+
+import argparse
+import functools
+import sys
+import time
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+METHODS = ("pca", "random")
+
+
+class Projection:
+    """y = normalize((x - mean) @ components.T) (components: 출력 차원 x 입력 차원)"""
+
+    def __init__(self, components, mean=None, method="pca"):
+        self.components = np.asarray(components, dtype=np.float32)
+        self.mean = (
+            np.zeros(self.components.shape[1], dtype=np.float32) if mean is None else np.asarray(mean, dtype=np.float32)
+        )
+        self.method = method
+
+    @property
+    def input_dimension(self):
+        return self.components.shape[1]
+
+    @property
+    def output_dimension(self):
+        return self.components.shape[0]
+
+    def transform(self, vectors):
+        """벡터(행) 목록을 투영하고 cosine 검색용으로 길이를 1로 맞춤"""
+        projected = (np.asarray(vectors, dtype=np.float32) - self.mean) @ self.components.T
+        norms = np.linalg.norm(projected, axis=1, keepdims=True)
+        return projected / np.where(norms == 0, 1, norms)
+
+    def save(self, path):
+        """.npz로 저장하고 실제 경로 반환 (확장자가 없으면 .npz를 붙임, 레지스트리에는 이 경로를 등록)"""
+        path = str(path)
+        if not path.endswith(".npz"):
+            path += ".npz"
+        np.savez(path, components=self.components, mean=self.mean, method=np.array(self.method))
+        return path
+
+
+@functools.lru_cache(maxsize=None)
+def load_projection(path):
+    """저장한 투영 읽기 (경로마다 프로세스당 한 번)"""
+    with np.load(path) as data:
+        return Projection(data["components"], data["mean"], str(data["method"]))
+
+
+def fit_projection(vectors, dimension, method="pca", seed=0):
+    """
+    코퍼스 벡터로 투영 학습 (scikit-learn)
+    :param vectors: (개수, 입력 차원) 배열
+    :param dimension: 목표 차원
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if method == "pca":
+        from sklearn.decomposition import PCA
+
+        pca = PCA(n_components=dimension, random_state=seed).fit(vectors)
+        return Projection(pca.components_, pca.mean_, method)
+    if method == "random":
+        from sklearn.random_projection import GaussianRandomProjection
+
+        projection = GaussianRandomProjection(n_components=dimension, random_state=seed).fit(vectors)
+        return Projection(projection.components_, None, method)
+    raise ValueError(f"Unknown projection method: {method}")
+
+
+class ProjectedEmbeddings(Embeddings):
+    """임베딩 결과에 투영을 적용 (질문/문서 모두 같은 투영)"""
+
+    def __init__(self, embeddings, projection):
+        self.embeddings = embeddings
+        self.projection = projection
+
+    @property
+    def dimension(self):
+        return self.projection.output_dimension
+
+    def embed_documents(self, texts):
+        return self.projection.transform(self.embeddings.embed_documents(texts)).tolist()
+
+    def embed_query(self, text):
+        return self.projection.transform([self.embeddings.embed_query(text)])[0].tolist()
+
+
+def sample_vectors(index, namespace, limit):
+    """인덱스에 저장된 벡터를 최대 limit개 읽어 (개수, 차원) 배열로 반환"""
+    from backend.reembed import fetch_pages
+
+    rows = []
+    for vectors in fetch_pages(index, namespace):
+        rows.extend(vector.values for vector in vectors.values() if vector.values)
+        if len(rows) >= limit:
+            break
+    return np.asarray(rows[:limit], dtype=np.float32)
+
+
+def _fit(args, config):
+    from backend.db import get_embedding_index
+
+    source = get_embedding_index(args.source) if args.source else config.retriever.record
+    if source is None:
+        sys.exit(f"❌ 등록되지 않은 인덱스입니다: {args.source}")
+    if source.get("projection"):
+        sys.exit(f"❌ 이미 축소한 인덱스입니다. 전체 차원 인덱스로 학습하세요: {source['index_name']}")
+
+    vectors = sample_vectors(config.pc.Index(source["index_name"]), source["namespace"], args.sample)
+    if len(vectors) == 0:
+        sys.exit(f"❌ {source['index_name']}에서 벡터를 읽지 못했습니다.")
+    input_dimension = vectors.shape[1]
+    if not 0 < args.dimension < input_dimension:
+        sys.exit(f"❌ 목표 차원은 1 이상 {input_dimension}(원래 차원) 미만이어야 합니다: {args.dimension}")
+    if len(vectors) < args.dimension and args.method == "pca":
+        sys.exit(f"❌ PCA에는 목표 차원({args.dimension})보다 많은 벡터가 필요합니다 (읽은 벡터 {len(vectors)}개).")
+    start = time.perf_counter()
+    projection = fit_projection(vectors, args.dimension, args.method, args.seed)
+    path = projection.save(args.output)
+    print(
+        f"✅ {source['index_name']} 벡터 {len(vectors)}개로 {args.method} 학습: "
+        f"{projection.input_dimension} → {projection.output_dimension}차원 ({time.perf_counter() - start:.1f}s, {path})"
+    )
+
+
+def main(argv=None):
+    from backend import config
+
+    parser = argparse.ArgumentParser(description="저장 벡터 차원 축소 (투영)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fit = commands.add_parser("fit", help="인덱스에 저장된 벡터로 투영 학습")
+    fit.add_argument("--source", help="학습에 사용할 등록된 인덱스 (기본값: 검색 중인 인덱스)")
+    fit.add_argument("--dimension", type=int, required=True, help="목표 차원")
+    fit.add_argument("--method", choices=METHODS, default="pca", help="투영 방식")
+    fit.add_argument("--sample", type=int, default=20000, help="학습에 사용할 최대 벡터 수")
+    fit.add_argument("--seed", type=int, default=0, help="난수 시드")
+    fit.add_argument("--output", required=True, help="저장할 .npz 경로 (확장자가 없으면 붙임)")
+    args = parser.parse_args(argv)
+
+    _fit(args, config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+사용자 일괄 등록 CLI
+- CSV(username, password 컬럼)를 batch 단위로 읽어 비밀번호를 모든 CPU 코어에서 병렬 해싱
+- 스테이징 테이블 COPY + 한 번의 upsert로 등록 (탈퇴한 사용자는 재활성화)
+- 행별 결과(created, reactivated, exists, duplicate, invalid, error)를 CSV 리포트로 저장
+
+실행 예시:
+    python -m backend.provision_users cohort.csv --report cohort_result.csv --batch-size 1000
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import Counter
+from itertools import islice
+
+from backend.accounts import bulk_register_users
+from backend.config import PASSWORD_HASH_CONFIG
+from backend.passwords import PasswordHasher
+
+
+def read_users(path):
+    """CSV에서 (행 번호, 아이디, 비밀번호)를 하나씩 반환"""
+    with open(path, encoding="utf-8", newline="") as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):  # 1행은 헤더
+            yield line_no, (row.get("username") or "").strip(), row.get("password") or ""
+
+
+def provision_users(users, batch_size=1000, hasher=None):
+    """batch 단위로 등록하며 행별 결과를 순서대로 반환"""
+    users = iter(users)
+    while batch := list(islice(users, batch_size)):
+        yield from bulk_register_users(batch, hasher=hasher)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="사용자 일괄 등록")
+    parser.add_argument("input", help="username, password 컬럼이 있는 CSV 파일")
+    parser.add_argument("--report", help="행별 결과 CSV 파일 (기본값: 표준 출력)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="한 번에 COPY 할 사용자 수")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="해싱 프로세스 수")
+    args = parser.parse_args(argv)
+
+    hasher = PasswordHasher(rounds=PASSWORD_HASH_CONFIG["rounds"], workers=args.workers)
+    report = open(args.report, "w", encoding="utf-8", newline="") if args.report else sys.stdout
+    counts = Counter()
+    start = time.perf_counter()
+    try:
+        writer = csv.DictWriter(report, fieldnames=["line_no", "username", "status"])
+        writer.writeheader()
+        for result in provision_users(read_users(args.input), args.batch_size, hasher):
+            writer.writerow(result)
+            counts[result["status"]] += 1
+    finally:
+        hasher.shutdown()
+        if report is not sys.stdout:
+            report.close()
+
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    summary = ", ".join(f"{status} {count}" for status, count in sorted(counts.items()))
+    print(
+        f"✅ {total}명 처리 ({summary}), {elapsed:.1f}s, {total / elapsed if elapsed else 0:.1f} users/s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
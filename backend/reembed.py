@@ -0,0 +1,241 @@
+"""
+임베딩 모델 교체 (재임베딩 마이그레이션)
+- register: 새 인덱스의 모델/차원/접두어를 레지스트리(embedding_indexes)에 등록 (--create면 Pinecone 인덱스도 생성)
+- copy: 검색 중인 인덱스의 벡터를 id 페이지 단위로 읽어 본문(metadata "text")을 새 모델로 다시 임베딩하고
+  같은 id/metadata로 새 인덱스에 업서트 (전체를 메모리에 올리지 않음, batch 단위 임베딩)
+  - 새 인덱스에 이미 있는 id는 건너뛰므로 중단된 뒤 다시 실행하면 남은 부분만 처리
+  - 원본에 없는 id는 새 인덱스에서 삭제하므로, 전환 직전에 한 번 더 실행하면 그 사이 바뀐 부분만 반영
+  - id가 내용 해시가 아닌 벡터(backend.ingest 외에서 업서트)의 내용이 바뀌었으면 --overwrite로 전체를 다시 임베딩
+  - 축소 인덱스(--projection)는 본문을 원래 모델로 임베딩한 뒤 투영하여 저장 (backend.projection)
+- activate: 모델/차원을 확인한 뒤 검색 인덱스를 바꿈
+  - 실행 중인 프로세스는 REGISTRY_REFRESH초 안에 새 인덱스로 검색 (재시작 불필요, 두 인덱스 모두 유지되므로 검색이 끊기지 않음)
+  - 이전 인덱스는 standby로 남으므로 activate로 바로 되돌릴 수 있음
+
+실행 예시:
+    python -m backend.reembed register --activate   # 현재 설정의 인덱스 등록 (처음 한 번)
+    python -m backend.reembed register --index interview-e5-small --model intfloat/multilingual-e5-small --create
+    python -m backend.reembed copy --target interview-e5-small
+    python -m backend.reembed copy --target interview-e5-small   # 전환 직전 바뀐 부분만 반영
+    python -m backend.reembed activate --index interview-e5-small
+    python -m backend.reembed list
+    # 차원 축소: backend.projection fit으로 만든 투영 파일을 지정 (차원은 투영 출력 차원)
+    python -m backend.reembed register --index interview-ada-256 --model text-embedding-ada-002 \\
+        --projection backend/data/projections/ada-256.npz --create
+"""
+
+import argparse
+import sys
+import time
+
+from backend.db import activate_embedding_index, get_embedding_index, list_embedding_indexes, register_embedding_index
+from backend.embedding_registry import EmbeddingMismatch
+from backend.embeddings import MODELS
+from backend.ingest import open_store
+from backend.projection import load_projection
+from backend.resilience import get_dependency
+
+PAGE_SIZE = 100  # Pinecone list/fetch 한 번에 읽을 id 수
+
+
+def fetch_pages(index, namespace, page_size=PAGE_SIZE):
+    """인덱스의 벡터(values, metadata 포함)를 {id: vector} 페이지 단위로 반환"""
+    for ids in index.list(namespace=namespace, limit=page_size):
+        yield get_dependency("pinecone").call(lambda: index.fetch(ids=ids, namespace=namespace)).vectors
+
+
+def iter_vectors(index, namespace, page_size=PAGE_SIZE):
+    """인덱스의 벡터를 [(id, metadata), ...] 페이지 단위로 반환"""
+    for vectors in fetch_pages(index, namespace, page_size):
+        yield [(vector_id, dict(vector.metadata or {})) for vector_id, vector in vectors.items()]
+
+
+def vector_count(index, namespace):
+    """네임스페이스의 벡터 수 (조회 실패 시 None)"""
+    try:
+        stats = get_dependency("pinecone").call(index.describe_index_stats)
+    except Exception as e:
+        print(f"Error describing index stats: {e}")
+        return None
+    summary = stats.namespaces.get(namespace)
+    return summary.vector_count if summary else 0
+
+
+def copy_vectors(source_index, source_namespace, target, batch_size=100, overwrite=False):
+    """
+    원본 벡터의 본문을 target(backend.ingest.PineconeStore)의 모델로 다시 임베딩하여 같은 id로 업서트하고,
+    원본에 없는 target 벡터는 삭제
+    :param overwrite: True면 target에 이미 있는 id도 다시 임베딩
+    :return: {"read", "upserted", "skipped", "missing_text", "deleted"}
+    """
+    existing = set(target.list_ids())
+    skip = set() if overwrite else existing
+    seen = set()
+    stats = dict.fromkeys(("read", "upserted", "skipped", "missing_text", "deleted"), 0)
+    pending = []
+
+    def flush():
+        target.upsert(pending)
+        stats["upserted"] += len(pending)
+        pending.clear()
+
+    for page in iter_vectors(source_index, source_namespace):
+        for vector_id, metadata in page:
+            stats["read"] += 1
+            seen.add(vector_id)
+            if not metadata.get("text"):
+                stats["missing_text"] += 1
+            elif vector_id in skip:
+                stats["skipped"] += 1
+            else:
+                pending.append((vector_id, metadata))
+                if len(pending) >= batch_size:
+                    flush()
+    if pending:
+        flush()
+
+    stale = sorted(existing - seen)
+    if stale:
+        target.delete(stale)
+    stats["deleted"] = len(stale)
+    return stats
+
+
+# 명령
+def _record(name):
+    record = get_embedding_index(name)
+    if record is None:
+        sys.exit(f"❌ 등록되지 않은 인덱스입니다: {name} (먼저 register)")
+    return record
+
+
+def _register(args, config):
+    model = args.model or (config.DEFAULT_INDEX["model"] if args.index == config.INDEX_NAME else None)
+    if model is None:
+        sys.exit("❌ 새 인덱스는 --model을 지정하세요.")
+    spec = MODELS.get(model, {})
+    projection = args.projection if args.projection is not None else (
+        config.DEFAULT_INDEX["projection"] if args.index == config.INDEX_NAME and args.model is None else ""
+    )
+    model_dimension = args.dimension or spec.get("dimension")
+    if model_dimension is None:
+        sys.exit(f"❌ 알 수 없는 모델이므로 --dimension을 지정하세요: {model}")
+    if args.dimension and spec.get("dimension") not in (None, args.dimension):
+        sys.exit(f"❌ {model}의 출력 차원은 {spec['dimension']}입니다.")
+    dimension = model_dimension
+    if projection:
+        try:
+            reduced = load_projection(projection)
+        except OSError as e:
+            sys.exit(f"❌ 투영 파일을 읽지 못했습니다: {e}")
+        if reduced.input_dimension != model_dimension:
+            sys.exit(f"❌ 투영 입력 차원 {reduced.input_dimension}이 {model}의 출력 차원 {model_dimension}과 다릅니다.")
+        dimension = reduced.output_dimension
+    if args.index == config.INDEX_NAME and args.model is None:
+        query_prefix, document_prefix = config.DEFAULT_INDEX["query_prefix"], config.DEFAULT_INDEX["document_prefix"]
+    else:
+        query_prefix = args.query_prefix if args.query_prefix is not None else spec.get("query_prefix", "")
+        document_prefix = args.document_prefix if args.document_prefix is not None else spec.get("document_prefix", "")
+
+    if args.create:
+        from pinecone import ServerlessSpec
+
+        config.pc.create_index(
+            name=args.index, dimension=dimension, metric="cosine", spec=ServerlessSpec(cloud="aws", region="us-east-1")
+        )
+        print(f"✅ Pinecone 인덱스 생성: {args.index} ({dimension}차원)")
+    registered = register_embedding_index(
+        args.index, args.namespace, model, dimension, query_prefix, document_prefix, projection
+    )
+    if not registered:
+        sys.exit(f"❌ 등록하지 못했습니다 (검색 중인 인덱스는 바꿀 수 없습니다): {args.index}")
+    reduced_from = f", {model_dimension}차원에서 축소" if projection else ""
+    print(f"✅ 등록: {args.index} ({model}, {dimension}차원{reduced_from}, namespace={args.namespace})")
+    if args.activate:
+        _activate(args.index, config, force=True)
+
+
+def _copy(args, config):
+    source = _record(args.source) if args.source else config.retriever.record
+    target = _record(args.target)
+    if source["index_name"] == target["index_name"]:
+        sys.exit("❌ 원본과 대상 인덱스가 같습니다.")
+    try:
+        store = open_store(config.pc, target, config.EMBEDDING_CONFIG, config.get_openai_key())
+    except EmbeddingMismatch as e:
+        sys.exit(f"❌ {e}")
+
+    start = time.perf_counter()
+    stats = copy_vectors(config.pc.Index(source["index_name"]), source["namespace"], store, args.batch_size, args.overwrite)
+    print(
+        f"✅ {source['index_name']} → {target['index_name']}: 읽음 {stats['read']}, 임베딩 {stats['upserted']}, "
+        f"유지 {stats['skipped']}, 삭제 {stats['deleted']}, 본문 없음 {stats['missing_text']} "
+        f"({time.perf_counter() - start:.1f}s)"
+    )
+
+
+def _activate(name, config, force=False):
+    record = _record(name)
+    try:
+        store = open_store(config.pc, record, config.EMBEDDING_CONFIG, config.get_openai_key())
+    except EmbeddingMismatch as e:
+        sys.exit(f"❌ {e}")
+    count = vector_count(store.index, record["namespace"])
+    if not count and not force:
+        sys.exit(f"❌ {name}에 벡터가 없습니다. copy 후 다시 실행하거나 --force를 지정하세요.")
+    if not activate_embedding_index(name):
+        sys.exit(f"❌ 전환하지 못했습니다: {name}")
+    print(f"✅ 검색 인덱스 전환: {name} (벡터 {count if count is not None else '?'}개, "
+          f"실행 중인 프로세스는 {config.EMBEDDING_CONFIG['registry_refresh']}초 안에 반영)")
+
+
+def _list():
+    for row in list_embedding_indexes():
+        print(
+            f"{row['status']:8} {row['index_name']:30} {row['model']:50} {row['dimension']:>5} "
+            f"namespace={row['namespace']} projection={row['projection'] or '-'} "
+            f"activated_at={row['activated_at'] or '-'}"
+        )
+
+
+def main(argv=None):
+    from backend import config
+
+    parser = argparse.ArgumentParser(description="임베딩 모델 교체 (재임베딩 마이그레이션)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    register = commands.add_parser("register", help="인덱스의 임베딩 모델/차원 등록")
+    register.add_argument("--index", default=config.INDEX_NAME, help="인덱스 이름 (기본값: 설정의 인덱스)")
+    register.add_argument("--namespace", default=config.PINECONE_NAMESPACE, help="네임스페이스")
+    register.add_argument("--model", help="임베딩 모델 (설정의 인덱스는 기본값: 설정의 모델)")
+    register.add_argument("--dimension", type=int, help="모델 출력 차원 (알려진 모델은 자동)")
+    register.add_argument("--query-prefix", help="질문 접두어 (기본값: 모델 규칙)")
+    register.add_argument("--document-prefix", help="문서 접두어 (기본값: 모델 규칙)")
+    register.add_argument("--projection", help="차원 축소 투영 파일 (backend.projection fit, 기본값: 축소하지 않음)")
+    register.add_argument("--create", action="store_true", help="Pinecone 인덱스도 생성 (serverless, cosine)")
+    register.add_argument("--activate", action="store_true", help="등록 후 바로 검색 인덱스로 사용")
+
+    copy = commands.add_parser("copy", help="원본 인덱스의 본문을 대상 모델로 다시 임베딩하여 채움")
+    copy.add_argument("--source", help="원본 인덱스 (기본값: 검색 중인 인덱스)")
+    copy.add_argument("--target", required=True, help="채울 등록된 인덱스")
+    copy.add_argument("--batch-size", type=int, default=config.INGEST_CONFIG["batch_size"], help="한 번에 임베딩할 벡터 수")
+    copy.add_argument("--overwrite", action="store_true", help="대상에 이미 있는 id도 다시 임베딩")
+
+    activate = commands.add_parser("activate", help="검색 인덱스 전환 (되돌릴 때도 사용)")
+    activate.add_argument("--index", required=True, help="검색에 사용할 등록된 인덱스")
+    activate.add_argument("--force", action="store_true", help="벡터가 없어도 전환")
+
+    commands.add_parser("list", help="등록된 인덱스 목록")
+    args = parser.parse_args(argv)
+
+    if args.command == "register":
+        _register(args, config)
+    elif args.command == "copy":
+        _copy(args, config)
+    elif args.command == "activate":
+        _activate(args.index, config, args.force)
+    else:
+        _list()
+
+
+if __name__ == "__main__":
+    main()
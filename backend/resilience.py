@@ -0,0 +1,307 @@
+"""
+외부 의존성(OpenAI, Pinecone, PostgreSQL) 호출 보호
+- 작업별 deadline: 별도 스레드에서 실행하고 시간이 지나면 호출한 스레드는 DeadlineExceeded로 바로 반환
+  (늦은 호출은 작업 스레드에서 끝까지 실행되지만 스크립트 스레드를 붙잡지 않음)
+- 재시도: 지수 백오프 + full jitter, 남은 deadline 안에서만 재시도
+- 서킷 브레이커: 연속 실패가 기준을 넘으면 reset_timeout 동안 호출 없이 바로 실패(CircuitOpen),
+  이후 한 번 시험 호출(half-open)하여 성공하면 다시 닫힘
+- fallback: 실패/차단 시 대체 결과(캐시된 후보 문서, 준비된 질문 등) 반환
+- hedge: 멱등 조회가 hedge_after초 안에 끝나지 않으면 같은 요청을 한 번 더 보내 먼저 끝난 결과 사용
+- 브레이커 상태와 의존성별 지연 시간(p50/p95/p99)은 snapshot()과 /metrics로 확인
+
+설정 예시 (.streamlit/secrets.toml):
+    [resilience.pinecone]
+    TIMEOUT = 3.0
+    HEDGE_AFTER = 0.5
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+
+from backend import metrics
+
+
+class DeadlineExceeded(TimeoutError):
+    """deadline 안에 호출이 끝나지 않음"""
+
+
+class CircuitOpen(RuntimeError):
+    """서킷 브레이커가 열려 있어 호출하지 않음"""
+
+
+# 서킷 브레이커
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        :param failure_threshold: 연속 실패가 이 횟수에 도달하면 열림
+        :param reset_timeout: 열린 뒤 시험 호출을 허용하기까지의 시간 (초)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opened_count = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """호출 가능 여부 (half-open에서는 시험 호출 하나만 허용)"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release(self):
+        """실패로 세지 않는 오류로 끝난 시험 호출 반납 (다음 호출이 다시 시험할 수 있도록)"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened_count += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probing = False
+
+
+# 재시도 대기 시간 (지수 백오프 + full jitter)
+def backoff_delay(attempt, base=0.2, cap=5.0, rng=random):
+    """attempt번째 재시도 전 대기 시간: 0 ~ min(cap, base * 2^attempt) 사이 임의 값"""
+    return rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="resilience")
+
+
+def _submit(fn):
+    # 트레이스/지표/세션 컨텍스트가 이어지도록 현재 context를 복사하여 실행
+    return _executor.submit(copy_context().run, fn)
+
+
+def _remaining(deadline):
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+class Dependency:
+    """외부 의존성 하나의 호출 정책 (deadline, 재시도, 서킷 브레이커, hedge)"""
+
+    def __init__(
+        self,
+        name,
+        timeout=None,
+        attempts=1,
+        backoff_base=0.2,
+        backoff_cap=5.0,
+        failure_threshold=5,
+        reset_timeout=30.0,
+        hedge_after=None,
+        is_failure=None,
+        window=1000,
+    ):
+        """
+        :param timeout: 재시도를 포함한 호출 전체 deadline (초, None이면 제한 없음)
+        :param attempts: 최대 시도 횟수 (1이면 재시도 없음)
+        :param hedge_after: hedge=True인 호출에서 두 번째 요청을 보내기까지 기다리는 시간 (초)
+        :param is_failure: 예외를 받아 브레이커 실패로 셀지 결정 (기본값: 모든 예외)
+                           예: 연결 풀 고갈은 재시도하되 DB 장애로 세지 않음
+        :param window: 지연 시간 백분위 계산에 사용할 최근 호출 수
+        """
+        self.name = name
+        self.timeout = timeout
+        self.attempts = max(1, attempts)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.hedge_after = hedge_after
+        self.is_failure = is_failure or (lambda error: True)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.outcomes = {}  # ok, error, timeout, short_circuit, fallback -> 횟수
+        self.retries = 0
+        self.hedges = 0
+
+    def call(self, fn, fallback=None, hedge=False, retry=True):
+        """
+        fn()을 정책에 따라 실행
+        :param fallback: 실패하거나 브레이커가 열려 있을 때 fallback(error)의 결과를 대신 반환
+        :param hedge: 멱등 조회만 True로 지정
+        :param retry: False면 한 번만 시도 (응답 일부를 이미 전달하는 스트리밍 등)
+        """
+        start = time.perf_counter()
+        if not self.breaker.allow():
+            error = CircuitOpen(f"{self.name} circuit is open")
+            return self._fail(error, "short_circuit", start, fallback)
+
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        attempts = self.attempts if retry else 1
+        for attempt in range(attempts):
+            try:
+                result = self._run(fn, deadline, hedge)
+            except Exception as error:
+                if self.is_failure(error):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.release()
+                timed_out = isinstance(error, DeadlineExceeded)
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                remaining = _remaining(deadline)
+                if (
+                    timed_out
+                    or attempt + 1 >= attempts
+                    or (remaining is not None and remaining <= delay)
+                    or not self.breaker.allow()
+                ):
+                    return self._fail(error, "timeout" if timed_out else "error", start, fallback)
+                with self._lock:
+                    self.retries += 1
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            self._observe("ok", start)
+            return result
+
+    def _run(self, fn, deadline, hedge):
+        """한 번 시도 (deadline이나 hedge가 없으면 현재 스레드에서 바로 실행)"""
+        hedge_after = self.hedge_after if hedge else None
+        if deadline is None and hedge_after is None:
+            return fn()
+
+        pending = {_submit(fn)}
+        if hedge_after is not None:
+            remaining = _remaining(deadline)
+            done, _ = wait(pending, timeout=hedge_after if remaining is None else min(hedge_after, remaining))
+            if not done:
+                pending.add(_submit(fn))
+                with self._lock:
+                    self.hedges += 1
+
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=_remaining(deadline), return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded(f"{self.name} call exceeded {self.timeout}s")
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _fail(self, error, outcome, start, fallback):
+        if fallback is None:
+            self._observe(outcome, start)
+            raise error
+        print(f"{self.name} unavailable ({type(error).__name__}: {error}), using fallback")
+        result = fallback(error)
+        self._observe("fallback", start)
+        return result
+
+    def _observe(self, outcome, start):
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            if outcome == "ok":
+                self._latencies.append(elapsed)
+        if metrics.is_enabled():
+            metrics.REGISTRY.observe("dependency", self.name, outcome, elapsed)
+
+    def stats(self) -> dict:
+        """브레이커 상태, 결과별 호출 수, 최근 성공 호출의 지연 시간 백분위"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            outcomes = dict(self.outcomes)
+            retries, hedges = self.retries, self.hedges
+
+        def percentile(q):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(len(latencies) * q))]
+
+        return {
+            "dependency": self.name,
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "opened": self.breaker.opened_count,
+            "calls": sum(outcomes.values()),
+            **{outcome: outcomes.get(outcome, 0) for outcome in ("ok", "error", "timeout", "short_circuit", "fallback")},
+            "retries": retries,
+            "hedges": hedges,
+            "p50_ms": _ms(percentile(0.5)),
+            "p95_ms": _ms(percentile(0.95)),
+            "p99_ms": _ms(percentile(0.99)),
+        }
+
+
+def _ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+# 의존성별 정책 (configure 전에도 기본 정책으로 사용 가능)
+_dependencies = {}
+_dependencies_lock = threading.Lock()
+
+
+def configure(config: dict):
+    """
+    의존성별 설정으로 정책 생성 (이미 만들어진 정책은 새 설정으로 교체)
+    :param config: {"openai": {"timeout": 60, "attempts": 2, ...}, "pinecone": {...}}
+    """
+    with _dependencies_lock:
+        _dependencies.clear()
+        for name, options in config.items():
+            _dependencies[name] = Dependency(name, **options)
+
+
+def get_dependency(name) -> Dependency:
+    with _dependencies_lock:
+        dependency = _dependencies.get(name)
+        if dependency is None:
+            dependency = _dependencies[name] = Dependency(name)
+    return dependency
+
+
+def snapshot() -> list:
+    """모든 의존성의 현재 상태 (관리자 페이지, /healthz용)"""
+    with _dependencies_lock:
+        dependencies = list(_dependencies.values())
+    return [dependency.stats() for dependency in dependencies]
+
+
+def _render_breakers():
+    """/metrics에 브레이커 상태 gauge 추가 (0: closed, 1: half-open, 2: open)"""
+    levels = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+    lines = [
+        "# HELP interview_circuit_breaker_state Circuit breaker state (0 closed, 1 half-open, 2 open).",
+        "# TYPE interview_circuit_breaker_state gauge",
+    ]
+    for row in snapshot():
+        lines.append(f'interview_circuit_breaker_state{{dependency="{row["dependency"]}"}} {levels[row["state"]]}')
+    return lines
+
+
+metrics.REGISTRY.add_collector(_render_breakers)
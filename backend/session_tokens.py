@@ -0,0 +1,242 @@
+"""
+로그인 세션 토큰
+- 로그인 시 임의의 토큰을 발급하여 브라우저 쿠키에 저장하고, 서버에는 토큰의 SHA-256 해시만 user_sessions 테이블에 저장
+- 새로고침/새 탭에서는 쿠키의 토큰으로 로그인 상태를 복원 (DB 조회 + bcrypt 검증 생략)
+- 검증 결과는 프로세스 내 캐시에 짧게 보관하고, 로그아웃/회원 탈퇴 시 토큰을 폐기
+"""
+
+import hashlib
+import json
+import secrets
+import threading
+import time
+
+import streamlit as st
+import streamlit.components.v1 as components
+from backend.db import get_connection, release_connection
+from backend.metrics import instrument, record_error
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+# 프로세스 내 토큰 검증 캐시
+class TokenCache:
+    def __init__(self, ttl=60, max_size=10000):
+        """
+        :param ttl: 캐시 유지 시간 (초). 다른 프로세스에서 폐기한 토큰은 최대 ttl 동안 유효하게 보일 수 있음
+        :param max_size: 최대 항목 수 (넘으면 가장 먼저 만료될 항목부터 제거)
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = {}  # token_hash -> (username, valid_until)
+        self._lock = threading.Lock()
+
+    def get(self, token_hash):
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is None:
+                return None
+            username, valid_until = entry
+            if time.monotonic() >= valid_until:
+                del self._entries[token_hash]
+                return None
+            return username
+
+    def set(self, token_hash, username, expires_in):
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                oldest = min(self._entries, key=lambda key: self._entries[key][1])
+                del self._entries[oldest]
+            self._entries[token_hash] = (username, time.monotonic() + min(self.ttl, expires_in))
+
+    def discard(self, token_hash):
+        with self._lock:
+            self._entries.pop(token_hash, None)
+
+    def discard_user(self, username):
+        with self._lock:
+            for token_hash in [key for key, entry in self._entries.items() if entry[0] == username]:
+                del self._entries[token_hash]
+
+
+_token_cache = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache(config: dict) -> TokenCache:
+    """설정값으로 공유 캐시를 한 번만 생성하여 반환"""
+    global _token_cache
+    with _token_cache_lock:
+        if _token_cache is None:
+            _token_cache = TokenCache(ttl=config.get("cache_ttl", 60))
+    return _token_cache
+
+
+# 세션 토큰 발급
+@instrument("db")
+def create_session_token(username: str, ttl: int) -> str:
+    """토큰을 발급하고 해시를 저장 (실패하면 None)"""
+    token = secrets.token_urlsafe(32)
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO user_sessions (token_hash, user_id, expires_at)
+                    SELECT %s, id, (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul') + make_interval(secs => %s)
+                    FROM users
+                    WHERE username = %s AND is_active = TRUE;
+                """,
+                    (hash_token(token), ttl, username),
+                )
+                conn.commit()
+                return token if cur.rowcount == 1 else None
+        except Exception as e:
+            print(f"Error creating session token: {e}")
+            record_error()
+            return None
+        finally:
+            release_connection(conn)
+    return None
+
+
+# 세션 토큰 검증
+@instrument("db")
+def validate_session_token(token: str, cache: TokenCache = None):
+    """유효한 토큰이면 사용자 이름 반환 (만료/폐기/탈퇴한 경우 None)"""
+    if not token:
+        return None
+    token_hash = hash_token(token)
+    if cache is not None:
+        username = cache.get(token_hash)
+        if username is not None:
+            return username
+
+    conn = get_connection()
+    row = None
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT u.username,
+                           EXTRACT(EPOCH FROM s.expires_at - (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul'))
+                    FROM user_sessions s
+                    JOIN users u ON s.user_id = u.id
+                    WHERE s.token_hash = %s
+                      AND s.revoked = FALSE
+                      AND u.is_active = TRUE
+                      AND s.expires_at > (CURRENT_TIMESTAMP AT TIME ZONE 'Asia/Seoul');
+                """,
+                    (token_hash,),
+                )
+                row = cur.fetchone()
+        except Exception as e:
+            print(f"Error validating session token: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+
+    if row is None:
+        return None
+    username, expires_in = row
+    if cache is not None:
+        cache.set(token_hash, username, float(expires_in))
+    return username
+
+
+# 세션 토큰 폐기
+@instrument("db")
+def revoke_session_token(token: str, cache: TokenCache = None):
+    """로그아웃 시 해당 토큰 폐기"""
+    token_hash = hash_token(token)
+    if cache is not None:
+        cache.discard(token_hash)
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE user_sessions SET revoked = TRUE WHERE token_hash = %s;",
+                    (token_hash,),
+                )
+                conn.commit()
+        except Exception as e:
+            print(f"Error revoking session token: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+
+
+@instrument("db")
+def revoke_user_sessions(username: str, cache: TokenCache = None):
+    """회원 탈퇴 시 사용자의 모든 토큰 폐기"""
+    if cache is not None:
+        cache.discard_user(username)
+    conn = get_connection()
+    if conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE user_sessions SET revoked = TRUE
+                    WHERE user_id = (SELECT id FROM users WHERE username = %s)
+                      AND revoked = FALSE;
+                """,
+                    (username,),
+                )
+                conn.commit()
+        except Exception as e:
+            print(f"Error revoking user sessions: {e}")
+            record_error()
+        finally:
+            release_connection(conn)
+
+
+# 브라우저 쿠키 저장소
+class CookieTokenStore:
+    """
+    토큰을 브라우저 쿠키에 보관
+    - 읽기: 페이지 로드 시 전달된 쿠키(st.context.cookies)
+    - 쓰기: Streamlit에는 서버에서 쿠키를 설정하는 API가 없으므로 다음 렌더링 때 스크립트로 설정
+      (스크립트로 설정하므로 HttpOnly는 불가, HTTPS에서만 전송되도록 Secure 지정)
+    """
+
+    PENDING_KEY = "_pending_cookie"
+
+    def __init__(self, name, max_age, secure=True):
+        """
+        :param secure: False면 Secure 없이 설정 (HTTP로 접속하는 로컬 개발 환경 전용)
+        """
+        self.name = name
+        self.max_age = max_age
+        self.secure = secure
+
+    def get(self):
+        pending = st.session_state.get(self.PENDING_KEY)
+        if pending is not None:
+            return pending["value"] or None
+        return st.context.cookies.get(self.name)
+
+    def set(self, token):
+        st.session_state[self.PENDING_KEY] = {"value": token, "max_age": self.max_age}
+
+    def clear(self):
+        st.session_state[self.PENDING_KEY] = {"value": "", "max_age": 0}
+
+    def flush(self):
+        """대기 중인 쿠키 변경을 브라우저에 반영 (매 페이지 렌더링 시 호출)"""
+        pending = st.session_state.pop(self.PENDING_KEY, None)
+        if pending is None:
+            return
+        cookie = (
+            f"{self.name}={pending['value']}; max-age={pending['max_age']}; path=/; SameSite=Strict"
+            + ("; Secure" if self.secure else "")
+        )
+        components.html(
+            f"<script>window.parent.document.cookie = {json.dumps(cookie)};</script>",
+            height=0,
+        )
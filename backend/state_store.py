@@ -0,0 +1,189 @@
+"""
+면접 상태 저장소
+- 면접 진행에 필요한 상태(STATE_KEYS)만 JSON으로 직렬화
+  (집합은 목록으로, message_ids는 messages에서 복원, LangGraph 앱 같은 프로세스 객체는 제외)
+- 저장할 때 마지막으로 읽은 버전을 함께 전달하고, 그 사이 다른 프로세스/탭이 먼저 저장했으면 VersionConflict
+  (낙관적 동시성 제어, 버전 0은 아직 저장되지 않은 상태)
+- memory: 프로세스 내 저장 (기본값), postgres: interview_states 테이블 (여러 프로세스/서버가 공유, 재시작 후에도 유지)
+- 끝내지 않고 떠난 면접이 쌓이지 않도록 ttl초 동안 저장되지 않은 상태는 삭제
+  (memory: 저장할 때 만료된 항목과 max_entries를 넘는 오래된 항목 삭제, postgres: sweep_interval초마다 만료된 행 삭제)
+
+설정 예시 (.streamlit/secrets.toml):
+    [state_store]
+    BACKEND = "postgres"
+    TTL = 86400
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+STATE_KEYS = (
+    "user",
+    "session_id",
+    "messages",
+    "used_prompts",
+    "used_questions",
+    "token_usage",
+    "context",
+    "generated_question",
+)
+SET_KEYS = ("used_prompts", "used_questions")
+
+
+class StateStoreError(Exception):
+    """상태 저장소 접근 실패"""
+
+
+class VersionConflict(StateStoreError):
+    """읽은 뒤 다른 곳에서 먼저 저장하여 버전이 맞지 않음"""
+
+
+# 직렬화
+def dump_state(state) -> str:
+    data = {key: state[key] for key in STATE_KEYS if key in state}
+    for key in SET_KEYS:
+        if key in data:
+            data[key] = sorted(data[key])
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_state(data) -> dict:
+    """dump_state 결과(문자열 또는 JSONB에서 읽은 dict)를 면접 상태로 복원"""
+    state = json.loads(data) if isinstance(data, str) else dict(data)
+    for key in SET_KEYS:
+        state[key] = set(state.get(key, ()))
+    state["message_ids"] = {msg["id"] for msg in state.get("messages", [])}
+    return state
+
+
+class MemoryStateStore:
+    """프로세스 내 저장소 (직렬화한 문자열을 보관하여 호출자의 상태 객체와 공유하지 않음)"""
+
+    def __init__(self, ttl=None, max_entries=None, clock=time.monotonic):
+        """
+        :param ttl: 마지막 저장 후 이 시간(초)이 지나면 삭제 (None이면 만료 없음)
+        :param max_entries: 보관할 최대 상태 수 (넘으면 가장 오래전에 저장된 상태부터 삭제, None이면 제한 없음)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (직렬화된 상태, 버전, 저장 시각), 저장 시각 순
+        self._lock = threading.Lock()
+
+    def _expired(self, entry, now):
+        return self.ttl is not None and now - entry[2] >= self.ttl
+
+    def load(self, key):
+        """(상태, 버전) 반환 (없거나 만료되었으면 (None, 0))"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, self._clock()):
+                del self._entries[key]
+                entry = None
+        if entry is None:
+            return None, 0
+        return load_state(entry[0]), entry[1]
+
+    def save(self, key, state, version) -> int:
+        """읽은 버전이 최신일 때만 저장하고 새 버전 반환"""
+        data = dump_state(state)
+        with self._lock:
+            now = self._clock()
+            self._sweep(now)
+            current = self._entries.get(key, (None, 0))[1]
+            if current != version:
+                raise VersionConflict(f"{key}: expected version {version}, found {current}")
+            self._entries[key] = (data, version + 1, now)
+            self._entries.move_to_end(key)
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return version + 1
+
+    def _sweep(self, now):
+        """만료된 상태 삭제 (저장 시각 순이므로 앞에서부터 만료되지 않은 항목까지만 확인)"""
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if not self._expired(entry, now):
+                break
+            del self._entries[key]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class PostgresStateStore:
+    """interview_states 테이블 저장소 (기존 연결 풀 사용)"""
+
+    def __init__(self, ttl=None, sweep_interval=600, clock=time.monotonic):
+        """
+        :param ttl: 마지막 저장 후 이 시간(초)이 지난 행을 삭제 (None이면 만료 없음)
+        :param sweep_interval: 만료된 행을 삭제하는 주기 (초, 저장할 때 확인)
+        """
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self._swept_at = None
+        self._sweep_lock = threading.Lock()
+
+    def _sweep(self):
+        if self.ttl is None:
+            return
+        with self._sweep_lock:
+            now = self._clock()
+            if self._swept_at is not None and now - self._swept_at < self.sweep_interval:
+                return
+            self._swept_at = now
+        from backend.db import purge_interview_states
+
+        purge_interview_states(self.ttl)
+
+    def load(self, key):
+        from backend.db import load_interview_state
+
+        row = load_interview_state(key)
+        if row is None:
+            return None, 0
+        return load_state(row["state"]), row["version"]
+
+    def save(self, key, state, version) -> int:
+        from backend.db import save_interview_state
+
+        self._sweep()
+        saved = save_interview_state(key, dump_state(state), version)
+        if saved is None:
+            raise StateStoreError(f"{key}: failed to save interview state")
+        if not saved:
+            raise VersionConflict(f"{key}: version {version} is no longer current")
+        return version + 1
+
+    def delete(self, key):
+        from backend.db import delete_interview_state
+
+        delete_interview_state(key)
+
+
+# 프로세스 전체에서 공유하는 저장소 인스턴스
+_state_store = None
+_state_store_lock = threading.Lock()
+
+
+def get_state_store(config: dict):
+    """설정의 backend(memory | postgres)로 공유 저장소를 한 번만 생성하여 반환"""
+    global _state_store
+    with _state_store_lock:
+        if _state_store is None:
+            backend = config.get("backend", "memory")
+            if backend == "memory":
+                _state_store = MemoryStateStore(config.get("ttl"), config.get("max_entries"))
+            elif backend == "postgres":
+                _state_store = PostgresStateStore(config.get("ttl"), config.get("sweep_interval", 600))
+            else:
+                raise ValueError(f"Unknown state store backend: {backend}")
+    return _state_store
@@ -0,0 +1,116 @@
+"""
+프롬프트 토큰 예산 관리
+- 대상 모델 기준 토큰 수 계산 (tiktoken 사용, 불가능하면 글자 수로 추정)
+- 검색된 문서(context)가 예산을 넘으면 질문과 관련 높은 문장만 추려서 압축
+- 면접 턴별 프롬프트/응답 토큰 사용량 기록 및 합계
+"""
+
+import re
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken이 없으면 글자 수 기반 추정 사용
+    tiktoken = None
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception as e:  # 알 수 없는 모델이거나 인코딩 파일을 내려받을 수 없는 경우
+        print(f"Token encoding unavailable for {model}, falling back to estimate: {e}")
+        return None
+
+
+# 토큰 수 계산
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """대상 모델 기준 토큰 수 (인코딩을 쓸 수 없으면 약 2자당 1토큰으로 추정)"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return (len(text) + 1) // 2
+    return len(encoding.encode(text))
+
+
+# 문장 단위 분리
+def split_sentences(text: str) -> list:
+    """마침표/물음표/느낌표/줄바꿈 기준으로 문장 분리"""
+    sentences = re.split(r"(?<=[.!?。])\s+|\n+", text)
+    return [sentence.strip() for sentence in sentences if sentence.strip()]
+
+
+def _bigrams(text):
+    # 한글은 띄어쓰기/조사 때문에 단어 일치가 약하므로 글자 bigram으로 비교
+    compact = re.sub(r"\s+", "", text.casefold())
+    return {compact[i:i + 2] for i in range(len(compact) - 1)}
+
+
+# 문서 압축
+def compress_context(context: str, question: str, budget: int, model: str = "gpt-4o-mini") -> str:
+    """
+    context가 토큰 예산을 넘으면 질문과 겹치는 정도가 높은 문장부터 골라 예산 안으로 압축
+    :param context: 검색된 문서 내용
+    :param question: 문장 점수 계산 기준 (질문 또는 검색 쿼리)
+    :param budget: 최대 토큰 수 (0 이하이면 압축하지 않음)
+    :return: 원래 문장 순서를 유지한 압축 결과
+    """
+    if not context or budget <= 0 or count_tokens(context, model) <= budget:
+        return context
+
+    sentences = split_sentences(context)
+    question_bigrams = _bigrams(question or "")
+
+    def score(index):
+        sentence_bigrams = _bigrams(sentences[index])
+        if not sentence_bigrams:
+            return 0.0
+        overlap = len(sentence_bigrams & question_bigrams) / len(sentence_bigrams)
+        return overlap - index * 1e-6  # 점수가 같으면 앞 문장 우선
+
+    selected = []
+    used = 0
+    for index in sorted(range(len(sentences)), key=score, reverse=True):
+        tokens = count_tokens(sentences[index], model)
+        if used + tokens > budget:
+            continue
+        selected.append(index)
+        used += tokens
+
+    if not selected:
+        # 한 문장도 예산 안에 들어가지 않으면 첫 문장을 잘라서 사용
+        encoding = _get_encoding(model)
+        if encoding is None:
+            return sentences[0][: budget * 2]
+        return encoding.decode(encoding.encode(sentences[0])[:budget])
+
+    return " ".join(sentences[index] for index in sorted(selected))
+
+
+# 토큰 사용량 기록
+def record_usage(usage_log: list, stage: str, response, cached=False) -> dict:
+    """LLM 응답의 usage_metadata를 턴별 사용량 목록에 추가"""
+    usage = getattr(response, "usage_metadata", None) or {}
+    entry = {
+        "stage": stage,
+        "prompt_tokens": usage.get("input_tokens", 0),
+        "completion_tokens": usage.get("output_tokens", 0),
+        "cached": cached,
+    }
+    usage_log.append(entry)
+    return entry
+
+
+def summarize_usage(usage_log: list) -> dict:
+    """면접 전체 토큰 사용량 합계"""
+    prompt_tokens = sum(entry["prompt_tokens"] for entry in usage_log)
+    completion_tokens = sum(entry["completion_tokens"] for entry in usage_log)
+    return {
+        "turns": len(usage_log),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
@@ -0,0 +1,245 @@
+"""
+면접 턴 단위 트레이싱
+- 면접 턴(답변 평가, 질문 생성, 면접 시작)마다 trace_id를 하나 발급하고, 단계별(DB, LangGraph 노드, 검색, LLM, 화면 출력)
+  하위 span을 기록
+- backend.metrics의 instrument/track으로 측정하는 호출은 트레이스가 진행 중이면 자동으로 하위 span이 됨
+- 턴이 끝나면 span을 OTLP 필드 이름(trace_id, span_id, parent_span_id, start_time_unix_nano ...)을 따른 JSONL로 저장
+- 트레이스가 진행 중이 아니거나 비활성화 상태면 span()은 아무것도 하지 않음
+
+설정 예시 (.streamlit/secrets.toml):
+    [tracing]
+    ENABLED = true
+    PATH = "traces.jsonl"
+"""
+
+import json
+import os
+import random
+import secrets
+import statistics
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+_current_span = ContextVar("tracing_current_span", default=None)
+_sink = None
+_sample_rate = 1.0
+
+
+class JsonlSpanSink:
+    """span을 한 줄에 하나씩 JSON으로 추가 기록"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        lines = "".join(json.dumps(span, ensure_ascii=False) + "\n" for span in spans)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+
+class _Trace:
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans = []  # 끝난 span 목록 (LangGraph 워커 스레드에서도 추가)
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_span_id", "name", "attributes", "_start", "_start_ns", "_token", "_error")
+
+    def __init__(self, trace, name, parent_span_id, attributes):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.attributes = attributes
+        self._error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self._start_ns = time.time_ns()
+        self._start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ns = int((time.perf_counter() - self._start) * 1e9)
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self._error = f"{exc_type.__name__}: {exc}"
+        self.trace.spans.append(
+            {
+                "trace_id": self.trace.trace_id,
+                "span_id": self.span_id,
+                "parent_span_id": self.parent_span_id,
+                "name": self.name,
+                "start_time_unix_nano": self._start_ns,
+                "end_time_unix_nano": self._start_ns + elapsed_ns,
+                "attributes": self.attributes,
+                "status": {"code": "ERROR", "message": self._error} if self._error else {"code": "OK"},
+            }
+        )
+        # 루트 span이 끝나면 트레이스 전체를 저장
+        if self.parent_span_id is None and _sink is not None:
+            try:
+                _sink.export(self.trace.spans)
+            except Exception as e:
+                print(f"Error exporting trace: {e}")
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def configure(config: dict):
+    """설정에서 활성화된 경우에만 JSONL 저장소 지정"""
+    global _sink, _sample_rate
+    if config.get("enabled", False):
+        _sink = JsonlSpanSink(config.get("path", "traces.jsonl"))
+        _sample_rate = config.get("sample_rate", 1.0)
+    else:
+        _sink = None
+
+
+def start_trace(name, **attributes):
+    """면접 턴 하나의 루트 span 시작 (새 trace_id 발급)"""
+    if _sink is None or (_sample_rate < 1.0 and random.random() >= _sample_rate):
+        return _NOOP_SPAN
+    return Span(_Trace(), name, None, attributes)
+
+
+def span(name, **attributes):
+    """진행 중인 트레이스의 하위 span 시작 (트레이스가 없으면 아무것도 하지 않음)"""
+    parent = _current_span.get()
+    if parent is None:
+        return _NOOP_SPAN
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+def is_tracing() -> bool:
+    return _current_span.get() is not None
+
+
+def mark_error(message="error"):
+    """현재 span을 실패로 표시 (예외를 잡고 반환값으로 실패를 알리는 함수용)"""
+    current = _current_span.get()
+    if current is not None and current._error is None:
+        current._error = message
+
+
+# 관리자 페이지용 조회 함수
+def load_traces(path, max_spans=20000) -> dict:
+    """JSONL 파일의 마지막 max_spans개 span을 trace_id별로 묶어서 반환"""
+    if not os.path.exists(path):
+        return {}
+    traces = {}
+    with open(path, encoding="utf-8") as f:
+        for line in deque(f, maxlen=max_spans):
+            try:
+                span_data = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # 기록 중이던 마지막 줄
+            traces.setdefault(span_data["trace_id"], []).append(span_data)
+    return traces
+
+
+def _duration_ms(span_data):
+    return (span_data["end_time_unix_nano"] - span_data["start_time_unix_nano"]) / 1e6
+
+
+def _root(spans):
+    return next((s for s in spans if s["parent_span_id"] is None), None)
+
+
+def summarize_traces(traces: dict) -> list:
+    """턴별 요약 (소요 시간이 긴 순서)"""
+    rows = []
+    for trace_id, spans in traces.items():
+        root = _root(spans)
+        if root is None:
+            continue  # 파일 앞부분이 잘려 루트가 없는 트레이스
+        rows.append(
+            {
+                "trace_id": trace_id,
+                "name": root["name"],
+                "started_at": root["start_time_unix_nano"] / 1e9,
+                "duration_ms": _duration_ms(root),
+                "spans": len(spans),
+                "status": root["status"]["code"],
+                **root["attributes"],
+            }
+        )
+    rows.sort(key=lambda row: row["duration_ms"], reverse=True)
+    return rows
+
+
+def stage_breakdown(spans: list) -> list:
+    """트레이스 하나의 span을 트리 순서(깊이 포함)로 정렬하고 루트 대비 비율 계산"""
+    root = _root(spans)
+    if root is None:
+        return []
+    children = {}
+    for span_data in spans:
+        children.setdefault(span_data["parent_span_id"], []).append(span_data)
+    total = _duration_ms(root) or 1.0
+
+    rows = []
+
+    def visit(span_data, depth):
+        duration = _duration_ms(span_data)
+        rows.append(
+            {
+                "stage": "  " * depth + span_data["name"],
+                "start_ms": (span_data["start_time_unix_nano"] - root["start_time_unix_nano"]) / 1e6,
+                "duration_ms": duration,
+                "share": duration / total,
+                "status": span_data["status"]["code"],
+            }
+        )
+        for child in sorted(children.get(span_data["span_id"], []), key=lambda s: s["start_time_unix_nano"]):
+            visit(child, depth + 1)
+
+    visit(root, 0)
+    return rows
+
+
+def stage_stats(traces: dict) -> list:
+    """최근 트레이스 전체의 단계(span 이름)별 소요 시간 통계"""
+    durations = {}
+    for spans in traces.values():
+        for span_data in spans:
+            durations.setdefault(span_data["name"], []).append(_duration_ms(span_data))
+    rows = []
+    for name, values in durations.items():
+        values.sort()
+        rows.append(
+            {
+                "stage": name,
+                "count": len(values),
+                "p50_ms": statistics.median(values),
+                "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))],
+                "total_ms": sum(values),
+            }
+        )
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
@@ -12,16 +12,40 @@
 - 에러 발생 시 원인을 쉽게 추적할 수 있도록 로그를 남길 때 유용
 """
 
+import statistics
+from collections import deque
+
 import streamlit as st
-from backend.accounts import logout
+from backend.accounts import logout, is_authenticated, flush_login_cookie
 
 
 def show_sidebar():
     """로그인 상태일 때 모든 페이지에 로그아웃 버튼 표시"""
-    if st.session_state.get("authenticated", False):
+    flush_login_cookie()  # 로그인/로그아웃으로 바뀐 세션 토큰 쿠키 반영
+    if is_authenticated():
         with st.sidebar:
             st.write(f"✅ 로그인 상태: {st.session_state['user']}님")
             if st.button("로그아웃"):
                 logout()
                 st.success("로그아웃 되었습니다.")
                 st.rerun()
+
+
+def record_render_time(scope: str, elapsed: float, keep: int = 50):
+    """스크립트 실행 시간 기록 (scope: 전체 실행 "app" / 부분 실행 "fragment")"""
+    render_times = st.session_state.setdefault("render_times", {})
+    render_times.setdefault(scope, deque(maxlen=keep)).append(elapsed)
+
+
+def summarize_render_times() -> dict:
+    """scope별 최근 실행 시간 요약 (초 단위)"""
+    return {
+        scope: {
+            "last": times[-1],
+            "p50": statistics.median(times),
+            "max": max(times),
+            "runs": len(times),
+        }
+        for scope, times in st.session_state.get("render_times", {}).items()
+        if times
+    }
@@ -0,0 +1,137 @@
+"""
+임베딩 백엔드 벤치마크 (backend.embeddings)
+- 질문 임베딩 지연 시간(p50/p95/p99, 질문 하나씩)과 대량 임베딩 처리량(docs/s)을 백엔드별로 측정
+- local: sentence-transformers 모델을 CPU에서 실행 (--threads, --batch-size, --processes 조합 비교)
+- openai: OPENAI_API_KEY가 있고 --remote를 지정했을 때만 측정 (네트워크 왕복 포함, 호출 비용 발생)
+- 문서는 --data-dir의 참고 문서 청크(backend.ingest)나 생성한 한국어 문장 사용
+
+실행 예시:
+    # 모델을 미리 받아 둔 뒤 네트워크 없이 측정
+    python -m benchmarks.embedding_bench --offline --threads 4 --queries 200 --docs 2000
+    python -m benchmarks.embedding_bench --offline --threads 1 --processes 4 --docs 5000
+    # 원격 API와 비교
+    OPENAI_API_KEY=... python -m benchmarks.embedding_bench --remote --remote-queries 30 --remote-docs 500
+"""
+
+import argparse
+import json
+import os
+import time
+
+from backend.embeddings import DEFAULT_LOCAL_MODEL, LocalEmbeddings
+from benchmarks.load_test import Recorder
+
+TOPICS = ["GIL", "데코레이터", "제너레이터", "비동기", "메모리 관리", "예외 처리", "클래스", "리스트와 튜플"]
+
+
+def sample_texts(count, data_dir=None):
+    """벤치마크용 문서 (data_dir가 있으면 참고 문서 청크를 반복 사용)"""
+    if data_dir:
+        from backend.ingest import build_chunks
+
+        chunks, _ = build_chunks(data_dir, 1000, 100)
+        texts = [chunk["text"] for chunk in chunks.values()]
+        if texts:
+            return [texts[i % len(texts)] for i in range(count)]
+    return [
+        f"{i}번 문서: 파이썬의 {TOPICS[i % len(TOPICS)]}에 대해 설명합니다. "
+        f"동작 방식과 주의할 점을 예제 코드 {i}와 함께 살펴봅니다."
+        for i in range(count)
+    ]
+
+
+def measure(name, embeddings, queries, docs, batch_size):
+    """질문 하나씩 임베딩한 지연 시간과 batch_size 단위 대량 임베딩 처리량"""
+    recorder = Recorder()
+    embeddings.embed_query(queries[0])  # 모델 로드/연결 준비는 측정에서 제외
+    for text in queries:
+        recorder.timed("embed_query", embeddings.embed_query, text)
+
+    start = time.perf_counter()
+    dimension = 0
+    for i in range(0, len(docs), batch_size):
+        vectors = embeddings.embed_documents(docs[i:i + batch_size])
+        dimension = len(vectors[0])
+    elapsed = time.perf_counter() - start
+    return {
+        "backend": name,
+        "dimension": dimension,
+        "queries": len(queries),
+        "embed_query": recorder.summary()["embed_query"],
+        "docs": len(docs),
+        "docs_elapsed": elapsed,
+        "docs_per_sec": len(docs) / elapsed if elapsed else 0.0,
+    }
+
+
+def run(args):
+    texts = sample_texts(max(args.docs, args.remote_docs), args.data_dir)
+    queries = [f"{topic}에 대해 설명해 주세요. ({i})" for i, topic in enumerate(TOPICS * (args.queries // len(TOPICS) + 1))]
+
+    reports = []
+    start = time.perf_counter()
+    local = LocalEmbeddings(
+        model=args.model,
+        batch_size=args.batch_size,
+        threads=args.threads,
+        processes=args.processes,
+        cache_dir=args.cache_dir,
+        offline=args.offline,
+    )
+    _ = local.dimension  # 모델 로드 시간 측정
+    load_seconds = time.perf_counter() - start
+    try:
+        # 프로세스 풀은 한 번에 넘긴 문서를 나누어 처리하므로 전체를 한 번에 전달
+        bulk_batch = len(texts[:args.docs]) if args.processes > 1 else args.batch_size
+        report = measure("local", local, queries[:args.queries], texts[:args.docs], bulk_batch)
+    finally:
+        local.close()
+    report.update(model=args.model, threads=args.threads, processes=args.processes, load_seconds=load_seconds)
+    reports.append(report)
+
+    if args.remote:
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            raise SystemExit("❌ --remote에는 OPENAI_API_KEY 환경 변수가 필요합니다.")
+        from langchain_openai import OpenAIEmbeddings
+
+        remote = OpenAIEmbeddings(api_key=api_key)
+        report = measure("openai", remote, queries[:args.remote_queries], texts[:args.remote_docs], args.batch_size)
+        report.update(model=remote.model)
+        reports.append(report)
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 벤치마크")
+    parser.add_argument("--model", default=DEFAULT_LOCAL_MODEL, help="로컬 sentence-transformers 모델 이름 또는 경로")
+    parser.add_argument("--threads", type=int, default=0, help="torch 스레드 수 (0이면 기본값)")
+    parser.add_argument("--batch-size", type=int, default=32, help="한 번에 임베딩할 문서 수")
+    parser.add_argument("--processes", type=int, default=0, help="대량 임베딩 프로세스 수 (0이면 현재 프로세스)")
+    parser.add_argument("--cache-dir", help="모델 캐시 폴더")
+    parser.add_argument("--offline", action="store_true", help="캐시에 있는 모델만 사용")
+    parser.add_argument("--queries", type=int, default=200, help="로컬 질문 임베딩 횟수")
+    parser.add_argument("--docs", type=int, default=2000, help="로컬 대량 임베딩 문서 수")
+    parser.add_argument("--data-dir", help="문서로 사용할 참고 문서 폴더 (없으면 생성한 문장)")
+    parser.add_argument("--remote", action="store_true", help="OpenAI 임베딩도 측정")
+    parser.add_argument("--remote-queries", type=int, default=30, help="원격 질문 임베딩 횟수")
+    parser.add_argument("--remote-docs", type=int, default=500, help="원격 대량 임베딩 문서 수")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    reports = run(args)
+    print(f"\n{'backend':8} {'dim':>5} {'query p50':>10} {'query p95':>10} {'query p99':>10} {'docs/s':>9}")
+    for report in reports:
+        row = report["embed_query"]
+        print(
+            f"{report['backend']:8} {report['dimension']:>5} {row['p50'] * 1000:>8.1f}ms {row['p95'] * 1000:>8.1f}ms "
+            f"{row['p99'] * 1000:>8.1f}ms {report['docs_per_sec']:>9.1f}"
+        )
+    print(f"\nlocal 모델 로드 {reports[0]['load_seconds']:.1f}s ({reports[0]['model']})")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
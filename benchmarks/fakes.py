@@ -0,0 +1,240 @@
+"""
+오프라인 부하 테스트용 가짜(fake) 구성 요소
+- 지연 시간 분포를 설정할 수 있는 결정적(deterministic) 챗 모델과 retriever
+- 사용자(스레드)별로 분리된 Streamlit session_state 대체 객체
+- 지정한 비율로 실패하거나 멈추는 장애 주입기 (backend.resilience 동작 확인용)
+"""
+
+import contextvars
+import hashlib
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import Runnable
+
+
+# 지연 시간 분포
+class LatencyDistribution:
+    def __init__(self, spec: str, seed=0):
+        """
+        :param spec: "const:0.5", "uniform:0.2,1.0", "lognormal:-0.5,0.4" 형식 (초 단위)
+        :param seed: 난수 시드 (같은 시드면 같은 지연 시간 순서)
+        """
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(value) for value in params.split(",") if value]
+        if kind not in ("const", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+        expected = {"const": 1, "uniform": 2, "lognormal": 2}[kind]
+        if len(self.params) != expected:
+            raise ValueError(f"Latency distribution '{kind}' needs {expected} parameter(s): {spec}")
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.kind == "const":
+                return self.params[0]
+            if self.kind == "uniform":
+                return self._random.uniform(*self.params)
+            return self._random.lognormvariate(*self.params)
+
+
+# 장애 주입기
+class InjectedFault(ConnectionError):
+    """장애 주입기가 일부러 낸 오류"""
+
+
+class FaultInjector:
+    def __init__(self, error_rate=0.0, hang_rate=0.0, hang_seconds=5.0, seed=0):
+        """
+        :param error_rate: 호출이 InjectedFault로 실패할 비율
+        :param hang_rate: 호출이 hang_seconds 동안 멈춘 뒤 진행할 비율
+        :param seed: 난수 시드 (같은 시드면 같은 장애 순서)
+        """
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.down = False  # True면 모든 호출 실패 (장애 상황)
+        self.errors = 0
+        self.hangs = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def maybe_fail(self):
+        with self._lock:
+            roll = self._random.random()
+            fail = self.down or roll < self.error_rate
+            hang = not fail and roll < self.error_rate + self.hang_rate
+            self.errors += fail
+            self.hangs += hang
+        if fail:
+            raise InjectedFault("injected fault")
+        if hang:
+            time.sleep(self.hang_seconds)
+
+    def wrap(self, fn):
+        """fn 호출 전에 장애를 주입하는 함수 반환"""
+
+        def wrapper(*args, **kwargs):
+            self.maybe_fail()
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode()).hexdigest()[:8]
+
+
+# 가짜 챗 모델
+class FakeChatModel(Runnable):
+    def __init__(self, latency: LatencyDistribution, recorder=None, faults: FaultInjector = None):
+        """프롬프트에서 결정적으로 응답을 만들고, 설정한 분포만큼 대기"""
+        self.latency = latency
+        self.recorder = recorder
+        self.faults = faults
+        self.calls = 0
+
+    def invoke(self, input, config=None, **kwargs):
+        if self.faults is not None:
+            self.faults.maybe_fail()
+        prompt = input.to_string() if hasattr(input, "to_string") else str(input)
+        delay = self.latency.sample()
+        time.sleep(delay)
+        self.calls += 1
+        if self.recorder is not None:
+            self.recorder.record("llm", delay)
+
+        if "평가:" in prompt:
+            content = f"평가 {_digest(prompt)}: 핵심 개념을 잘 설명했습니다. 모범답안: ..."
+        else:
+            content = f"면접 질문 {_digest(prompt)}: 이 개념을 설명해 주세요."
+        input_tokens = len(prompt) // 2
+        output_tokens = len(content) // 2
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+
+
+# 가짜 retriever
+class FakeRetriever:
+    def __init__(self, latency: LatencyDistribution, num_docs=50, k=5, recorder=None, seed=0, faults: FaultInjector = None):
+        """고정된 문서 집합에서 k개를 골라 반환"""
+        self.latency = latency
+        self.recorder = recorder
+        self.faults = faults
+        self.k = k
+        self.docs = [
+            Document(page_content=f"문서 {i}: 파이썬 개념 {i}에 대한 설명입니다. " * 5)
+            for i in range(num_docs)
+        ]
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def invoke(self, query, config=None, **kwargs):
+        if self.faults is not None:
+            self.faults.maybe_fail()
+        delay = self.latency.sample()
+        time.sleep(delay)
+        if self.recorder is not None:
+            self.recorder.record("retriever", delay)
+        with self._lock:
+            return self._random.sample(self.docs, self.k)
+
+
+# 가짜 벡터 스토어 / 임베딩 / Pinecone 클라이언트 (backend.config import 시 네트워크 호출 방지)
+class FakeVectorStore:
+    def __init__(self, *args, **kwargs):
+        self.retriever = None
+
+    def as_retriever(self, search_type=None, search_kwargs=None):
+        return self.retriever
+
+
+class FakeEmbeddings:
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class _IndexList(list):
+    def names(self):
+        return list(self)
+
+
+class FakePinecone:
+    index_names = _IndexList()
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def list_indexes(self):
+        return self.index_names
+
+    def Index(self, name):
+        return None
+
+    def describe_index(self, name):
+        return SimpleNamespace(name=name, dimension=None)  # 차원을 알 수 없으면 확인을 건너뜀
+
+
+# 사용자별 session_state
+class SessionState(dict):
+    """st.session_state처럼 속성/키 접근을 모두 지원하는 dict"""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key)
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+    def __delattr__(self, key):
+        del self[key]
+
+
+_current_state = contextvars.ContextVar("bench_session_state")
+
+
+class ContextSessionState:
+    """현재 컨텍스트(시뮬레이션 사용자)의 SessionState로 위임 (LangGraph 워커 스레드에도 전파됨)"""
+
+    def _state(self):
+        return _current_state.get()
+
+    def __getattr__(self, key):
+        return getattr(self._state(), key)
+
+    def __setattr__(self, key, value):
+        setattr(self._state(), key, value)
+
+    def __getitem__(self, key):
+        return self._state()[key]
+
+    def __setitem__(self, key, value):
+        self._state()[key] = value
+
+    def __contains__(self, key):
+        return key in self._state()
+
+    def get(self, key, default=None):
+        return self._state().get(key, default)
+
+    def setdefault(self, key, default=None):
+        return self._state().setdefault(key, default)
+
+
+def bind_session_state(state: SessionState):
+    """현재 스레드(컨텍스트)를 state를 사용하는 사용자로 지정"""
+    _current_state.set(state)
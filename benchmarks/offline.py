@@ -0,0 +1,55 @@
+"""
+벤치마크 공통: 외부 서비스 없이 backend 모듈을 import 하기 위한 설정
+- st.secrets를 로컬 PostgreSQL 접속 정보와 가짜 API 키로 대체
+- backend.config import 시점의 Pinecone/OpenAI 클라이언트 생성을 가짜 객체로 대체
+"""
+
+from unittest.mock import patch
+from urllib.parse import urlparse
+
+import streamlit
+
+from benchmarks.fakes import FakePinecone, FakeEmbeddings, FakeVectorStore
+
+BENCH_INDEX_NAME = "bench-index"
+
+
+def build_secrets(dsn, overrides=None):
+    """로컬 PostgreSQL 접속 정보와 가짜 API 키로 st.secrets 대체값 생성"""
+    url = urlparse(dsn)
+    secrets = {
+        "postgres": {
+            "POSTGRES_HOST": url.hostname or "localhost",
+            "POSTGRES_DB": url.path.lstrip("/"),
+            "POSTGRES_USER": url.username or "postgres",
+            "POSTGRES_PASSWORD": url.password or "",
+            "POSTGRES_PORT": str(url.port or 5432),
+            "SSL_MODE": "disable",
+        },
+        "openai": {"OPENAI_API_KEY": "offline"},
+        "pinecone": {
+            "PINECONE_API_KEY": "offline",
+            "PINECONE_ENV": "offline",
+            "PINECONE_INDEX_NAME": BENCH_INDEX_NAME,
+        },
+    }
+    secrets.update(overrides or {})
+    return secrets
+
+
+def patch_external_services(stack, dsn, overrides=None):
+    """
+    ExitStack에 외부 서비스 패치를 등록 (backend 모듈 import 전에 호출)
+    :param overrides: 추가/덮어쓸 secrets 섹션 (예: {"password_hash": {"ROUNDS": 10}})
+    """
+    # backend.config보다 먼저 import하여 패치 대상으로 사용
+    import pinecone
+    import langchain_openai
+    import langchain_pinecone
+
+    if BENCH_INDEX_NAME not in FakePinecone.index_names:
+        FakePinecone.index_names.append(BENCH_INDEX_NAME)
+    stack.enter_context(patch.object(streamlit, "secrets", build_secrets(dsn, overrides)))
+    stack.enter_context(patch.object(pinecone, "Pinecone", FakePinecone))
+    stack.enter_context(patch.object(langchain_openai, "OpenAIEmbeddings", FakeEmbeddings))
+    stack.enter_context(patch.object(langchain_pinecone, "PineconeVectorStore", FakeVectorStore))
@@ -0,0 +1,162 @@
+"""
+차원 축소 평가 (backend.projection)
+- 목표 차원/투영 방식별로 recall@k(전체 차원 정확 검색 상위 k개 중 축소 벡터 검색으로 찾은 비율),
+  질문 하나당 검색 지연 시간(p50/p95, numpy 전수 검색), 벡터당 저장 용량을 측정하여 축소 차원 선택 근거로 사용
+  - 검색 지연 시간은 Pinecone 대신 같은 코퍼스를 메모리에서 전수 검색한 값 (차원에 따른 상대 비용 비교용)
+  - 질문은 코퍼스에서 떼어 낸 벡터 (--queries개, 투영 학습과 검색 대상에서 제외)
+- 벡터는 인덱스에 저장된 벡터(--index), .npy 파일(--vectors), 생성한 벡터(기본값, 저차원 구조 + 잡음) 중 선택
+- --target-recall 이상인 가장 작은 차원을 방식별로 추천
+
+실행 예시:
+    python -m benchmarks.projection_bench --dimensions 64,128,256,512 --k 10
+    python -m benchmarks.projection_bench --index interview-index --sample 20000 --json projection_report.json
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from backend.projection import fit_projection, METHODS
+from benchmarks.load_test import Recorder
+
+
+def synthetic_vectors(count, dimension=1536, rank=64, clusters=40, noise=0.05, seed=0):
+    """실제 임베딩처럼 몇 개의 주제(클러스터)와 낮은 유효 차원을 가진 단위 벡터"""
+    rng = np.random.default_rng(seed)
+    basis = rng.standard_normal((rank, dimension))
+    centers = rng.standard_normal((clusters, rank)) * 2
+    latent = centers[rng.integers(clusters, size=count)] + rng.standard_normal((count, rank))
+    vectors = latent @ basis + rng.standard_normal((count, dimension)) * noise * np.sqrt(rank)
+    return _normalize(vectors.astype(np.float32))
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def top_k(corpus, queries, k):
+    """cosine(단위 벡터 내적) 상위 k개 id (질문별, 순서 무관)"""
+    scores = queries @ corpus.T
+    return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+
+def recall_at_k(truth, found):
+    k = truth.shape[1]
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(truth.tolist(), found.tolist())]))
+
+
+def _search_latency(corpus, queries, k):
+    recorder = Recorder()
+    for query in queries:
+        recorder.timed("search", top_k, corpus, query[None, :], k)
+    return recorder.summary()["search"]
+
+
+def evaluate(vectors, dimensions, methods=METHODS, k=10, queries=200, seed=0):
+    """
+    전체 차원 정확 검색을 기준으로 방식/차원별 recall@k와 검색 지연 시간 측정
+    :return: [{"method", "dimension", "recall", "search_p50", "search_p95", "bytes_per_vector", "fit_seconds"}, ...]
+             (첫 행은 전체 차원 기준)
+    """
+    vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+    order = np.random.default_rng(seed).permutation(len(vectors))
+    held_out, corpus = vectors[order[:queries]], vectors[order[queries:]]
+    if len(corpus) <= k:
+        raise ValueError(f"코퍼스 벡터({len(corpus)}개)가 k({k})보다 많아야 합니다.")
+    truth = top_k(corpus, held_out, k)
+
+    def row(method, dimension, found, latency, fit_seconds):
+        return {
+            "method": method,
+            "dimension": dimension,
+            "recall": recall_at_k(truth, found),
+            "search_p50": latency["p50"],
+            "search_p95": latency["p95"],
+            "bytes_per_vector": dimension * 4,  # float32
+            "fit_seconds": fit_seconds,
+        }
+
+    reports = [row("full", corpus.shape[1], truth, _search_latency(corpus, held_out, k), 0.0)]
+    for method in methods:
+        for dimension in dimensions:
+            if dimension >= corpus.shape[1] or (method == "pca" and dimension > len(corpus)):
+                print(f"건너뜀: {method} {dimension}차원 (입력 차원 {corpus.shape[1]}, 코퍼스 {len(corpus)}개)")
+                continue
+            start = time.perf_counter()
+            projection = fit_projection(corpus, dimension, method, seed)
+            fit_seconds = time.perf_counter() - start
+            reduced_corpus, reduced_queries = projection.transform(corpus), projection.transform(held_out)
+            found = top_k(reduced_corpus, reduced_queries, k)
+            reports.append(row(method, dimension, found, _search_latency(reduced_corpus, reduced_queries, k), fit_seconds))
+    return reports
+
+
+def recommend(reports, target_recall):
+    """방식별로 recall이 target_recall 이상인 가장 작은 차원 (없으면 None)"""
+    best = {}
+    for report in reports:
+        if report["method"] == "full" or report["recall"] < target_recall:
+            continue
+        if report["method"] not in best or report["dimension"] < best[report["method"]]["dimension"]:
+            best[report["method"]] = report
+    return {method: best.get(method) for method in {r["method"] for r in reports} - {"full"}}
+
+
+def load_vectors(args):
+    if args.vectors:
+        return np.load(args.vectors)
+    if args.index:
+        from backend import config
+        from backend.db import get_embedding_index
+        from backend.projection import sample_vectors
+
+        record = get_embedding_index(args.index)
+        namespace = record["namespace"] if record else config.PINECONE_NAMESPACE
+        return sample_vectors(config.pc.Index(args.index), namespace, args.sample)
+    return synthetic_vectors(args.sample, args.synthetic_dimension, seed=args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="차원 축소 평가 (recall@k, 검색 지연 시간)")
+    parser.add_argument("--dimensions", default="64,128,256,512", help="평가할 목표 차원 (쉼표로 구분)")
+    parser.add_argument("--methods", default=",".join(METHODS), help="투영 방식 (pca, random)")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k (retriever 검색 수와 맞춤)")
+    parser.add_argument("--queries", type=int, default=200, help="질문으로 떼어 낼 벡터 수")
+    parser.add_argument("--index", help="저장된 벡터를 읽을 Pinecone 인덱스")
+    parser.add_argument("--vectors", help="벡터 .npy 파일 (개수 x 차원)")
+    parser.add_argument("--sample", type=int, default=5000, help="읽거나 생성할 벡터 수")
+    parser.add_argument("--synthetic-dimension", type=int, default=1536, help="생성할 벡터의 차원")
+    parser.add_argument("--target-recall", type=float, default=0.95, help="추천 기준 recall@k")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    vectors = load_vectors(args)
+    dimensions = [int(value) for value in args.dimensions.split(",")]
+    methods = [value.strip() for value in args.methods.split(",")]
+    reports = evaluate(vectors, dimensions, methods, args.k, args.queries, args.seed)
+
+    print(f"\n벡터 {len(vectors)}개 (질문 {args.queries}개), recall@{args.k}")
+    print(f"{'method':7} {'dim':>5} {'recall':>7} {'search p50':>11} {'search p95':>11} {'bytes/vec':>10} {'fit':>7}")
+    for report in reports:
+        print(
+            f"{report['method']:7} {report['dimension']:>5} {report['recall']:>7.3f} "
+            f"{report['search_p50'] * 1000:>9.2f}ms {report['search_p95'] * 1000:>9.2f}ms "
+            f"{report['bytes_per_vector']:>10} {report['fit_seconds']:>6.1f}s"
+        )
+    for method, report in sorted(recommend(reports, args.target_recall).items()):
+        if report:
+            print(f"{method}: recall@{args.k} {args.target_recall} 이상인 가장 작은 차원 {report['dimension']} "
+                  f"(recall {report['recall']:.3f})")
+        else:
+            print(f"{method}: recall@{args.k} {args.target_recall} 이상인 차원 없음")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
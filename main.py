@@ -1,5 +1,5 @@
 import streamlit as st
-from backend.accounts import authenticate, register_user, login_user
+from backend.accounts import authenticate, register_user, login_user, is_authenticated
 from backend.utils import show_sidebar
 
 
@@ -13,7 +13,7 @@ if "user" not in st.session_state:
 # 로그인 UI
 st.title("🔑 로그인")
 
-if not st.session_state["authenticated"]:
+if not is_authenticated():  # 새로고침 시 세션 토큰 쿠키로 로그인 복원
     tab1, tab2 = st.tabs(["로그인", "회원가입"])
 
     with tab1:
@@ -0,0 +1,68 @@
+import pandas as pd
+import streamlit as st
+from backend.accounts import is_admin
+from backend.analytics import default_period, refresh, refresh_if_stale, summarize_usage
+from backend.config import ANALYTICS_CONFIG
+from backend.db import get_daily_usage, get_usage_watermark, get_user_usage
+from backend.utils import show_sidebar
+
+
+# 사용 통계 페이지 (관리자 전용, 집계 테이블만 조회)
+def display_analytics():
+    """기간별 세션 수, 활동 사용자, 면접당 답변 수, 챗봇 응답 시간 표시"""
+
+    if not is_admin():
+        st.warning("관리자만 접근할 수 있습니다.")
+        return
+
+    # 마지막 갱신 후 REFRESH_INTERVAL이 지났으면 새로 추가된 행만 집계
+    if st.button("지금 갱신"):
+        refresh(ANALYTICS_CONFIG)
+    else:
+        refresh_if_stale(ANALYTICS_CONFIG)
+    watermark = get_usage_watermark()
+    if watermark is None or watermark["refreshed_at"] is None:
+        st.info("아직 집계된 통계가 없습니다.")
+        return
+    st.caption(f"마지막 집계: {watermark['refreshed_at']:%Y-%m-%d %H:%M:%S} (최근 {ANALYTICS_CONFIG['lag']}초 데이터는 다음 집계에 반영)")
+
+    # 조회 기간
+    period = st.date_input("조회 기간", value=default_period(30))
+    if len(period) != 2:
+        return
+    start, end = period
+
+    daily = get_daily_usage(start, end)
+    users = get_user_usage(start, end)
+    if not daily:
+        st.info("선택한 기간에 사용 기록이 없습니다.")
+        return
+
+    # 기간 요약
+    summary = summarize_usage(daily, users)
+    cols = st.columns(4)
+    cols[0].metric("면접 세션", f"{summary['sessions']:,}")
+    cols[1].metric("활동 사용자", f"{summary['active_users']:,}")
+    cols[2].metric("면접당 답변", f"{summary['answers_per_session']:.1f}")
+    cols[3].metric("평균 응답 시간", "-" if summary["avg_latency"] is None else f"{summary['avg_latency']:.1f}s")
+
+    # 일별 추이
+    daily = pd.DataFrame(daily).set_index("day")
+    st.subheader("일별 세션 / 활동 사용자")
+    st.line_chart(daily[["sessions", "active_users"]])
+    st.subheader("일별 답변 수")
+    st.bar_chart(daily["answers"])
+    st.subheader("일별 챗봇 응답 시간 (초)")
+    st.line_chart(daily[["avg_latency", "max_latency"]])
+
+    # 답변이 많은 사용자
+    st.subheader("사용자별 통계 (답변 수 상위)")
+    limit = st.slider("표시할 사용자 수", 5, 100, 20)
+    st.dataframe(pd.DataFrame(users[:limit]), hide_index=True, use_container_width=True)
+
+
+# Streamlit 실행 시 메인 함수 호출
+if __name__ == "__main__":
+    st.title("📊 사용 통계")
+    show_sidebar()
+    display_analytics()
@@ -0,0 +1,78 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+from backend.accounts import is_admin
+from backend.config import TRACING_CONFIG
+from backend.resilience import snapshot
+from backend.tracing import load_traces, summarize_traces, stage_breakdown, stage_stats
+from backend.utils import show_sidebar
+
+
+# 면접 턴 트레이스 조회 페이지 (관리자 전용)
+def display_traces():
+    """최근 트레이스 중 느린 턴 목록과 단계별 소요 시간 표시"""
+
+    if not is_admin():
+        st.warning("관리자만 접근할 수 있습니다.")
+        return
+
+    # 외부 의존성 상태 (현재 프로세스 기준)
+    st.subheader("외부 의존성 상태")
+    st.dataframe(pd.DataFrame(snapshot()), hide_index=True, use_container_width=True)
+
+    if not TRACING_CONFIG["enabled"]:
+        st.info("트레이싱이 꺼져 있습니다. secrets.toml의 [tracing] ENABLED를 true로 설정하세요.")
+
+    traces = load_traces(TRACING_CONFIG["path"])
+    turns = summarize_traces(traces)
+    if not turns:
+        st.info("기록된 트레이스가 없습니다.")
+        return
+
+    # 턴 종류 필터
+    names = sorted({turn["name"] for turn in turns})
+    selected_names = st.multiselect("턴 종류", names, default=names)
+    turns = [turn for turn in turns if turn["name"] in selected_names]
+
+    # 느린 턴 목록
+    st.subheader(f"느린 턴 (최근 {len(traces)}개 중)")
+    limit = st.slider("표시할 턴 수", 5, 100, 20)
+    slowest = pd.DataFrame(turns[:limit])
+    if slowest.empty:
+        st.info("선택한 종류의 턴이 없습니다.")
+        return
+    slowest["started_at"] = slowest["started_at"].map(
+        lambda ts: datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+    )
+    st.dataframe(slowest, hide_index=True, use_container_width=True)
+
+    # 선택한 턴의 단계별 소요 시간
+    trace_id = st.selectbox(
+        "단계별로 볼 턴",
+        options=slowest["trace_id"],
+        format_func=lambda tid: next(
+            f"{row['name']} {row['duration_ms']:.0f}ms ({tid[:8]})" for row in turns if row["trace_id"] == tid
+        ),
+    )
+    st.subheader("단계별 소요 시간")
+    breakdown = pd.DataFrame(stage_breakdown(traces[trace_id]))
+    st.dataframe(
+        breakdown,
+        hide_index=True,
+        use_container_width=True,
+        column_config={"share": st.column_config.ProgressColumn("비율", min_value=0.0, max_value=1.0, format="%.2f")},
+    )
+
+    # 최근 트레이스 전체의 단계별 통계
+    st.subheader("단계별 통계 (최근 트레이스 전체)")
+    stats = pd.DataFrame(stage_stats({tid: traces[tid] for tid in (turn["trace_id"] for turn in turns)}))
+    st.dataframe(stats, hide_index=True, use_container_width=True)
+    st.bar_chart(stats.set_index("stage")["p95_ms"])
+
+
+# Streamlit 실행 시 메인 함수 호출
+if __name__ == "__main__":
+    st.title("⏱️ 면접 턴 트레이스")
+    show_sidebar()
+    display_traces()
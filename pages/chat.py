@@ -1,74 +1,137 @@
+import time
 import streamlit as st
 from backend.langchain_chatbot import (
     initialize_session,
     display_chat_history,
+    display_new_messages,
+    end_interview,
     handle_user_input,
     feedback_documents,
-    initialize_evaluation_workflow,
     generate_question,
+    start_interview,
 )
-from backend.db import create_chat_session, get_user_id
-from backend.utils import show_sidebar
+from backend.db import get_user_id
+from backend.token_budget import summarize_usage
+from backend.accounts import is_authenticated
+from backend.utils import show_sidebar, record_render_time, summarize_render_times
+from backend.config import PROFILING_CONFIG
+from backend.profiling import profile_rerun
+
+# 새 대화는 fragment 안에서만 다시 실행 (답변 입력/계속 진행 시 이전 대화를 다시 그리지 않음)
+@st.fragment
+def live_chat():
+    # 부분 실행도 느리면 프로파일 저장 (전체 실행 중이면 바깥 프로파일에 포함)
+    with profile_rerun("chat.fragment", PROFILING_CONFIG):
+        _live_chat()
+
+
+def _live_chat():
+    fragment_start = time.perf_counter()
+
+    # 전체 실행 이후 추가된 메시지 출력
+    display_new_messages()
+
+    # 사용자 입력 받기
+    handle_user_input()
+
+    # 이번 면접의 토큰 사용량 및 첫 질문 생성 시간 표시
+    if st.session_state.get("token_usage"):
+        usage = summarize_usage(st.session_state.token_usage)
+        st.caption(
+            f"토큰 사용량: 프롬프트 {usage['prompt_tokens']} / 응답 {usage['completion_tokens']} "
+            f"(총 {usage['total_tokens']}, {usage['turns']}회 호출)"
+        )
+    if st.session_state.get("first_question_latency") is not None:
+        st.caption(f"첫 질문 생성 시간: {st.session_state.first_question_latency:.2f}초")
+
+    # 면접 지속 여부 버튼 표시
+    if st.session_state.get("show_continue_button", False):
+        st.write("면접을 계속하시겠습니까?")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            if st.button("계속 진행"):
+                st.session_state.show_continue_button = False  # 버튼 숨기기
+                generate_question()  # 다음 질문 생성
+                st.rerun(scope="fragment")
+
+        with col2:
+            if st.button("종료하고 저장"):
+                st.write("면접을 종료합니다.")
+
+                # 기존 대화 기록 삭제
+                st.session_state.chat_history = []
+                end_interview()
+                st.session_state.first_question_asked = False  # 첫 질문 여부도 리셋
+                st.session_state.show_continue_button = False
+                st.session_state.interview_started = False
+                st.session_state.first_question_latency = None
+
+                # 페이지 전체를 새로고침하여 완전 리셋
+                st.rerun()
+
+    # 부분 실행 시간 기록 (전체 실행 중 호출된 경우는 아래 전체 실행 시간에 포함)
+    if not st.session_state.get("full_run", False):
+        record_render_time("fragment", time.perf_counter() - fragment_start)
+
+    # 최근 실행 시간 표시
+    st.caption(
+        " / ".join(
+            f"{'전체' if scope == 'app' else '부분'} 실행 {row['last'] * 1000:.0f}ms "
+            f"(중앙값 {row['p50'] * 1000:.0f}ms, {row['runs']}회)"
+            for scope, row in summarize_render_times().items()
+        )
+    )
+
 
 # Streamlit UI 실행 함수
-st.set_page_config(page_title="AI 면접 도우미 챗봇")
-st.title("AI 면접 도우미 챗봇")
-show_sidebar()
-
-# 로그인 확인
-if "authenticated" not in st.session_state or not st.session_state["authenticated"]:
-    st.warning("🚨 채팅을 사용하려면 먼저 로그인하세요.")
-    st.stop()  # 로그인 안 했으면 실행 중지
-
-# 사용자 ID 가져오기
-username = st.session_state["user"]
-user_id = get_user_id(username)
-
-
-# "면접 시작하기" 버튼을 눌렀을 때 새로운 세션 생성
-if st.button("면접 시작하기"):
-    st.session_state.session_id = create_chat_session(user_id)  # 새로운 세션 생성
-    st.session_state.interview_started = True
-    st.session_state.show_continue_button = False  # 새 질문 생성 시 버튼 숨김
-    st.session_state.first_question_asked = False  # 첫 질문 여부 초기화
-    initialize_session()  # 세션 초기화
-    generate_question()  # 첫 질문 생성
-    st.rerun()  # 페이지 새로고침하여 UI 갱신
-
-# 세션 상태 초기화 (최초 실행 시)
-if "initialized" not in st.session_state:
-    initialize_session()
-    feedback_documents()
-    st.session_state.app = initialize_evaluation_workflow()
-    st.session_state.initialized = True
-
-# 채팅 기록 출력
-display_chat_history()
-
-# 사용자 입력 받기
-handle_user_input()
-
-# 면접 지속 여부 버튼 표시
-if st.session_state.get("show_continue_button", False):
-    st.write("면접을 계속하시겠습니까?")
-    col1, col2 = st.columns(2)
-
-    with col1:
-        if st.button("계속 진행"):
-            st.session_state.show_continue_button = False  # 버튼 숨기기
-            generate_question()  # 다음 질문 생성
-            st.rerun()
-
-    with col2:
-        if st.button("종료하고 저장"):
-            st.write("면접을 종료합니다.")
-
-            # 기존 대화 기록 삭제
-            st.session_state.chat_history = []
-            st.session_state.messages = []
-            st.session_state.first_question_asked = False  # 첫 질문 여부도 리셋
-            st.session_state.show_continue_button = False
-            st.session_state.interview_started = False
-
-            # 페이지 새로고침하여 완전 리셋
-            st.rerun()
+def render_page():
+    run_start = time.perf_counter()
+
+    st.set_page_config(page_title="AI 면접 도우미 챗봇")
+    st.title("AI 면접 도우미 챗봇")
+    show_sidebar()
+
+    # 로그인 확인
+    if not is_authenticated():
+        st.warning("🚨 채팅을 사용하려면 먼저 로그인하세요.")
+        st.stop()  # 로그인 안 했으면 실행 중지
+
+    # 사용자 ID 가져오기 (로그인 사용자가 바뀔 때만 DB 조회)
+    username = st.session_state["user"]
+    if st.session_state.get("user_id_owner") != username:
+        st.session_state.user_id = get_user_id(username)
+        st.session_state.user_id_owner = username
+    user_id = st.session_state.user_id
+
+
+    # "면접 시작하기" 버튼을 눌렀을 때 새로운 세션 생성
+    if st.button("면접 시작하기"):
+        st.session_state.interview_started = True
+        st.session_state.show_continue_button = False  # 새 질문 생성 시 버튼 숨김
+        st.session_state.first_question_asked = False  # 첫 질문 여부 초기화
+        start_interview(user_id)  # 세션 생성 + 첫 질문 생성 (검색/LLM 호출 1회씩)
+        st.rerun()  # 페이지 새로고침하여 UI 갱신
+
+    # 세션 상태 초기화 (최초 실행 시, 검색/LLM 호출 없음)
+    if "initialized" not in st.session_state:
+        initialize_session()
+        feedback_documents()
+        st.session_state.initialized = True
+
+    # 이전 대화 출력 (전체 실행 시에만)
+    display_chat_history()
+
+    st.session_state.full_run = True
+    try:
+        live_chat()
+    finally:
+        st.session_state.full_run = False
+
+    # 전체 실행 시간 기록
+    record_render_time("app", time.perf_counter() - run_start)
+
+
+# 느린 재실행은 프로파일을 저장 (PROFILING_CONFIG로 켜는 경우에만)
+with profile_rerun("chat", PROFILING_CONFIG):
+    render_page()
@@ -1,7 +1,126 @@
+import datetime
+
 import streamlit as st
-from backend.db import get_user_chat_sessions, get_chat_history, get_user_id
-from backend.accounts import is_authenticated
+from backend.db import get_user_chat_sessions, get_chat_history, get_user_id, search_chat_messages
+from backend.accounts import is_authenticated, is_admin
 from backend.utils import show_sidebar
+from backend.config import EXPORT_CONFIG, PROFILING_CONFIG
+from backend.export import export_bytes, export_file_name, export_messages, FORMATS
+from backend.profiling import profile_rerun
+
+
+SEARCH_PAGE_SIZE = 20
+
+
+# 대화 내용 검색
+def display_search(user_id):
+    """
+    검색어가 들어간 메시지를 관련도순으로 표시하고, 선택한 결과의 세션 ID 반환 (선택하지 않으면 None)
+    관리자는 전체 사용자 대화에서 검색 가능
+    """
+    query = st.text_input("대화 내용 검색", placeholder="예: GIL, 데코레이터")
+    if not query.strip():
+        return None
+
+    all_users = is_admin() and st.checkbox("전체 사용자 대화에서 검색")
+
+    # 검색어나 범위가 바뀌면 첫 페이지부터
+    search_key = (query, all_users)
+    if st.session_state.get("history_search_key") != search_key:
+        st.session_state["history_search_key"] = search_key
+        st.session_state["history_search_page"] = 0
+    page = st.session_state["history_search_page"]
+
+    # 다음 페이지가 있는지 확인하기 위해 한 행 더 조회
+    results = search_chat_messages(
+        query,
+        user_id=None if all_users else user_id,
+        limit=SEARCH_PAGE_SIZE + 1,
+        offset=page * SEARCH_PAGE_SIZE,
+    )
+    has_next = len(results) > SEARCH_PAGE_SIZE
+    results = results[:SEARCH_PAGE_SIZE]
+
+    if not results:
+        st.info("검색 결과가 없습니다.")
+        return None
+
+    selected_session_id = None
+    for result in results:
+        sender = "🧑‍💻 사용자" if result["sender"] == "user" else "🤖 챗봇"
+        owner = f" · {result['username']}" if all_users else ""
+        st.markdown(f"**{sender} ({result['timestamp']}) · 세션 {result['session_id']}{owner}**")
+        st.markdown(result["snippet"])
+        if st.button("이 세션 보기", key=f"history_search_{result['message_id']}"):
+            selected_session_id = result["session_id"]
+
+    # 페이지 이동
+    prev_col, page_col, next_col = st.columns([1, 2, 1])
+    if prev_col.button("이전", disabled=page == 0):
+        st.session_state["history_search_page"] = page - 1
+        st.rerun()
+    page_col.caption(f"{page + 1} 페이지")
+    if next_col.button("다음", disabled=not has_next):
+        st.session_state["history_search_page"] = page + 1
+        st.rerun()
+
+    st.markdown("---")
+    return selected_session_id
+
+
+# 특정 세션의 대화 내역 표시
+def display_session(session_id):
+    chat_history = get_chat_history(session_id)
+
+    if not chat_history:
+        st.info("이 세션에는 대화 기록이 없습니다.")
+        return
+
+    # 채팅 내역 표시
+    st.subheader(f"채팅 내역 (세션 ID: {session_id})")
+
+    for chat in chat_history:
+        sender = "🧑‍💻 사용자" if chat["sender"] == "user" else "🤖 챗봇"
+        st.markdown(f"**{sender} ({chat['timestamp']}):**")
+        st.write(chat["message"])
+        st.markdown("---")
+
+
+# 대화 내보내기
+def display_export(user_id, username, session_id):
+    """선택한 세션, 내 전체 면접, (관리자) 기간 내 전체 사용자 대화를 파일로 내려받기"""
+    with st.expander("대화 내보내기"):
+        scopes = {"session": "선택한 세션", "user": "내 전체 면접"}
+        if is_admin():
+            scopes["range"] = "기간 (전체 사용자)"
+        scope = st.radio("범위", options=scopes.keys(), format_func=scopes.get, horizontal=True)
+        fmt = st.selectbox("형식", options=FORMATS.keys())
+
+        options = {"user_id": user_id}
+        if scope == "session":
+            options["session_id"] = session_id
+        elif scope == "range":
+            period = st.date_input("기간", value=(datetime.date.today() - datetime.timedelta(days=29), datetime.date.today()))
+            if len(period) != 2:
+                return
+            options = {"user_id": None, "start_day": period[0], "end_day": period[1]}
+
+        # 다시 실행할 때마다 만들지 않도록 버튼을 누른 경우에만 생성
+        if not st.button("내보내기 파일 만들기"):
+            return
+        limit_mb = EXPORT_CONFIG["download_limit_mb"]
+        data = export_bytes(export_messages(fmt, **options), max_bytes=limit_mb * 1024 * 1024)
+        if data is None:
+            st.warning(f"{limit_mb}MB를 넘는 내보내기는 `python -m backend.export` 또는 API(`GET /exports`)를 사용하세요.")
+            return
+        file_name = export_file_name(
+            fmt,
+            options.get("session_id"),
+            username if scope != "range" else None,
+            options.get("start_day"),
+            options.get("end_day"),
+        )
+        st.download_button("다운로드", data, file_name=file_name, mime=FORMATS[fmt][0])
 
 
 # 채팅 히스토리 조회 페이지
@@ -21,6 +140,12 @@ def display_chat_history():
         st.error("사용자 정보를 찾을 수 없습니다.")
         return
 
+    # 검색 결과에서 세션을 고르면 해당 세션을 바로 표시
+    searched_session_id = display_search(user_id)
+    if searched_session_id is not None:
+        display_session(searched_session_id)
+        return
+
     # 사용자의 채팅 세션 목록 가져오기
     sessions = get_user_chat_sessions(user_id)
 
@@ -37,24 +162,15 @@ def display_chat_history():
     )
 
     # 특정 세션의 대화 내역 가져오기
-    chat_history = get_chat_history(selected_session_id)
+    display_session(selected_session_id)
 
-    if not chat_history:
-        st.info("이 세션에는 대화 기록이 없습니다.")
-        return
-
-    # 채팅 내역 표시
-    st.subheader(f"채팅 내역 (세션 ID: {selected_session_id})")
-
-    for chat in chat_history:
-        sender = "🧑‍💻 사용자" if chat["sender"] == "user" else "🤖 챗봇"
-        st.markdown(f"**{sender} ({chat['timestamp']}):**")
-        st.write(chat["message"])
-        st.markdown("---")
+    display_export(user_id, username, selected_session_id)
 
 
 # Streamlit 실행 시 메인 함수 호출
 if __name__ == "__main__":
-    st.title("📜 채팅 히스토리")
-    show_sidebar()
-    display_chat_history()
+    # 느린 재실행은 프로파일을 저장 (PROFILING_CONFIG로 켜는 경우에만)
+    with profile_rerun("history", PROFILING_CONFIG):
+        st.title("📜 채팅 히스토리")
+        show_sidebar()
+        display_chat_history()
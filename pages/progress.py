@@ -0,0 +1,55 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+from backend.accounts import is_authenticated
+from backend.db import get_score_percentile, get_score_trend, get_topic_scores, get_user_id
+from backend.utils import show_sidebar
+
+
+# 면접 성적 페이지 (evaluations 테이블만 조회)
+def display_progress():
+    """점수 추이, 약한 주제, 전체 사용자 대비 백분위 표시"""
+
+    if not is_authenticated():
+        st.warning("로그인이 필요합니다.")
+        return
+
+    user_id = get_user_id(st.session_state["user"])
+    if not user_id:
+        st.error("사용자 정보를 찾을 수 없습니다.")
+        return
+
+    days = st.selectbox("기간", options=[30, 90, 365], format_func=lambda d: f"최근 {d}일")
+    start_day = datetime.date.today() - datetime.timedelta(days=days - 1)
+
+    trend = get_score_trend(user_id, start_day)
+    if not trend:
+        st.info("선택한 기간에 점수가 기록된 평가가 없습니다.")
+        return
+
+    # 기간 요약 (전체 사용자 대비 위치)
+    rank = get_score_percentile(user_id, start_day)
+    cols = st.columns(3)
+    cols[0].metric("평가 수", f"{sum(row['evaluations'] for row in trend):,}")
+    if rank is not None:
+        cols[1].metric("평균 점수", f"{rank['score']:.1f} / 10")
+        cols[2].metric("전체 사용자 대비", f"상위 {100 - rank['percentile'] * 100:.0f}%", help=f"비교 사용자 {rank['users']}명")
+
+    # 날짜별 점수 추이
+    st.subheader("점수 추이")
+    st.line_chart(pd.DataFrame(trend).set_index("day")[["score", "accuracy", "completeness", "clarity"]])
+
+    # 주제별 평균 점수 (낮은 주제부터)
+    st.subheader("약한 주제")
+    topics = get_topic_scores(user_id)
+    if topics:
+        st.bar_chart(pd.DataFrame(topics).set_index("topic")["score"])
+        st.dataframe(pd.DataFrame(topics), hide_index=True, use_container_width=True)
+
+
+# Streamlit 실행 시 메인 함수 호출
+if __name__ == "__main__":
+    st.title("📈 면접 성적")
+    show_sidebar()
+    display_progress()
@@ -1,5 +1,6 @@
 import pytest
 import bcrypt
+from unittest.mock import patch
 from backend.accounts import (
     hash_password,
     verify_password,
@@ -11,6 +12,8 @@ from backend.accounts import (
     is_authenticated
 )
 from backend.init_db import init_database
+from backend.accounts import get_password_hash, bulk_register_users
+from backend.passwords import get_hash_rounds, PasswordHasher
 
 class TestAccounts:
     @pytest.fixture(autouse=True)
@@ -80,4 +83,59 @@ class TestAccounts:
 
         # 동일한 사용자명으로 다시 회원가입 시도 (성공해야 함)
         result = register_user(test_credentials["username"], test_credentials["password"])
-        assert result is True 
\ No newline at end of file
+        assert result is True 
+
+    def test_rehash_on_login(self, test_credentials):
+        """해싱 비용 설정이 바뀌면 로그인 성공 시 새 비용으로 다시 해싱"""
+        register_user(test_credentials["username"], test_credentials["password"])
+        old_hash = get_password_hash(test_credentials["username"])
+        old_rounds = get_hash_rounds(old_hash)
+
+        with patch("backend.accounts.get_password_hasher") as mock_get_hasher:
+            hasher = PasswordHasher(rounds=old_rounds - 1 if old_rounds > 4 else old_rounds + 1, workers=0)
+            mock_get_hasher.return_value = hasher
+
+            # 잘못된 비밀번호로는 재해싱하지 않음
+            assert authenticate(test_credentials["username"], test_credentials["wrong_password"]) is False
+            assert get_password_hash(test_credentials["username"]) == old_hash
+
+            assert authenticate(test_credentials["username"], test_credentials["password"]) is True
+
+        new_hash = get_password_hash(test_credentials["username"])
+        assert get_hash_rounds(new_hash) == hasher.rounds
+        assert authenticate(test_credentials["username"], test_credentials["password"]) is True
+
+    def test_bulk_register_users(self, test_credentials):
+        """일괄 등록: 신규 추가, 탈퇴 사용자 재활성화, 기존/중복/잘못된 행은 건너뜀"""
+        register_user("active_user", "pw1")
+        register_user("inactive_user", "pw2")
+        delete_user("inactive_user")
+
+        results = bulk_register_users(
+            [
+                (2, "new_user", "new_pw"),
+                (3, "inactive_user", "reactivated_pw"),
+                (4, "active_user", "other_pw"),
+                (5, "new_user", "duplicate_pw"),
+                (6, "", "no_username"),
+            ],
+            hasher=PasswordHasher(rounds=4, workers=0),
+        )
+
+        assert [result["status"] for result in results] == [
+            "created", "reactivated", "exists", "duplicate", "invalid"
+        ]
+        assert authenticate("new_user", "new_pw") is True
+        assert authenticate("new_user", "duplicate_pw") is False
+        assert authenticate("inactive_user", "reactivated_pw") is True
+        assert authenticate("active_user", "pw1") is True
+
+    def test_bulk_register_rejects_passwords_over_bcrypt_limit(self, test_credentials):
+        """bcrypt 최대 길이(72 bytes)를 넘는 비밀번호는 invalid로 표시하고 나머지 행은 등록"""
+        results = bulk_register_users(
+            [(2, "short_user", "ok"), (3, "long_user", "x" * 100), (4, "korean_user", "가" * 25)],
+            hasher=PasswordHasher(rounds=4, workers=0),
+        )
+
+        assert [result["status"] for result in results] == ["created", "invalid", "invalid"]
+        assert authenticate("short_user", "ok") is True
@@ -0,0 +1,126 @@
+import datetime
+import pytest
+from backend import analytics
+from backend.db import (
+    get_connection,
+    release_connection,
+    refresh_usage_rollups,
+    get_daily_usage,
+    get_user_usage,
+    get_usage_watermark,
+    delete_chat_session,
+)
+from backend.init_db import init_database
+
+DAY1 = datetime.datetime(2025, 3, 1, 10, 0, 0)
+DAY2 = datetime.datetime(2025, 3, 2, 9, 0, 0)
+
+
+def execute(sql, params=()):
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            row = cur.fetchone() if cur.description else None
+        conn.commit()
+        return row
+    finally:
+        release_connection(conn)
+
+
+def add_user(username):
+    return execute("INSERT INTO users (username, password) VALUES (%s, 'x') RETURNING id;", (username,))[0]
+
+
+def add_session(user_id, created_at, turns):
+    """질문 → (답변, 평가)를 turns번 저장, 평가는 답변 2초 뒤"""
+    session_id = execute(
+        "INSERT INTO chat_sessions (user_id, created_at) VALUES (%s, %s) RETURNING id;", (user_id, created_at)
+    )[0]
+    at = created_at
+    execute("INSERT INTO chat_messages (session_id, sender, message, timestamp) VALUES (%s, 'bot', '질문', %s);", (session_id, at))
+    for _ in range(turns):
+        at += datetime.timedelta(seconds=30)
+        execute("INSERT INTO chat_messages (session_id, sender, message, timestamp) VALUES (%s, 'user', '답변', %s);", (session_id, at))
+        at += datetime.timedelta(seconds=2)
+        execute("INSERT INTO chat_messages (session_id, sender, message, timestamp) VALUES (%s, 'bot', '평가', %s);", (session_id, at))
+    return session_id
+
+
+class TestAnalytics:
+    @pytest.fixture(autouse=True)
+    def setup_database(self):
+        """각 테스트 전에 데이터베이스 초기화"""
+        init_database()
+
+    def test_refresh_rolls_up_by_day_and_user(self):
+        alice, bob = add_user("alice"), add_user("bob")
+        add_session(alice, DAY1, turns=2)
+        add_session(alice, DAY1, turns=1)
+        add_session(bob, DAY2, turns=3)
+
+        result = refresh_usage_rollups(lag_seconds=0)
+        assert (result["sessions"], result["messages"]) == (3, 15)
+
+        daily = get_daily_usage(DAY1.date(), DAY2.date())
+        assert [(row["sessions"], row["active_users"], row["answers"], row["bot_messages"]) for row in daily] == [
+            (2, 1, 3, 5),
+            (1, 1, 3, 4),
+        ]
+        assert daily[0]["avg_latency"] == pytest.approx(2.0)  # 첫 질문은 응답 시간에서 제외
+        assert daily[0]["latency_count"] == 3
+
+        users = get_user_usage(DAY1.date(), DAY2.date())
+        assert [(row["username"], row["sessions"], row["answers"], row["active_days"]) for row in users] == [
+            ("alice", 2, 3, 1),
+            ("bob", 1, 3, 1),
+        ]
+
+    def test_refresh_is_incremental(self):
+        """다시 갱신하면 새로 추가된 행만 더하고, 삭제된 세션은 빼지 않음"""
+        alice = add_user("alice")
+        first = add_session(alice, DAY1, turns=1)
+        refresh_usage_rollups(lag_seconds=0)
+
+        assert refresh_usage_rollups(lag_seconds=0)["messages"] == 0
+        delete_chat_session(first)
+        add_session(alice, DAY1, turns=2)
+        result = refresh_usage_rollups(lag_seconds=0)
+        assert (result["sessions"], result["messages"]) == (1, 5)
+
+        day = get_daily_usage(DAY1.date(), DAY1.date())[0]
+        assert (day["sessions"], day["answers"], day["bot_messages"]) == (2, 3, 5)
+
+    def test_refresh_waits_for_lag(self):
+        """lag보다 최근에 저장된 행은 다음 갱신으로 미룸"""
+        alice = add_user("alice")
+        add_session(alice, DAY1, turns=1)
+        recent = datetime.datetime.now() + datetime.timedelta(days=1)  # 아직 lag 안쪽
+        add_session(alice, recent, turns=1)
+
+        result = refresh_usage_rollups(lag_seconds=60)
+        assert (result["sessions"], result["messages"]) == (1, 3)
+        assert get_daily_usage(recent.date(), recent.date()) == []
+
+    def test_refresh_if_stale(self):
+        config = {"lag": 0, "refresh_interval": 300}
+        assert get_usage_watermark()["refreshed_at"] is None
+        assert analytics.refresh_if_stale(config) is not None
+        assert get_usage_watermark()["age"] < 300
+        assert analytics.refresh_if_stale(config) is None
+        assert analytics.refresh_if_stale({**config, "refresh_interval": 0}) is not None
+
+    def test_summarize_usage(self):
+        daily = [
+            {"sessions": 2, "answers": 6, "latency_count": 6, "avg_latency": 1.0},
+            {"sessions": 2, "answers": 2, "latency_count": 2, "avg_latency": 5.0},
+            {"sessions": 0, "answers": 0, "latency_count": 0, "avg_latency": None},
+        ]
+        summary = analytics.summarize_usage(daily, users=[{"user_id": 1}, {"user_id": 2}])
+        assert summary == {
+            "sessions": 4,
+            "active_users": 2,
+            "answers": 8,
+            "answers_per_session": 2.0,
+            "avg_latency": pytest.approx(2.0),
+        }
@@ -0,0 +1,133 @@
+import json
+import pytest
+from unittest.mock import patch
+from langchain_core.documents import Document
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from backend.init_db import init_database
+from backend.accounts import register_user
+from backend.api import create_app
+from backend.state_store import MemoryStateStore, PostgresStateStore
+from tests.test_interview_service import ChunkedLLM
+
+
+def parse_sse(text):
+    """SSE 응답을 (event, data) 목록으로 변환"""
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestInterviewApi:
+    @pytest.fixture(autouse=True)
+    def setup_database(self):
+        init_database()
+        register_user("api_user", "api_password")
+
+    @pytest.fixture
+    def fakes(self):
+        with patch("backend.interview_service.get_openai_client", return_value=ChunkedLLM()), \
+             patch("backend.interview_service.retriever") as retriever:
+            retriever.invoke.side_effect = lambda query: [Document(page_content=f"문서 {retriever.invoke.call_count}")]
+            yield
+
+    @pytest.fixture
+    def client(self, fakes):
+        return TestClient(create_app(MemoryStateStore()))
+
+    @pytest.fixture
+    def headers(self, client):
+        response = client.post("/auth/login", json={"username": "api_user", "password": "api_password"})
+        assert response.status_code == 200
+        return {"Authorization": f"Bearer {response.json()['token']}"}
+
+    def test_login_rejects_wrong_password(self, client):
+        response = client.post("/auth/login", json={"username": "api_user", "password": "wrong"})
+        assert response.status_code == 401
+
+    def test_requires_token(self, client):
+        assert client.post("/interviews").status_code == 401
+        assert client.post("/interviews", headers={"Authorization": "Bearer invalid"}).status_code == 401
+
+    def test_interview_flow_with_sse(self, client, headers):
+        """면접 시작 → 답변 평가 스트리밍(SSE) → 다음 질문"""
+        started = client.post("/interviews", headers=headers).json()
+        interview_id = started["interview_id"]
+        assert started["question"]["content"] == "질문 1"
+        assert started["session_id"] is not None
+
+        response = client.post(f"/interviews/{interview_id}/answers", json={"answer": "제 답변"}, headers=headers)
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_sse(response.text)
+        assert [event for event, _ in events] == ["message", "token", "token", "token", "message", "done"]
+        assert events[0][1]["content"] == "제 답변"
+        assert events[4][1]["content"] == "좋은 답변입니다."
+        assert events[-1][1]["completion_tokens"] == 11
+
+        question = client.post(f"/interviews/{interview_id}/questions", headers=headers).json()["question"]
+        assert question["content"] == "질문 3"
+
+        detail = client.get(f"/interviews/{interview_id}", headers=headers).json()
+        assert [msg["role"] for msg in detail["messages"]] == ["assistant", "user", "assistant", "assistant"]
+
+    def test_websocket_answer(self, client, headers):
+        interview_id = client.post("/interviews", headers=headers).json()["interview_id"]
+        token = headers["Authorization"].split(" ")[1]
+
+        with client.websocket_connect(f"/interviews/{interview_id}/ws?token={token}") as ws:
+            ws.send_json({"type": "answer", "answer": "제 답변"})
+            events = []
+            while not events or events[-1]["event"] != "done":
+                events.append(ws.receive_json())
+
+        assert "".join(e["data"]["content"] for e in events if e["event"] == "token") == "좋은 답변입니다."
+
+    def test_end_interview_deletes_state(self, client, headers):
+        interview_id = client.post("/interviews", headers=headers).json()["interview_id"]
+
+        assert client.delete(f"/interviews/{interview_id}", headers=headers).status_code == 204
+        assert client.get(f"/interviews/{interview_id}", headers=headers).status_code == 404
+        assert client.delete(f"/interviews/{interview_id}", headers=headers).status_code == 404
+
+    def test_other_user_cannot_access(self, client, headers):
+        interview_id = client.post("/interviews", headers=headers).json()["interview_id"]
+        register_user("other_user", "other_password")
+        token = client.post("/auth/login", json={"username": "other_user", "password": "other_password"}).json()["token"]
+        response = client.get(f"/interviews/{interview_id}", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 404
+
+    def test_export_streams_own_transcripts(self, client, headers):
+        """일반 사용자는 자신의 대화만 내보내고, 관리자는 전체 사용자 대화를 내보냄"""
+        client.post("/interviews", headers=headers)
+        register_user("other_user", "other_password")
+
+        response = client.get("/exports?format=jsonl", headers=headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert "interviews-api_user.jsonl" in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [(row["username"], row["message"]) for row in rows] == [("api_user", "질문 1")]
+
+        assert client.get("/exports?user=other_user", headers=headers).status_code == 403
+        assert client.get("/exports?format=xlsx", headers=headers).status_code == 422
+        with patch.dict("backend.api.ADMIN_CONFIG", {"users": ["api_user"]}):
+            assert client.get("/exports?user=other_user", headers=headers).status_code == 200
+            assert client.get("/exports?user=nobody", headers=headers).status_code == 404
+
+    def test_replicas_share_postgres_store(self, fakes):
+        """postgres 저장소를 쓰면 면접 시작/답변/다음 질문을 서로 다른 프로세스(앱)가 나누어 처리"""
+        replicas = [TestClient(create_app(PostgresStateStore())) for _ in range(2)]
+        token = replicas[0].post("/auth/login", json={"username": "api_user", "password": "api_password"}).json()["token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        interview_id = replicas[0].post("/interviews", headers=headers).json()["interview_id"]
+        events = parse_sse(replicas[1].post(f"/interviews/{interview_id}/answers", json={"answer": "제 답변"}, headers=headers).text)
+        assert events[-1][0] == "done"
+        replicas[0].post(f"/interviews/{interview_id}/questions", headers=headers)
+
+        detail = replicas[1].get(f"/interviews/{interview_id}", headers=headers).json()
+        assert [msg["role"] for msg in detail["messages"]] == ["assistant", "user", "assistant", "assistant"]
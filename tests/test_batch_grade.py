@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from backend import resilience
+from backend.batch_grade import (
+    make_evaluator,
+    read_records,
+    load_completed_ids,
+    ResultWriter,
+    run_batch,
+    truncate_partial_line,
+)
+
+class TestBatchGrade:
+    @pytest.fixture
+    def csv_input(self, tmp_path):
+        path = tmp_path / "answers.csv"
+        path.write_text(
+            "id,question,answer\n"
+            "a1,GIL이란?,전역 인터프리터 락입니다.\n"
+            "a2,리스트와 튜플의 차이는?,변경 가능 여부입니다.\n"
+            "a3,데코레이터란?,\n",
+            encoding="utf-8",
+        )
+        return str(path)
+
+    @pytest.fixture
+    def fake_evaluate(self):
+        def evaluate(question, answer):
+            return f"평가: {answer}", {"input_tokens": 10, "output_tokens": 5}
+        return evaluate
+
+    def test_read_records(self, csv_input, tmp_path):
+        """CSV/JSONL 입력 읽기 (answer가 없는 레코드는 건너뜀)"""
+        records = list(read_records(csv_input))
+        assert [record["id"] for record in records] == ["a1", "a2"]
+
+        jsonl_input = tmp_path / "answers.jsonl"
+        jsonl_input.write_text(json.dumps({"question": "Q", "answer": "A"}, ensure_ascii=False) + "\n", encoding="utf-8")
+        assert list(read_records(str(jsonl_input))) == [{"id": "1", "question": "Q", "answer": "A"}]
+
+        with pytest.raises(ValueError):
+            list(read_records(str(tmp_path / "answers.txt")))
+
+    @pytest.mark.parametrize("suffix", [".jsonl", ".csv"])
+    def test_run_batch_and_resume(self, csv_input, fake_evaluate, tmp_path, suffix):
+        """결과를 스트리밍 저장하고, 다시 실행하면 완료된 레코드는 건너뜀"""
+        output = str(tmp_path / f"results{suffix}")
+        with ResultWriter(output) as writer:
+            stats = run_batch(read_records(csv_input), fake_evaluate, writer, concurrency=2)
+        assert stats["graded"] == 2
+        assert stats["prompt_tokens"] == 20
+        assert stats["completion_tokens"] == 10
+        assert load_completed_ids(output) == {"a1", "a2"}
+
+        completed = load_completed_ids(output)
+        with ResultWriter(output) as writer:
+            stats = run_batch(read_records(csv_input), fake_evaluate, writer, completed_ids=completed)
+        assert stats["graded"] == 0
+        assert stats["skipped"] == 2
+        assert load_completed_ids(output) == {"a1", "a2"}
+
+    def test_resume_after_interrupted_write(self, csv_input, fake_evaluate, tmp_path):
+        """기록 도중 중단되어 남은 불완전한 마지막 줄은 건너뛰고 잘라 낸 뒤 해당 레코드를 다시 평가"""
+        output = tmp_path / "results.jsonl"
+        complete = json.dumps({"id": "a1", "evaluation": "평가"}, ensure_ascii=False) + "\n"
+        output.write_text(complete + '{"id": "a2", "evalua', encoding="utf-8")
+
+        completed = load_completed_ids(str(output))
+        assert completed == {"a1"}
+        with ResultWriter(str(output)) as writer:
+            stats = run_batch(read_records(csv_input), fake_evaluate, writer, completed_ids=completed)
+
+        assert (stats["graded"], stats["skipped"]) == (1, 1)
+        lines = output.read_text(encoding="utf-8").splitlines()
+        assert lines[0] == complete.strip()
+        assert [json.loads(line)["id"] for line in lines] == ["a1", "a2"]
+
+    def test_truncate_partial_line(self, tmp_path):
+        path = tmp_path / "results.jsonl"
+        path.write_bytes(b"line1\nline2\npartial")
+        assert truncate_partial_line(str(path), chunk_size=4) == 7
+        assert path.read_bytes() == b"line1\nline2\n"
+        assert truncate_partial_line(str(path)) == 0
+
+        path.write_bytes(b"no newline at all")
+        truncate_partial_line(str(path))
+        assert path.read_bytes() == b""
+
+    def test_evaluator_retries_transient_failures(self, csv_input, tmp_path):
+        """retriever/LLM의 일시적 실패는 resilience 정책으로 재시도하여 평가 결과를 기록"""
+        calls = {"llm": 0, "retriever": 0}
+
+        def flaky_llm(prompt):
+            calls["llm"] += 1
+            if calls["llm"] == 1:
+                raise RuntimeError("429 Too Many Requests")
+            return AIMessage(content="좋은 답변입니다.")
+
+        def flaky_retrieve(question):
+            calls["retriever"] += 1
+            if calls["retriever"] == 1:
+                raise TimeoutError("pinecone timeout")
+            return [Document(page_content="GIL 설명")]
+
+        original = dict(resilience._dependencies)
+        resilience.configure({
+            "openai": {"attempts": 2, "backoff_base": 0.001},
+            "pinecone": {"attempts": 2, "backoff_base": 0.001},
+        })
+        output = str(tmp_path / "results.jsonl")
+        try:
+            with patch("backend.config.get_openai_client", return_value=RunnableLambda(flaky_llm)), \
+                 patch("backend.config.retriever") as retriever:
+                retriever.invoke.side_effect = flaky_retrieve
+                with ResultWriter(output) as writer:
+                    stats = run_batch(read_records(csv_input), make_evaluator(), writer, concurrency=1)
+        finally:
+            resilience._dependencies.clear()
+            resilience._dependencies.update(original)
+
+        assert (stats["graded"], stats["failed"]) == (2, 0)
+        assert calls == {"llm": 3, "retriever": 3}
+        assert load_completed_ids(output) == {"a1", "a2"}
+
+    def test_failed_records_are_retried(self, csv_input, tmp_path):
+        """실패한 레코드는 기록하지 않아 다음 실행 때 다시 평가"""
+        def flaky(question, answer):
+            if "GIL" in question:
+                raise RuntimeError("timeout")
+            return "평가", {}
+
+        output = str(tmp_path / "results.jsonl")
+        with ResultWriter(output) as writer:
+            stats = run_batch(read_records(csv_input), flaky, writer)
+        assert stats["failed"] == 1
+        assert load_completed_ids(output) == {"a2"}
+
+    def test_concurrency_limit(self, tmp_path):
+        """동시에 실행되는 평가 수가 concurrency를 넘지 않음"""
+        lock = threading.Lock()
+        running = {"now": 0, "max": 0}
+
+        def slow(question, answer):
+            with lock:
+                running["now"] += 1
+                running["max"] = max(running["max"], running["now"])
+            time.sleep(0.01)
+            with lock:
+                running["now"] -= 1
+            return "평가", {}
+
+        records = ({"id": str(i), "question": "Q", "answer": "A"} for i in range(20))
+        with ResultWriter(str(tmp_path / "results.jsonl")) as writer:
+            stats = run_batch(records, slow, writer, concurrency=3)
+        assert stats["graded"] == 20
+        assert running["max"] <= 3
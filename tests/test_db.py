@@ -11,8 +11,11 @@ from backend.db import (
     delete_chat_messages,
     delete_chat_session,
     delete_all_user_sessions,
-    get_user_id
+    get_user_id,
+    build_search_query,
+    search_chat_messages,
 )
+from backend.init_db import init_database
 
 class TestDB:
     @pytest.fixture
@@ -146,4 +149,68 @@ class TestDB:
         
         user_id = get_user_id("test_user")
         assert user_id == 1
-        mock_cur.execute.assert_called_once()
\ No newline at end of file
+        mock_cur.execute.assert_called_once()
+
+    def test_build_search_query(self):
+        """검색어를 접두사 tsquery로 변환 (연산자/특수문자 제거)"""
+        assert build_search_query("GIL 동작") == "gil:* & 동작:*"
+        assert build_search_query("a & b | !c's") == "a:* & b:* & c:* & s:*"
+        assert build_search_query("  ?! ") is None
+
+    def test_search_chat_messages_scope(self, mock_connection_pool, mock_connection):
+        """사용자를 지정하면 해당 사용자 세션으로 검색 범위 제한"""
+        mock_conn, mock_cur = mock_connection
+        mock_connection_pool.getconn.return_value = mock_conn
+        mock_cur.fetchall.return_value = []
+
+        search_chat_messages("GIL", user_id=3, limit=10, offset=20)
+        sql, params = mock_cur.execute.call_args[0]
+        assert "s.user_id = %(user_id)s" in sql
+        assert params == {"query": "gil:*", "user_id": 3, "limit": 10, "offset": 20}
+
+        search_chat_messages("GIL")
+        assert "s.user_id = %(user_id)s" not in mock_cur.execute.call_args[0][0]
+
+        mock_cur.execute.reset_mock()
+        assert search_chat_messages("!!") == []
+        mock_cur.execute.assert_not_called()
+
+
+class TestMessageSearch:
+    @pytest.fixture
+    def sessions(self):
+        """두 사용자의 세션에 메시지 저장 (실제 DB)"""
+        init_database()
+        conn = get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("INSERT INTO users (username, password) VALUES ('alice', 'x'), ('bob', 'x') RETURNING id;")
+                alice, bob = (row[0] for row in cur.fetchall())
+            conn.commit()
+        finally:
+            release_connection(conn)
+        alice_session, bob_session = create_chat_session(alice), create_chat_session(bob)
+        insert_chat_message(alice_session, "bot", "파이썬의 GIL에 대해 설명해 주세요.")
+        insert_chat_message(alice_session, "user", "GIL은 한 번에 하나의 스레드만 바이트코드를 실행하게 합니다. GIL 때문에 CPU 작업은 멀티프로세싱을 씁니다.")
+        insert_chat_message(alice_session, "bot", "데코레이터의 동작 원리를 설명해 주세요.")
+        insert_chat_message(bob_session, "user", "GIL은 I/O 대기 중에는 해제됩니다.")
+        return alice, alice_session, bob_session
+
+    def test_search_ranks_and_scopes_by_user(self, sessions):
+        """조사가 붙은 단어도 찾고, 많이 언급한 메시지를 먼저, 다른 사용자 메시지는 제외"""
+        alice, alice_session, _ = sessions
+        results = search_chat_messages("gil", user_id=alice)
+        assert [row["sender"] for row in results] == ["user", "bot"]
+        assert {row["session_id"] for row in results} == {alice_session}
+        assert "**GIL은**" in results[0]["snippet"]
+
+    def test_search_all_users_and_pagination(self, sessions):
+        _, alice_session, bob_session = sessions
+        results = search_chat_messages("GIL")
+        assert {row["username"] for row in results} == {"alice", "bob"}
+
+        pages = [search_chat_messages("GIL", limit=1, offset=i) for i in range(4)]
+        assert [row["message_id"] for page in pages[:3] for row in page] == [row["message_id"] for row in results]
+        assert pages[3] == []
+        assert search_chat_messages("GIL 데코레이터") == []
+
@@ -0,0 +1,214 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from backend.db import (
+    activate_embedding_index,
+    get_active_embedding_index,
+    get_embedding_index,
+    list_embedding_indexes,
+    register_embedding_index,
+)
+from backend.embedding_registry import (
+    ActiveRetriever,
+    check_index,
+    default_record,
+    embedding_config,
+    EmbeddingMismatch,
+    same_index,
+    validate,
+)
+from backend.init_db import init_database
+from backend.projection import Projection, ProjectedEmbeddings
+
+CONFIG = {"backend": "openai", "model": None, "query_prefix": "", "document_prefix": "", "threads": 2}
+
+
+def record(index_name="idx-a", model="text-embedding-ada-002", dimension=1536, **kwargs):
+    return {
+        "index_name": index_name, "namespace": "ns", "model": model, "dimension": dimension,
+        "query_prefix": "", "document_prefix": "", "projection": "", **kwargs,
+    }
+
+
+class TestRecords:
+    def test_default_record_uses_model_conventions(self):
+        assert default_record("idx", "ns", CONFIG) == record("idx")
+        e5 = default_record("idx", "ns", {**CONFIG, "backend": "local", "model": "intfloat/multilingual-e5-small"})
+        assert (e5["dimension"], e5["query_prefix"], e5["document_prefix"]) == (384, "query: ", "passage: ")
+
+    def test_embedding_config_takes_backend_from_model(self):
+        config = embedding_config(record(model="intfloat/multilingual-e5-small", query_prefix="query: "), CONFIG)
+        assert (config["backend"], config["model"], config["query_prefix"], config["threads"]) == (
+            "local", "intfloat/multilingual-e5-small", "query: ", 2,
+        )
+
+    def test_default_record_with_projection(self, tmp_path):
+        path = str(tmp_path / "ada-256.npz")
+        Projection(np.zeros((256, 1536))).save(path)
+
+        reduced = default_record("idx", "ns", {**CONFIG, "projection": path})
+
+        assert (reduced["dimension"], reduced["projection"]) == (256, path)
+        assert embedding_config(reduced, CONFIG)["projection"] == path
+        assert not same_index(reduced, record("idx"))
+
+    def test_same_index_ignores_status(self):
+        assert same_index(record(status="active"), record())
+        assert not same_index(record(), record(model="text-embedding-3-small"))
+        assert not same_index(record(), None)
+
+
+class TestValidate:
+    def test_matching_dimensions(self):
+        validate(record(), index_dimension=1536, embedding_dimension=None)
+
+    def test_index_dimension_mismatch(self):
+        with pytest.raises(EmbeddingMismatch, match="Pinecone 인덱스 차원 384 != 1536"):
+            validate(record(), index_dimension=384)
+
+    def test_registered_dimension_disagrees_with_model(self):
+        with pytest.raises(EmbeddingMismatch, match="모델 목록의 차원 1536 != 384"):
+            validate(record(dimension=384))
+
+    def test_unknown_local_model_checked_against_output(self):
+        validate(record(model="/models/custom", dimension=512), index_dimension=512, embedding_dimension=512)
+        with pytest.raises(EmbeddingMismatch, match="임베딩 모델 출력 차원 256"):
+            validate(record(model="/models/custom", dimension=512), embedding_dimension=256)
+
+    def test_projected_index(self):
+        projection = Projection(np.zeros((256, 1536)))
+        validate(record(dimension=256, projection="p.npz"), index_dimension=256, embedding_dimension=256,
+                 projection=projection)
+        with pytest.raises(EmbeddingMismatch, match="모델 목록의 차원 3072 != 1536"):
+            validate(record(model="text-embedding-3-large", dimension=256, projection="p.npz"), projection=projection)
+        with pytest.raises(EmbeddingMismatch, match="투영 출력 차원 256 != 128"):
+            validate(record(dimension=128, projection="p.npz"), projection=projection)
+        with pytest.raises(EmbeddingMismatch, match="적용되지 않았습니다"):
+            validate(record(dimension=256, projection="p.npz"), index_dimension=256)
+
+    def test_check_index_uses_embedding_projection(self):
+        pc = MagicMock()
+        pc.describe_index.return_value = SimpleNamespace(dimension=256)
+        embeddings = ProjectedEmbeddings(MagicMock(), Projection(np.zeros((256, 1536))))
+
+        check_index(pc, record(dimension=256, projection="p.npz"), embeddings)
+        with pytest.raises(EmbeddingMismatch, match="Pinecone 인덱스 차원 256 != 1536"):
+            check_index(pc, record(), MagicMock(dimension=None))
+
+    def test_check_index_describes_pinecone_index(self):
+        pc = MagicMock()
+        pc.describe_index.return_value = SimpleNamespace(dimension=1024)
+        with pytest.raises(EmbeddingMismatch):
+            check_index(pc, record(), MagicMock(dimension=None))
+        pc.describe_index.assert_called_once_with("idx-a")
+
+    def test_check_index_skips_unavailable_index_dimension(self):
+        pc = MagicMock()
+        pc.describe_index.side_effect = RuntimeError("down")
+        check_index(pc, record(), SimpleNamespace())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestActiveRetriever:
+    @pytest.fixture
+    def retriever(self, monkeypatch):
+        active = {"record": None}
+        opened = []
+
+        def open_vectorstore(rec):
+            if rec["model"] == "broken":
+                raise EmbeddingMismatch("broken")
+            opened.append(rec["index_name"])
+            store = MagicMock()
+            store.as_retriever.return_value.invoke.side_effect = lambda query: [f"{rec['index_name']}:{query}"]
+            return store
+
+        clock = FakeClock()
+        retriever = ActiveRetriever(
+            record("default"), open_vectorstore, search_type="mmr", search_kwargs={"k": 5}, refresh_interval=30, clock=clock
+        )
+        monkeypatch.setattr(retriever, "_active_record", lambda: active["record"])
+        return retriever, active, opened, clock
+
+    def test_uses_default_until_index_is_registered(self, retriever):
+        retriever, active, opened, clock = retriever
+
+        assert retriever.invoke("q") == ["default:q"]
+        assert retriever.record["index_name"] == "default"
+        assert (retriever.search_type, retriever.search_kwargs) == ("mmr", {"k": 5})
+
+    def test_switches_after_refresh_interval(self, retriever):
+        retriever, active, opened, clock = retriever
+        retriever.invoke("q")
+
+        active["record"] = record("idx-b", status="active")
+        assert retriever.invoke("q") == ["default:q"]  # 확인 주기 전에는 그대로
+        clock.now = 31
+        assert retriever.invoke("q") == ["idx-b:q"]
+        clock.now = 62
+        retriever.invoke("q")
+        assert opened == ["default", "idx-b"]  # 같은 인덱스면 다시 만들지 않음
+
+    def test_keeps_current_index_when_switch_fails_or_lookup_fails(self, retriever):
+        retriever, active, opened, clock = retriever
+        active["record"] = record("idx-b")
+        retriever.invoke("q")
+
+        active["record"] = record("idx-c", model="broken")
+        clock.now = 31
+        assert retriever.invoke("q") == ["idx-b:q"]
+
+        active["record"] = None  # DB 조회 실패
+        clock.now = 62
+        assert retriever.invoke("q") == ["idx-b:q"]
+
+
+class TestRegistryDb:
+    @pytest.fixture(autouse=True)
+    def setup_database(self):
+        init_database()
+
+    def test_register_and_activate(self):
+        assert register_embedding_index("idx-a", "ns", "text-embedding-ada-002", 1536)
+        assert register_embedding_index("idx-b", "ns", "intfloat/multilingual-e5-small", 384, "query: ", "passage: ")
+        assert get_active_embedding_index() is None
+        assert get_embedding_index("idx-b")["status"] == "building"
+
+        assert activate_embedding_index("idx-a")
+        assert activate_embedding_index("idx-b")
+
+        active = get_active_embedding_index()
+        assert (active["index_name"], active["query_prefix"], active["dimension"]) == ("idx-b", "query: ", 384)
+        assert active["activated_at"] is not None
+        assert [(row["index_name"], row["status"]) for row in list_embedding_indexes()] == [
+            ("idx-b", "active"), ("idx-a", "standby"),
+        ]
+
+    def test_register_projection(self):
+        assert register_embedding_index("idx-a", "ns", "text-embedding-ada-002", 256, projection="ada-256.npz")
+        assert get_embedding_index("idx-a")["projection"] == "ada-256.npz"
+        assert register_embedding_index("idx-b", "ns", "text-embedding-ada-002", 1536)
+        assert get_embedding_index("idx-b")["projection"] == ""
+
+    def test_active_index_cannot_be_redefined(self):
+        register_embedding_index("idx-a", "ns", "text-embedding-ada-002", 1536)
+        activate_embedding_index("idx-a")
+
+        assert not register_embedding_index("idx-a", "ns", "intfloat/multilingual-e5-small", 384)
+        assert get_embedding_index("idx-a")["model"] == "text-embedding-ada-002"
+
+    def test_activate_unknown_index_keeps_current(self):
+        register_embedding_index("idx-a", "ns", "text-embedding-ada-002", 1536)
+        activate_embedding_index("idx-a")
+
+        assert not activate_embedding_index("missing")
+        assert get_active_embedding_index()["index_name"] == "idx-a"
@@ -0,0 +1,116 @@
+import sys
+import types
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from backend import embeddings as embeddings_module
+from backend.embeddings import create_embeddings, load_model, LocalEmbeddings
+from backend.metrics import InstrumentedEmbeddings
+from benchmarks.embedding_bench import measure
+
+
+class FakeSentenceTransformer:
+    """문장 길이로 만든 2차원 벡터를 돌려주는 모델 (생성/호출 기록)"""
+
+    instances = []
+
+    def __init__(self, model, device=None, cache_folder=None, local_files_only=False):
+        self.options = {"model": model, "device": device, "cache_folder": cache_folder, "local_files_only": local_files_only}
+        self.calls = []
+        FakeSentenceTransformer.instances.append(self)
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False, **kwargs):
+        self.calls.append(("encode", list(texts), batch_size))
+        return np.array([[len(text), 1.0] for text in texts])
+
+    def encode_multi_process(self, texts, pool, batch_size=32, normalize_embeddings=False):
+        self.calls.append(("encode_multi_process", list(texts), batch_size))
+        return np.array([[len(text), 2.0] for text in texts])
+
+    def start_multi_process_pool(self, devices):
+        self.calls.append(("start_pool", devices))
+        return object()
+
+    def stop_multi_process_pool(self, pool):
+        self.calls.append(("stop_pool",))
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    FakeSentenceTransformer.instances = []
+    torch = types.SimpleNamespace(set_num_threads=MagicMock())
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(SentenceTransformer=FakeSentenceTransformer))
+    monkeypatch.setitem(sys.modules, "torch", torch)
+    monkeypatch.setattr(embeddings_module, "_models", {})
+    return torch
+
+
+class TestLocalEmbeddings:
+    def test_model_loaded_once_per_process(self, fake_model):
+        first = LocalEmbeddings("model-a", threads=3, offline=True, cache_dir="/models")
+        second = LocalEmbeddings("model-a")
+
+        first.embed_query("질문")
+        second.embed_documents(["문서"])
+
+        assert len(FakeSentenceTransformer.instances) == 1
+        assert FakeSentenceTransformer.instances[0].options == {
+            "model": "model-a", "device": "cpu", "cache_folder": "/models", "local_files_only": True,
+        }
+        fake_model.set_num_threads.assert_called_once_with(3)
+        assert load_model("model-a", "/models") is first.model
+
+    def test_prefixes_and_batch_size(self, fake_model):
+        local = LocalEmbeddings("model-e5", batch_size=8, query_prefix="query: ", document_prefix="passage: ")
+
+        assert local.embed_query("GIL") == [len("query: GIL"), 1.0]
+        assert local.embed_documents(["a", "bb"]) == [[len("passage: a"), 1.0], [len("passage: bb"), 1.0]]
+        assert local.model.calls[-1] == ("encode", ["passage: a", "passage: bb"], 8)
+        assert local.dimension == 2
+
+    def test_bulk_uses_process_pool_and_reuses_it(self, fake_model):
+        local = LocalEmbeddings("model-b", batch_size=2, processes=2)
+
+        assert local.embed_documents(["x"]) == [[1, 1.0]]  # 작은 요청은 현재 프로세스
+        local.embed_documents(["a", "b", "c", "d"])
+        local.embed_documents(["e", "f", "g", "h"])
+        local.close()
+
+        kinds = [call[0] for call in local.model.calls]
+        assert kinds == ["encode", "start_pool", "encode_multi_process", "encode_multi_process", "stop_pool"]
+        assert local.model.calls[1] == ("start_pool", ["cpu", "cpu"])
+
+
+class TestCreateEmbeddings:
+    def test_local_backend(self, fake_model):
+        created = create_embeddings({"backend": "local", "model": "model-c", "threads": 2, "batch_size": 16})
+
+        assert isinstance(created, InstrumentedEmbeddings)
+        assert created.model_name == "model-c" and created.batch_size == 16 and created.threads == 2
+
+    def test_openai_backend(self):
+        with patch("langchain_openai.OpenAIEmbeddings") as openai_embeddings:
+            created = create_embeddings({"backend": "openai", "model": None}, api_key="key")
+
+        openai_embeddings.assert_called_once_with(api_key="key")
+        assert isinstance(created, InstrumentedEmbeddings)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_embeddings({"backend": "cohere"})
+
+
+def test_bench_measure_reports_latency_and_throughput():
+    fake = MagicMock()
+    fake.embed_query.return_value = [0.0] * 4
+    fake.embed_documents.side_effect = lambda texts: [[0.0] * 4 for _ in texts]
+
+    report = measure("fake", fake, ["q1", "q2", "q3"], [f"d{i}" for i in range(10)], batch_size=4)
+
+    assert report["embed_query"]["count"] == 3
+    assert report["dimension"] == 4 and report["docs"] == 10
+    assert [len(call.args[0]) for call in fake.embed_documents.call_args_list] == [4, 4, 2]
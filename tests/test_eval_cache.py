@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import patch
+from backend.eval_cache import (
+    EvaluationCache,
+    normalize_answer,
+    make_cache_key,
+    get_evaluation_cache,
+)
+
+class TestEvalCache:
+    @pytest.fixture
+    def cache(self):
+        return EvaluationCache(max_size=2, ttl=60)
+
+    @pytest.fixture
+    def sample(self):
+        return {
+            "question": "파이썬의 GIL이란 무엇인가요?",
+            "answer": "GIL은  Global Interpreter Lock 입니다.",
+            "context": "파이썬의 GIL에 대한 설명",
+            "model": "gpt-4o-mini",
+        }
+
+    def test_normalize_answer(self):
+        """공백/대소문자 정규화 테스트"""
+        assert normalize_answer("  GIL은\n Global  Lock ") == "gil은 global lock"
+
+    def test_cache_key(self, sample):
+        """정규화된 답변은 같은 키, 문서/모델이 다르면 다른 키"""
+        key = make_cache_key(**sample)
+        assert key == make_cache_key(sample["question"], "gil은 global interpreter lock 입니다.", sample["context"], sample["model"])
+        assert key != make_cache_key(sample["question"], sample["answer"], "다른 문서", sample["model"])
+        assert key != make_cache_key(sample["question"], sample["answer"], sample["context"], "gpt-4o")
+
+    def test_get_and_stats(self, cache, sample):
+        """캐시 적중/미스 및 절약량 통계 테스트"""
+        assert cache.get(**sample) is None
+        cache.set(**sample, evaluation="좋은 답변입니다.", total_tokens=120, latency=1.5)
+        assert cache.get(**sample) == "좋은 답변입니다."
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["saved_tokens"] == 120
+        assert stats["saved_latency"] == 1.5
+
+    def test_ttl_expiry(self, cache, sample):
+        """TTL이 지나면 캐시 미스"""
+        with patch("backend.eval_cache.time.time", return_value=1000.0):
+            cache.set(**sample, evaluation="평가")
+        with patch("backend.eval_cache.time.time", return_value=1061.0):
+            assert cache.get(**sample) is None
+        assert cache.stats()["size"] == 0
+
+    def test_lru_eviction(self, cache, sample):
+        """최대 크기를 넘으면 가장 오래 사용되지 않은 항목 제거"""
+        for i in range(3):
+            cache.set(f"질문 {i}", "답변", "", "m", f"평가 {i}")
+        assert cache.get("질문 0", "답변", "", "m") is None
+        assert cache.get("질문 2", "답변", "", "m") == "평가 2"
+
+    def test_get_evaluation_cache_disabled(self):
+        """설정에서 꺼져 있으면 None 반환"""
+        assert get_evaluation_cache({"enabled": False}) is None
+
+    def test_invalid_backend(self):
+        """지원하지 않는 백엔드"""
+        with pytest.raises(ValueError):
+            EvaluationCache(backend="redis")
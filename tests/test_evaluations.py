@@ -0,0 +1,148 @@
+import datetime
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.runnables import Runnable
+from backend import interview_service as service
+from backend.db import (
+    create_chat_session,
+    get_connection,
+    get_score_percentile,
+    get_score_trend,
+    get_topic_scores,
+    release_connection,
+)
+from backend.evaluations import parse_evaluation, ScoreFilter
+from backend.init_db import init_database
+
+TOPICS = ["데코레이터", "동시성/GIL"]
+SCORED = (
+    "평가:\n핵심은 맞지만 예시가 부족합니다.\n\n모범 답안:\nGIL은 한 번에 한 스레드만 실행합니다.\n\n"
+    '<score>{"score": 7, "accuracy": 8, "completeness": 6, "clarity": 7, "topic": "동시성/GIL"}</score>'
+)
+
+
+class TestParseEvaluation:
+    def test_splits_body_and_scores(self):
+        body, evaluation = parse_evaluation(SCORED, TOPICS)
+        assert body.endswith("GIL은 한 번에 한 스레드만 실행합니다.")
+        assert "<score>" not in body
+        assert evaluation == {
+            "score": 7, "accuracy": 8, "completeness": 6, "clarity": 7,
+            "topic": "동시성/GIL",
+            "model_answer": "GIL은 한 번에 한 스레드만 실행합니다.",
+        }
+
+    def test_unknown_topic_and_missing_close_tag(self):
+        _, evaluation = parse_evaluation(
+            '평가: 좋음 <score>{"score": 9.4, "accuracy": 9, "completeness": 9, "clarity": 10, "topic": "우주"}', TOPICS
+        )
+        assert (evaluation["score"], evaluation["topic"], evaluation["model_answer"]) == (9, "기타", None)
+
+    @pytest.mark.parametrize("text", [
+        "점수 블록이 없는 평가",
+        '평가 <score>{"score": 11, "accuracy": 1, "completeness": 1, "clarity": 1}</score>',
+        '평가 <score>{"score": 5}</score>',
+        "평가 <score>not json</score>",
+    ])
+    def test_invalid_blocks_keep_body_only(self, text):
+        body, evaluation = parse_evaluation(text, TOPICS)
+        assert evaluation is None
+        assert body.startswith("점수 블록이 없는 평가" if "<score>" not in text else "평가")
+
+    def test_score_filter_hides_block_split_across_chunks(self):
+        chunks = []
+        score_filter = ScoreFilter(chunks.append)
+        for piece in ["평가: 좋", "습니다. <sc", "ore>{\"score\"", ": 7}</score>"]:
+            score_filter(piece)
+        score_filter.flush()
+        assert "".join(chunks) == "평가: 좋습니다. "
+
+        chunks.clear()
+        score_filter = ScoreFilter(chunks.append)
+        for piece in ["a <s", "mall> 태그 아님"]:
+            score_filter(piece)
+        score_filter.flush()
+        assert "".join(chunks) == "a <small> 태그 아님"
+
+
+class ScoredLLM(Runnable):
+    """점수 블록을 붙인 평가를 조각으로 스트리밍하는 LLM"""
+
+    def __init__(self, text):
+        self.text = text
+
+    def invoke(self, input, config=None, **kwargs):
+        return AIMessage(content=self.text)
+
+    def stream(self, input, config=None, **kwargs):
+        for i in range(0, len(self.text), 9):
+            yield AIMessageChunk(content=self.text[i:i + 9])
+
+
+def score_block(score, topic):
+    return f'평가: ... <score>{{"score": {score}, "accuracy": {score}, "completeness": {score}, "clarity": {score}, "topic": "{topic}"}}</score>'
+
+
+class TestStoredEvaluations:
+    @pytest.fixture(autouse=True)
+    def users(self):
+        init_database()
+        conn = get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("INSERT INTO users (username, password) VALUES ('kim', 'x'), ('lee', 'x'), ('park', 'x') RETURNING id;")
+                self.kim, self.lee, self.park = (row[0] for row in cur.fetchall())
+            conn.commit()
+        finally:
+            release_connection(conn)
+
+    def answer(self, user_id, text, on_chunk=None):
+        state = service.new_state(session_id=create_chat_session(user_id), generated_question="GIL이란?")
+        with patch("backend.interview_service.get_openai_client", return_value=ScoredLLM(text)), \
+             patch.dict("backend.interview_service.EVAL_CACHE_CONFIG", {"enabled": False}):
+            return service.submit_answer(state, "제 답변", on_chunk=on_chunk)
+
+    def test_submit_answer_stores_scores_and_hides_block(self):
+        chunks = []
+        replies = self.answer(self.kim, SCORED, on_chunk=chunks.append)
+        assert "<score>" not in "".join(chunks)
+        assert replies[0]["content"] == parse_evaluation(SCORED)[0]
+
+        conn = get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT e.score, e.topic, e.question, e.model_answer, m.message
+                    FROM evaluations e JOIN chat_messages m ON m.id = e.message_id;
+                """)
+                score, topic, question, model_answer, message = cur.fetchone()
+        finally:
+            release_connection(conn)
+        assert (score, topic, question) == (7, "동시성/GIL", "GIL이란?")
+        assert model_answer == "GIL은 한 번에 한 스레드만 실행합니다."
+        assert message == replies[0]["content"]
+
+    def test_unscored_evaluation_is_not_stored(self):
+        self.answer(self.kim, "점수 없는 평가")
+        assert get_score_trend(self.kim) == []
+
+    def test_progress_queries(self):
+        for score, topic in [(4, "데코레이터"), (6, "데코레이터"), (9, "동시성/GIL")]:
+            self.answer(self.kim, score_block(score, topic))
+        self.answer(self.lee, score_block(3, "데코레이터"))
+        self.answer(self.park, score_block(10, "데코레이터"))
+
+        trend = get_score_trend(self.kim, datetime.date.today())
+        assert [(row["evaluations"], round(row["score"], 2)) for row in trend] == [(3, 6.33)]
+
+        topics = get_topic_scores(self.kim)
+        assert [(row["topic"], row["evaluations"], row["score"]) for row in topics] == [
+            ("데코레이터", 2, 5.0),
+            ("동시성/GIL", 1, 9.0),
+        ]
+        assert [row["topic"] for row in get_topic_scores(self.kim, min_evaluations=2)] == ["데코레이터"]
+
+        rank = get_score_percentile(self.kim)
+        assert (rank["percentile"], rank["users"]) == (0.5, 3)
+        assert get_score_percentile(self.kim, datetime.date.today() + datetime.timedelta(days=2)) is None
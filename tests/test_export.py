@@ -0,0 +1,90 @@
+import csv
+import datetime
+import io
+import json
+import pytest
+from backend import db
+from backend.db import create_chat_session, get_connection, insert_chat_message, release_connection
+from backend.export import export_bytes, export_file_name, export_messages, iter_export, main
+from backend.init_db import init_database
+
+
+def add_user(username):
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("INSERT INTO users (username, password) VALUES (%s, 'x') RETURNING id;", (username,))
+            user_id = cur.fetchone()[0]
+        conn.commit()
+        return user_id
+    finally:
+        release_connection(conn)
+
+
+def read(fmt, data):
+    """내보낸 바이트를 행(dict) 목록으로 복원"""
+    if fmt == "csv":
+        return list(csv.DictReader(io.StringIO(data.decode("utf-8-sig"))))
+    if fmt == "jsonl":
+        return [json.loads(line) for line in data.decode("utf-8").splitlines()]
+    pq = pytest.importorskip("pyarrow.parquet")
+    return pq.read_table(io.BytesIO(data)).to_pylist()
+
+
+class TestExport:
+    @pytest.fixture(autouse=True)
+    def sessions(self):
+        """두 사용자의 세션 (kim: 2개, lee: 1개)"""
+        init_database()
+        kim, lee = add_user("kim"), add_user("lee")
+        self.kim, self.lee = kim, lee
+        self.kim_sessions = [create_chat_session(kim), create_chat_session(kim)]
+        self.lee_session = create_chat_session(lee)
+        for i, session_id in enumerate(self.kim_sessions + [self.lee_session]):
+            insert_chat_message(session_id, "bot", f"질문 {i}")
+            insert_chat_message(session_id, "user", f'답변 {i}, "따옴표"\n줄바꿈')
+
+    @pytest.mark.parametrize("fmt", ["csv", "jsonl", "parquet"])
+    def test_round_trip(self, fmt):
+        """작은 batch로 여러 조각에 나누어 내보내도 모든 행이 순서대로 복원"""
+        chunks = list(export_messages(fmt, user_id=self.kim, batch_size=1))
+        assert len(chunks) > 2
+        rows = read(fmt, b"".join(chunks))
+        assert [row["username"] for row in rows] == ["kim"] * 4
+        assert [row["message"] for row in rows] == ["질문 0", '답변 0, "따옴표"\n줄바꿈', "질문 1", '답변 1, "따옴표"\n줄바꿈']
+        assert [str(row["session_id"]) for row in rows] == [str(s) for s in self.kim_sessions for _ in range(2)]
+
+    def test_scopes(self):
+        def messages(**options):
+            return [row["message_id"] for row in db.iter_chat_messages(**options)]
+
+        assert len(messages()) == 6
+        assert len(messages(session_id=self.lee_session)) == 2
+        assert messages(session_id=self.lee_session, user_id=self.kim) == []  # 다른 사용자 세션은 제외
+        day = next(db.iter_chat_messages())["timestamp"].date()  # 저장 시각은 Asia/Seoul 기준
+        assert len(messages(start_day=day, end_day=day)) == 6
+        assert messages(end_day=day - datetime.timedelta(days=1)) == []
+
+    def test_empty_export_has_header_only(self):
+        assert read("csv", b"".join(export_messages("csv", session_id=-1))) == []
+        assert b"".join(export_messages("jsonl", session_id=-1)) == b""
+        with pytest.raises(ValueError):
+            iter_export([], "xlsx")
+
+    def test_export_bytes_limit_releases_connection(self):
+        """크기 제한을 넘으면 None을 반환하고 DB 연결 반납"""
+        assert export_bytes(export_messages("jsonl", batch_size=1), max_bytes=10) is None
+        assert not db.connection_pool._used
+        assert read("jsonl", export_bytes(export_messages("jsonl"), max_bytes=1 << 20))[0]["message"] == "질문 0"
+
+    def test_file_name(self):
+        assert export_file_name("csv", session_id=3, username="kim") == "interviews-kim-session3.csv"
+        assert export_file_name("parquet", start_day=datetime.date(2025, 3, 1), end_day=datetime.date(2025, 3, 31)) \
+            == "interviews-2025-03-01_2025-03-31.parquet"
+
+    def test_cli(self, tmp_path, capsys):
+        output = tmp_path / "kim.jsonl"
+        main(["--format", "jsonl", "--user", "kim", "--output", str(output), "--batch-size", "2"])
+        assert len(read("jsonl", output.read_bytes())) == 4
+        with pytest.raises(SystemExit):
+            main(["--user", "nobody"])
@@ -0,0 +1,200 @@
+from unittest.mock import MagicMock
+
+import pytest
+from backend import ingest
+
+
+def make_text(count, start=0):
+    return "\n\n".join(
+        f"문단 {i}: 파이썬의 {i}번째 개념을 설명하는 문장입니다. 예제와 함께 동작 방식을 살펴봅니다." for i in range(start, start + count)
+    )
+
+
+class FakeStore:
+    """id → metadata를 보관하는 인덱스 대신 사용 (임베딩한 청크 수 기록)"""
+
+    def __init__(self, vectors=None):
+        self.vectors = dict(vectors or {})
+        self.embedded = 0
+
+    def list_ids(self):
+        return list(self.vectors)
+
+    def upsert(self, items):
+        self.embedded += len(items)
+        self.vectors.update(items)
+
+    def delete(self, ids):
+        for vector_id in ids:
+            del self.vectors[vector_id]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / "python.md").write_text(make_text(60), encoding="utf-8")
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "notes" / "gil.txt").write_text(make_text(20, start=100), encoding="utf-8")
+    (tmp_path / "image.png").write_bytes(b"\x89PNG")
+    return tmp_path
+
+
+def run(store, data_dir, **kwargs):
+    return ingest.ingest(store, data_dir, chunk_size=300, chunk_overlap=40, batch_size=7, **kwargs)
+
+
+def test_split_text_respects_chunk_size_and_overlap():
+    chunks = ingest.split_text(make_text(80), chunk_size=300, chunk_overlap=40)
+
+    assert len(chunks) > 5
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    # 두 번째 청크부터 첫 줄은 직전 청크의 끝부분
+    for previous, chunk in zip(chunks, chunks[1:]):
+        overlap = chunk.split("\n", 1)[0]
+        assert len(overlap) < 40
+        assert previous.endswith(overlap)
+
+
+def test_split_text_splits_long_paragraph_on_word_boundary():
+    text = " ".join(f"단어{i}" for i in range(300))
+
+    chunks = ingest.split_text(text, chunk_size=200)
+
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_split_text_rejects_invalid_overlap():
+    with pytest.raises(ValueError):
+        ingest.split_text("text", chunk_size=100, chunk_overlap=100)
+
+
+def test_edit_changes_only_nearby_chunks():
+    """앞부분 문단을 고치거나 추가해도 뒤쪽 청크는 그대로"""
+    paragraphs = make_text(200).split("\n\n")
+    before = set(ingest.split_text("\n\n".join(paragraphs), 300, 40))
+    edited = paragraphs[:5] + ["새로 추가한 문단입니다."] + [paragraphs[5] + " 내용 수정"] + paragraphs[6:]
+    after = set(ingest.split_text("\n\n".join(edited), 300, 40))
+
+    assert len(after - before) <= 4
+    assert len(before & after) >= len(before) - 4
+
+
+def test_chunk_id_is_stable_ascii_and_scoped_by_source():
+    first = ingest.chunk_id("한글 문서.docx", "같은 내용")
+
+    assert first == ingest.chunk_id("한글 문서.docx", "같은 내용")
+    assert first != ingest.chunk_id("other.docx", "같은 내용")
+    assert first.startswith(ingest.source_prefix("한글 문서.docx"))
+    assert ingest.ID_PATTERN.match(first)
+
+
+def test_iter_documents_skips_unsupported_and_temp_files(data_dir):
+    (data_dir / "~$python.docx").write_bytes(b"lock")
+
+    assert [source for source, _ in ingest.iter_documents(data_dir)] == ["notes/gil.txt", "python.md"]
+
+
+def test_first_run_upserts_every_chunk(data_dir):
+    store = FakeStore()
+
+    stats = run(store, data_dir)
+
+    assert stats["documents"] == 2
+    assert stats["upserted"] == stats["chunks"] == len(store.vectors) == store.embedded
+    assert stats["unchanged"] == stats["deleted"] == 0
+    assert {metadata["source"] for metadata in store.vectors.values()} == {"python.md", "notes/gil.txt"}
+    assert all(metadata["text"] for metadata in store.vectors.values())
+
+
+def test_unchanged_corpus_embeds_nothing(data_dir):
+    store = FakeStore()
+    run(store, data_dir)
+    store.embedded = 0
+
+    stats = run(store, data_dir)
+
+    assert store.embedded == 0
+    assert stats["unchanged"] == stats["chunks"]
+    assert stats["upserted"] == stats["deleted"] == 0
+
+
+def test_changed_document_upserts_and_deletes_only_diff(data_dir):
+    store = FakeStore()
+    run(store, data_dir)
+    before = set(store.vectors)
+    store.embedded = 0
+
+    paragraphs = make_text(60).split("\n\n")
+    paragraphs[30] = "GIL은 한 번에 하나의 스레드만 바이트코드를 실행하도록 합니다."
+    (data_dir / "python.md").write_text("\n\n".join(paragraphs), encoding="utf-8")
+    stats = run(store, data_dir)
+
+    assert 0 < stats["upserted"] <= 3
+    assert store.embedded == stats["upserted"]
+    assert stats["deleted"] == len(before - set(store.vectors)) > 0
+    assert stats["unchanged"] == stats["chunks"] - stats["upserted"]
+    assert any("GIL은" in metadata["text"] for metadata in store.vectors.values())
+
+
+def test_removed_document_vectors_are_deleted(data_dir):
+    store = FakeStore({"vec1": {"text": "직접 업서트한 예시"}})
+    run(store, data_dir)
+
+    (data_dir / "notes" / "gil.txt").unlink()
+    stats = run(store, data_dir)
+
+    assert stats["deleted"] > 0 and stats["upserted"] == 0
+    assert {metadata["source"] for key, metadata in store.vectors.items() if key != "vec1"} == {"python.md"}
+    assert "vec1" in store.vectors  # 다른 id 형식은 건드리지 않음
+
+
+def test_dry_run_changes_nothing(data_dir):
+    store = FakeStore()
+
+    stats = run(store, data_dir, dry_run=True)
+
+    assert stats["upserted"] == stats["chunks"] > 0
+    assert store.vectors == {} and store.embedded == 0
+
+
+def test_pinecone_store_embeds_and_batches_requests():
+    index = MagicMock()
+    index.list.return_value = iter([["a", "b"], ["c"]])
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [[float(len(text))] for text in texts]
+    store = ingest.PineconeStore(index, embeddings, "ns")
+
+    assert store.list_ids() == ["a", "b", "c"]
+    index.list.assert_called_once_with(namespace="ns")
+
+    store.upsert([("id1", {"text": "하나", "source": "a.md"}), ("id2", {"text": "둘둘", "source": "a.md"})])
+    index.upsert.assert_called_once_with(
+        vectors=[
+            {"id": "id1", "values": [2.0], "metadata": {"text": "하나", "source": "a.md"}},
+            {"id": "id2", "values": [2.0], "metadata": {"text": "둘둘", "source": "a.md"}},
+        ],
+        namespace="ns",
+    )
+
+    store.delete([f"id{i}" for i in range(ingest.DELETE_BATCH_SIZE + 1)])
+    assert [len(call.kwargs["ids"]) for call in index.delete.call_args_list] == [ingest.DELETE_BATCH_SIZE, 1]
+
+
+@pytest.mark.parametrize("model, dependencies", [
+    ("text-embedding-ada-002", ["openai", "pinecone"]),
+    ("intfloat/multilingual-e5-small", ["pinecone"]),  # 로컬 모델은 OpenAI deadline/서킷 브레이커를 거치지 않음
+])
+def test_open_store_applies_openai_dependency_only_to_remote_embeddings(monkeypatch, model, dependencies):
+    embeddings = MagicMock()
+    embeddings.embed_documents.return_value = [[0.1]]
+    monkeypatch.setattr(ingest, "create_embeddings", lambda config, api_key=None: embeddings)
+    monkeypatch.setattr(ingest, "check_index", lambda pc, record, embeddings: None)
+    used = []
+    get_dependency = ingest.get_dependency
+    monkeypatch.setattr(ingest, "get_dependency", lambda name: used.append(name) or get_dependency(name))
+    record = {"index_name": "idx", "namespace": "ns", "model": model, "query_prefix": "", "document_prefix": ""}
+
+    store = ingest.open_store(MagicMock(), record, {"backend": "openai"})
+    store.upsert([("id1", {"text": "하나"})])
+
+    assert used == dependencies
@@ -0,0 +1,96 @@
+import pytest
+from unittest.mock import patch
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.runnables import Runnable
+from backend import interview_service as service
+
+
+class ChunkedLLM(Runnable):
+    """질문은 한 번에, 평가는 세 조각으로 나누어 스트리밍하는 LLM"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, input, config=None, **kwargs):
+        self.calls += 1
+        return AIMessage(content=f"질문 {self.calls}", usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15})
+
+    def stream(self, input, config=None, **kwargs):
+        self.calls += 1
+        yield AIMessageChunk(content="좋은 ")
+        yield AIMessageChunk(content="답변")
+        yield AIMessageChunk(content="입니다.", usage_metadata={"input_tokens": 20, "output_tokens": 6, "total_tokens": 26})
+
+
+@pytest.fixture
+def llm():
+    llm = ChunkedLLM()
+    with patch("backend.interview_service.get_openai_client", return_value=llm):
+        yield llm
+
+
+@pytest.fixture
+def mock_retriever():
+    with patch("backend.interview_service.retriever") as mock:
+        mock.invoke.side_effect = lambda query: [Document(page_content=f"문서 {mock.invoke.call_count}")]
+        yield mock
+
+
+@pytest.fixture
+def mock_db():
+    with patch("backend.interview_service.create_chat_session", return_value=7), \
+         patch("backend.interview_service.insert_chat_message") as insert:
+        yield insert
+
+
+def test_start_and_ask_with_plain_dict(llm, mock_retriever, mock_db):
+    """Streamlit 없이 dict 상태만으로 면접 진행"""
+    state = service.new_state(user="tester")
+    first = service.start_interview(state, user_id=1)
+    second = service.ask_question(state)
+
+    assert state["session_id"] == 7
+    assert (first["content"], second["content"]) == ("질문 1", "질문 2")
+    assert state["generated_question"] == "질문 2"
+    assert state["used_prompts"] == {"문서 1", "문서 2"}
+    assert [call.args for call in mock_db.call_args_list] == [(7, "bot", "질문 1"), (7, "bot", "질문 2")]
+
+
+def test_submit_answer_streams_chunks(llm, mock_db):
+    """평가 응답 조각을 차례로 전달하고 합친 결과와 사용량을 저장"""
+    state = service.new_state(session_id=7, generated_question="GIL이란?")
+    chunks, added = [], []
+
+    replies = service.submit_answer(state, "제 답변", on_message=added.append, on_chunk=chunks.append)
+
+    assert chunks == ["좋은 ", "답변", "입니다."]
+    assert [msg["content"] for msg in replies] == ["좋은 답변입니다."]
+    assert [(msg["role"], msg["content"]) for msg in added] == [("user", "제 답변"), ("assistant", "좋은 답변입니다.")]
+    assert state["token_usage"][-1]["completion_tokens"] == 6
+    assert mock_db.call_count == 2
+
+
+def test_submit_answer_dedup_by_id(mock_db):
+    """evaluator가 같은 메시지를 여러 번 반환해도 한 번만 추가"""
+    state = service.new_state(session_id=7)
+
+    def evaluator(state, user_msg, on_chunk):
+        reply = AIMessage(content="평가 결과", id="reply-1")
+        yield AIMessage(content=user_msg["content"], id=user_msg["id"])
+        yield reply
+        yield reply
+
+    replies = service.submit_answer(state, "제 답변", evaluator=evaluator)
+
+    assert [msg["id"] for msg in replies] == ["reply-1"]
+    assert len(state["messages"]) == 2
+
+
+def test_ask_question_token_cap(llm, mock_retriever, mock_db):
+    state = service.new_state()
+    state["token_usage"].append({"stage": "question", "prompt_tokens": 100, "completion_tokens": 0, "cached": False})
+    with patch.dict(service.TOKEN_BUDGET_CONFIG, {"interview_token_cap": 100}):
+        with pytest.raises(service.TokenCapReached):
+            service.ask_question(state)
+    assert llm.calls == 0
@@ -0,0 +1,171 @@
+import json
+import pytest
+from unittest.mock import patch, MagicMock
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+from benchmarks.fakes import SessionState
+from backend import langchain_chatbot, tracing
+from backend.state_store import MemoryStateStore
+from backend.langchain_chatbot import (
+    initialize_session,
+    start_interview,
+    generate_question,
+    display_chat_history,
+    display_new_messages,
+    add_message,
+    handle_user_input,
+)
+
+class TestLangchainChatbot:
+    @pytest.fixture
+    def session_state(self):
+        """st.session_state 모의 객체"""
+        state = SessionState()
+        with patch.object(langchain_chatbot.st, "session_state", state), \
+             patch("backend.langchain_chatbot.get_state_store", return_value=MemoryStateStore()):
+            yield state
+
+    @pytest.fixture
+    def mock_retriever(self):
+        with patch("backend.interview_service.retriever") as mock:
+            mock.invoke.side_effect = lambda query: [
+                Document(page_content=f"문서 {mock.invoke.call_count}")
+            ]
+            yield mock
+
+    @pytest.fixture
+    def mock_llm(self):
+        """호출할 때마다 다른 질문을 반환하는 LLM"""
+        llm = MagicMock(side_effect=lambda prompt: AIMessage(content=f"질문 {llm.call_count}"))
+        with patch("backend.interview_service.get_openai_client", return_value=llm):
+            yield llm
+
+    @pytest.fixture
+    def mock_db(self):
+        with patch("backend.interview_service.create_chat_session", return_value=7) as create, \
+             patch("backend.interview_service.insert_chat_message") as insert:
+            yield create, insert
+
+    def test_initialize_session_makes_no_calls(self, session_state, mock_retriever, mock_llm):
+        """최초 실행 시 검색/LLM 호출 없이 상태만 초기화"""
+        initialize_session()
+        assert session_state.messages == []
+        assert session_state.used_questions == set()
+        mock_retriever.invoke.assert_not_called()
+        mock_llm.assert_not_called()
+
+    def test_start_interview_single_pass(self, session_state, mock_retriever, mock_llm, mock_db):
+        """면접 시작 시 검색 1회, 질문 생성 1회만 수행"""
+        create, insert = mock_db
+        session_state.messages = [{"role": "assistant", "content": "이전 면접 질문"}]
+
+        start_interview(user_id=1)
+
+        assert mock_retriever.invoke.call_count == 1
+        assert mock_llm.call_count == 1
+        create.assert_called_once_with(1)
+        insert.assert_called_once_with(7, "bot", "질문 1")
+        assert session_state.session_id == 7
+        assert [(msg["role"], msg["content"]) for msg in session_state.messages] == [("assistant", "질문 1")]
+        assert session_state.message_ids == {session_state.messages[0]["id"]}
+        assert session_state.first_question_latency >= 0
+
+    def test_generate_question_after_start(self, session_state, mock_retriever, mock_llm, mock_db):
+        """다음 질문은 새로운 문서로 생성"""
+        with patch("backend.langchain_chatbot.message"):
+            start_interview(user_id=1)
+            generate_question()
+
+        assert session_state.generated_question == "질문 2"
+        assert session_state.used_prompts == {"문서 1", "문서 2"}
+        assert len(session_state.messages) == 2
+
+    def test_display_history_window(self, session_state):
+        """긴 대화는 최근 window개만 출력하고, 이후에는 새 메시지만 출력"""
+        initialize_session()
+        with patch.dict(langchain_chatbot.CHAT_VIEW_CONFIG, {"window": 3}):
+            session_state.history_window = 3
+            for i in range(5):
+                add_message("user", f"답변 {i}")
+
+            with patch("backend.langchain_chatbot.message") as mock_message, \
+                 patch("backend.langchain_chatbot.st.button") as mock_button:
+                display_chat_history()
+                assert [c.args[0] for c in mock_message.call_args_list] == ["답변 2", "답변 3", "답변 4"]
+                mock_button.assert_called_once()
+
+                mock_message.reset_mock()
+                add_message("assistant", "질문 5")
+                display_new_messages()
+                assert [c.args[0] for c in mock_message.call_args_list] == ["질문 5"]
+
+    def test_handle_user_input_dedup_by_id(self, session_state):
+        """평가 워크플로우 이벤트 중 이미 출력한 메시지(사용자 입력)는 다시 추가하지 않음"""
+        initialize_session()
+        session_state.session_id = 7
+        app = MagicMock()
+
+        def stream(inputs, config, stream_mode):
+            user = inputs["messages"][0]
+            user_msg = MagicMock(id=user["id"], content=user["content"])
+            reply = MagicMock(id="reply-1", content="평가 결과")
+            yield {"messages": [user_msg]}
+            yield {"messages": [user_msg, reply]}
+            yield {"messages": [user_msg, reply]}
+
+        app.stream.side_effect = stream
+
+        with patch("backend.langchain_chatbot.get_evaluation_workflow", return_value=app), \
+             patch("backend.langchain_chatbot.st.chat_input", return_value="제 답변"), \
+             patch("backend.interview_service.insert_chat_message") as insert, \
+             patch("backend.langchain_chatbot.message"):
+            handle_user_input()
+
+        assert [(msg["role"], msg["content"]) for msg in session_state.messages] == [
+            ("user", "제 답변"), ("assistant", "평가 결과")
+        ]
+        assert insert.call_count == 2
+        assert session_state.show_continue_button is True
+
+    def test_answer_turn_trace(self, session_state, mock_llm, tmp_path):
+        """답변 1회 처리가 하나의 트레이스로 기록되고 LangGraph 노드/LLM 호출이 하위 span으로 포함"""
+        path = tmp_path / "traces.jsonl"
+        tracing.configure({"enabled": True, "path": str(path)})
+        try:
+            initialize_session()
+            session_state.session_id = 7
+            with patch("backend.langchain_chatbot.st.chat_input", return_value="제 답변"), \
+                 patch("backend.interview_service.insert_chat_message"), \
+                 patch("backend.langchain_chatbot.message"):
+                handle_user_input()
+        finally:
+            tracing.configure({"enabled": False})
+
+        spans = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        by_name = {s["name"]: s for s in spans}
+        assert len({s["trace_id"] for s in spans}) == 1
+        assert by_name["interview.answer"]["attributes"]["session_id"] == 7
+        assert by_name["langgraph.call_model"]["parent_span_id"] == by_name["interview.answer"]["span_id"]
+        assert by_name["llm.evaluation"]["parent_span_id"] == by_name["llm.scheduler"]["span_id"]
+
+    def test_restore_interview_after_restart(self, session_state, mock_retriever, mock_llm, mock_db):
+        """같은 저장소를 쓰면 새 세션(다른 프로세스/재시작)에서도 진행 중인 면접을 이어서 진행"""
+        session_state.user = "tester"
+        start_interview(user_id=1)
+
+        restarted = SessionState(user="tester")
+        with patch.object(langchain_chatbot.st, "session_state", restarted):
+            initialize_session()
+            with patch("backend.langchain_chatbot.message"):
+                generate_question()
+
+        assert [msg["content"] for msg in restarted.messages] == ["질문 1", "질문 2"]
+        assert restarted.used_prompts == {"문서 1", "문서 2"}
+        assert restarted.state_version == 2
+
+        # 이전 세션은 버전이 맞지 않으므로 저장하지 못하고 최신 상태를 다시 불러옴
+        with patch("backend.langchain_chatbot.message"), \
+             patch("backend.langchain_chatbot.st.warning") as warning:
+            generate_question()
+        warning.assert_called_once()
+        assert [msg["content"] for msg in session_state.messages] == ["질문 1", "질문 2"]
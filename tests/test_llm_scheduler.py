@@ -0,0 +1,100 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+from backend.llm_scheduler import (
+    LLMScheduler,
+    TokenBucket,
+    LLMQueueFull,
+    LLMDeadlineExceeded,
+    estimate_tokens,
+    PRIORITY_EVALUATION,
+    PRIORITY_BACKGROUND,
+)
+
+class RateLimitError(Exception):
+    """openai.RateLimitError 모의 클래스"""
+
+
+class TestLLMScheduler:
+    def test_token_bucket(self):
+        """토큰 버킷 차감 및 대기 시간 계산 테스트"""
+        bucket = TokenBucket(rate_per_min=60)
+        assert bucket.time_until(60) == 0.0
+        bucket.consume(60)
+        assert bucket.time_until(1) > 0
+
+    def test_estimate_tokens(self):
+        """입력 길이 기반 토큰 추정 테스트"""
+        assert estimate_tokens({"context": "가" * 100}, 50) == 100
+
+    def test_submit_returns_result(self):
+        """정상 실행 및 실제 사용량 보정 테스트"""
+        scheduler = LLMScheduler(tokens_per_min=1000)
+        response = MagicMock(usage_metadata={"total_tokens": 300})
+        assert scheduler.submit(lambda: response, est_tokens=100) is response
+        assert scheduler.token_bucket.tokens < 800  # 예상치(100)가 아닌 실제 사용량(300) 반영
+
+        stats = scheduler.stats()
+        assert stats["completed"] == 1
+        assert stats["queue_depth"] == 0
+        assert stats["active"] == 0
+
+    def test_priority_order(self):
+        """동시 실행 슬롯이 비면 평가 요청이 백그라운드 요청보다 먼저 실행"""
+        scheduler = LLMScheduler(max_concurrency=1)
+        order = []
+        release = threading.Event()
+
+        blocker = threading.Thread(target=scheduler.submit, args=(release.wait,))
+        blocker.start()
+        time.sleep(0.05)
+
+        background = threading.Thread(
+            target=scheduler.submit,
+            args=(lambda: order.append("background"),),
+            kwargs={"priority": PRIORITY_BACKGROUND},
+        )
+        background.start()
+        time.sleep(0.05)
+        evaluation = threading.Thread(
+            target=scheduler.submit,
+            args=(lambda: order.append("evaluation"),),
+            kwargs={"priority": PRIORITY_EVALUATION},
+        )
+        evaluation.start()
+        time.sleep(0.05)
+        assert scheduler.stats()["queue_depth"] == 2
+
+        release.set()
+        for thread in (blocker, background, evaluation):
+            thread.join(timeout=2)
+        assert order == ["evaluation", "background"]
+
+    def test_queue_full(self):
+        """대기열이 가득 차면 즉시 거절"""
+        scheduler = LLMScheduler(max_queue=0)
+        with pytest.raises(LLMQueueFull):
+            scheduler.submit(lambda: None)
+        assert scheduler.stats()["rejected"] == 1
+
+    def test_deadline_exceeded(self):
+        """rate limit 때문에 deadline 안에 실행되지 못하면 LLMDeadlineExceeded"""
+        scheduler = LLMScheduler(requests_per_min=1)
+        scheduler.submit(lambda: None)
+        with pytest.raises(LLMDeadlineExceeded):
+            scheduler.submit(lambda: None, deadline=0.05)
+        assert scheduler.stats()["expired"] == 1
+
+    def test_rate_limit_counted(self):
+        """429 오류는 횟수를 기록하고 잠시 새 요청을 멈춤"""
+        scheduler = LLMScheduler(rate_limit_cooldown=10)
+
+        def fail():
+            raise RateLimitError("429 Too Many Requests")
+
+        with pytest.raises(RateLimitError):
+            scheduler.submit(fail)
+        assert scheduler.stats()["rate_limited"] == 1
+        with pytest.raises(LLMDeadlineExceeded):
+            scheduler.submit(lambda: None, deadline=0.05)
@@ -0,0 +1,97 @@
+import threading
+import pytest
+from unittest.mock import MagicMock
+from langchain_core.prompts import PromptTemplate
+from benchmarks.fakes import (
+    LatencyDistribution,
+    FakeChatModel,
+    FakeRetriever,
+    SessionState,
+    ContextSessionState,
+    bind_session_state,
+)
+from benchmarks.load_test import percentile, Recorder, PoolMonitor
+from benchmarks.offline import build_secrets
+
+class TestLoadTest:
+    def test_latency_distribution(self):
+        """같은 시드면 같은 지연 시간 순서"""
+        first = LatencyDistribution("lognormal:-3,0.5", seed=1)
+        second = LatencyDistribution("lognormal:-3,0.5", seed=1)
+        assert [first.sample() for _ in range(5)] == [second.sample() for _ in range(5)]
+        assert LatencyDistribution("const:0.25").sample() == 0.25
+        with pytest.raises(ValueError):
+            LatencyDistribution("normal:1,2")
+        with pytest.raises(ValueError):
+            LatencyDistribution("uniform:1")
+
+    def test_fake_chat_model_in_chain(self):
+        """프롬프트 체인에 연결되고, 같은 입력이면 같은 응답과 토큰 사용량 반환"""
+        llm = FakeChatModel(LatencyDistribution("const:0"))
+        chain = PromptTemplate(template="문서 내용: {context}", input_variables=["context"]) | llm
+        first = chain.invoke({"context": "GIL"})
+        assert first.content == chain.invoke({"context": "GIL"}).content
+        assert first.usage_metadata["total_tokens"] > 0
+        assert llm.calls == 2
+
+    def test_fake_retriever(self):
+        """k개의 문서 반환"""
+        retriever = FakeRetriever(LatencyDistribution("const:0"), num_docs=10, k=3)
+        assert len(retriever.invoke("질문")) == 3
+
+    def test_context_session_state(self):
+        """스레드(가상 사용자)마다 분리된 session_state"""
+        proxy = ContextSessionState()
+        results = {}
+
+        def user(name):
+            bind_session_state(SessionState())
+            proxy.user = name
+            proxy["messages"] = []
+            proxy.messages.append(name)
+            results[name] = (proxy.get("user"), "messages" in proxy, list(proxy.messages))
+
+        threads = [threading.Thread(target=user, args=(name,)) for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == {"a": ("a", True, ["a"]), "b": ("b", True, ["b"])}
+
+    def test_percentile(self):
+        """퍼센타일 계산 테스트"""
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50.5
+        assert percentile(values, 99) == pytest.approx(99.01)
+        assert percentile([], 95) == 0.0
+
+    def test_recorder(self):
+        """단계별 소요 시간과 오류 집계"""
+        recorder = Recorder()
+        recorder.timed("stage", lambda: None)
+        with pytest.raises(RuntimeError):
+            recorder.timed("stage", MagicMock(side_effect=RuntimeError))
+        summary = recorder.summary()
+        assert summary["stage"]["count"] == 2
+        assert summary["stage"]["errors"] == 1
+
+    def test_pool_monitor(self):
+        """연결 풀 최대 사용량과 고갈 횟수"""
+        connections = iter([MagicMock(), MagicMock(), None])
+        monitor = PoolMonitor(lambda: next(connections), lambda conn: None, maxconn=2)
+        first = monitor.get_connection()
+        monitor.get_connection()
+        monitor.get_connection()
+        monitor.release_connection(first)
+        summary = monitor.summary()
+        assert summary["max_in_use"] == 2
+        assert summary["saturation"] == 1.0
+        assert summary["exhausted"] == 1
+
+    def test_build_secrets(self):
+        """DSN으로 st.secrets 대체값 생성"""
+        secrets = build_secrets("postgresql://bench:pw@db:6543/bench_db")
+        assert secrets["postgres"]["POSTGRES_HOST"] == "db"
+        assert secrets["postgres"]["POSTGRES_PORT"] == "6543"
+        assert secrets["postgres"]["POSTGRES_DB"] == "bench_db"
+        assert build_secrets("postgresql://localhost/db", {"eval_cache": {"ENABLED": True}})["eval_cache"]["ENABLED"]
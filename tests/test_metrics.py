@@ -0,0 +1,110 @@
+import pytest
+from unittest.mock import MagicMock
+from backend import metrics
+from backend.metrics import (
+    MetricsRegistry,
+    REGISTRY,
+    InstrumentedEmbeddings,
+    instrument,
+    track,
+    record_error,
+)
+
+class TestMetrics:
+    @pytest.fixture(autouse=True)
+    def clean_registry(self):
+        REGISTRY.clear()
+        yield
+        metrics.disable()
+        REGISTRY.clear()
+
+    def test_disabled_records_nothing(self):
+        """비활성화 상태에서는 원래 함수만 호출"""
+        @instrument("db")
+        def query():
+            return 42
+
+        assert query() == 42
+        with track("llm", "question"):
+            pass
+        assert REGISTRY.render().count("interview_calls_total{") == 0
+
+    def test_outcomes(self):
+        """정상 종료는 ok, 예외 또는 record_error()는 error"""
+        metrics.enable()
+
+        @instrument("db")
+        def ok():
+            return True
+
+        @instrument("db", "swallowed")
+        def swallowed():
+            try:
+                raise RuntimeError("connection lost")
+            except RuntimeError:
+                record_error()
+                return None
+
+        @instrument("db")
+        def raises():
+            raise ValueError("bad")
+
+        ok()
+        ok()
+        swallowed()
+        with pytest.raises(ValueError):
+            raises()
+
+        assert REGISTRY.get_count("db", "ok") == 2
+        assert REGISTRY.get_count("db", "swallowed", "error") == 1
+        assert REGISTRY.get_count("db", "raises", "error") == 1
+
+    def test_connection_failure_marks_db_operation(self, monkeypatch):
+        """연결을 가져오지 못하면 연결 획득과 바깥 DB 작업 모두 error"""
+        from backend import db
+
+        metrics.enable()
+        monkeypatch.setattr(db, "_acquire_connection", instrument("db", "get_connection")(MagicMock(side_effect=OSError)))
+
+        assert db.create_chat_session(1) is None
+        assert REGISTRY.get_count("db", "get_connection", "error") == 1
+        assert REGISTRY.get_count("db", "create_chat_session", "error") == 1
+        assert REGISTRY.get_count("db", "create_chat_session", "ok") == 0
+
+    def test_record_error_marks_innermost_call(self):
+        """중첩 호출에서는 가장 안쪽 호출만 실패로 표시"""
+        metrics.enable()
+        with track("auth", "authenticate"):
+            with track("db", "get_password_hash"):
+                record_error()
+        assert REGISTRY.get_count("db", "get_password_hash", "error") == 1
+        assert REGISTRY.get_count("auth", "authenticate", "ok") == 1
+
+    def test_render_histogram(self):
+        registry = MetricsRegistry(buckets=(0.1, 1.0))
+        registry.observe("llm", "evaluation", "ok", 0.05)
+        registry.observe("llm", "evaluation", "ok", 0.5)
+        registry.observe("llm", "evaluation", "ok", 5.0)
+
+        text = registry.render()
+        labels = 'component="llm",operation="evaluation",outcome="ok"'
+        assert f"interview_calls_total{{{labels}}} 3" in text
+        assert f'interview_call_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+        assert f'interview_call_duration_seconds_bucket{{{labels},le="1.0"}} 2' in text
+        assert f'interview_call_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+        assert f"interview_call_duration_seconds_count{{{labels}}} 3" in text
+
+    def test_label_escaping(self):
+        registry = MetricsRegistry()
+        registry.observe("db", 'say "hi"', "ok", 0.01)
+        assert 'operation="say \\"hi\\""' in registry.render()
+
+    def test_instrumented_embeddings(self):
+        metrics.enable()
+        inner = MagicMock()
+        inner.embed_query.return_value = [0.1, 0.2]
+        embeddings = InstrumentedEmbeddings(inner, name="openai")
+
+        assert embeddings.embed_query("질문") == [0.1, 0.2]
+        assert embeddings.model == inner.model  # 나머지 속성은 위임
+        assert REGISTRY.get_count("embedding", "openai.embed_query") == 1
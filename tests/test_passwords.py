@@ -0,0 +1,45 @@
+import bcrypt
+import pytest
+from backend.passwords import (
+    PasswordHasher,
+    get_hash_rounds,
+    needs_rehash,
+)
+
+class TestPasswords:
+    @pytest.fixture(params=[0, 1], ids=["inline", "process_pool"])
+    def hasher(self, request):
+        hasher = PasswordHasher(rounds=4, workers=request.param)
+        yield hasher
+        hasher.shutdown()
+
+    def test_hash_and_verify(self, hasher):
+        """해싱 결과는 설정한 비용의 bcrypt 해시이고 검증 가능"""
+        hashed = hasher.hash("test_password123")
+        assert get_hash_rounds(hashed) == 4
+        assert bcrypt.checkpw(b"test_password123", hashed.encode())
+        assert hasher.verify("test_password123", hashed)
+        assert not hasher.verify("wrong_password", hashed)
+
+    def test_hash_many(self, hasher):
+        """병렬 해싱 결과는 입력 순서를 유지"""
+        passwords = [f"password_{i}" for i in range(5)]
+        hashed = hasher.hash_many(passwords)
+        assert len(hashed) == 5
+        assert all(bcrypt.checkpw(pw.encode(), h.encode()) for pw, h in zip(passwords, hashed))
+
+    def test_needs_rehash(self):
+        """저장된 해시의 비용이 설정과 다르면 재해싱 대상"""
+        hashed = bcrypt.hashpw(b"pw", bcrypt.gensalt(rounds=5)).decode()
+        assert needs_rehash(hashed, 4)
+        assert not needs_rehash(hashed, 5)
+
+    def test_invalid_hash(self):
+        """bcrypt 해시가 아니면 ValueError"""
+        with pytest.raises(ValueError):
+            get_hash_rounds("plain-text")
+
+    def test_invalid_rounds(self):
+        """bcrypt가 지원하지 않는 비용"""
+        with pytest.raises(ValueError):
+            PasswordHasher(rounds=3)
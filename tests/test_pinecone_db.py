@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pinecone.grpc")
+from backend.embedding_registry import EmbeddingMismatch  # noqa: E402
+from backend.pinecone_db import PineconeWrapper  # noqa: E402
+from backend.projection import Projection  # noqa: E402
+
+
+def test_pinecone_wrapper_uses_given_embeddings():
+    local = MagicMock()
+    local.embed_documents.return_value = [[0.1, 0.2]]
+    local.embed_query.return_value = [0.3, 0.4]
+    with patch("backend.pinecone_db.Pinecone") as client:
+        client.return_value.list_indexes.return_value = ["idx"]
+        client.return_value.describe_index.return_value = SimpleNamespace(dimension=2)
+        wrapper = PineconeWrapper("key", "idx", "env", dimension=2, embeddings=local)
+
+    wrapper.upsert_data([{"id": "vec1", "text": "문서"}])
+    wrapper.query("질문", top_k=2)
+
+    wrapper.index.upsert.assert_called_once_with(
+        vectors=[{"id": "vec1", "values": [0.1, 0.2], "metadata": {"text": "문서"}}], namespace="example-namespace"
+    )
+    assert wrapper.index.query.call_args.kwargs["vector"] == [0.3, 0.4]
+    wrapper.pc.inference.embed.assert_not_called()
+
+
+def test_pinecone_wrapper_projects_upserts_and_queries():
+    projection = Projection(np.eye(2, 1024))
+    with patch("backend.pinecone_db.Pinecone") as client:
+        client.return_value.list_indexes.return_value = []
+        wrapper = PineconeWrapper("key", "idx", "env", projection=projection)
+    wrapper.pc.inference.embed.side_effect = lambda model, inputs, parameters: [
+        {"values": [3.0, 4.0] + [0.0] * 1022} for _ in inputs
+    ]
+
+    wrapper.upsert_data([{"id": "vec1", "text": "문서"}])
+
+    assert wrapper.pc.create_index.call_args.kwargs["dimension"] == 2
+    np.testing.assert_allclose(wrapper.index.upsert.call_args.kwargs["vectors"][0]["values"], [0.6, 0.8])
+
+
+def test_pinecone_wrapper_defaults_to_model_dimension():
+    with patch("backend.pinecone_db.Pinecone") as client:
+        client.return_value.list_indexes.return_value = []
+        wrapper = PineconeWrapper("key", "idx", "env")
+    wrapper.pc.inference.embed.return_value = [SimpleNamespace(values=[0.1] * 1024)]
+
+    wrapper.query("질문")
+
+    assert wrapper.pc.create_index.call_args.kwargs["dimension"] == 1024
+    assert wrapper.pc.inference.embed.call_args.kwargs == {
+        "model": "multilingual-e5-large", "inputs": ["질문"], "parameters": {"input_type": "query"},
+    }
+
+
+def test_pinecone_wrapper_rejects_existing_index_with_other_dimension():
+    with patch("backend.pinecone_db.Pinecone") as client:
+        client.return_value.list_indexes.return_value = ["idx"]
+        client.return_value.describe_index.return_value = SimpleNamespace(dimension=384)
+        with pytest.raises(EmbeddingMismatch, match="Pinecone 인덱스 차원 384 != 1024"):
+            PineconeWrapper("key", "idx", "env")
+
+
+def test_pinecone_wrapper_rejects_dimension_other_than_model():
+    with patch("backend.pinecone_db.Pinecone") as client:
+        client.return_value.list_indexes.return_value = []
+        with pytest.raises(EmbeddingMismatch, match="모델 목록의 차원 1024 != 384"):
+            PineconeWrapper("key", "idx", "env", dimension=384)
+
+    client.return_value.create_index.assert_not_called()
@@ -0,0 +1,82 @@
+import time
+import pytest
+from unittest.mock import patch
+from benchmarks.fakes import SessionState
+from backend import profiling
+from backend.profiling import (
+    profile_rerun,
+    list_profiles,
+    summarize_profiles,
+    main,
+)
+
+def slow_function(seconds):
+    time.sleep(seconds)
+
+class TestProfiling:
+    @pytest.fixture
+    def config(self, tmp_path):
+        return {"enabled": True, "threshold": 0.05, "dir": str(tmp_path / "profiles"), "keep": 2}
+
+    @pytest.fixture(autouse=True)
+    def session_state(self):
+        state = SessionState(
+            user="kim",
+            session_id=7,
+            messages=[{"role": "assistant", "content": "질문"}, {"role": "user", "content": "답변"}],
+        )
+        with patch.object(profiling.st, "session_state", state):
+            yield state
+
+    def test_fast_rerun_not_saved(self, config):
+        with profile_rerun("chat", config):
+            pass
+        assert list_profiles(config["dir"]) == []
+
+    def test_slow_rerun_saved_with_metadata(self, config):
+        with profile_rerun("chat", config):
+            slow_function(0.06)
+
+        [profile] = list_profiles(config["dir"])
+        assert profile["page"] == "chat"
+        assert profile["elapsed"] >= 0.05
+        assert (profile["user"], profile["session_id"], profile["turn"]) == ("kim", 7, 1)
+
+        rows = summarize_profiles([profile["path"]])
+        assert any("slow_function" in row["function"] for row in rows)
+
+    def test_saved_on_rerun_exception(self, config):
+        """st.rerun()/st.stop()처럼 예외로 끝난 재실행도 저장"""
+        with pytest.raises(RuntimeError):
+            with profile_rerun("chat", config):
+                slow_function(0.06)
+                raise RuntimeError("rerun")
+        assert len(list_profiles(config["dir"])) == 1
+
+    def test_nested_is_noop(self, config):
+        with profile_rerun("chat", config):
+            with profile_rerun("chat.fragment", config):
+                slow_function(0.06)
+        assert [p["page"] for p in list_profiles(config["dir"])] == ["chat"]
+
+    def test_keep_latest(self, config):
+        for page in ["chat", "history", "chat"]:
+            with profile_rerun(page, config):
+                slow_function(0.06)
+            time.sleep(0.001)
+        assert [p["page"] for p in list_profiles(config["dir"])] == ["history", "chat"]
+        assert [p["page"] for p in list_profiles(config["dir"], page="history")] == ["history"]
+
+    def test_disabled(self, config):
+        config["enabled"] = False
+        with profile_rerun("chat", config):
+            slow_function(0.06)
+        assert list_profiles(config["dir"]) == []
+
+    def test_cli(self, config, capsys):
+        with profile_rerun("chat", config):
+            slow_function(0.06)
+        main(["--dir", config["dir"], "--top", "5"])
+        out = capsys.readouterr().out
+        assert "프로파일 1개" in out
+        assert "session=7" in out
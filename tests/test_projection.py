@@ -0,0 +1,161 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from backend.embeddings import create_embeddings
+from backend import projection as projection_module
+from backend.projection import fit_projection, load_projection, Projection, ProjectedEmbeddings, sample_vectors
+from benchmarks.projection_bench import evaluate, recall_at_k, recommend, synthetic_vectors
+
+
+class FakeEmbeddings:
+    def embed_documents(self, texts):
+        return [[float(len(text)), 1.0, 0.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 0.0, 1.0]
+
+
+def test_transform_centers_projects_and_normalizes():
+    projection = Projection([[1, 0, 0], [0, 1, 1]], mean=[1, 0, 0])
+
+    vectors = projection.transform([[4, 1, 3], [1, 0, 0]])
+
+    assert (projection.input_dimension, projection.output_dimension) == (3, 2)
+    np.testing.assert_allclose(vectors[0], [0.6, 0.8], rtol=1e-6)
+    np.testing.assert_allclose(vectors[1], [0.0, 0.0])  # 길이 0 벡터는 그대로
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "proj.npz")
+    Projection(np.eye(2, 3), mean=[1, 2, 3], method="random").save(path)
+
+    loaded = load_projection(path)
+
+    assert loaded.method == "random"
+    np.testing.assert_array_equal(loaded.mean, [1, 2, 3])
+    assert load_projection(path) is loaded  # 경로마다 한 번만 읽음
+
+
+def test_save_appends_npz_suffix(tmp_path):
+    path = Projection(np.eye(2, 3)).save(tmp_path / "ada-2")
+
+    assert path == str(tmp_path / "ada-2.npz")
+    assert load_projection(path).output_dimension == 2
+
+
+def test_projected_embeddings_applies_same_projection():
+    embeddings = ProjectedEmbeddings(FakeEmbeddings(), Projection([[0, 1, 0], [0, 0, 1]]))
+
+    assert embeddings.dimension == 2
+    assert embeddings.embed_documents(["ab", "c"]) == [[1.0, 0.0], [1.0, 0.0]]
+    assert embeddings.embed_query("ab") == [0.0, 1.0]
+
+
+def test_create_embeddings_wraps_with_projection(tmp_path):
+    path = str(tmp_path / "proj.npz")
+    Projection(np.ones((4, 1536))).save(path)
+
+    with patch("langchain_openai.OpenAIEmbeddings") as openai_embeddings:
+        openai_embeddings.return_value.embed_query.return_value = [1.0] * 1536
+        embeddings = create_embeddings({"backend": "openai", "model": None, "projection": path}, api_key="key")
+
+        assert embeddings.dimension == 4
+        np.testing.assert_allclose(embeddings.embed_query("질문"), [0.5] * 4)
+
+
+def test_sample_vectors_reads_stored_values():
+    class FakeIndex:
+        def list(self, namespace=None, limit=100):
+            yield ["a", "b"]
+            yield ["c"]
+
+        def fetch(self, ids, namespace=None):
+            return SimpleNamespace(vectors={i: SimpleNamespace(values=[float(ord(i))] * 3) for i in ids})
+
+    vectors = sample_vectors(FakeIndex(), "ns", limit=2)
+
+    assert vectors.shape == (2, 3)
+    np.testing.assert_array_equal(vectors[:, 0], [97, 98])
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        fit_projection(np.ones((10, 4)), 2, method="umap")
+
+
+class TestFitCommand:
+    @pytest.fixture
+    def run(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(projection_module, "sample_vectors", lambda index, namespace, limit: np.ones((50, 8)))
+        config = SimpleNamespace(retriever=SimpleNamespace(record={"index_name": "idx", "namespace": "ns"}),
+                                 pc=SimpleNamespace(Index=lambda name: None))
+
+        def run(dimension, method="pca"):
+            args = SimpleNamespace(source=None, dimension=dimension, method=method, sample=100, seed=0,
+                                   output=str(tmp_path / "proj"))
+            projection_module._fit(args, config)
+
+        return run
+
+    @pytest.mark.parametrize("dimension", [0, 8, 20])
+    def test_rejects_dimension_outside_input(self, run, dimension):
+        with pytest.raises(SystemExit, match="원래 차원"):
+            run(dimension)
+
+    def test_prints_saved_path(self, run, tmp_path, capsys):
+        pytest.importorskip("sklearn")
+        run(4, method="random")
+
+        assert str(tmp_path / "proj.npz") in capsys.readouterr().out
+        assert load_projection(str(tmp_path / "proj.npz")).output_dimension == 4
+
+
+class TestFit:
+    @pytest.fixture(autouse=True)
+    def sklearn(self):
+        pytest.importorskip("sklearn")
+
+    def test_pca_keeps_neighbours_of_low_rank_corpus(self):
+        vectors = synthetic_vectors(600, dimension=128, rank=8, clusters=10, noise=0.01)
+
+        projection = fit_projection(vectors, 16)
+        reduced = projection.transform(vectors)
+
+        assert (projection.method, reduced.shape) == ("pca", (600, 16))
+        np.testing.assert_allclose(np.linalg.norm(reduced, axis=1), 1, rtol=1e-5)
+
+    def test_random_projection_has_no_mean(self):
+        projection = fit_projection(np.ones((20, 64)), 8, method="random")
+
+        assert projection.components.shape == (8, 64)
+        assert not projection.mean.any()
+
+    def test_evaluate_reports_recall_and_latency_per_dimension(self):
+        vectors = synthetic_vectors(400, dimension=96, rank=8, clusters=8, noise=0.01)
+
+        reports = evaluate(vectors, [4, 16, 200], methods=["pca", "random"], k=5, queries=20)
+
+        assert [(r["method"], r["dimension"]) for r in reports] == [
+            ("full", 96), ("pca", 4), ("pca", 16), ("random", 4), ("random", 16),  # 입력 차원 이상은 건너뜀
+        ]
+        assert reports[0]["recall"] == 1.0
+        assert next(r for r in reports if (r["method"], r["dimension"]) == ("pca", 16))["recall"] > 0.8
+        assert all(r["search_p50"] > 0 and r["bytes_per_vector"] == r["dimension"] * 4 for r in reports)
+
+
+def test_recall_and_recommend():
+    assert recall_at_k(np.array([[1, 2], [3, 4]]), np.array([[2, 1], [3, 5]])) == 0.75
+
+    reports = [
+        {"method": "full", "dimension": 1536, "recall": 1.0},
+        {"method": "pca", "dimension": 64, "recall": 0.9},
+        {"method": "pca", "dimension": 128, "recall": 0.97},
+        {"method": "pca", "dimension": 256, "recall": 0.99},
+        {"method": "random", "dimension": 256, "recall": 0.7},
+    ]
+    best = recommend(reports, 0.95)
+    assert best["pca"]["dimension"] == 128
+    assert best["random"] is None
@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+from backend.reembed import copy_vectors, iter_vectors, vector_count
+
+
+class FakeIndex:
+    """list(id 페이지)/fetch/describe_index_stats만 지원하는 Pinecone 인덱스"""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.fetches = 0
+
+    def list(self, namespace=None, limit=100):
+        ids = sorted(self.vectors)
+        for start in range(0, len(ids), limit):
+            yield ids[start:start + limit]
+
+    def fetch(self, ids, namespace=None):
+        self.fetches += 1
+        return SimpleNamespace(
+            vectors={vector_id: SimpleNamespace(metadata=self.vectors[vector_id]) for vector_id in ids}
+        )
+
+    def describe_index_stats(self):
+        return SimpleNamespace(namespaces={"ns": SimpleNamespace(vector_count=len(self.vectors))})
+
+
+class FakeStore:
+    """backend.ingest.PineconeStore 대신 사용 (임베딩한 id 기록)"""
+
+    def __init__(self, vectors=None):
+        self.vectors = dict(vectors or {})
+        self.embedded = []
+
+    def list_ids(self):
+        return list(self.vectors)
+
+    def upsert(self, items):
+        self.embedded.extend(vector_id for vector_id, _ in items)
+        self.vectors.update(items)
+
+    def delete(self, ids):
+        for vector_id in ids:
+            del self.vectors[vector_id]
+
+
+def source(count):
+    return FakeIndex({f"id{i:03d}": {"text": f"문서 {i}", "source": "a.md"} for i in range(count)})
+
+
+def test_iter_vectors_reads_in_pages():
+    index = source(250)
+
+    pages = list(iter_vectors(index, "ns"))
+
+    assert [len(page) for page in pages] == [100, 100, 50]
+    assert pages[0][0] == ("id000", {"text": "문서 0", "source": "a.md"})
+    assert index.fetches == 3
+
+
+def test_copy_fills_target_in_batches():
+    target = FakeStore()
+    batches = []
+    upsert = target.upsert
+    target.upsert = lambda items: (batches.append(len(items)), upsert(items))
+
+    stats = copy_vectors(source(25), "ns", target, batch_size=10)
+
+    assert stats == {"read": 25, "upserted": 25, "skipped": 0, "missing_text": 0, "deleted": 0}
+    assert batches == [10, 10, 5]
+    assert target.vectors["id007"] == {"text": "문서 7", "source": "a.md"}
+
+
+def test_copy_resumes_and_syncs_deletions():
+    """이미 채운 id는 건너뛰고, 원본에서 사라진 id는 삭제"""
+    index = source(20)
+    target = FakeStore()
+    copy_vectors(index, "ns", target)
+    target.embedded.clear()
+
+    del index.vectors["id005"]
+    index.vectors["id100"] = {"text": "새 문서"}
+    index.vectors["id101"] = {"source": "본문 없음"}
+    stats = copy_vectors(index, "ns", target)
+
+    assert target.embedded == ["id100"]
+    assert stats == {"read": 21, "upserted": 1, "skipped": 19, "missing_text": 1, "deleted": 1}
+    assert "id005" not in target.vectors
+
+
+def test_copy_overwrite_reembeds_everything():
+    index = source(5)
+    target = FakeStore({"id000": {"text": "예전 내용"}})
+
+    stats = copy_vectors(index, "ns", target, overwrite=True)
+
+    assert stats["upserted"] == 5 and stats["skipped"] == 0
+    assert target.vectors["id000"]["text"] == "문서 0"
+
+
+def test_vector_count():
+    assert vector_count(source(7), "ns") == 7
+    assert vector_count(source(7), "other") == 0
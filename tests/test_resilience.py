@@ -0,0 +1,145 @@
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from langchain_core.documents import Document
+from benchmarks.fakes import FaultInjector, InjectedFault, FakeRetriever, LatencyDistribution
+from backend import interview_service as service, metrics, resilience
+from backend.resilience import CircuitBreaker, CircuitOpen, DeadlineExceeded, Dependency, backoff_delay
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_probes_once(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open" and not breaker.allow()
+
+        # reset_timeout이 지나면 시험 호출 하나만 허용
+        with patch("backend.resilience.time.monotonic", return_value=time.monotonic() + 11):
+            assert breaker.allow()
+            assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.allow()
+
+    def test_backoff_delay_is_bounded(self):
+        delays = [backoff_delay(attempt, base=0.1, cap=0.5) for attempt in range(10) for _ in range(20)]
+        assert all(0 <= delay <= 0.5 for delay in delays)
+
+
+class TestDependency:
+    def test_retries_until_success(self):
+        faults = FaultInjector(error_rate=1.0)
+        dependency = Dependency("test", attempts=3, backoff_base=0.001)
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                faults.maybe_fail()
+            return "ok"
+
+        assert dependency.call(flaky) == "ok"
+        assert dependency.stats()["retries"] == 2
+        assert dependency.breaker.state == "closed"
+
+    def test_deadline_frees_caller(self):
+        """멈춘 호출도 deadline이 지나면 호출한 스레드는 바로 반환"""
+        dependency = Dependency("test", timeout=0.05)
+        start = time.perf_counter()
+        with pytest.raises(DeadlineExceeded):
+            dependency.call(FaultInjector(hang_rate=1.0, hang_seconds=1.0).wrap(lambda: "late"))
+        assert time.perf_counter() - start < 0.5
+        assert dependency.stats()["timeout"] == 1
+
+    def test_open_circuit_fails_fast_with_fallback(self):
+        faults = FaultInjector()
+        faults.down = True
+        dependency = Dependency("test", failure_threshold=2, reset_timeout=60)
+        failing = faults.wrap(lambda: "ok")
+
+        for _ in range(2):
+            with pytest.raises(InjectedFault):
+                dependency.call(failing)
+        assert dependency.breaker.state == "open"
+
+        with pytest.raises(CircuitOpen):
+            dependency.call(failing)
+        assert dependency.call(failing, fallback=lambda error: "cached") == "cached"
+        assert faults.errors == 2  # 열린 뒤에는 호출하지 않음
+        stats = dependency.stats()
+        assert (stats["short_circuit"], stats["fallback"]) == (1, 1)
+
+    def test_ignored_errors_do_not_open_circuit(self):
+        """연결 풀 고갈처럼 장애가 아닌 오류는 재시도하되 브레이커에 세지 않음"""
+        dependency = Dependency("test", attempts=2, failure_threshold=1, backoff_base=0.001,
+                                is_failure=lambda error: not isinstance(error, LookupError))
+        with pytest.raises(LookupError):
+            dependency.call(lambda: {}["missing"])
+        assert dependency.breaker.state == "closed"
+        assert dependency.stats()["retries"] == 1
+
+    def test_hedged_read_uses_faster_response(self):
+        """첫 요청이 느리면 두 번째 요청을 보내 먼저 끝난 결과 사용"""
+        dependency = Dependency("test", timeout=2.0, hedge_after=0.05)
+        calls = []
+        lock = threading.Lock()
+
+        def read():
+            with lock:
+                calls.append(1)
+                first = len(calls) == 1
+            time.sleep(1.0 if first else 0.01)
+            return "slow" if first else "fast"
+
+        start = time.perf_counter()
+        assert dependency.call(read, hedge=True) == "fast"
+        assert time.perf_counter() - start < 0.5
+        assert dependency.stats()["hedges"] == 1
+
+    def test_breaker_state_in_metrics(self):
+        resilience.get_dependency("metrics_test").breaker.record_failure()
+        assert 'interview_circuit_breaker_state{dependency="metrics_test"} 0' in metrics.REGISTRY.render()
+
+
+class TestDegradedInterview:
+    @pytest.fixture(autouse=True)
+    def dependencies(self):
+        """테스트마다 새 정책 (브레이커가 빨리 열리도록 설정, 끝나면 원래 정책 복원)"""
+        original = dict(resilience._dependencies)
+        resilience.configure({
+            "openai": {"attempts": 1, "failure_threshold": 1, "reset_timeout": 60},
+            "pinecone": {"attempts": 1, "failure_threshold": 1, "reset_timeout": 60},
+        })
+        service._candidates.clear()
+        with patch("backend.interview_service.create_chat_session", return_value=7), \
+             patch("backend.interview_service.insert_chat_message"):
+            yield
+        resilience._dependencies.clear()
+        resilience._dependencies.update(original)
+
+    def test_retriever_outage_uses_cached_candidates(self):
+        faults = FaultInjector()
+        retriever = FakeRetriever(LatencyDistribution("const:0"), num_docs=5, k=5, faults=faults)
+        with patch("backend.interview_service.retriever", retriever):
+            first = service.retrieve_candidates()
+            faults.down = True
+            assert {doc.page_content for doc in service.retrieve_candidates()} == {doc.page_content for doc in first}
+            assert resilience.get_dependency("pinecone").breaker.state == "open"
+
+    def test_llm_outage_serves_canned_question_and_evaluation(self):
+        faults = FaultInjector()
+        faults.down = True
+        with patch("backend.interview_service.get_openai_client", return_value=faults.wrap(lambda prompt: None)), \
+             patch("backend.interview_service.retriever") as retriever, \
+             patch("backend.interview_service.get_evaluation_cache") as get_cache:
+            retriever.invoke.return_value = [Document(page_content="문서")]
+            get_cache.return_value.get.return_value = None
+            state = service.new_state()
+            question = service.start_interview(state, user_id=1)
+            replies = service.submit_answer(state, "제 답변")
+
+        assert question["content"] in service.FALLBACK_QUESTIONS
+        assert [msg["content"] for msg in replies] == [service.FALLBACK_EVALUATION]
+        get_cache.return_value.set.assert_not_called()  # 대체 평가는 캐시에 저장하지 않음
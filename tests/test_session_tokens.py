@@ -0,0 +1,110 @@
+import pytest
+from unittest.mock import patch
+from backend.init_db import init_database
+from backend.accounts import register_user, delete_user
+from backend.session_tokens import (
+    TokenCache,
+    hash_token,
+    create_session_token,
+    validate_session_token,
+    revoke_session_token,
+    revoke_user_sessions,
+    CookieTokenStore,
+)
+
+class TestTokenCache:
+    def test_get_set(self):
+        cache = TokenCache(ttl=60)
+        cache.set("hash", "user", expires_in=3600)
+        assert cache.get("hash") == "user"
+        assert cache.get("other") is None
+
+    def test_expires_with_token(self):
+        """토큰 만료가 캐시 유지 시간보다 빠르면 토큰 만료 시점까지만 캐시"""
+        cache = TokenCache(ttl=60)
+        with patch("backend.session_tokens.time.monotonic", return_value=100.0):
+            cache.set("hash", "user", expires_in=5)
+        with patch("backend.session_tokens.time.monotonic", return_value=104.0):
+            assert cache.get("hash") == "user"
+        with patch("backend.session_tokens.time.monotonic", return_value=105.0):
+            assert cache.get("hash") is None
+
+    def test_max_size(self):
+        cache = TokenCache(ttl=60, max_size=2)
+        cache.set("a", "user1", expires_in=10)
+        cache.set("b", "user2", expires_in=100)
+        cache.set("c", "user3", expires_in=100)
+        assert cache.get("a") is None
+        assert cache.get("b") == "user2"
+        assert cache.get("c") == "user3"
+
+    def test_discard_user(self):
+        cache = TokenCache(ttl=60)
+        cache.set("a", "user1", expires_in=100)
+        cache.set("b", "user1", expires_in=100)
+        cache.set("c", "user2", expires_in=100)
+        cache.discard_user("user1")
+        assert cache.get("a") is None and cache.get("b") is None
+        assert cache.get("c") == "user2"
+
+class TestSessionTokens:
+    @pytest.fixture(autouse=True)
+    def setup_database(self):
+        """각 테스트 전에 데이터베이스 초기화"""
+        init_database()
+        register_user("token_user", "password")
+
+    def test_create_and_validate(self):
+        token = create_session_token("token_user", ttl=3600)
+        assert token
+        assert validate_session_token(token) == "token_user"
+        assert validate_session_token("unknown-token") is None
+        assert validate_session_token(None) is None
+
+    def test_create_for_unknown_user(self):
+        assert create_session_token("nonexistent_user", ttl=3600) is None
+
+    def test_expired_token(self):
+        token = create_session_token("token_user", ttl=-1)
+        assert validate_session_token(token) is None
+
+    def test_validate_uses_cache(self):
+        cache = TokenCache(ttl=60)
+        token = create_session_token("token_user", ttl=3600)
+        assert validate_session_token(token, cache) == "token_user"
+        with patch("backend.session_tokens.get_connection") as mock_conn:
+            assert validate_session_token(token, cache) == "token_user"
+            mock_conn.assert_not_called()
+
+    def test_revoke(self):
+        cache = TokenCache(ttl=60)
+        token = create_session_token("token_user", ttl=3600)
+        other = create_session_token("token_user", ttl=3600)
+        validate_session_token(token, cache)
+
+        revoke_session_token(token, cache)
+        assert cache.get(hash_token(token)) is None
+        assert validate_session_token(token, cache) is None
+        assert validate_session_token(other, cache) == "token_user"
+
+        revoke_user_sessions("token_user", cache)
+        assert validate_session_token(other, cache) is None
+
+    def test_delete_user_revokes_tokens(self):
+        token = create_session_token("token_user", ttl=3600)
+        assert delete_user("token_user") is True
+        assert validate_session_token(token) is None
+
+
+class TestCookieTokenStore:
+    @pytest.mark.parametrize("secure, suffix", [(True, "; Secure"), (False, "")])
+    def test_flush_sets_cookie(self, secure, suffix):
+        with patch("backend.session_tokens.st") as st, patch("backend.session_tokens.components") as components:
+            st.session_state = {}
+            store = CookieTokenStore("interview_session", 3600, secure=secure)
+            store.set("token")
+            store.flush()
+
+        script = components.html.call_args.args[0]
+        assert f"interview_session=token; max-age=3600; path=/; SameSite=Strict{suffix}\";" in script
+        assert ("Secure" in script) is secure
@@ -0,0 +1,133 @@
+import pytest
+from backend.init_db import init_database
+from backend.state_store import (
+    MemoryStateStore,
+    PostgresStateStore,
+    VersionConflict,
+    dump_state,
+    load_state,
+)
+
+
+def make_state():
+    return {
+        "user": "tester",
+        "session_id": 7,
+        "messages": [{"id": "m1", "role": "assistant", "content": "질문 1"}],
+        "message_ids": {"m1"},
+        "used_prompts": {"문서 1"},
+        "used_questions": {"질문 1"},
+        "token_usage": [],
+        "context": "문서 1",
+        "generated_question": "질문 1",
+        "app": object(),  # 프로세스 객체는 저장하지 않음
+        "history_window": 20,  # 화면 상태도 저장하지 않음
+    }
+
+
+def test_dump_and_load_roundtrip():
+    state = make_state()
+    restored = load_state(dump_state(state))
+    assert restored["used_prompts"] == {"문서 1"}
+    assert restored["message_ids"] == {"m1"}
+    assert restored["messages"] == state["messages"]
+    assert "app" not in restored and "history_window" not in restored
+
+
+@pytest.fixture(params=["memory", "postgres"])
+def store(request):
+    if request.param == "memory":
+        return MemoryStateStore()
+    init_database()
+    return PostgresStateStore()
+
+
+def test_save_and_load(store):
+    assert store.load("user:tester") == (None, 0)
+    assert store.save("user:tester", make_state(), 0) == 1
+
+    state, version = store.load("user:tester")
+    assert version == 1
+    state["messages"].append({"id": "m2", "role": "user", "content": "답변"})
+    assert store.save("user:tester", state, version) == 2
+
+    state, version = store.load("user:tester")
+    assert (version, state["message_ids"]) == (2, {"m1", "m2"})
+
+
+def test_version_conflict(store):
+    """같은 버전을 읽은 두 곳 중 먼저 저장한 쪽만 반영"""
+    store.save("user:tester", make_state(), 0)
+    first, version = store.load("user:tester")
+    second, _ = store.load("user:tester")
+
+    store.save("user:tester", first, version)
+    with pytest.raises(VersionConflict):
+        store.save("user:tester", second, version)
+    with pytest.raises(VersionConflict):
+        store.save("user:tester", make_state(), 0)  # 이미 있는 키를 새로 만들 수 없음
+
+
+def test_delete(store):
+    store.save("user:tester", make_state(), 0)
+    store.delete("user:tester")
+    assert store.load("user:tester") == (None, 0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_store_expires_idle_states():
+    clock = FakeClock()
+    store = MemoryStateStore(ttl=60, clock=clock)
+    store.save("interview:a", make_state(), 0)
+    clock.now = 30
+    store.save("interview:b", make_state(), 0)
+
+    clock.now = 70
+    assert store.load("interview:a") == (None, 0)
+    assert store.load("interview:b")[1] == 1
+
+    store.save("interview:c", make_state(), 0)  # 저장할 때 만료된 항목 정리
+    clock.now = 95
+    store.save("interview:c", store.load("interview:c")[0], 1)
+    assert len(store) == 1
+
+
+def test_memory_store_evicts_oldest_over_max_entries():
+    store = MemoryStateStore(max_entries=2)
+    for key in ("a", "b", "c"):
+        store.save(key, make_state(), 0)
+    store.save("b", store.load("b")[0], 1)
+    store.save("d", make_state(), 0)
+
+    assert [key for key in "abcd" if store.load(key)[0] is not None] == ["b", "d"]
+
+
+def test_postgres_store_purges_expired_rows():
+    from backend.db import get_connection, release_connection
+
+    init_database()
+    clock = FakeClock()
+    store = PostgresStateStore(ttl=3600, sweep_interval=600, clock=clock)
+    store.save("interview:old", make_state(), 0)
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("UPDATE interview_states SET updated_at = updated_at - INTERVAL '2 hours';")
+        conn.commit()
+    finally:
+        release_connection(conn)
+
+    store.save("interview:new", make_state(), 0)  # 첫 저장에서 이미 정리했으므로 sweep_interval 전에는 그대로
+    assert store.load("interview:old")[1] == 1
+
+    clock.now = 600
+    store.save("interview:new", store.load("interview:new")[0], 1)
+    assert store.load("interview:old") == (None, 0)
+    assert store.load("interview:new")[1] == 2
@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from backend.token_budget import (
+    count_tokens,
+    split_sentences,
+    compress_context,
+    record_usage,
+    summarize_usage,
+)
+
+class TestTokenBudget:
+    @pytest.fixture(autouse=True)
+    def offline_encoding(self):
+        """인코딩 파일 다운로드 없이 글자 수 기반 추정 사용"""
+        with patch("backend.token_budget._get_encoding", return_value=None):
+            yield
+
+    @pytest.fixture
+    def context(self):
+        return (
+            "파이썬의 GIL은 한 번에 하나의 스레드만 바이트코드를 실행하도록 하는 락입니다. "
+            "리스트는 변경 가능한 시퀀스 자료형입니다. "
+            "튜플은 변경할 수 없는 시퀀스 자료형입니다.\n"
+            "GIL 때문에 CPU 바운드 작업은 멀티스레딩으로 성능이 잘 오르지 않습니다."
+        )
+
+    def test_count_tokens(self):
+        """빈 문자열과 추정 토큰 수 테스트"""
+        assert count_tokens("") == 0
+        assert count_tokens("가나다라") == 2
+
+    def test_split_sentences(self, context):
+        """문장 분리 테스트"""
+        assert len(split_sentences(context)) == 4
+
+    def test_compress_within_budget(self, context):
+        """예산 이내이면 그대로 반환"""
+        assert compress_context(context, "GIL", budget=10000) == context
+        assert compress_context(context, "GIL", budget=0) == context
+
+    def test_compress_keeps_relevant_sentences(self, context):
+        """질문과 관련 높은 문장을 원래 순서대로 남김"""
+        result = compress_context(context, "파이썬 GIL과 멀티스레딩", budget=50)
+        assert count_tokens(result) <= 50
+        assert "GIL은" in result
+        assert "멀티스레딩" in result
+        assert result.index("GIL은") < result.index("멀티스레딩")
+        assert "튜플" not in result
+
+    def test_compress_truncates_long_sentence(self):
+        """한 문장도 예산에 들어가지 않으면 잘라서 반환"""
+        result = compress_context("가" * 100, "질문", budget=10)
+        assert result == "가" * 20
+
+    def test_record_and_summarize_usage(self):
+        """턴별 토큰 사용량 기록 및 합계"""
+        usage_log = []
+        response = MagicMock(usage_metadata={"input_tokens": 100, "output_tokens": 30})
+        record_usage(usage_log, "question", response)
+        record_usage(usage_log, "evaluation", MagicMock(usage_metadata=None), cached=True)
+
+        assert usage_log[1] == {"stage": "evaluation", "prompt_tokens": 0, "completion_tokens": 0, "cached": True}
+        assert summarize_usage(usage_log) == {
+            "turns": 2,
+            "prompt_tokens": 100,
+            "completion_tokens": 30,
+            "total_tokens": 130,
+        }
@@ -0,0 +1,106 @@
+import json
+import threading
+import pytest
+from contextvars import copy_context
+from backend import tracing
+from backend.metrics import track, record_error
+from backend.tracing import (
+    start_trace,
+    span,
+    load_traces,
+    summarize_traces,
+    stage_breakdown,
+    stage_stats,
+)
+
+class TestTracing:
+    @pytest.fixture
+    def trace_path(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        tracing.configure({"enabled": True, "path": str(path)})
+        yield path
+        tracing.configure({"enabled": False})
+
+    def read_spans(self, path):
+        return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    def test_disabled_is_noop(self, tmp_path):
+        tracing.configure({"enabled": False})
+        with start_trace("interview.answer") as root:
+            with span("db.insert_chat_message"):
+                pass
+        assert not tracing.is_tracing()
+        assert not list(tmp_path.iterdir())
+
+    def test_span_tree(self, trace_path):
+        """루트 span 하나에 단계별 하위 span이 같은 trace_id로 기록"""
+        with start_trace("interview.answer", user="kim"):
+            with span("langgraph.call_model"):
+                with track("llm", "evaluation"):
+                    pass
+            with track("db", "insert_chat_message"):
+                record_error()
+
+        spans = {s["name"]: s for s in self.read_spans(trace_path)}
+        root = spans["interview.answer"]
+        assert root["parent_span_id"] is None
+        assert root["attributes"] == {"user": "kim"}
+        assert len({s["trace_id"] for s in spans.values()}) == 1
+        assert spans["langgraph.call_model"]["parent_span_id"] == root["span_id"]
+        assert spans["llm.evaluation"]["parent_span_id"] == spans["langgraph.call_model"]["span_id"]
+        assert spans["db.insert_chat_message"]["status"]["code"] == "ERROR"
+        assert root["status"]["code"] == "OK"
+
+    def test_each_turn_has_new_trace_id(self, trace_path):
+        for _ in range(2):
+            with start_trace("interview.question"):
+                pass
+        assert len({s["trace_id"] for s in self.read_spans(trace_path)}) == 2
+
+    def test_span_in_worker_thread(self, trace_path):
+        """context를 복사하여 실행한 다른 스레드의 span도 같은 트레이스에 기록"""
+        with start_trace("interview.start"):
+            ctx = copy_context()
+            thread = threading.Thread(target=ctx.run, args=(lambda: span("db.create_chat_session").__enter__().__exit__(None, None, None),))
+            thread.start()
+            thread.join()
+
+        names = {s["name"] for s in self.read_spans(trace_path)}
+        assert names == {"interview.start", "db.create_chat_session"}
+
+    def test_exception_marks_error(self, trace_path):
+        with pytest.raises(RuntimeError):
+            with start_trace("interview.answer"):
+                raise RuntimeError("boom")
+        root = self.read_spans(trace_path)[0]
+        assert root["status"] == {"code": "ERROR", "message": "RuntimeError: boom"}
+
+    def test_summaries(self, trace_path):
+        with start_trace("interview.answer"):
+            with span("llm.evaluation"):
+                pass
+            with span("render.message"):
+                pass
+        with start_trace("interview.question"):
+            with span("llm.question"):
+                pass
+
+        traces = load_traces(str(trace_path))
+        turns = summarize_traces(traces)
+        assert {turn["name"] for turn in turns} == {"interview.answer", "interview.question"}
+        assert turns[0]["duration_ms"] >= turns[1]["duration_ms"]
+
+        answer = next(turn for turn in turns if turn["name"] == "interview.answer")
+        rows = stage_breakdown(traces[answer["trace_id"]])
+        assert [row["stage"] for row in rows] == ["interview.answer", "  llm.evaluation", "  render.message"]
+        assert rows[0]["share"] == 1.0
+
+        stats = {row["stage"]: row for row in stage_stats(traces)}
+        assert stats["llm.evaluation"]["count"] == 1
+
+    def test_load_skips_partial_line(self, trace_path):
+        with start_trace("interview.answer"):
+            pass
+        with open(trace_path, "a", encoding="utf-8") as f:
+            f.write('{"trace_id": "abc", "span')
+        assert len(load_traces(str(trace_path))) == 1